@@ -24,7 +24,7 @@ import ErrorMessage from './components/ErrorMessage';
  */
 function App() {
   // Fetch attendance data from GitHub
-  const { data, loading, error, refetch } = useAttendanceData();
+  const { data, loading, error, refetch, loadUser } = useAttendanceData();
 
   // State management
   const [selectedUser, setSelectedUser] = useState('');
@@ -46,6 +46,13 @@ function App() {
     }
   }, [users, selectedUser]);
 
+  // Sharded output: fetch the selected user's file on first selection
+  useEffect(() => {
+    if (data && selectedUser && data[selectedUser] === null) {
+      loadUser(selectedUser);
+    }
+  }, [data, selectedUser]);
+
   // Get filtered data for selected user and date range
   const { filteredMonthlyData, summaryStats, attendedDates, manualAttendanceDates, skipDates } = useFilteredData(
     data,
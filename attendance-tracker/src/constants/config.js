@@ -8,6 +8,30 @@
 export const ATTENDANCE_JSON_URL =
   'https://raw.githubusercontent.com/koustubh25/station-station/main/output/attendance.json';
 
+/**
+ * URL of the sharded output manifest (index.json). Set this when the tracker
+ * runs with OUTPUT_LAYOUT=sharded, e.g.
+ * 'https://raw.githubusercontent.com/koustubh25/station-station/main/output/index.json'.
+ * The app then loads only the manifest up front and fetches each user's file
+ * when that user is selected. Leave null to load the single attendance.json.
+ */
+export const ATTENDANCE_INDEX_URL = null;
+
+/**
+ * URL of version.json, written next to the output when the tracker runs with
+ * OUTPUT_PRECOMPRESS=1, e.g.
+ * 'https://raw.githubusercontent.com/koustubh25/station-station/main/output/version.json'.
+ * When set (and ATTENDANCE_INDEX_URL is not), the app fetches the minified
+ * payload only when the content hash in version.json changes, and polls it
+ * every VERSION_POLL_INTERVAL_MS. Leave null to always fetch attendance.json.
+ */
+export const ATTENDANCE_VERSION_URL = null;
+
+/**
+ * How often to poll version.json for new data (milliseconds)
+ */
+export const VERSION_POLL_INTERVAL_MS = 5 * 60 * 1000;
+
 /**
  * Default start date for filtering (Financial year start: October 1, 2025)
  */
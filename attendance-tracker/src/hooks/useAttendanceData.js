@@ -1,14 +1,30 @@
-import { useState, useEffect } from 'react';
-import { fetchAttendanceData } from '../utils/dataFetcher';
+import { useState, useEffect, useRef } from 'react';
+import {
+  fetchAttendanceData,
+  fetchAttendanceIndex,
+  fetchUserShard,
+  fetchVersionedAttendanceData
+} from '../utils/dataFetcher';
+import { ATTENDANCE_INDEX_URL, ATTENDANCE_VERSION_URL, VERSION_POLL_INTERVAL_MS } from '../constants/config';
 
 /**
  * Custom hook for fetching and managing attendance data
- * @returns {Object} { data, loading, error, refetch }
+ *
+ * With ATTENDANCE_INDEX_URL set, only the sharded output manifest is fetched
+ * on mount: data holds every user with a null placeholder, and loadUser
+ * fetches a user's shard on demand. With ATTENDANCE_VERSION_URL set, the
+ * payload is fetched through version.json and version.json is polled so new
+ * data is picked up without re-downloading unchanged data. Otherwise the
+ * whole attendance.json is loaded. loadUser only does something for sharded
+ * output.
+ *
+ * @returns {Object} { data, loading, error, refetch, loadUser }
  */
 export function useAttendanceData() {
   const [data, setData] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
+  const indexRef = useRef(null);
 
   /**
    * Fetch attendance data from the API
@@ -18,8 +34,22 @@ export function useAttendanceData() {
       setLoading(true);
       setError(null);
 
-      const attendanceData = await fetchAttendanceData();
-      setData(attendanceData);
+      if (ATTENDANCE_INDEX_URL) {
+        const index = await fetchAttendanceIndex();
+        indexRef.current = index;
+
+        const placeholders = { metadata: index.metadata };
+        Object.keys(index.users).forEach((username) => {
+          placeholders[username] = null;
+        });
+        setData(placeholders);
+      } else if (ATTENDANCE_VERSION_URL) {
+        const { data: attendanceData } = await fetchVersionedAttendanceData();
+        setData(attendanceData);
+      } else {
+        const attendanceData = await fetchAttendanceData();
+        setData(attendanceData);
+      }
     } catch (err) {
       setError(err.message || 'Failed to load attendance data');
       console.error('Error loading attendance data:', err);
@@ -28,6 +58,23 @@ export function useAttendanceData() {
     }
   };
 
+  /**
+   * Lazily fetch one user's shard (sharded output only)
+   * @param {string} username - User to load
+   */
+  const loadUser = async (username) => {
+    const index = indexRef.current;
+    if (!index || !index.users[username]) return;
+
+    try {
+      const userData = await fetchUserShard(index, username);
+      setData((current) => ({ ...current, [username]: userData }));
+    } catch (err) {
+      setError(err.message || 'Failed to load attendance data');
+      console.error(`Error loading attendance data for ${username}:`, err);
+    }
+  };
+
   /**
    * Refetch data (for retry functionality)
    */
@@ -40,10 +87,27 @@ export function useAttendanceData() {
     loadData();
   }, []);
 
+  // Poll version.json and swap in new data only when its content hash changed
+  useEffect(() => {
+    if (ATTENDANCE_INDEX_URL || !ATTENDANCE_VERSION_URL) return undefined;
+
+    const timer = setInterval(async () => {
+      try {
+        const { data: attendanceData, changed } = await fetchVersionedAttendanceData();
+        if (changed) setData(attendanceData);
+      } catch (err) {
+        console.error('Error polling attendance version:', err);
+      }
+    }, VERSION_POLL_INTERVAL_MS);
+
+    return () => clearInterval(timer);
+  }, []);
+
   return {
     data,
     loading,
     error,
-    refetch
+    refetch,
+    loadUser
   };
 }
@@ -1,5 +1,13 @@
 import { describe, it, expect, vi, beforeEach, afterEach } from 'vitest';
-import { fetchAttendanceData } from '../utils/dataFetcher';
+import {
+  fetchAttendanceData,
+  fetchAttendanceIndex,
+  fetchUserShard,
+  fetchVersionedAttendanceData,
+  resetAttendanceVersionCache,
+  expandAttendanceHistory,
+  decodeDayBitsets
+} from '../utils/dataFetcher';
 import { parseAttendanceDate, isDateInRange, getMonthLabel } from '../utils/dateHelpers';
 import { filterDataByDateRange, calculateSummaryStats, transformMonthlyData } from '../utils/calculations';
 
@@ -82,6 +90,135 @@ describe('Data Layer Tests', () => {
 
       await expect(fetchAttendanceData()).rejects.toThrow('Failed to fetch attendance data');
     });
+
+    it('should expand compacted closed months into attendanceDays', async () => {
+      global.fetch.mockResolvedValueOnce({
+        ok: true,
+        json: async () => ({
+          metadata: { generatedAt: '2025-11-02T07:08:42Z', totalUsers: 1 },
+          koustubh25: {
+            attendanceDays: ['2025-10-09', '2025-10-10'],
+            attendanceHistory: {
+              '2025-05': { mask: (1 << 7) | (1 << 12), count: 2 },
+              '2025-06': { mask: (1 << 2) | (1 << 4), count: 2 }
+            }
+          }
+        })
+      });
+
+      const data = await fetchAttendanceData();
+
+      expect(data.koustubh25.attendanceDays).toEqual(mockAttendanceData.koustubh25.attendanceDays);
+    });
+
+    it('should decode bitset-encoded users', async () => {
+      global.fetch.mockResolvedValueOnce({
+        ok: true,
+        json: async () => ({
+          metadata: { generatedAt: '2025-11-02T07:08:42Z', totalUsers: 1, encoding: 'bitset-v1' },
+          koustubh25: {
+            calendar: {
+              attended: { '2024': 'AQAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAIA==' },
+              manual: {},
+              skip: { '2025': 'AAAAAAAAAEA=' },
+              working: {}
+            }
+          }
+        })
+      });
+
+      const data = await fetchAttendanceData();
+
+      expect(data.koustubh25.attendanceDays).toEqual(['2024-01-01', '2024-12-31']);
+      expect(data.koustubh25.manualAttendanceDates).toEqual([]);
+      expect(data.koustubh25.skipDates).toEqual(['2025-03-04']);
+      expect(data.koustubh25.calendar).toBeUndefined();
+    });
+
+    it('should return an empty list for missing bitsets', () => {
+      expect(decodeDayBitsets(undefined)).toEqual([]);
+    });
+
+    it('should decode day bits including the 31st', () => {
+      expect(expandAttendanceHistory({ '2025-01': { mask: 2 ** 30 + 1, count: 2 } }))
+        .toEqual(['2025-01-01', '2025-01-31']);
+      expect(expandAttendanceHistory(undefined)).toEqual([]);
+    });
+  });
+
+  describe('Sharded output', () => {
+    const indexUrl = 'https://example.com/output/index.json';
+    const index = {
+      metadata: { generatedAt: '2025-11-02T07:08:42Z', totalUsers: 1, layout: 'sharded' },
+      users: { koustubh25: { file: 'users/koustubh25.json', sha256: 'abc', size: 10 } }
+    };
+
+    beforeEach(() => {
+      global.fetch = vi.fn();
+    });
+
+    afterEach(() => {
+      vi.restoreAllMocks();
+    });
+
+    it('should fetch the manifest and then a single user shard', async () => {
+      global.fetch
+        .mockResolvedValueOnce({ ok: true, json: async () => index })
+        .mockResolvedValueOnce({ ok: true, json: async () => ({ ...mockAttendanceData.koustubh25 }) });
+
+      const loadedIndex = await fetchAttendanceIndex(indexUrl);
+      const userData = await fetchUserShard(loadedIndex, 'koustubh25', indexUrl);
+
+      expect(userData.attendanceDays).toEqual(mockAttendanceData.koustubh25.attendanceDays);
+      expect(global.fetch).toHaveBeenLastCalledWith(
+        'https://example.com/output/users/koustubh25.json',
+        expect.objectContaining({ cache: 'no-cache' })
+      );
+    });
+
+    it('should reject manifests without a users section', async () => {
+      global.fetch.mockResolvedValueOnce({ ok: true, json: async () => mockAttendanceData });
+
+      await expect(fetchAttendanceIndex(indexUrl)).rejects.toThrow('Failed to fetch attendance data');
+    });
+
+    it('should reject users missing from the manifest', async () => {
+      await expect(fetchUserShard(index, 'someone', indexUrl)).rejects.toThrow('Unknown user');
+    });
+  });
+
+  describe('Versioned output', () => {
+    const versionUrl = 'https://example.com/output/version.json';
+    const version = {
+      contentHash: 'abc123',
+      generatedAt: '2025-11-02T07:08:42Z',
+      files: { json: { file: 'attendance.min.json', size: 100, sha256: 'def' } }
+    };
+
+    beforeEach(() => {
+      resetAttendanceVersionCache();
+      global.fetch = vi.fn();
+    });
+
+    afterEach(() => {
+      vi.restoreAllMocks();
+    });
+
+    it('should only download the payload when the content hash changes', async () => {
+      global.fetch
+        .mockResolvedValueOnce({ ok: true, json: async () => version })
+        .mockResolvedValueOnce({ ok: true, json: async () => mockAttendanceData })
+        .mockResolvedValueOnce({ ok: true, json: async () => version });
+
+      const first = await fetchVersionedAttendanceData(versionUrl);
+      const second = await fetchVersionedAttendanceData(versionUrl);
+
+      expect(first.changed).toBe(true);
+      expect(first.data).toEqual(mockAttendanceData);
+      expect(second.changed).toBe(false);
+      expect(global.fetch).toHaveBeenCalledTimes(3);
+      expect(global.fetch.mock.calls[1][0]).toBe('https://example.com/output/attendance.min.json?v=abc123');
+    });
   });
 
   describe('Date Filtering', () => {
@@ -1,4 +1,100 @@
-import { ATTENDANCE_JSON_URL } from '../constants/config';
+import { ATTENDANCE_JSON_URL, ATTENDANCE_INDEX_URL, ATTENDANCE_VERSION_URL } from '../constants/config';
+
+/**
+ * Expands a closed-month attendance history into ISO date strings.
+ * Each month entry is { mask, count } where bit (day - 1) of mask is set
+ * when the user attended on that day.
+ * @param {Object} history - attendanceHistory object keyed by 'YYYY-MM'
+ * @returns {string[]} Sorted ISO date strings (YYYY-MM-DD)
+ */
+export function expandAttendanceHistory(history) {
+  const days = [];
+  Object.keys(history || {}).sort().forEach((month) => {
+    let mask = history[month].mask;
+    for (let day = 1; mask > 0; day += 1, mask = Math.floor(mask / 2)) {
+      if (mask % 2 === 1) {
+        days.push(`${month}-${String(day).padStart(2, '0')}`);
+      }
+    }
+  });
+  return days;
+}
+
+/**
+ * Decodes per-year base64 day-of-year bitsets (metadata.encoding 'bitset-v1').
+ * Bit n (day of year n + 1) is bit (n % 8) of byte floor(n / 8).
+ * @param {Object} bitsets - Object keyed by year with base64 bitset strings
+ * @returns {string[]} Sorted ISO date strings (YYYY-MM-DD)
+ */
+export function decodeDayBitsets(bitsets) {
+  const days = [];
+  Object.keys(bitsets || {}).sort().forEach((year) => {
+    const bytes = atob(bitsets[year]);
+    for (let i = 0; i < bytes.length; i += 1) {
+      const byte = bytes.charCodeAt(i);
+      for (let bit = 0; bit < 8; bit += 1) {
+        if (byte & (1 << bit)) {
+          const day = new Date(Date.UTC(Number(year), 0, 1 + i * 8 + bit));
+          days.push(day.toISOString().slice(0, 10));
+        }
+      }
+    }
+  });
+  return days;
+}
+
+/**
+ * Restores plain ISO date lists for one user: decodes a bitset calendar
+ * (metadata.encoding 'bitset-v1') and expands compacted closed months back
+ * into attendanceDays.
+ * @param {Object} userData - User data object (modified in place)
+ * @param {string} [encoding] - metadata.encoding of the file the user came from
+ * @returns {Object} The same user data object
+ */
+export function decodeUserData(userData, encoding) {
+  if (!userData) return userData;
+
+  if (encoding === 'bitset-v1' && userData.calendar) {
+    const { attended, manual, skip, working } = userData.calendar;
+    userData.attendanceDays = decodeDayBitsets(attended);
+    userData.manualAttendanceDates = decodeDayBitsets(manual);
+    userData.skipDates = decodeDayBitsets(skip);
+    userData.workingDays = decodeDayBitsets(working);
+    delete userData.calendar;
+  }
+
+  if (userData.attendanceHistory) {
+    userData.attendanceDays = [
+      ...expandAttendanceHistory(userData.attendanceHistory),
+      ...(userData.attendanceDays || []),
+    ].sort();
+  }
+
+  return userData;
+}
+
+/**
+ * Validates an attendance data object and decodes all of its users
+ * @param {Object} data - Parsed attendance JSON (modified in place)
+ * @returns {Object} The same data object
+ * @throws {Error} If the structure is invalid
+ */
+function decodeAttendanceData(data) {
+  // Validate basic JSON structure
+  if (!data || typeof data !== 'object') {
+    throw new Error('Invalid JSON structure');
+  }
+
+  if (!data.metadata) {
+    throw new Error('Missing metadata in JSON');
+  }
+
+  Object.keys(data).forEach((key) => {
+    if (key !== 'metadata') decodeUserData(data[key], data.metadata.encoding);
+  });
+
+  return data;
+}
 
 /**
  * Fetches attendance data from GitHub raw URL
@@ -15,20 +111,135 @@ export async function fetchAttendanceData() {
       throw new Error(`HTTP error! status: ${response.status}`);
     }
 
-    const data = await response.json();
+    return decodeAttendanceData(await response.json());
+  } catch (error) {
+    console.error('Error fetching attendance data:', error);
+    throw new Error('Failed to fetch attendance data. Please check your connection and try again.');
+  }
+}
+
+/**
+ * Fetches the sharded output manifest (index.json)
+ * @param {string} [indexUrl] - Manifest URL (defaults to ATTENDANCE_INDEX_URL)
+ * @returns {Promise<Object>} The manifest: { metadata, users: { username: { file, sha256, size } } }
+ * @throws {Error} If fetch fails or the manifest is invalid
+ */
+export async function fetchAttendanceIndex(indexUrl = ATTENDANCE_INDEX_URL) {
+  try {
+    const response = await fetch(indexUrl, {
+      cache: 'no-cache',
+    });
+
+    if (!response.ok) {
+      throw new Error(`HTTP error! status: ${response.status}`);
+    }
+
+    const index = await response.json();
+
+    if (!index || !index.metadata || !index.users || typeof index.users !== 'object') {
+      throw new Error('Invalid index structure');
+    }
+
+    return index;
+  } catch (error) {
+    console.error('Error fetching attendance index:', error);
+    throw new Error('Failed to fetch attendance data. Please check your connection and try again.');
+  }
+}
+
+/**
+ * Fetches and decodes one user's shard listed in the manifest
+ * @param {Object} index - Manifest from fetchAttendanceIndex
+ * @param {string} username - User to load
+ * @param {string} [indexUrl] - Manifest URL the shard path is relative to
+ * @returns {Promise<Object>} The user's attendance data
+ * @throws {Error} If the user is not in the manifest or the fetch fails
+ */
+export async function fetchUserShard(index, username, indexUrl = ATTENDANCE_INDEX_URL) {
+  const entry = index.users[username];
+  if (!entry) {
+    throw new Error(`Unknown user: ${username}`);
+  }
+
+  try {
+    const response = await fetch(new URL(entry.file, indexUrl).toString(), {
+      cache: 'no-cache',
+    });
+
+    if (!response.ok) {
+      throw new Error(`HTTP error! status: ${response.status}`);
+    }
+
+    return decodeUserData(await response.json(), index.metadata.encoding);
+  } catch (error) {
+    console.error(`Error fetching attendance data for ${username}:`, error);
+    throw new Error('Failed to fetch attendance data. Please check your connection and try again.');
+  }
+}
 
-    // Validate basic JSON structure
-    if (!data || typeof data !== 'object') {
-      throw new Error('Invalid JSON structure');
+// Last payload fetched through version.json, reused while its content hash is unchanged
+let versionCache = { contentHash: null, data: null };
+
+/**
+ * Fetches the small version file written next to the precompressed output
+ * @param {string} [versionUrl] - version.json URL (defaults to ATTENDANCE_VERSION_URL)
+ * @returns {Promise<Object>} { contentHash, generatedAt, files: { json: { file, size, sha256 }, ... } }
+ * @throws {Error} If fetch fails or the version file is invalid
+ */
+export async function fetchAttendanceVersion(versionUrl = ATTENDANCE_VERSION_URL) {
+  const response = await fetch(versionUrl, {
+    cache: 'no-cache',
+  });
+
+  if (!response.ok) {
+    throw new Error(`HTTP error! status: ${response.status}`);
+  }
+
+  const version = await response.json();
+  if (!version || !version.contentHash || !version.files || !version.files.json) {
+    throw new Error('Invalid version structure');
+  }
+
+  return version;
+}
+
+/**
+ * Fetches attendance data via version.json: the payload is only downloaded
+ * when the content hash differs from the last fetch. The minified payload is
+ * requested with the hash as a query parameter, so the browser/CDN cache can
+ * be used instead of 'no-cache'.
+ * @param {string} [versionUrl] - version.json URL (defaults to ATTENDANCE_VERSION_URL)
+ * @returns {Promise<Object>} { data, changed } - changed is false when the cached data was reused
+ * @throws {Error} If fetch fails or JSON is invalid
+ */
+export async function fetchVersionedAttendanceData(versionUrl = ATTENDANCE_VERSION_URL) {
+  try {
+    const version = await fetchAttendanceVersion(versionUrl);
+
+    if (versionCache.data && versionCache.contentHash === version.contentHash) {
+      return { data: versionCache.data, changed: false };
     }
 
-    if (!data.metadata) {
-      throw new Error('Missing metadata in JSON');
+    const payloadUrl = new URL(version.files.json.file, versionUrl);
+    payloadUrl.searchParams.set('v', version.contentHash);
+
+    const response = await fetch(payloadUrl.toString());
+    if (!response.ok) {
+      throw new Error(`HTTP error! status: ${response.status}`);
     }
 
-    return data;
+    const data = decodeAttendanceData(await response.json());
+    versionCache = { contentHash: version.contentHash, data };
+    return { data, changed: true };
   } catch (error) {
     console.error('Error fetching attendance data:', error);
     throw new Error('Failed to fetch attendance data. Please check your connection and try again.');
   }
 }
+
+/**
+ * Clears the version.json payload cache (used by tests)
+ */
+export function resetAttendanceVersionCache() {
+  versionCache = { contentHash: null, data: null };
+}
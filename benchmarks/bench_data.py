@@ -0,0 +1,92 @@
+"""Synthetic data builders shared by the benchmark modules."""
+
+import random
+from datetime import date, timedelta
+
+from synthetic_data import generate_transactions
+
+
+BENCH_START_DATE = date(2015, 1, 1)
+TARGET_STATION = "Melbourne Central"
+HOME_STATION = "Heathmont Station"
+
+_transaction_cache = {}
+_record_cache = {}
+_output_cache = {}
+
+
+def make_transactions(count):
+    """Return `count` well-formed synthetic transactions from as many 10-year cards as needed."""
+    if count not in _transaction_cache:
+        transactions = []
+        seed = 0
+        while len(transactions) < count:
+            transactions.extend(generate_transactions(
+                target_station=TARGET_STATION,
+                home_station=HOME_STATION,
+                start_date=BENCH_START_DATE,
+                years=10,
+                malformed_rate=0.0,
+                seed=seed
+            ))
+            seed += 1
+        _transaction_cache[count] = transactions[:count]
+    return _transaction_cache[count]
+
+
+def make_records(count):
+    """Return make_transactions(count) normalised into TransactionRecords."""
+    if count not in _record_cache:
+        from transaction_processor import normalize_transactions
+        _record_cache[count] = normalize_transactions(make_transactions(count))
+    return _record_cache[count]
+
+
+def period_end(years):
+    """Last day of a period of `years` years starting at BENCH_START_DATE."""
+    return date(BENCH_START_DATE.year + years - 1, 12, 31)
+
+
+def make_attendance_days(years, seed=0, attendance_rate=0.6):
+    """Return sorted ISO attendance days covering `years` years of weekdays."""
+    rng = random.Random(seed)
+    days = []
+    current_date = BENCH_START_DATE
+    end_date = period_end(years)
+
+    while current_date <= end_date:
+        if current_date.weekday() < 5 and rng.random() < attendance_rate:
+            days.append(current_date.strftime('%Y-%m-%d'))
+        current_date += timedelta(days=1)
+
+    return days
+
+
+def make_output(num_users, years):
+    """Return an existing-output dict for `num_users` users with `years` of history.
+
+    Users share one attendance history and statistics block so large user
+    counts stay cheap to build; per-user lists are still distinct objects.
+    """
+    key = (num_users, years)
+    if key not in _output_cache:
+        from output_manager import calculate_statistics
+        from working_days import VIC_HOLIDAYS
+
+        attendance_days = make_attendance_days(years)
+        statistics = calculate_statistics(
+            attendance_days, BENCH_START_DATE, period_end(years), [], VIC_HOLIDAYS
+        )
+        output = {}
+        for index in range(num_users):
+            output[f"user{index:05d}"] = {
+                "attendanceDays": list(attendance_days),
+                "manualAttendanceDates": [],
+                "latestProcessedDate": f"{attendance_days[-1]}T17:45:00+11:00",
+                "targetStation": TARGET_STATION,
+                "lastUpdated": "2025-01-01T00:00:00Z",
+                "skipDates": [],
+                "statistics": statistics,
+            }
+        _output_cache[key] = output
+    return _output_cache[key]
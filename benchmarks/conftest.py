@@ -0,0 +1,49 @@
+"""Shared fixtures and size parameters for the benchmark suite.
+
+Benchmarks are kept out of tests/ so the default pytest run (and the Docker
+test files) never pick them up. Run them with run-benchmarks.sh.
+"""
+
+import pytest
+
+
+# Data sizes per scale. "small" keeps a local run under a minute; "full" covers
+# the production envelope (10^6 transactions, 10^4 users, 10-year periods).
+SCALES = {
+    "small": {
+        "transactions": [10 ** 3, 10 ** 4],
+        "users": [1, 100],
+        "years": [1, 5],
+    },
+    "full": {
+        "transactions": [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6],
+        "users": [1, 100, 10 ** 4],
+        "years": [1, 5, 10],
+    },
+}
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--bench-scale",
+        choices=sorted(SCALES.keys()),
+        default="small",
+        help="Benchmark data sizes to run (default: small)",
+    )
+
+
+def pytest_generate_tests(metafunc):
+    """Parametrize n_transactions / n_users / n_years from the selected scale."""
+    sizes = SCALES[metafunc.config.getoption("--bench-scale")]
+
+    for fixture_name, key in (("n_transactions", "transactions"),
+                              ("n_users", "users"),
+                              ("n_years", "years")):
+        if fixture_name in metafunc.fixturenames:
+            metafunc.parametrize(fixture_name, sizes[key], ids=lambda n, k=key: f"{k}={n}")
+
+
+@pytest.fixture
+def vic_holidays():
+    from working_days import VIC_HOLIDAYS
+    return VIC_HOLIDAYS
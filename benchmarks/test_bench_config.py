@@ -0,0 +1,43 @@
+"""Benchmarks for loading many users from a unified config and a streaming manifest."""
+
+import json
+
+from config_manager import load_tracker_config
+from synthetic_data import generate_credentials_env, generate_unified_config
+
+
+def _write_inputs(tmp_path, n_users):
+    users = generate_unified_config(n_users, seed=7)["users"]
+    env = generate_credentials_env(users, seed=7)
+
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"users": users}))
+    manifest_path = tmp_path / "users.jsonl"
+    manifest_path.write_text("\n".join(json.dumps(dict(config, user=username)) for username, config in users.items()))
+    secrets_path = tmp_path / "secrets.jsonl"
+    secrets_path.write_text("\n".join(json.dumps({
+        "user": username,
+        "username": env[f"MYKI_USERNAME_{username.upper()}"],
+        "card_number": env[f"MYKI_CARDNUMBER_{username.upper()}"],
+        "password": env[f"MYKI_PASSWORD_{username.upper()}"],
+    }) for username in users))
+    secrets_path.chmod(0o600)
+    return str(config_path), str(manifest_path), str(secrets_path), env
+
+
+def test_load_unified_config(benchmark, n_users, tmp_path, monkeypatch):
+    config_path, _, _, env = _write_inputs(tmp_path, n_users)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+
+    config = benchmark(load_tracker_config, config_path)
+
+    assert len(config.credentials) == n_users
+
+
+def test_load_manifest(benchmark, n_users, tmp_path):
+    _, manifest_path, secrets_path, _ = _write_inputs(tmp_path, n_users)
+
+    config = benchmark(load_tracker_config, manifest_path, secrets_path)
+
+    assert len(config.credentials) == n_users
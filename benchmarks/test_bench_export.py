@@ -0,0 +1,37 @@
+"""Benchmarks for the columnar Parquet export against the nested JSON output."""
+
+import pytest
+
+pytest.importorskip("pyarrow")
+import pyarrow.dataset as ds
+
+from columnar_export import attendance_table, export_columnar
+from output_manager import save_output, load_existing_output
+
+from bench_data import make_output
+
+
+def test_export_attendance_parquet(benchmark, n_users, tmp_path):
+    output = make_output(n_users, 1)
+
+    benchmark(export_columnar, output, str(tmp_path / "export"), "parquet")
+
+
+def test_load_attendance_parquet(benchmark, n_users, tmp_path):
+    output = make_output(n_users, 1)
+    written = export_columnar(output, str(tmp_path / "export"), "parquet")
+
+    result = benchmark(lambda: ds.dataset(written["attendance"], partitioning="hive").to_table())
+
+    assert result.num_rows == attendance_table(output).num_rows
+
+
+def test_load_attendance_json(benchmark, n_users, tmp_path):
+    # Baseline for test_load_attendance_parquet: the same data as nested JSON
+    output = make_output(n_users, 1)
+    output_path = str(tmp_path / "attendance.json")
+    save_output(output, output_path=output_path, config_path=str(tmp_path / "missing.json"))
+
+    result = benchmark(load_existing_output, output_path)
+
+    assert len(result) == n_users + 1
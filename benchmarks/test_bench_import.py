@@ -0,0 +1,71 @@
+"""Cold-start benchmarks for the entry points that never launch a browser.
+
+Each module is imported in a fresh interpreter with `python -X importtime`,
+so the timing includes everything the entry point pulls in. The heavy
+dependencies (Playwright, holidays, requests, numpy, pyarrow) and the
+profilers behind --profile must only be loaded by the code paths that use
+them, not at import time.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+# Tracker-only and offline entry points
+ENTRY_POINTS = [
+    "myki_attendance_tracker",
+    "run_myki_workflow",
+    "scheduler",
+    "event_log",
+    "output_store",
+    "output_manager",
+]
+
+LAZY_MODULES = {
+    "playwright", "holidays", "requests", "numpy", "pyarrow", "browser_config", "myki_auth",
+    # Profiling (--profile) must cost nothing when it is off
+    "cProfile", "pstats", "tracemalloc",
+}
+
+
+def _import_time(module: str):
+    """Import a module in a fresh interpreter.
+
+    Returns:
+        Tuple (top-level modules imported, cumulative import time of module in µs)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SRC_DIR, capture_output=True, text=True, check=True,
+    )
+
+    imported, cumulative = set(), None
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative_us, name = (part.strip() for part in line.split("|"))
+        if not cumulative_us.isdigit():
+            continue  # header line
+        imported.add(name.split(".")[0])
+        if name == module:
+            cumulative = int(cumulative_us)
+    return imported, cumulative
+
+
+@pytest.mark.parametrize("module", ENTRY_POINTS)
+def test_entry_point_import_is_lazy(module):
+    imported, _ = _import_time(module)
+
+    assert not imported & LAZY_MODULES
+
+
+@pytest.mark.parametrize("module", ENTRY_POINTS)
+def test_cold_start(benchmark, module):
+    _, cumulative = benchmark.pedantic(_import_time, args=(module,), rounds=5, iterations=1)
+
+    assert cumulative is not None
@@ -0,0 +1,42 @@
+"""Benchmarks for the JSON codec, comparing the orjson and stdlib backends."""
+
+import pytest
+
+import json_codec
+
+from bench_data import make_output, make_transactions
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, monkeypatch):
+    """Run each benchmark with orjson (if installed) and with the stdlib fallback."""
+    if request.param == "orjson":
+        if json_codec.orjson is None:
+            pytest.skip("orjson is not installed")
+    else:
+        monkeypatch.setattr(json_codec, "orjson", None)
+    return request.param
+
+
+def test_dumps_output(benchmark, backend, n_users):
+    output = make_output(n_users, 1)
+
+    result = benchmark(json_codec.dumps_bytes, output, indent=2)
+
+    assert result.startswith(b"{")
+
+
+def test_loads_output(benchmark, backend, n_users):
+    content = json_codec.dumps_bytes(make_output(n_users, 1), indent=2)
+
+    result = benchmark(json_codec.loads, content)
+
+    assert len(result) == n_users
+
+
+def test_loads_transaction_page(benchmark, backend, n_transactions):
+    content = json_codec.dumps_bytes({"data": make_transactions(n_transactions)})
+
+    result = benchmark(json_codec.loads, content)
+
+    assert len(result["data"]) == n_transactions
@@ -0,0 +1,164 @@
+"""Benchmarks for output statistics, merging and persistence."""
+
+import json
+from datetime import datetime
+
+from output_manager import (
+    calculate_statistics,
+    update_user_output,
+    load_existing_output,
+    save_output,
+    save_sharded_output,
+    save_sqlite_output,
+)
+from output_store import AttendanceStore, STORE_FILENAME
+
+from bench_data import (
+    make_attendance_days,
+    make_output,
+    BENCH_START_DATE,
+    TARGET_STATION,
+    period_end,
+)
+
+
+def _write_config(tmp_path, usernames):
+    config_path = tmp_path / "config.json"
+    users = {
+        username: {"targetStation": TARGET_STATION, "startDate": BENCH_START_DATE.isoformat()}
+        for username in usernames
+    }
+    with open(config_path, 'w') as f:
+        json.dump({"users": users}, f)
+    return str(config_path)
+
+
+def test_calculate_statistics(benchmark, n_years, vic_holidays):
+    attendance_days = make_attendance_days(n_years)
+
+    result = benchmark(
+        calculate_statistics,
+        attendance_days, BENCH_START_DATE, period_end(n_years), [], vic_holidays
+    )
+
+    assert result["totalWorkingDays"] > 0
+
+
+def test_update_user_output_by_users(benchmark, n_users, vic_holidays):
+    existing_output = make_output(n_users, 1)
+    username = next(iter(existing_output))
+
+    result = benchmark(
+        update_user_output,
+        existing_output=existing_output,
+        username=username,
+        new_attendance_days=[period_end(1).isoformat()],
+        latest_txn_datetime=datetime.fromisoformat(f"{period_end(1).isoformat()}T17:45:00+11:00"),
+        target_station=TARGET_STATION,
+        start_date=BENCH_START_DATE,
+        end_date=period_end(1),
+        skip_dates=[],
+        vic_holidays=vic_holidays,
+        manual_attendance_dates=[]
+    )
+
+    assert len(result) == n_users
+
+
+def test_update_user_output_by_years(benchmark, n_years, vic_holidays):
+    existing_output = make_output(1, n_years)
+    username = next(iter(existing_output))
+
+    result = benchmark(
+        update_user_output,
+        existing_output=existing_output,
+        username=username,
+        new_attendance_days=[period_end(n_years).isoformat()],
+        latest_txn_datetime=datetime.fromisoformat(f"{period_end(n_years).isoformat()}T17:45:00+11:00"),
+        target_station=TARGET_STATION,
+        start_date=BENCH_START_DATE,
+        end_date=period_end(n_years),
+        skip_dates=[],
+        vic_holidays=vic_holidays,
+        manual_attendance_dates=[]
+    )
+
+    assert result[username]["statistics"]["totalWorkingDays"] > 0
+
+
+def test_save_output(benchmark, n_users, tmp_path):
+    output = make_output(n_users, 1)
+    config_path = _write_config(tmp_path, output.keys())
+    output_path = str(tmp_path / "attendance.json")
+
+    benchmark(save_output, output, output_path=output_path, config_path=config_path)
+
+
+def test_load_existing_output(benchmark, n_users, tmp_path):
+    output = make_output(n_users, 1)
+    config_path = _write_config(tmp_path, output.keys())
+    output_path = str(tmp_path / "attendance.json")
+    save_output(output, output_path=output_path, config_path=config_path)
+
+    result = benchmark(load_existing_output, output_path)
+
+    assert len(result) == n_users + 1  # users + metadata
+
+
+def test_save_output_bitset(benchmark, n_users, tmp_path):
+    output = make_output(n_users, 1)
+    config_path = _write_config(tmp_path, output.keys())
+    output_path = str(tmp_path / "attendance.json")
+
+    benchmark(save_output, output, output_path=output_path, config_path=config_path, encoding="bitset")
+
+
+def test_load_existing_output_bitset(benchmark, n_users, tmp_path):
+    output = make_output(n_users, 1)
+    config_path = _write_config(tmp_path, output.keys())
+    output_path = str(tmp_path / "attendance.json")
+    save_output(output, output_path=output_path, config_path=config_path, encoding="bitset")
+
+    result = benchmark(load_existing_output, output_path)
+
+    assert len(result) == n_users + 1  # users + metadata
+
+
+def test_save_sharded_output_one_changed(benchmark, n_users, tmp_path):
+    output = make_output(n_users, 1)
+    config_path = _write_config(tmp_path, output.keys())
+    output_dir = str(tmp_path / "output")
+    save_sharded_output(output, output_dir=output_dir, config_path=config_path)
+
+    # Re-save with a single user's data changed: only that shard is rewritten,
+    # every other shard is skipped by its content hash
+    username = next(iter(output))
+    changed_days = output[username]["attendanceDays"] + ["2099-01-01"]
+    changed = dict(output, **{username: dict(output[username], attendanceDays=changed_days)})
+
+    benchmark(save_sharded_output, changed, output_dir=output_dir, config_path=config_path)
+
+
+def test_save_sqlite_output_one_changed(benchmark, n_users, tmp_path):
+    output = make_output(n_users, 1)
+    config_path = _write_config(tmp_path, output.keys())
+    output_dir = str(tmp_path / "output")
+    save_sqlite_output(output, output_dir=output_dir, config_path=config_path)
+
+    # Only the changed user's new day is inserted into the store
+    username = next(iter(output))
+    changed_days = output[username]["attendanceDays"] + ["2099-01-01"]
+    changed = dict(output, **{username: dict(output[username], attendanceDays=changed_days)})
+
+    benchmark(save_sqlite_output, changed, output_dir=output_dir, config_path=config_path)
+
+
+def test_store_attendance_between(benchmark, n_users, tmp_path):
+    output = make_output(n_users, 1)
+    config_path = _write_config(tmp_path, output.keys())
+    save_sqlite_output(output, output_dir=str(tmp_path), config_path=config_path)
+
+    with AttendanceStore(str(tmp_path / STORE_FILENAME)) as store:
+        result = benchmark(store.attendance_between, BENCH_START_DATE, BENCH_START_DATE.replace(month=3))
+
+    assert len(result) > 0
@@ -0,0 +1,103 @@
+"""Benchmarks for the transaction processing hot paths."""
+
+from datetime import datetime
+
+import pytest
+
+from transaction_processor import (
+    normalize_transactions,
+    filter_transactions,
+    calculate_attendance_days,
+)
+from output_manager import filter_new_transactions
+
+from bench_data import make_transactions, make_records, BENCH_START_DATE, TARGET_STATION, period_end
+
+
+def _midpoint_datetime(transactions):
+    """Datetime of a well-formed transaction near the middle of the (newest-first) list."""
+    index = len(transactions) // 2
+    while transactions[index]["transactionDateTime"][-6:] not in ("+10:00", "+11:00"):
+        index += 1
+    return datetime.fromisoformat(transactions[index]["transactionDateTime"])
+
+
+def test_filter_transactions(benchmark, n_transactions):
+    transactions = make_transactions(n_transactions)
+
+    result = benchmark(
+        filter_transactions, transactions, TARGET_STATION, BENCH_START_DATE, period_end(10)
+    )
+
+    assert result
+
+
+def test_calculate_attendance_days(benchmark, n_transactions, vic_holidays):
+    transactions = filter_transactions(
+        make_transactions(n_transactions), TARGET_STATION, BENCH_START_DATE, period_end(10)
+    )
+
+    result = benchmark(calculate_attendance_days, transactions, [], vic_holidays)
+
+    assert result
+
+
+def test_filter_new_transactions(benchmark, n_transactions):
+    transactions = make_transactions(n_transactions)
+    latest_processed_date = _midpoint_datetime(transactions)
+
+    result = benchmark(filter_new_transactions, transactions, latest_processed_date)
+
+    assert result
+
+
+def test_normalize_transactions(benchmark, n_transactions):
+    transactions = make_transactions(n_transactions)
+
+    result = benchmark(normalize_transactions, transactions)
+
+    assert len(result) == n_transactions
+
+
+def test_record_pipeline(benchmark, n_transactions, vic_holidays):
+    """Full per-user pipeline as process_user runs it: normalise once, then filter."""
+    transactions = make_transactions(n_transactions)
+    latest_processed_date = _midpoint_datetime(transactions)
+
+    def pipeline():
+        records = normalize_transactions(transactions)
+        new_records = filter_new_transactions(records, latest_processed_date)
+        filtered = filter_transactions(new_records, TARGET_STATION, BENCH_START_DATE, period_end(10))
+        return calculate_attendance_days(filtered, [], vic_holidays)
+
+    assert benchmark(pipeline)
+
+
+def test_filter_transactions_records(benchmark, n_transactions):
+    records = make_records(n_transactions)
+
+    result = benchmark(filter_transactions, records, TARGET_STATION, BENCH_START_DATE, period_end(10))
+
+    assert result
+
+
+def test_columnar_pipeline(benchmark, n_transactions, vic_holidays):
+    """Same pipeline as test_record_pipeline on a columnar TransactionBatch."""
+    pytest.importorskip("numpy")
+    from transaction_batch import (
+        TransactionBatch,
+        filter_new_transactions_batch,
+        filter_transactions_batch,
+        calculate_attendance_days_batch,
+    )
+
+    records = make_records(n_transactions)
+    latest_processed_date = _midpoint_datetime(make_transactions(n_transactions))
+
+    def pipeline():
+        batch = TransactionBatch.from_records(records)
+        new_batch = filter_new_transactions_batch(batch, latest_processed_date)
+        filtered = filter_transactions_batch(new_batch, TARGET_STATION, BENCH_START_DATE, period_end(10))
+        return calculate_attendance_days_batch(filtered, [], vic_holidays)
+
+    assert benchmark(pipeline)
@@ -34,6 +34,94 @@ cleanup() {
     exit $exit_code
 }
 
+# Copy files from temp directories back to mounted volumes (no-op without temp dirs)
+copy_back_to_mounts() {
+    if [ "$USING_TEMP_DIRS" != true ]; then
+        return 0
+    fi
+    local dir temp_dir mount_dir
+    log "Copying files from temp directories back to mounted volumes..."
+    for dir in output auth_data screenshots; do
+        temp_dir="/tmp/$dir"
+        mount_dir="/app/$dir"
+
+        if [ -d "$temp_dir" ] && [ -d "$mount_dir" ]; then
+            log "Copying $dir files from temp to mounted volume..."
+            # Use cp with force to overwrite read-only mounts
+            if cp -rf "$temp_dir"/* "$mount_dir/" 2>/dev/null; then
+                log "  ✓ Successfully copied $dir files to mounted volume"
+            else
+                # If copy fails, dump the attendance.json to stdout for GitHub Actions to capture
+                log "  ⚠ Could not copy $dir files back (mount may be read-only)"
+
+                if [ "$dir" = "output" ] && [ -f "$temp_dir/attendance.json" ]; then
+                    log "Dumping attendance.json content for GitHub Actions artifact:"
+                    echo "===== BEGIN ATTENDANCE JSON ====="
+                    cat "$temp_dir/attendance.json"
+                    echo ""  # Ensure newline after JSON content
+                    echo "===== END ATTENDANCE JSON ====="
+
+                    # Also try writing to mount with different approach
+                    log "Attempting to write attendance.json using redirection..."
+                    cat "$temp_dir/attendance.json" > "$mount_dir/attendance.json" 2>/dev/null && \
+                        log "  ✓ Successfully wrote attendance.json via redirection" || \
+                        log "  ⚠ Could not write attendance.json to mount"
+                fi
+            fi
+        fi
+    done
+}
+
+# Pass SIGTERM/SIGINT on to the running workflow or scheduler.
+# Bash runs as PID 1, so it only receives the signal itself; the child stops
+# (the scheduler after its current cycle) and the steps below still run.
+forward_signal() {
+    if [ -n "$CHILD_PID" ] && kill -0 "$CHILD_PID" 2>/dev/null; then
+        log "Forwarding SIG$1 to PID $CHILD_PID"
+        kill -"$1" "$CHILD_PID" 2>/dev/null || true
+    fi
+}
+
+# Start a command in the background as CHILD_PID, forwarding signals to it
+start_child() {
+    "$@" &
+    CHILD_PID=$!
+    trap 'forward_signal TERM' TERM
+    trap 'forward_signal INT' INT
+}
+
+# Wait for CHILD_PID to exit and store its exit code in WORKFLOW_EXIT_CODE
+wait_child() {
+    local code
+    while true; do
+        code=0
+        wait "$CHILD_PID" || code=$?
+        # wait returns >128 when a forwarded signal interrupts it; keep waiting for the child
+        if [ "$code" -gt 128 ] && kill -0 "$CHILD_PID" 2>/dev/null; then
+            continue
+        fi
+        WORKFLOW_EXIT_CODE=$code
+        return 0
+    done
+}
+
+# Copy output back after every finished scheduler cycle (lastRunEnd in the
+# status file changes) until the daemon exits
+sync_daemon_output() {
+    local status_file="${SCHEDULER_STATUS_FILE:-${OUTPUT_DIR:-output}/scheduler_status.json}"
+    local last_run_end="" run_end
+    while kill -0 "$CHILD_PID" 2>/dev/null; do
+        sleep "${SCHEDULER_SYNC_INTERVAL:-30}" &
+        wait $! 2>/dev/null || true
+        run_end=$(grep -o '"lastRunEnd": *"[^"]*"' "$status_file" 2>/dev/null || true)
+        if [ -n "$run_end" ] && [ "$run_end" != "$last_run_end" ]; then
+            last_run_end="$run_end"
+            log "Scheduled run finished"
+            copy_back_to_mounts
+        fi
+    done
+}
+
 # Set up trap to ensure cleanup runs on exit
 trap cleanup EXIT INT TERM
 
@@ -193,44 +281,25 @@ else
         exit 1
     fi
 
-    log "Executing default workflow: python src/run_myki_workflow.py config/myki_config.json"
-    python src/run_myki_workflow.py config/myki_config.json
-    WORKFLOW_EXIT_CODE=$?
+    if [ -n "$SCHEDULER_CRON" ] || [ -n "$SCHEDULER_INTERVAL" ]; then
+        # Daemon mode: stay resident and run the workflow on the schedule
+        # (the scheduler reads SCHEDULER_CRON / SCHEDULER_INTERVAL itself)
+        log "Executing scheduler daemon: python src/scheduler.py config/myki_config.json"
+        start_child python src/scheduler.py config/myki_config.json
+        if [ "$USING_TEMP_DIRS" = true ]; then
+            log "Output is written to /tmp and copied back after each scheduled run"
+            sync_daemon_output
+        fi
+        wait_child
+    else
+        log "Executing default workflow: python src/run_myki_workflow.py config/myki_config.json"
+        start_child python src/run_myki_workflow.py config/myki_config.json
+        wait_child
+    fi
 fi
 
 # Step 8: Copy files from temp directories back to mounted volumes
-if [ "$USING_TEMP_DIRS" = true ]; then
-    log "Copying files from temp directories back to mounted volumes..."
-    for dir in output auth_data screenshots; do
-        temp_dir="/tmp/$dir"
-        mount_dir="/app/$dir"
-
-        if [ -d "$temp_dir" ] && [ -d "$mount_dir" ]; then
-            log "Copying $dir files from temp to mounted volume..."
-            # Use cp with force to overwrite read-only mounts
-            if cp -rf "$temp_dir"/* "$mount_dir/" 2>/dev/null; then
-                log "  ✓ Successfully copied $dir files to mounted volume"
-            else
-                # If copy fails, dump the attendance.json to stdout for GitHub Actions to capture
-                log "  ⚠ Could not copy $dir files back (mount may be read-only)"
-
-                if [ "$dir" = "output" ] && [ -f "$temp_dir/attendance.json" ]; then
-                    log "Dumping attendance.json content for GitHub Actions artifact:"
-                    echo "===== BEGIN ATTENDANCE JSON ====="
-                    cat "$temp_dir/attendance.json"
-                    echo ""  # Ensure newline after JSON content
-                    echo "===== END ATTENDANCE JSON ====="
-
-                    # Also try writing to mount with different approach
-                    log "Attempting to write attendance.json using redirection..."
-                    cat "$temp_dir/attendance.json" > "$mount_dir/attendance.json" 2>/dev/null && \
-                        log "  ✓ Successfully wrote attendance.json via redirection" || \
-                        log "  ⚠ Could not write attendance.json to mount"
-                fi
-            fi
-        fi
-    done
-fi
+copy_back_to_mounts
 
 # Step 9: Report workflow exit code
 if [ $WORKFLOW_EXIT_CODE -eq 0 ]; then
@@ -0,0 +1,42 @@
+#!/bin/bash
+# Benchmark runner for Myki Transaction Tracker
+# Purpose: Record and compare performance baselines for the processing/output hot paths
+#
+# Usage:
+#   ./run-benchmarks.sh save [--bench-scale=full]      # Record a new baseline
+#   ./run-benchmarks.sh compare [--bench-scale=full]   # Fail if slower than the latest baseline
+#   ./run-benchmarks.sh run [pytest args...]           # Run without saving or comparing
+#
+# Environment:
+#   BENCHMARK_THRESHOLD  Allowed mean regression before compare fails (default: 15%)
+
+set -e  # Exit on any error
+
+SCRIPT_DIR="$( cd "$( dirname "${BASH_SOURCE[0]}" )" && pwd )"
+STORAGE="$SCRIPT_DIR/benchmarks/.results"
+THRESHOLD="${BENCHMARK_THRESHOLD:-15%}"
+
+MODE="${1:-run}"
+shift || true
+
+cd "$SCRIPT_DIR"
+
+COMMON_ARGS=(benchmarks -q "--benchmark-storage=file://$STORAGE" --benchmark-columns=min,mean,max,rounds)
+
+case "$MODE" in
+    save)
+        echo "[BENCH] Recording baseline in $STORAGE"
+        python -m pytest "${COMMON_ARGS[@]}" --benchmark-autosave "$@"
+        ;;
+    compare)
+        echo "[BENCH] Comparing against latest baseline (fail on mean regression > $THRESHOLD)"
+        python -m pytest "${COMMON_ARGS[@]}" --benchmark-compare "--benchmark-compare-fail=mean:$THRESHOLD" "$@"
+        ;;
+    run)
+        python -m pytest "${COMMON_ARGS[@]}" "$@"
+        ;;
+    *)
+        echo "Usage: $0 {save|compare|run} [pytest args...]" >&2
+        exit 2
+        ;;
+esac
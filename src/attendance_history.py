@@ -0,0 +1,144 @@
+"""Closed-month attendance history for Myki Attendance Tracker.
+
+Months that are fully in the past are frozen into compact summaries instead of
+being kept as ISO date strings in `attendanceDays`:
+
+    "attendanceHistory": {
+        "2025-05": {"mask": 4224, "count": 2},
+        ...
+    }
+
+Bit (day - 1) of `mask` is set when the user attended on that day of the month,
+and `count` is the number of set bits. Only the current (open) month stays in
+`attendanceDays`, so merging and statistics scale with recent activity rather
+than with the whole history.
+
+Summaries are treated as immutable: updates return a new history dictionary
+and replace month entries instead of modifying them.
+"""
+
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def month_key(day: str) -> str:
+    """Month key (YYYY-MM) of an ISO date string (YYYY-MM-DD)."""
+    return day[:7]
+
+
+def _day_bit(day: str) -> int:
+    """Bit for an ISO date string within its month's mask."""
+    return 1 << (int(day[8:10]) - 1)
+
+
+def summarize_month(mask: int) -> Dict[str, int]:
+    """Build a month summary entry from a day bitmask."""
+    return {"mask": mask, "count": bin(mask).count("1")}
+
+
+def history_contains(history: Dict[str, Dict[str, int]], day: str) -> bool:
+    """Check whether an ISO date string is recorded in the history."""
+    entry = history.get(month_key(day))
+    return entry is not None and bool(entry["mask"] & _day_bit(day))
+
+
+def add_days(history: Dict[str, Dict[str, int]], days: Iterable[str]) -> Dict[str, Dict[str, int]]:
+    """Return a new history with days OR-ed into their month summaries.
+
+    Args:
+        history: Existing history (not modified)
+        days: ISO date strings to add (duplicates and already-recorded days are ignored)
+
+    Returns:
+        New history dictionary sorted by month (the input itself if nothing changed)
+    """
+    masks: Dict[str, int] = {}
+    for day in days:
+        key = month_key(day)
+        masks[key] = masks.get(key, 0) | _day_bit(day)
+
+    changed = {}
+    for key, mask in masks.items():
+        previous = history.get(key)
+        if previous is not None:
+            mask |= previous["mask"]
+            if mask == previous["mask"]:
+                continue
+        changed[key] = summarize_month(mask)
+
+    if not changed:
+        return history
+
+    updated = dict(history)
+    updated.update(changed)
+    return dict(sorted(updated.items()))
+
+
+def compact_days(
+    history: Dict[str, Dict[str, int]],
+    days: List[str],
+    before: Optional[date] = None
+) -> Tuple[Dict[str, Dict[str, int]], List[str]]:
+    """Move days of closed months into the history.
+
+    A day is moved if its month is before `before`'s month, or if its month is
+    already summarized in the history (so each month lives in one place).
+
+    Args:
+        history: Existing history (not modified)
+        days: Sorted ISO date strings still held as a list
+        before: First day of the open month, or None to only fold days into
+               months that are already summarized
+
+    Returns:
+        Tuple of (new history, days that remain in the open list)
+    """
+    cutoff = f"{before.year:04d}-{before.month:02d}" if before is not None else None
+
+    closed = []
+    remaining = []
+    for day in days:
+        key = month_key(day)
+        if key in history or (cutoff is not None and key < cutoff):
+            closed.append(day)
+        else:
+            remaining.append(day)
+
+    return add_days(history, closed), remaining
+
+
+def iter_month_days(key: str, mask: int) -> Iterable[str]:
+    """Iterate the ISO date strings recorded in one month's mask, in order."""
+    day = 1
+    while mask:
+        if mask & 1:
+            yield f"{key}-{day:02d}"
+        mask >>= 1
+        day += 1
+
+
+def expand_history(history: Dict[str, Dict[str, int]]) -> List[str]:
+    """Expand a history back into a sorted list of ISO date strings."""
+    days: List[str] = []
+    for key in sorted(history):
+        days.extend(iter_month_days(key, history[key]["mask"]))
+    return days
+
+
+def history_day_count(history: Dict[str, Dict[str, int]]) -> int:
+    """Total number of days recorded in the history."""
+    return sum(entry["count"] for entry in history.values())
+
+
+def history_bounds(history: Dict[str, Dict[str, int]]) -> Tuple[Optional[str], Optional[str]]:
+    """First and last recorded days in the history, or (None, None) if empty."""
+    months = [key for key in sorted(history) if history[key]["mask"]]
+    if not months:
+        return None, None
+
+    first_mask = history[months[0]]["mask"]
+    last_mask = history[months[-1]]["mask"]
+    first_day = (first_mask & -first_mask).bit_length()
+    last_day = last_mask.bit_length()
+
+    return f"{months[0]}-{first_day:02d}", f"{months[-1]}-{last_day:02d}"
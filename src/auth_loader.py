@@ -3,11 +3,16 @@
 Supports multi-user sessions by using MYKI_AUTH_USERNAME_KEY environment variable.
 """
 
-import json
 import os
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 
+import json_codec
+from run_log import get_logger
+
+
+logger = get_logger(__name__)
+
 
 def get_session_suffix() -> str:
     """Get session file suffix for multi-user support.
@@ -35,12 +40,12 @@ def load_session_data() -> Tuple[Optional[Dict], Optional[Dict], Optional[Dict],
     session_file = auth_data_dir / f'session{suffix}.json'
 
     if not session_file.exists():
-        print(f"Session file not found: {session_file}")
-        print("Run authentication first to generate session data.")
+        logger.warning("Session file not found: %s", session_file)
+        logger.info("Run authentication first to generate session data.")
         return (None, None, None, None)
 
-    with open(session_file, 'r') as f:
-        session_data = json.load(f)
+    with open(session_file, 'rb') as f:
+        session_data = json_codec.load(f)
 
     cookies = session_data.get('cookies', {})
     headers = session_data.get('headers', {})
@@ -48,12 +53,12 @@ def load_session_data() -> Tuple[Optional[Dict], Optional[Dict], Optional[Dict],
     bearer_token = session_data.get('bearer_token')
     timestamp = session_data.get('timestamp', 'unknown')
 
-    print(f"Loaded session data from: {session_file}")
-    print(f"Session timestamp: {timestamp}")
-    print(f"Cookies: {len(cookies)} items")
-    print(f"Headers: {len(headers)} items")
-    print(f"Auth request data: {'available' if auth_request else 'not available'}")
-    print(f"Bearer token: {'available' if bearer_token else 'NOT FOUND'}")
+    logger.info("Loaded session data from: %s", session_file)
+    logger.info("Session timestamp: %s", timestamp)
+    logger.info("Cookies: %d items", len(cookies))
+    logger.info("Headers: %d items", len(headers))
+    logger.info("Auth request data: %s", 'available' if auth_request else 'not available')
+    logger.info("Bearer token: %s", 'available' if bearer_token else 'NOT FOUND')
 
     return (cookies, headers, auth_request, bearer_token)
 
@@ -71,13 +76,13 @@ def load_cookies() -> Optional[Dict]:
     cookies_file = auth_data_dir / f'cookies{suffix}.json'
 
     if not cookies_file.exists():
-        print(f"Cookies file not found: {cookies_file}")
+        logger.warning("Cookies file not found: %s", cookies_file)
         return None
 
-    with open(cookies_file, 'r') as f:
-        cookies = json.load(f)
+    with open(cookies_file, 'rb') as f:
+        cookies = json_codec.load(f)
 
-    print(f"Loaded {len(cookies)} cookies from: {cookies_file}")
+    logger.info("Loaded %d cookies from: %s", len(cookies), cookies_file)
     return cookies
 
 
@@ -94,13 +99,13 @@ def load_headers() -> Optional[Dict]:
     headers_file = auth_data_dir / f'headers{suffix}.json'
 
     if not headers_file.exists():
-        print(f"Headers file not found: {headers_file}")
+        logger.warning("Headers file not found: %s", headers_file)
         return None
 
-    with open(headers_file, 'r') as f:
-        headers = json.load(f)
+    with open(headers_file, 'rb') as f:
+        headers = json_codec.load(f)
 
-    print(f"Loaded {len(headers)} headers from: {headers_file}")
+    logger.info("Loaded %d headers from: %s", len(headers), headers_file)
     return headers
 
 
@@ -117,13 +122,13 @@ def load_auth_request_data() -> Optional[Dict]:
     auth_request_file = auth_data_dir / f'auth_request{suffix}.json'
 
     if not auth_request_file.exists():
-        print(f"Auth request file not found: {auth_request_file}")
+        logger.warning("Auth request file not found: %s", auth_request_file)
         return None
 
-    with open(auth_request_file, 'r') as f:
-        auth_request = json.load(f)
+    with open(auth_request_file, 'rb') as f:
+        auth_request = json_codec.load(f)
 
-    print(f"Loaded auth request data from: {auth_request_file}")
+    logger.info("Loaded auth request data from: %s", auth_request_file)
     return auth_request
 
 
@@ -0,0 +1,224 @@
+"""Columnar Parquet / Arrow IPC export for Myki Attendance Tracker.
+
+Flattens the nested attendance output (and, when available, the normalised
+transactions of the run) into typed tables for analytics tools:
+
+    attendance:    user, year, date (date32), station (dictionary),
+                   ptv (bool), manual (bool)
+    transactions:  user, year, timestamp (timestamp[s, UTC]), utc_offset (int32),
+                   date (date32), station (dictionary), type (dictionary)
+
+Both are written as hive-partitioned datasets, one directory per user and
+year, e.g. output/export/attendance/user=koustubh/year=2025/part-0.parquet.
+Analytics code can then load a single user or year without reading the rest:
+
+    >>> import pyarrow.dataset as ds
+    >>> ds.dataset("output/export/attendance", partitioning="hive").to_table(
+    ...     filter=ds.field("year") == 2025).to_pandas()
+
+Arrow IPC datasets are read the same way with format="ipc".
+
+pyarrow is optional. Without it, export_available() returns False and the
+tracker skips the export.
+"""
+
+import shutil
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+except ImportError:  # optional: the export is skipped without it
+    pa = None
+    ds = None
+
+from attendance_history import expand_history
+from transaction_processor import TransactionRecord, TransactionType
+from run_log import get_logger
+
+
+logger = get_logger(__name__)
+
+
+# Export formats accepted by export_columnar() (OUTPUT_EXPORT environment variable)
+EXPORT_FORMATS = ("parquet", "arrow")
+
+# pyarrow.dataset format name and file extension per export format
+_DATASET_FORMATS = {
+    "parquet": ("parquet", "parquet"),
+    "arrow": ("ipc", "arrow"),
+}
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+_TRANSACTION_TYPE_NAMES = {
+    TransactionType.OTHER: "Other",
+    TransactionType.TOUCH_ON: "Touch on",
+    TransactionType.TOUCH_OFF: "Touch off",
+}
+
+
+def export_available() -> bool:
+    """Check whether pyarrow is installed so the columnar export can run."""
+    return pa is not None
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError("pyarrow is required for the columnar export. Install it with: pip install pyarrow")
+
+
+def _dictionary(values: List[str]):
+    """String column stored as dictionary (categorical) codes."""
+    return pa.array(values, type=pa.string()).dictionary_encode()
+
+
+def _date32(ordinals: List[int]):
+    """date32 column from date.toordinal() values."""
+    return pa.array([ordinal - _EPOCH_ORDINAL for ordinal in ordinals], type=pa.int32()).cast(pa.date32())
+
+
+def attendance_table(output_data: Dict):
+    """Build the per-day attendance table from an output dictionary.
+
+    One row per user and day attended, by PTV touch-off (attendanceDays and
+    attendanceHistory) or manual attendance (manualAttendanceDates).
+
+    Args:
+        output_data: Output dictionary (plain lists, not bitset-encoded)
+
+    Returns:
+        pyarrow.Table sorted by user and date
+    """
+    _require_pyarrow()
+
+    users, ordinals, stations, ptv_flags, manual_flags = [], [], [], [], []
+    for username in sorted(k for k in output_data if k != "metadata"):
+        user_data = output_data[username] or {}
+        ptv_days = set(expand_history(user_data.get("attendanceHistory") or {}))
+        ptv_days.update(user_data.get("attendanceDays", []))
+        manual_days = set(user_data.get("manualAttendanceDates", []))
+        station = user_data.get("targetStation")
+
+        for day in sorted(ptv_days | manual_days):
+            users.append(username)
+            ordinals.append(date(int(day[0:4]), int(day[5:7]), int(day[8:10])).toordinal())
+            stations.append(station)
+            ptv_flags.append(day in ptv_days)
+            manual_flags.append(day in manual_days)
+
+    return pa.table({
+        "user": _dictionary(users),
+        "year": pa.array([date.fromordinal(o).year for o in ordinals], type=pa.int16()),
+        "date": _date32(ordinals),
+        "station": _dictionary(stations),
+        "ptv": pa.array(ptv_flags, type=pa.bool_()),
+        "manual": pa.array(manual_flags, type=pa.bool_()),
+    })
+
+
+def transactions_table(records_by_user: Dict[str, Iterable[TransactionRecord]]):
+    """Build the transaction table from normalised TransactionRecords.
+
+    Args:
+        records_by_user: Dictionary {username: TransactionRecords}
+
+    Returns:
+        pyarrow.Table with one row per transaction, sorted by user and time
+    """
+    _require_pyarrow()
+
+    users, epochs, offsets, ordinals, stations, types = [], [], [], [], [], []
+    for username in sorted(records_by_user):
+        for record in sorted(records_by_user[username], key=lambda r: r.epoch):
+            users.append(username)
+            epochs.append(int(record.epoch))
+            offsets.append(record.utc_offset)
+            ordinals.append(record.date_ordinal)
+            stations.append(record.station)
+            types.append(_TRANSACTION_TYPE_NAMES[TransactionType(record.txn_type)])
+
+    return pa.table({
+        "user": _dictionary(users),
+        "year": pa.array([date.fromordinal(o).year for o in ordinals], type=pa.int16()),
+        "timestamp": pa.array(epochs, type=pa.int64()).cast(pa.timestamp("s", tz="UTC")),
+        "utc_offset": pa.array(offsets, type=pa.int32()),
+        "date": _date32(ordinals),
+        "station": _dictionary(stations),
+        "type": _dictionary(types),
+    })
+
+
+def write_partitioned(table, directory: str, fmt: str = "parquet") -> Path:
+    """Write a table as a dataset partitioned by user and year.
+
+    The dataset is written next to the target directory first and then
+    swapped in, so readers never see a half-written export and partitions
+    of removed users do not linger.
+
+    Args:
+        table: pyarrow.Table with "user" and "year" columns
+        directory: Dataset directory (replaced if it exists)
+        fmt: "parquet" or "arrow" (Arrow IPC)
+
+    Returns:
+        Path of the dataset directory
+
+    Raises:
+        ValueError: If fmt is not one of EXPORT_FORMATS
+    """
+    _require_pyarrow()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}' (expected one of: {', '.join(EXPORT_FORMATS)})")
+
+    dataset_format, extension = _DATASET_FORMATS[fmt]
+    path = Path(directory)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    shutil.rmtree(tmp_path, ignore_errors=True)
+
+    ds.write_dataset(
+        table,
+        tmp_path,
+        format=dataset_format,
+        partitioning=["user", "year"],
+        partitioning_flavor="hive",
+        basename_template=f"part-{{i}}.{extension}",
+    )
+    tmp_path.mkdir(parents=True, exist_ok=True)  # an empty table writes no files
+
+    shutil.rmtree(path, ignore_errors=True)
+    tmp_path.rename(path)
+    return path
+
+
+def export_columnar(
+    output_data: Dict,
+    export_dir: str = "output/export",
+    fmt: str = "parquet",
+    transactions: Optional[Dict[str, Iterable[TransactionRecord]]] = None
+) -> Dict[str, Path]:
+    """Export attendance (and transactions, if given) as partitioned datasets.
+
+    Args:
+        output_data: Output dictionary as saved (plain lists)
+        export_dir: Directory for the attendance/ and transactions/ datasets
+        fmt: "parquet" (default) or "arrow" (Arrow IPC)
+        transactions: Dictionary {username: TransactionRecords} collected
+                     during the run (optional)
+
+    Returns:
+        Dictionary {dataset name: directory} of the datasets written
+    """
+    written = {
+        "attendance": write_partitioned(attendance_table(output_data), str(Path(export_dir) / "attendance"), fmt)
+    }
+    if transactions:
+        written["transactions"] = write_partitioned(
+            transactions_table(transactions), str(Path(export_dir) / "transactions"), fmt
+        )
+
+    for name, path in written.items():
+        logger.info("✓ Exported %s (%s) to: %s", name, fmt, path.absolute())
+    return written
@@ -6,8 +6,84 @@ Supports both unified config format (recommended) and legacy separate configs.
 
 import json
 import os
+from dataclasses import dataclass
+from datetime import date, datetime
 from pathlib import Path
-from typing import Dict, Tuple, Optional
+from typing import Dict, FrozenSet, List, Tuple, Optional
+
+import json_codec
+from run_log import get_logger
+
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class UserSettings:
+    """One user's config, validated and parsed once (see compile_user_entry).
+
+    Frozen and slotted: the same object is shared by every phase of a run
+    (and pickled to processing_pool workers).
+
+    Attributes:
+        username: Config key
+        display_username: Name shown on the dashboard (config "username", default: config key)
+        target_station: Station whose touch offs count as attendance
+        start_date: First tracked day
+        end_date: Last tracked day, None if open-ended (see effective_end_date)
+        skip_dates: Skip dates, minus manual attendance dates (manual attendance wins)
+        manual_dates: Manual attendance dates
+        manual_attendance_dates: manual_dates as sorted ISO strings, as written to the output
+    """
+    __slots__ = (
+        "username", "display_username", "target_station", "start_date", "end_date",
+        "skip_dates", "manual_dates", "manual_attendance_dates",
+    )
+
+    username: str
+    display_username: str
+    target_station: str
+    start_date: date
+    end_date: Optional[date]
+    skip_dates: FrozenSet[date]
+    manual_dates: FrozenSet[date]
+    manual_attendance_dates: Tuple[str, ...]
+
+    def __reduce__(self):
+        # Frozen slotted instances can't be restored attribute by attribute
+        return (UserSettings, tuple(getattr(self, name) for name in self.__slots__))
+
+    def effective_end_date(self, today: Optional[date] = None) -> date:
+        """end_date, or today for an open-ended user (resolved per run, not at load)."""
+        return self.end_date or today or date.today()
+
+
+@dataclass
+class TrackerConfig:
+    """Parsed configuration for one tracking run (see run_tracking).
+
+    Attributes:
+        users: User config dictionary {username: {...}} as returned by
+               load_unified_config() (comment keys are ignored)
+        credentials: Credentials per username from load_user_credentials()
+        config_path: Config file the users were loaded from, recorded in the
+                     output metadata (None if built in memory)
+        settings: Compiled UserSettings per username (compiled from users,
+                  and so validated, if not given)
+    """
+    users: Dict[str, Dict]
+    credentials: Dict[str, Dict[str, str]]
+    config_path: Optional[str] = None
+    settings: Optional[Dict[str, UserSettings]] = None
+
+    def __post_init__(self):
+        if self.settings is None:
+            self.settings = compile_user_config(self.users)
+
+    @property
+    def usernames(self) -> List[str]:
+        """Usernames to track, in config order (comment keys removed)."""
+        return [k for k in self.users if not k.startswith("_")]
 
 
 def load_unified_config(config_path: str = "config/myki_config.json") -> Dict:
@@ -32,8 +108,8 @@ def load_unified_config(config_path: str = "config/myki_config.json") -> Dict:
             f"  Create config file first (see config/myki_config.example.json)"
         )
 
-    with open(path, 'r') as f:
-        config = json.load(f)
+    with open(path, 'rb') as f:
+        config = json_codec.load(f)
 
     # Extract users config
     if "users" not in config:
@@ -53,8 +129,8 @@ def load_unified_config(config_path: str = "config/myki_config.json") -> Dict:
             f"  Add at least one user to track in {config_path}"
         )
 
-    print(f"Loaded unified config from: {path.absolute()}")
-    print(f"  Users to track: {len(user_config)}")
+    logger.info("Loaded unified config from: %s", path.absolute())
+    logger.info("  Users to track: %d", len(user_config))
 
     return user_config
 
@@ -81,8 +157,8 @@ def load_user_config(config_path: str = "config/myki_tracker_config.json") -> Di
         )
 
     try:
-        with open(path, 'r') as f:
-            config = json.load(f)
+        with open(path, 'rb') as f:
+            config = json_codec.load(f)
     except json.JSONDecodeError as e:
         raise json.JSONDecodeError(
             f"Invalid JSON in config file: {e.msg}",
@@ -90,147 +166,184 @@ def load_user_config(config_path: str = "config/myki_tracker_config.json") -> Di
             e.pos
         )
 
-    print(f"Loaded config from: {path.absolute()}")
+    logger.info("Loaded config from: %s", path.absolute())
     return config
 
 
-def validate_user_config(user_config: Dict) -> None:
-    """Validate user configuration JSON schema and data formats.
+_REQUIRED_FIELDS = ["targetStation", "startDate"]
+_FORBIDDEN_FIELDS = ["mykiCardNumber"]
+
+
+def _parse_iso_date(value, error: str) -> date:
+    """Parse a YYYY-MM-DD string, raising ValueError(error) if it isn't one."""
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        raise ValueError(error)
+
+
+def compile_user_entry(username: str, config: Dict) -> UserSettings:
+    """Validate one user's configuration and parse it into UserSettings.
 
     Args:
-        user_config: Dictionary containing user configurations
+        username: Config key of the user
+        config: The user's configuration dictionary
+
+    Returns:
+        UserSettings with parsed dates
 
     Raises:
         ValueError: If validation fails with specific error details
-
-    Note:
-        Required fields: targetStation, startDate
-        Optional fields: username (for display), endDate (defaults to current date), skipDates (defaults to empty array).
-        The config key itself (e.g., "koustubh") maps to environment variables for credentials.
-
-        SECURITY: mykiCardNumber field is NOT ALLOWED in config - use environment variables instead.
     """
-    from datetime import datetime
+    # Check for forbidden fields (security)
+    for field in _FORBIDDEN_FIELDS:
+        if field in config:
+            raise ValueError(
+                f"Field '{field}' is not allowed in config for user '{username}'. "
+                f"Security requirement: Use environment variable MYKI_CARDNUMBER_{username.upper()} instead. "
+                f"See .env.example for correct format."
+            )
 
-    required_fields = ["targetStation", "startDate"]
-    forbidden_fields = ["mykiCardNumber"]
+    # Check all required fields are present
+    for field in _REQUIRED_FIELDS:
+        if field not in config:
+            raise ValueError(
+                f"Missing required field '{field}' for user '{username}'"
+            )
 
-    for username, config in user_config.items():
-        # Skip comment keys (those starting with underscore)
-        if username.startswith("_"):
-            continue
+    # Validate targetStation is a string
+    if not isinstance(config["targetStation"], str):
+        raise ValueError(
+            f"Field 'targetStation' must be a string for user '{username}'"
+        )
 
-        # Check for forbidden fields (security)
-        for field in forbidden_fields:
-            if field in config:
-                raise ValueError(
-                    f"Field '{field}' is not allowed in config for user '{username}'. "
-                    f"Security requirement: Use environment variable MYKI_CARDNUMBER_{username.upper()} instead. "
-                    f"See .env.example for correct format."
-                )
+    # Validate skipDates is a list (if provided)
+    skip_dates = set()
+    if "skipDates" in config:
+        if not isinstance(config["skipDates"], list):
+            raise ValueError(
+                f"Field 'skipDates' must be an array for user '{username}'"
+            )
 
-        # Check all required fields are present
-        for field in required_fields:
-            if field not in config:
+        # Validate date formats for skipDates
+        for skip_date in config["skipDates"]:
+            if not isinstance(skip_date, str):
                 raise ValueError(
-                    f"Missing required field '{field}' for user '{username}'"
+                    f"All skipDates must be strings for user '{username}'"
                 )
+            skip_dates.add(_parse_iso_date(
+                skip_date,
+                f"Invalid date format in skipDates for user '{username}': '{skip_date}'. "
+                f"Expected ISO format (YYYY-MM-DD)"
+            ))
 
-        # Validate targetStation is a string
-        if not isinstance(config["targetStation"], str):
+    # Validate startDate format
+    start_date = _parse_iso_date(
+        config["startDate"],
+        f"Invalid date format for startDate in user '{username}': '{config['startDate']}'. "
+        f"Expected ISO format (YYYY-MM-DD)"
+    )
+
+    # Validate endDate format (if provided)
+    end_date = None
+    if "endDate" in config:
+        end_date = _parse_iso_date(
+            config["endDate"],
+            f"Invalid date format for endDate in user '{username}': '{config['endDate']}'. "
+            f"Expected ISO format (YYYY-MM-DD)"
+        )
+
+    # Validate manualAttendanceDates (if provided)
+    manual_dates = set()
+    if "manualAttendanceDates" in config:
+        # Must be a list
+        if not isinstance(config["manualAttendanceDates"], list):
             raise ValueError(
-                f"Field 'targetStation' must be a string for user '{username}'"
+                f"Field 'manualAttendanceDates' must be an array for user '{username}'"
             )
 
-        # Validate skipDates is a list (if provided)
-        if "skipDates" in config:
-            if not isinstance(config["skipDates"], list):
+        # Default to current date if endDate not specified
+        range_end = end_date or date.today()
+
+        # Validate each date
+        for manual_date_str in config["manualAttendanceDates"]:
+            # Must be a string
+            if not isinstance(manual_date_str, str):
                 raise ValueError(
-                    f"Field 'skipDates' must be an array for user '{username}'"
+                    f"All manualAttendanceDates must be strings for user '{username}'"
                 )
 
-            # Validate date formats for skipDates
-            for skip_date in config["skipDates"]:
-                if not isinstance(skip_date, str):
-                    raise ValueError(
-                        f"All skipDates must be strings for user '{username}'"
-                    )
-                try:
-                    datetime.strptime(skip_date, '%Y-%m-%d')
-                except ValueError:
-                    raise ValueError(
-                        f"Invalid date format in skipDates for user '{username}': '{skip_date}'. "
-                        f"Expected ISO format (YYYY-MM-DD)"
-                    )
-
-        # Validate startDate format
-        try:
-            datetime.strptime(config["startDate"], '%Y-%m-%d')
-        except ValueError:
-            raise ValueError(
-                f"Invalid date format for startDate in user '{username}': '{config['startDate']}'. "
+            # Validate date format
+            manual_date = _parse_iso_date(
+                manual_date_str,
+                f"Invalid date format in manualAttendanceDates for user '{username}': '{manual_date_str}'. "
                 f"Expected ISO format (YYYY-MM-DD)"
             )
 
-        # Validate endDate format (if provided)
-        if "endDate" in config:
-            try:
-                datetime.strptime(config["endDate"], '%Y-%m-%d')
-            except ValueError:
+            # Validate date is within range
+            if manual_date < start_date:
                 raise ValueError(
-                    f"Invalid date format for endDate in user '{username}': '{config['endDate']}'. "
-                    f"Expected ISO format (YYYY-MM-DD)"
+                    f"Manual attendance date '{manual_date_str}' is before startDate '{config['startDate']}' "
+                    f"for user '{username}'"
                 )
 
-        # Validate manualAttendanceDates (if provided)
-        if "manualAttendanceDates" in config:
-            # Must be a list
-            if not isinstance(config["manualAttendanceDates"], list):
+            if manual_date > range_end:
+                end_date_str = config.get("endDate", range_end.strftime('%Y-%m-%d'))
                 raise ValueError(
-                    f"Field 'manualAttendanceDates' must be an array for user '{username}'"
+                    f"Manual attendance date '{manual_date_str}' is after endDate '{end_date_str}' "
+                    f"for user '{username}'"
                 )
+            manual_dates.add(manual_date)
+
+    return UserSettings(
+        username=username,
+        display_username=config.get("username", username),
+        target_station=config["targetStation"],
+        start_date=start_date,
+        end_date=end_date,
+        # Manual attendance takes precedence over skip dates
+        skip_dates=frozenset(skip_dates - manual_dates),
+        manual_dates=frozenset(manual_dates),
+        manual_attendance_dates=tuple(d.isoformat() for d in sorted(manual_dates))
+    )
+
+
+def compile_user_config(user_config: Dict) -> Dict[str, UserSettings]:
+    """Validate and parse every user of a config (comment keys are skipped).
+
+    Raises:
+        ValueError: If any user fails validation
+    """
+    return {
+        username: compile_user_entry(username, config)
+        for username, config in user_config.items()
+        if not username.startswith("_")
+    }
 
-            # Get date range for validation
-            start_date = datetime.strptime(config["startDate"], '%Y-%m-%d').date()
-            if "endDate" in config:
-                end_date = datetime.strptime(config["endDate"], '%Y-%m-%d').date()
-            else:
-                # Default to current date if endDate not specified
-                from datetime import date
-                end_date = date.today()
-
-            # Validate each date
-            for manual_date_str in config["manualAttendanceDates"]:
-                # Must be a string
-                if not isinstance(manual_date_str, str):
-                    raise ValueError(
-                        f"All manualAttendanceDates must be strings for user '{username}'"
-                    )
-
-                # Validate date format
-                try:
-                    manual_date = datetime.strptime(manual_date_str, '%Y-%m-%d').date()
-                except ValueError:
-                    raise ValueError(
-                        f"Invalid date format in manualAttendanceDates for user '{username}': '{manual_date_str}'. "
-                        f"Expected ISO format (YYYY-MM-DD)"
-                    )
-
-                # Validate date is within range
-                if manual_date < start_date:
-                    raise ValueError(
-                        f"Manual attendance date '{manual_date_str}' is before startDate '{config['startDate']}' "
-                        f"for user '{username}'"
-                    )
-
-                if manual_date > end_date:
-                    end_date_str = config.get("endDate", end_date.strftime('%Y-%m-%d'))
-                    raise ValueError(
-                        f"Manual attendance date '{manual_date_str}' is after endDate '{end_date_str}' "
-                        f"for user '{username}'"
-                    )
-
-    print(f"Config validation passed for {len([k for k in user_config.keys() if not k.startswith('_')])} user(s)")
+
+def validate_user_config(user_config: Dict) -> Dict[str, UserSettings]:
+    """Validate user configuration JSON schema and data formats.
+
+    Args:
+        user_config: Dictionary containing user configurations
+
+    Returns:
+        Compiled UserSettings per username (see compile_user_config)
+
+    Raises:
+        ValueError: If validation fails with specific error details
+
+    Note:
+        Required fields: targetStation, startDate
+        Optional fields: username (for display), endDate (defaults to current date), skipDates (defaults to empty array).
+        The config key itself (e.g., "koustubh") maps to environment variables for credentials.
+
+        SECURITY: mykiCardNumber field is NOT ALLOWED in config - use environment variables instead.
+    """
+    settings = compile_user_config(user_config)
+
+    logger.info("Config validation passed for %d user(s)", len(settings))
+    return settings
 
 
 def get_effective_end_date(user_config: Dict, username: str) -> str:
@@ -243,8 +356,6 @@ def get_effective_end_date(user_config: Dict, username: str) -> str:
     Returns:
         End date as ISO string (YYYY-MM-DD). If endDate not in config, returns current date.
     """
-    from datetime import date
-
     config = user_config[username]
     if "endDate" in config:
         return config["endDate"]
@@ -281,91 +392,194 @@ def get_effective_skip_dates(user_config: Dict, username: str) -> list:
         return skip_dates
 
     # Remove any skip dates that conflict with manual attendance dates
-    # Manual attendance takes precedence
-    effective_skip_dates = [d for d in skip_dates if d not in manual_dates]
+    # Manual attendance takes precedence (set lookup keeps this linear)
+    manual_date_set = set(manual_dates)
+    effective_skip_dates = [d for d in skip_dates if d not in manual_date_set]
 
     # Log if conflicts were resolved
-    conflicts = set(skip_dates) & set(manual_dates)
+    conflicts = manual_date_set.intersection(skip_dates)
     if conflicts:
-        print(f"INFO: Resolved {len(conflicts)} conflict(s) for user '{username}': "
-              f"Manual attendance overrides skip dates for: {sorted(conflicts)}")
+        logger.info("INFO: Resolved %d conflict(s) for user '%s': "
+                    "Manual attendance overrides skip dates for: %s", len(conflicts), username, sorted(conflicts))
 
     return effective_skip_dates
 
 
-def load_user_credentials(user_config: Dict) -> Dict[str, Dict[str, str]]:
-    """Load user credentials (username, card number, password) from environment variables.
+# Credential fields every user needs, as named in the credentials dict
+CREDENTIAL_FIELDS = ("username", "card_number", "password")
+
+# card_number value that fetches every card on the user's account (see get_cards)
+DISCOVER_CARDS = "auto"
+
+
+def parse_card_numbers(value: str) -> Tuple[str, ...]:
+    """Split a card_number credential into card numbers.
+
+    Staff with several myki cards (a replaced card, or a concession plus a
+    full-fare card) list them separated by ',' or ';'. DISCOVER_CARDS
+    ("auto") is kept as the single entry and resolved at fetch time.
+
+    Args:
+        value: card_number credential, e.g. "308425279093478,308425279093999"
+
+    Returns:
+        Tuple of distinct card numbers, in the given order
+    """
+    cards = (card.strip() for card in value.replace(";", ",").split(","))
+    return tuple(dict.fromkeys(card for card in cards if card))
+
+
+def user_card_numbers(credentials: Dict[str, str]) -> Tuple[str, ...]:
+    """Card numbers in a user's credentials dict (see load_user_credentials)."""
+    return parse_card_numbers(credentials["card_number"])
+
+
+class EnvSecretSource:
+    """Credentials from environment variables (the default secret source).
+
+    For config key "john_doe": MYKI_USERNAME_JOHN_DOE, MYKI_CARDNUMBER_JOHN_DOE
+    and MYKI_PASSWORD_JOHN_DOE. Other secret sources (see
+    user_manifest.FileSecretSource) provide the same lookup/secret_name methods.
+    """
+
+    description = "environment variables"
+    hint = "See .env.example for correct format and variable naming pattern."
+
+    _PREFIXES = {
+        "username": "MYKI_USERNAME",
+        "card_number": "MYKI_CARDNUMBER",
+        "password": "MYKI_PASSWORD",
+    }
+
+    def secret_name(self, config_key: str, field: str) -> str:
+        """Name of the environment variable holding one credential field."""
+        return f"{self._PREFIXES[field]}_{config_key.upper()}"
+
+    def lookup(self, config_key: str) -> Dict[str, Optional[str]]:
+        """Credential fields for a config key (None where a variable is unset)."""
+        return {field: os.getenv(self.secret_name(config_key, field)) for field in CREDENTIAL_FIELDS}
+
+
+def resolve_user_credentials(
+    config_key: str,
+    config: Dict,
+    secrets
+) -> Tuple[Optional[Dict[str, str]], List[str]]:
+    """Look up one user's credentials in a secret source.
+
+    Args:
+        config_key: Config key of the user
+        config: The user's configuration dictionary (for the display username)
+        secrets: Secret source (EnvSecretSource or user_manifest.FileSecretSource)
+
+    Returns:
+        Tuple (credentials dict or None, names of missing secrets)
+    """
+    values = secrets.lookup(config_key)
+    missing = [secrets.secret_name(config_key, field) for field in CREDENTIAL_FIELDS if values.get(field) is None]
+
+    # Only store credentials if all of them are present
+    if not all(values.get(field) for field in CREDENTIAL_FIELDS):
+        return None, missing
+
+    return {
+        "username": values["username"],
+        "card_number": values["card_number"],
+        "password": values["password"],
+        # Display username from config, or default to the config key
+        "display_username": config.get("username", config_key)
+    }, missing
+
+
+def missing_credentials_error(missing: List[str], secrets, limit: Optional[int] = None) -> ValueError:
+    """Build the error listing missing secrets (the first limit of them, if given)."""
+    shown = missing if limit is None else missing[:limit]
+    more = f"\n  ... and {len(missing) - len(shown)} more" if len(missing) > len(shown) else ""
+    return ValueError(
+        f"Missing required {secrets.description} for credentials:\n" +
+        "\n".join(f"  - {name}" for name in shown) + more +
+        f"\n\n{secrets.hint}"
+    )
+
+
+def load_user_credentials(user_config: Dict, secrets=None) -> Dict[str, Dict[str, str]]:
+    """Load user credentials (username, card number, password) from a secret source.
 
     Args:
         user_config: Dictionary containing user configurations
+        secrets: Secret source (default: EnvSecretSource, i.e. environment variables)
 
     Returns:
         Dictionary mapping config key to credentials dict with keys:
             - username: Myki account username
-            - card_number: Myki card number
+            - card_number: Myki card number(s), see parse_card_numbers
             - password: Myki account password
             - display_username: Username for frontend display (from config or defaults to key)
 
     Raises:
-        ValueError: If any required credential environment variables are missing
+        ValueError: If any required credentials are missing
 
     Environment Variable Pattern:
         For config key "koustubh", environment variables must be:
         - MYKI_USERNAME_KOUSTUBH=actual_myki_username
-        - MYKI_CARDNUMBER_KOUSTUBH=card_number
+        - MYKI_CARDNUMBER_KOUSTUBH=card_number (several: "card1,card2";
+          every card on the account: "auto")
         - MYKI_PASSWORD_KOUSTUBH=password
 
     Note:
         Config key is converted to UPPERCASE for environment variable names.
         Example: "john_doe" -> MYKI_USERNAME_JOHN_DOE
     """
+    secrets = secrets or EnvSecretSource()
     credentials = {}
     missing_vars = []
 
-    for config_key in user_config.keys():
+    for config_key, config in user_config.items():
         # Skip comment keys (those starting with underscore)
         if config_key.startswith("_"):
             continue
 
-        # Convert config key to uppercase for environment variable names
-        config_key_upper = config_key.upper()
-
-        # Define required environment variable names
-        env_var_username = f"MYKI_USERNAME_{config_key_upper}"
-        env_var_cardnumber = f"MYKI_CARDNUMBER_{config_key_upper}"
-        env_var_password = f"MYKI_PASSWORD_{config_key_upper}"
-
-        # Load credentials from environment variables
-        username = os.getenv(env_var_username)
-        card_number = os.getenv(env_var_cardnumber)
-        password = os.getenv(env_var_password)
-
-        # Track missing variables
-        if username is None:
-            missing_vars.append(env_var_username)
-        if card_number is None:
-            missing_vars.append(env_var_cardnumber)
-        if password is None:
-            missing_vars.append(env_var_password)
-
-        # If all credentials are present, store them
-        if username and card_number and password:
-            # Get display username from config or default to config key
-            display_username = user_config[config_key].get("username", config_key)
-
-            credentials[config_key] = {
-                "username": username,
-                "card_number": card_number,
-                "password": password,
-                "display_username": display_username
-            }
+        user_credentials, missing = resolve_user_credentials(config_key, config, secrets)
+        missing_vars.extend(missing)
+        if user_credentials is not None:
+            credentials[config_key] = user_credentials
 
     if missing_vars:
-        raise ValueError(
-            f"Missing required environment variables for credentials:\n" +
-            "\n".join(f"  - {var}" for var in missing_vars) +
-            f"\n\nSee .env.example for correct format and variable naming pattern."
-        )
+        raise missing_credentials_error(missing_vars, secrets)
 
-    print(f"Loaded credentials for {len(credentials)} user(s)")
+    logger.info("Loaded credentials for %d user(s)", len(credentials))
     return credentials
+
+
+def load_tracker_config(config_path: str = "config/myki_config.json", secrets_path: Optional[str] = None) -> TrackerConfig:
+    """Load, validate and resolve credentials for a unified config file or manifest.
+
+    .jsonl and .csv paths are read as streaming user manifests (see
+    user_manifest). Credentials come from the secrets file if one is given
+    (or set in MYKI_SECRETS_FILE), otherwise from environment variables.
+
+    Args:
+        config_path: Path to unified config JSON file or user manifest
+        secrets_path: Secrets file (optional, default: MYKI_SECRETS_FILE)
+
+    Returns:
+        TrackerConfig ready to pass to run_tracking()
+
+    Raises:
+        FileNotFoundError: If config file doesn't exist
+        ValueError: If the config is invalid or credentials are missing
+    """
+    from user_manifest import is_manifest, load_manifest_config, open_secret_source
+
+    secrets = open_secret_source(secrets_path)
+    if is_manifest(config_path):
+        return load_manifest_config(config_path, secrets)
+
+    user_config = load_unified_config(config_path)
+    settings = validate_user_config(user_config)
+    return TrackerConfig(
+        users=user_config,
+        credentials=load_user_credentials(user_config, secrets),
+        config_path=config_path,
+        settings=settings
+    )
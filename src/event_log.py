@@ -0,0 +1,437 @@
+"""Append-only attendance event log for Myki Attendance Tracker.
+
+Each run appends what changed to a JSONL file (one event per line) next to
+the output, instead of leaving only the latest snapshot:
+
+    {"runId": "20250502T074500Z-1a2b3c4d", "timestamp": "2025-05-02T07:45:00Z",
+     "type": "day_attended", "user": "koustubh", "date": "2025-05-02"}
+
+Event types:
+    snapshot               Full output (users only) that later events apply to
+    day_attended           New attendance day ("date")
+    manual_day_added       Manual attendance date added in the config ("date")
+    manual_day_removed     Manual attendance date removed from the config ("date")
+    skip_date_added        Skip date added in the config ("date")
+    skip_date_removed      Skip date removed from the config ("date")
+    statistics_recomputed  Changed statistics for the user: changed totals
+                           ("totals"), changed or new monthlyBreakdown entries
+                           ("months"), and, only if there are any, keys and
+                           months no longer in the statistics ("removedTotals",
+                           "removedMonths")
+    user_updated           Other changed user fields ("fields")
+
+lastUpdated changes on every run, so it is not logged; replayed users keep
+the value from the last snapshot.
+
+Appends are O(changes) per run. replay_events() rebuilds the output from the
+log. compact_event_log() replaces the log with one snapshot event once it
+grows large, so replaying stays cheap and the log stays bounded.
+
+Usage:
+    python src/event_log.py output/events.jsonl                  # compact the log
+    python src/event_log.py output/events.jsonl --rebuild output/attendance.json
+"""
+
+import argparse
+import os
+import sys
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import json_codec
+from attendance_history import compact_days, history_contains, iter_month_days
+from output_manager import save_output, write_atomic
+from run_log import get_logger
+
+
+logger = get_logger(__name__)
+
+
+EVENT_LOG_FILENAME = "events.jsonl"
+
+# Compact once the log passes this size (override with OUTPUT_EVENT_LOG_MAX_BYTES)
+DEFAULT_COMPACT_BYTES = 1024 * 1024
+
+# User fields recorded by user_updated events (dates and statistics have their own events)
+_TRACKED_FIELDS = ("targetStation", "latestProcessedDate")
+
+# Event type -> (user field holding the sorted ISO date list, add/remove)
+_DATE_LIST_EVENTS = {
+    "manual_day_added": ("manualAttendanceDates", True),
+    "manual_day_removed": ("manualAttendanceDates", False),
+    "skip_date_added": ("skipDates", True),
+    "skip_date_removed": ("skipDates", False),
+}
+
+
+def new_run_id() -> str:
+    """Create a run id (UTC timestamp plus a random suffix)."""
+    return f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}-{uuid.uuid4().hex[:8]}"
+
+
+def _user_entries(output_data: Dict) -> Dict[str, Dict]:
+    """User entries of an output dictionary (metadata and empty users are dropped)."""
+    return {
+        key: value for key, value in (output_data or {}).items()
+        if key != "metadata" and value is not None
+    }
+
+
+def _new_attended_days(previous: Dict, current: Dict) -> List[str]:
+    """Attendance days in current (list or history) that previous does not have."""
+    previous_days = set(previous.get("attendanceDays", []))
+    previous_history = previous.get("attendanceHistory") or {}
+
+    def is_new(day: str) -> bool:
+        return day not in previous_days and not history_contains(previous_history, day)
+
+    added = {day for day in current.get("attendanceDays", []) if is_new(day)}
+    for key, entry in (current.get("attendanceHistory") or {}).items():
+        # Closed months are immutable, so unchanged summaries can be skipped
+        if previous_history.get(key) != entry:
+            added.update(day for day in iter_month_days(key, entry["mask"]) if is_new(day))
+    return sorted(added)
+
+
+def _statistics_event(username: str, previous: Optional[Dict], current: Optional[Dict]) -> Optional[Dict]:
+    """Describe changed statistics as a statistics_recomputed event (None if unchanged)."""
+    if current == previous:
+        return None
+    if not isinstance(current, dict):
+        return {"type": "statistics_recomputed", "user": username, "statistics": current}
+
+    previous = previous if isinstance(previous, dict) else {}
+    previous_months = {entry["month"]: entry for entry in previous.get("monthlyBreakdown", [])}
+    current_months = {entry["month"]: entry for entry in current.get("monthlyBreakdown", [])}
+
+    event = {
+        "type": "statistics_recomputed",
+        "user": username,
+        "totals": {
+            key: value for key, value in current.items()
+            if key != "monthlyBreakdown" and previous.get(key) != value
+        },
+        "months": [
+            entry for month_key, entry in sorted(current_months.items())
+            if previous_months.get(month_key) != entry
+        ],
+    }
+    # Totals can be null (e.g. firstAttendance), so removed keys are listed separately
+    removed_totals = sorted(set(previous) - set(current))
+    if removed_totals:
+        event["removedTotals"] = removed_totals
+    removed = sorted(set(previous_months) - set(current_months))
+    if removed:
+        event["removedMonths"] = removed
+    return event
+
+
+def _apply_statistics_event(user_data: Dict, event: Dict) -> None:
+    """Apply a statistics_recomputed event to replayed user data."""
+    if "statistics" in event:
+        # Full statistics (also written by older versions of this module)
+        user_data["statistics"] = event["statistics"]
+        return
+
+    statistics = dict(user_data.get("statistics") or {})
+    statistics.update(event.get("totals", {}))
+    for key in event.get("removedTotals", []):
+        statistics.pop(key, None)
+    months = {entry["month"]: entry for entry in statistics.get("monthlyBreakdown", [])}
+    for month_key in event.get("removedMonths", []):
+        months.pop(month_key, None)
+    months.update((entry["month"], entry) for entry in event.get("months", []))
+    if months or "monthlyBreakdown" in statistics:
+        statistics["monthlyBreakdown"] = [months[month_key] for month_key in sorted(months)]
+    user_data["statistics"] = statistics
+
+
+def user_events(username: str, previous: Optional[Dict], current: Dict) -> List[Dict]:
+    """Describe the changes from previous to current user data as events.
+
+    Args:
+        username: User the events belong to
+        previous: User data before the run (None for a new user)
+        current: User data after the run
+
+    Returns:
+        List of events without runId/timestamp (see append_events)
+    """
+    previous = previous or {}
+    events = [
+        {"type": "day_attended", "user": username, "date": day}
+        for day in _new_attended_days(previous, current)
+    ]
+
+    for event_type, (field, added) in _DATE_LIST_EVENTS.items():
+        before = set(previous.get(field, []))
+        after = set(current.get(field, []))
+        changed = after - before if added else before - after
+        events.extend({"type": event_type, "user": username, "date": day} for day in sorted(changed))
+
+    statistics_event = _statistics_event(username, previous.get("statistics"), current.get("statistics"))
+    if statistics_event:
+        events.append(statistics_event)
+
+    fields = {
+        field: current.get(field) for field in _TRACKED_FIELDS
+        if field in current and current.get(field) != previous.get(field)
+    }
+    if fields:
+        events.append({"type": "user_updated", "user": username, "fields": fields})
+
+    return events
+
+
+def output_events(previous_output: Dict, current_output: Dict) -> List[Dict]:
+    """Describe the changes between two output dictionaries as events (per user)."""
+    previous_users = _user_entries(previous_output)
+    events = []
+    for username, user_data in _user_entries(current_output).items():
+        events.extend(user_events(username, previous_users.get(username), user_data))
+    return events
+
+
+def snapshot_event(output_data: Dict) -> Dict:
+    """Build a snapshot event holding the users of an output dictionary."""
+    return {"type": "snapshot", "users": _user_entries(output_data)}
+
+
+def _ends_with_newline(path: Path) -> bool:
+    """Check whether a non-empty file ends with a newline."""
+    with open(path, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def append_events(
+    log_path: str,
+    events: Iterable[Dict],
+    run_id: Optional[str] = None,
+    fsync: bool = False
+) -> int:
+    """Append events to the log, stamped with the run id and a UTC timestamp.
+
+    All events of one call are written with a single append, so the existing
+    log is never rewritten.
+
+    Args:
+        log_path: Path to the JSONL event log (created if missing)
+        events: Events from output_events()/user_events()/snapshot_event()
+        run_id: Run id for every event (default: new_run_id())
+        fsync: Flush the log to disk before returning
+
+    Returns:
+        Number of events appended
+    """
+    run_id = run_id or new_run_id()
+    timestamp = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    lines = [
+        json_codec.dumps_bytes(dict({"runId": run_id, "timestamp": timestamp}, **event))
+        for event in events
+    ]
+    if not lines:
+        return 0
+
+    path = Path(log_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'ab') as f:
+        # Start on a fresh line if a previous append was cut short
+        if f.tell() > 0 and not _ends_with_newline(path):
+            f.write(b"\n")
+        f.write(b"\n".join(lines) + b"\n")
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    return len(lines)
+
+
+def read_events(log_path: str) -> List[Dict]:
+    """Read all events from the log.
+
+    Lines that are not valid JSON (such as a line cut short by a crash
+    mid-append) are skipped with a warning.
+
+    Args:
+        log_path: Path to the JSONL event log
+
+    Returns:
+        List of events in log order (empty list if the log does not exist)
+    """
+    path = Path(log_path)
+    if not path.exists():
+        return []
+
+    events = []
+    with open(path, 'rb') as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                events.append(json_codec.loads(line))
+            except json_codec.JSONDecodeError:
+                logger.warning("WARNING: Skipping malformed event log line %d in %s", line_number, path)
+    return events
+
+
+def _new_user() -> Dict:
+    """User data for a user first seen in a non-snapshot event."""
+    return {
+        "attendanceDays": [],
+        "manualAttendanceDates": [],
+        "latestProcessedDate": None,
+        "targetStation": None,
+        "lastUpdated": None
+    }
+
+
+def replay_events(events: Iterable[Dict]) -> Dict:
+    """Rebuild output user data by applying events in order.
+
+    Args:
+        events: Events from read_events()
+
+    Returns:
+        Output dictionary (users only, no metadata) as of the last event
+    """
+    output: Dict[str, Dict] = {}
+    pending_days: Dict[str, set] = {}
+
+    for event in events:
+        event_type = event.get("type")
+        if event_type == "snapshot":
+            output = {username: dict(user_data) for username, user_data in event["users"].items()}
+            pending_days = {}
+            continue
+
+        username = event["user"]
+        user_data = output.get(username)
+        if user_data is None:
+            user_data = output[username] = _new_user()
+
+        if event_type == "day_attended":
+            pending_days.setdefault(username, set()).add(event["date"])
+        elif event_type in _DATE_LIST_EVENTS:
+            field, added = _DATE_LIST_EVENTS[event_type]
+            dates = set(user_data.get(field, []))
+            if added:
+                dates.add(event["date"])
+            else:
+                dates.discard(event["date"])
+            user_data[field] = sorted(dates)
+        elif event_type == "statistics_recomputed":
+            _apply_statistics_event(user_data, event)
+            # The stored counters describe the old statistics; force a full rebuild
+            user_data.pop("statisticsState", None)
+        elif event_type == "user_updated":
+            user_data.update(event["fields"])
+        else:
+            logger.warning("WARNING: Ignoring unknown event type '%s'", event_type)
+
+    for username, days in pending_days.items():
+        user_data = output[username]
+        history = user_data.get("attendanceHistory") or {}
+        merged = sorted(
+            set(user_data.get("attendanceDays", [])).union(
+                day for day in days if not history_contains(history, day)
+            )
+        )
+        history, user_data["attendanceDays"] = compact_days(history, merged)
+        if history:
+            user_data["attendanceHistory"] = history
+
+    return output
+
+
+def compact_event_log(log_path: str, fsync: bool = False) -> Dict:
+    """Replace the log with a single snapshot event holding the replayed output.
+
+    Args:
+        log_path: Path to the JSONL event log
+        fsync: Flush the new log to disk before returning
+
+    Returns:
+        Output dictionary (users only) rebuilt from the log
+    """
+    path = Path(log_path)
+    events = read_events(path)
+    output = replay_events(events)
+
+    run_ids = [event.get("runId") for event in events if event.get("runId")]
+    snapshot = dict(
+        {"runId": run_ids[-1] if run_ids else new_run_id(),
+         "timestamp": datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')},
+        **snapshot_event(output)
+    )
+    write_atomic(path, json_codec.dumps_bytes(snapshot) + b"\n", fsync=fsync)
+
+    logger.info("Compacted %d event(s) into a snapshot: %s", len(events), path.absolute())
+    return output
+
+
+def record_run(
+    log_path: str,
+    previous_output: Dict,
+    current_output: Dict,
+    fsync: bool = False,
+    compact_bytes: Optional[int] = None,
+    run_id: Optional[str] = None
+) -> int:
+    """Append the changes made by one run to the event log, compacting if it is large.
+
+    A new log starts with a snapshot of previous_output so that replaying it
+    reproduces current_output.
+
+    Args:
+        log_path: Path to the JSONL event log
+        previous_output: Output loaded at the start of the run
+        current_output: Output after processing all users
+        fsync: Flush the log to disk before returning
+        compact_bytes: Compact once the log is larger than this
+                      (default: OUTPUT_EVENT_LOG_MAX_BYTES or 1 MiB; 0 disables)
+        run_id: Run id for the events (default: new_run_id())
+
+    Returns:
+        Number of events appended
+    """
+    events = output_events(previous_output, current_output)
+    if not os.path.exists(log_path):
+        events.insert(0, snapshot_event(previous_output))
+
+    appended = append_events(log_path, events, run_id=run_id, fsync=fsync)
+    logger.info("Appended %s event(s) to: %s", appended, Path(log_path).absolute())
+
+    if compact_bytes is None:
+        compact_bytes = int(os.getenv('OUTPUT_EVENT_LOG_MAX_BYTES', DEFAULT_COMPACT_BYTES))
+    if compact_bytes > 0 and os.path.getsize(log_path) > compact_bytes:
+        compact_event_log(log_path, fsync=fsync)
+
+    return appended
+
+
+def main() -> int:
+    """CLI entry point: compact an event log and optionally rebuild the snapshot."""
+    parser = argparse.ArgumentParser(description="Compact the attendance event log")
+    parser.add_argument("log_path", help="Path to the event log (e.g. output/events.jsonl)")
+    parser.add_argument("--rebuild", metavar="OUTPUT_PATH",
+                        help="Also rewrite this output file from the replayed log")
+    parser.add_argument("--config", default="config/myki_tracker_config.json",
+                        help="Config used to filter users when rebuilding")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.log_path):
+        print(f"✗ ERROR: Event log not found: {args.log_path}")
+        return 1
+
+    output = compact_event_log(args.log_path)
+
+    if args.rebuild:
+        save_output(output, output_path=args.rebuild, config_path=args.config)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
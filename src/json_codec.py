@@ -0,0 +1,100 @@
+"""JSON encoding and decoding for Myki Attendance Tracker.
+
+All config, session, API and output JSON goes through this module. It uses
+orjson when it is installed and falls back to the standard library json
+module otherwise. For the data the tracker writes (strings, integers,
+ordinary floats), both backends produce the same bytes:
+
+- Key order is preserved (or sorted with sort_keys=True)
+- indent=2 gives the same layout as json.dumps(..., indent=2)
+- Compact output uses "," and ":" separators
+- Non-ASCII characters are written as UTF-8 (not \\u escapes)
+
+orjson is optional. Values it cannot encode (non-string keys, integers
+beyond 64 bits, indents other than 2) are encoded with the standard library
+instead.
+"""
+
+import io
+import json
+from typing import IO, Any, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used without it
+    orjson = None
+
+
+# Raised by loads()/load() for invalid JSON with either backend
+# (orjson.JSONDecodeError is a subclass of json.JSONDecodeError)
+JSONDecodeError = json.JSONDecodeError
+
+
+def backend_name() -> str:
+    """Name of the JSON backend in use ("orjson" or "json")."""
+    return "orjson" if orjson is not None else "json"
+
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    """Parse a JSON document.
+
+    Args:
+        data: JSON text as str or UTF-8 bytes
+
+    Returns:
+        Parsed Python object
+
+    Raises:
+        JSONDecodeError: If data is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, (bytes, bytearray)):
+        data = data.decode("utf-8")
+    return json.loads(data)
+
+
+def load(fp: IO) -> Any:
+    """Parse a JSON document from an open file (text or binary mode)."""
+    return loads(fp.read())
+
+
+def dumps_bytes(obj: Any, indent: Optional[int] = None, sort_keys: bool = False) -> bytes:
+    """Serialise obj to UTF-8 JSON bytes.
+
+    Args:
+        obj: Object to serialise
+        indent: None for compact output, or number of spaces to indent
+        sort_keys: Sort dictionary keys (default: keep insertion order)
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None and indent in (None, 2):
+        option = 0
+        if indent == 2:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, option=option)
+        except orjson.JSONEncodeError:
+            pass  # e.g. non-string keys: let the standard library handle it
+
+    separators = (",", ":") if indent is None else (",", ": ")
+    return json.dumps(
+        obj, indent=indent, sort_keys=sort_keys, separators=separators, ensure_ascii=False
+    ).encode("utf-8")
+
+
+def dumps(obj: Any, indent: Optional[int] = None, sort_keys: bool = False) -> str:
+    """Serialise obj to a JSON string (see dumps_bytes)."""
+    return dumps_bytes(obj, indent=indent, sort_keys=sort_keys).decode("utf-8")
+
+
+def dump(obj: Any, fp: IO, indent: Optional[int] = None, sort_keys: bool = False) -> None:
+    """Serialise obj to an open file (text or binary mode; see dumps_bytes)."""
+    if isinstance(fp, io.TextIOBase):
+        fp.write(dumps(obj, indent=indent, sort_keys=sort_keys))
+    else:
+        fp.write(dumps_bytes(obj, indent=indent, sort_keys=sort_keys))
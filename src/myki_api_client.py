@@ -4,11 +4,17 @@ This module uses the authentication data (cookies and headers) saved by myki_aut
 to make authenticated API calls to the Myki API.
 """
 
-import requests
-import json
-from typing import Dict, Optional, List, Any
+from typing import TYPE_CHECKING, Dict, Optional, List, Any
 from pathlib import Path
 from auth_loader import load_session_data
+import json_codec
+from run_log import get_logger
+
+if TYPE_CHECKING:
+    import requests
+
+
+logger = get_logger(__name__)
 
 
 class MykiAPIClient:
@@ -17,7 +23,8 @@ class MykiAPIClient:
     BASE_URL = "https://mykiapi.ptv.vic.gov.au/v2"
 
     def __init__(self, cookies: Optional[Dict] = None, headers: Optional[Dict] = None,
-                 auth_request: Optional[Dict] = None, bearer_token: Optional[str] = None):
+                 auth_request: Optional[Dict] = None, bearer_token: Optional[str] = None,
+                 http_session: Optional["requests.Session"] = None):
         """Initialize the API client.
 
         Args:
@@ -25,9 +32,11 @@ class MykiAPIClient:
             headers: Request headers. If None, loads from saved data.
             auth_request: Authentication request data containing special headers.
             bearer_token: Bearer token for authorization header.
+            http_session: requests.Session to send requests with, so its
+                          connection pool is reused (default: one-off requests).
         """
         if cookies is None or headers is None:
-            print("Loading saved authentication data...")
+            logger.info("Loading saved authentication data...")
             cookies, headers, auth_request, bearer_token = load_session_data()
 
             if not cookies or not headers:
@@ -36,6 +45,7 @@ class MykiAPIClient:
                 )
 
         self.cookies = cookies
+        self.http_session = http_session
         self.auth_request = auth_request or {}
         self.bearer_token = bearer_token
 
@@ -68,16 +78,18 @@ class MykiAPIClient:
         # Add Authorization Bearer token (CRITICAL for API calls)
         if self.bearer_token:
             self.headers['authorization'] = f'Bearer {self.bearer_token}'
-            print(f"\n✓ MykiAPIClient initialized")
-            print(f"  Cookies: {len(self.cookies)} items")
-            print(f"  Headers: {len(self.headers)} items")
-            print(f"  Auth headers: x-verifytoken, x-ptvwebauth, x-passthruauth, authorization")
+            logger.info("")
+            logger.info("✓ MykiAPIClient initialized")
+            logger.info("  Cookies: %d items", len(self.cookies))
+            logger.info("  Headers: %d items", len(self.headers))
+            logger.info("  Auth headers: x-verifytoken, x-ptvwebauth, x-passthruauth, authorization")
         else:
-            print(f"\n⚠ MykiAPIClient initialized WITHOUT Bearer token")
-            print(f"  Cookies: {len(self.cookies)} items")
-            print(f"  Headers: {len(self.headers)} items")
-            print(f"  Auth headers: x-verifytoken, x-ptvwebauth, x-passthruauth")
-            print(f"  WARNING: API calls may fail without Bearer token!")
+            logger.warning("")
+            logger.warning("⚠ MykiAPIClient initialized WITHOUT Bearer token")
+            logger.info("  Cookies: %d items", len(self.cookies))
+            logger.info("  Headers: %d items", len(self.headers))
+            logger.info("  Auth headers: x-verifytoken, x-ptvwebauth, x-passthruauth")
+            logger.warning("  WARNING: API calls may fail without Bearer token!")
 
     def _make_request(
         self,
@@ -85,7 +97,7 @@ class MykiAPIClient:
         endpoint: str,
         data: Optional[Dict] = None,
         params: Optional[Dict] = None
-    ) -> requests.Response:
+    ) -> "requests.Response":
         """Make an authenticated request to the Myki API.
 
         Args:
@@ -100,20 +112,25 @@ class MykiAPIClient:
         Raises:
             requests.RequestException: If request fails
         """
+        # Imported here so that importing the client (e.g. by offline tools) stays cheap
+        import requests
+
         url = f"{self.BASE_URL}{endpoint}"
 
-        print(f"\n→ {method} {url}")
+        logger.debug("")
+        logger.debug("→ %s %s", method, url)
 
-        response = requests.request(
+        sender = self.http_session if self.http_session is not None else requests
+        response = sender.request(
             method=method,
             url=url,
             headers=self.headers,
             cookies=self.cookies,
-            json=data,
+            data=json_codec.dumps_bytes(data) if data is not None else None,
             params=params
         )
 
-        print(f"← Status: {response.status_code}")
+        logger.debug("← Status: %s", response.status_code)
 
         return response
 
@@ -134,8 +151,8 @@ class MykiAPIClient:
         response.raise_for_status()
 
         try:
-            return response.json()
-        except json.JSONDecodeError:
+            return json_codec.loads(response.content)
+        except json_codec.JSONDecodeError:
             return {'raw_content': response.text}
 
     def post(self, endpoint: str, data: Optional[Dict] = None) -> Dict[str, Any]:
@@ -155,8 +172,8 @@ class MykiAPIClient:
         response.raise_for_status()
 
         try:
-            return response.json()
-        except json.JSONDecodeError:
+            return json_codec.loads(response.content)
+        except json_codec.JSONDecodeError:
             return {'raw_content': response.text}
 
     # Common API endpoint methods
@@ -167,7 +184,8 @@ class MykiAPIClient:
         Returns:
             Account data
         """
-        print("\nFetching account information...")
+        logger.info("")
+        logger.info("Fetching account information...")
         return self.get('/account')
 
     def get_cards(self) -> List[Dict[str, Any]]:
@@ -176,7 +194,8 @@ class MykiAPIClient:
         Returns:
             List of card objects
         """
-        print("\nFetching myki cards...")
+        logger.info("")
+        logger.info("Fetching myki cards...")
         result = self.get('/account/cards')
         return result if isinstance(result, list) else result
 
@@ -189,7 +208,8 @@ class MykiAPIClient:
         Returns:
             Card details
         """
-        print(f"\nFetching details for card {card_id}...")
+        logger.info("")
+        logger.info("Fetching details for card %s...", card_id)
         return self.get(f'/card/{card_id}')
 
     def get_transactions(
@@ -210,7 +230,8 @@ class MykiAPIClient:
             >>> client = MykiAPIClient()
             >>> transactions = client.get_transactions("308425279093478", page=0)
         """
-        print(f"\nFetching transaction history for card {card_number}...")
+        logger.debug("")
+        logger.debug("Fetching transaction history for card %s (page %d)...", card_number, page)
         endpoint = '/myki/transactions'
         params = {'page': page}
         data = {'mykiCardNumber': card_number}
@@ -228,8 +249,8 @@ class MykiAPIClient:
             response.raise_for_status()
 
         try:
-            return response.json()
-        except json.JSONDecodeError:
+            return json_codec.loads(response.content)
+        except json_codec.JSONDecodeError:
             return {'raw_content': response.text}
 
     def get_balance(self, card_id: str) -> Dict[str, Any]:
@@ -241,7 +262,8 @@ class MykiAPIClient:
         Returns:
             Balance information
         """
-        print(f"\nFetching balance for card {card_id}...")
+        logger.info("")
+        logger.info("Fetching balance for card %s...", card_id)
         return self.get(f'/card/{card_id}/balance')
 
     def authenticate_account(self, username: str, password: str) -> Dict[str, Any]:
@@ -257,7 +279,8 @@ class MykiAPIClient:
         Returns:
             Authentication response
         """
-        print("\nAuthenticating account...")
+        logger.info("")
+        logger.info("Authenticating account...")
         data = {
             'username': username,
             'password': password,
@@ -268,6 +291,8 @@ class MykiAPIClient:
 
 def main():
     """Test the API client with saved authentication data."""
+    import requests
+
     try:
         # Initialize client with saved data
         client = MykiAPIClient()
@@ -286,13 +311,13 @@ def main():
         try:
             transactions = client.get_transactions(card_number, page=0)
             print("✓ Transactions retrieved successfully!")
-            print(json.dumps(transactions, indent=2))
+            print(json_codec.dumps(transactions, indent=2))
         except requests.HTTPError as e:
             print(f"✗ Transactions endpoint failed: {e}")
             if e.response:
                 try:
                     error_json = e.response.json()
-                    print(f"   Error details: {json.dumps(error_json, indent=2)}")
+                    print(f"   Error details: {json_codec.dumps(error_json, indent=2)}")
                 except:
                     print(f"   Response: {e.response.text}")
         except Exception as e:
@@ -305,7 +330,7 @@ def main():
         try:
             transactions_p1 = client.get_transactions(card_number, page=1)
             print("✓ Page 1 transactions retrieved:")
-            print(json.dumps(transactions_p1, indent=2))
+            print(json_codec.dumps(transactions_p1, indent=2))
         except requests.HTTPError as e:
             print(f"✗ Page 1 failed: {e.response.status_code} - {e.response.text}")
 
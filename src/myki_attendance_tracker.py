@@ -3,35 +3,85 @@
 This module tracks work attendance by monitoring Myki "Touch off" events
 at designated stations for multiple users.
 
-Main orchestration and CLI entry point.
+Main orchestration and CLI entry point. run_tracking() is the in-process API:
+
+    >>> config = load_tracker_config("config/myki_config.json")
+    >>> result = run_tracking(config, options=TrackerOptions(output_dir="output"))
+    >>> result.exit_code
+    0
 """
 
-import json
 import os
 import sys
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, Tuple, Optional
-
-import requests
+from typing import Dict, List, Mapping, Sequence, Tuple, Optional
 
+import json_codec
 from myki_api_client import MykiAPIClient
 from config_manager import (
-    load_unified_config,
-    validate_user_config,
-    load_user_credentials,
-    get_effective_end_date,
-    get_effective_skip_dates
+    DISCOVER_CARDS,
+    TrackerConfig,
+    UserSettings,
+    compile_user_entry,
+    load_tracker_config,
+    user_card_numbers
 )
-from working_days import VIC_HOLIDAYS, parse_skip_dates
-from transaction_fetcher import fetch_all_transactions
-from transaction_processor import filter_transactions, calculate_attendance_days
+from working_days import get_vic_holidays
+from transaction_fetcher import discover_card_numbers, fetch_card_transactions
+from transaction_processor import MELBOURNE_TZ, normalize_transactions
 from output_manager import (
     load_existing_output,
-    get_latest_processed_date,
-    filter_new_transactions,
     update_user_output,
-    save_output
+    save_output,
+    load_sharded_output,
+    save_sharded_output,
+    load_sqlite_output,
+    save_sqlite_output,
+    OUTPUT_LAYOUTS,
+    OUTPUT_ENCODINGS
 )
+from event_log import EVENT_LOG_FILENAME, record_run
+from run_state import RunState
+from run_profiler import RunProfiler, profile_scope
+from run_log import configure_logging, get_logger
+from processing_pool import UserTask, compute_user_output, process_users, process_workers, use_process_pool
+
+
+logger = get_logger(__name__)
+
+
+def fetch_user_transactions(
+    username: str,
+    card_numbers: Sequence[str],
+    client: MykiAPIClient,
+    checkpoint: Optional[RunState] = None
+) -> List[Dict]:
+    """Fetch a user's transactions, or reuse the ones this run already fetched.
+
+    Args:
+        username: Username (key in config)
+        card_numbers: Myki card numbers (see config_manager.user_card_numbers);
+                     (DISCOVER_CARDS,) fetches every card on the account
+        client: MykiAPIClient instance
+        checkpoint: Run checkpoint (optional); new fetches are cached in it
+
+    Returns:
+        List of raw transaction dictionaries of all cards, merged
+    """
+    all_transactions = checkpoint.load_transactions(username) if checkpoint is not None else None
+    if all_transactions is not None:
+        logger.info("")
+        logger.info("Using %d transactions fetched earlier in this run", len(all_transactions))
+        return all_transactions
+
+    if tuple(card_numbers) == (DISCOVER_CARDS,):
+        card_numbers = discover_card_numbers(client)
+    all_transactions = fetch_card_transactions(client, card_numbers)
+    if checkpoint is not None:
+        checkpoint.save_transactions(username, all_transactions)
+    return all_transactions
 
 
 def process_user(
@@ -40,13 +90,16 @@ def process_user(
     user_credentials: Dict,
     client: MykiAPIClient,
     existing_output: Dict,
-    vic_holidays
+    vic_holidays,
+    transaction_sink: Optional[Dict] = None,
+    checkpoint: Optional[RunState] = None,
+    settings: Optional[UserSettings] = None
 ) -> Tuple[bool, Optional[Dict], Optional[Exception]]:
     """Process a single user's attendance tracking.
 
     Orchestrates all steps for one user:
-    1. Parse user config (station, dates, skip dates) and credentials (card number)
-    2. Fetch all transactions (handle pagination)
+    1. Parse user config (station, dates, skip dates) and credentials (card numbers)
+    2. Fetch all transactions of every card (handle pagination) and normalise them into records
     3. Filter new transactions (incremental processing)
     4. Filter by station, type, and date range
     5. Calculate attendance days (working days only)
@@ -55,10 +108,18 @@ def process_user(
     Args:
         username: Username (key in config)
         user_config: User configuration dictionary
-        user_credentials: User credentials dictionary with card_number, username, password
+        user_credentials: User credentials dictionary with card_number (one or
+                         more cards, or "auto"), username, password
         client: MykiAPIClient instance (reused across users)
         existing_output: Existing output data for incremental processing
         vic_holidays: Melbourne VIC holidays object
+        transaction_sink: Dictionary that receives this user's normalised
+                         TransactionRecords under username (optional, used by
+                         the columnar export)
+        checkpoint: Run checkpoint (optional). Transactions fetched earlier in
+                   the run are reused, and new fetches are cached in it.
+        settings: user_config already compiled by TrackerConfig (optional,
+                 compiled here if not given)
 
     Returns:
         Tuple of (success: bool, user_output_data: dict or None, error: Exception or None)
@@ -67,275 +128,590 @@ def process_user(
 
     Note:
         Catches all exceptions within function and returns them (doesn't raise).
-        Uses print statements for user-friendly logging at each step.
+        Logs user-friendly progress at each step (see run_log).
     """
     try:
-        print(f"\n{'=' * 60}")
-        print(f"Processing user: {username}")
-        print(f"{'=' * 60}")
+        logger.info("")
+        logger.info("=" * 60)
+        logger.info("Processing user: %s", username)
+        logger.info("=" * 60)
 
         # Step 1: Parse user config and credentials
-        card_number = user_credentials["card_number"]
-        target_station = user_config["targetStation"]
-        start_date_str = user_config["startDate"]
-        end_date_str = get_effective_end_date({username: user_config}, username)
-        skip_dates_str = get_effective_skip_dates({username: user_config}, username)
-        manual_attendance_dates = user_config.get("manualAttendanceDates", [])
-
-        print(f"Configuration:")
-        print(f"  Card Number: {card_number}")
-        print(f"  Target Station: {target_station}")
-        print(f"  Date Range: {start_date_str} to {end_date_str}")
-        print(f"  Skip Dates: {len(skip_dates_str)} day(s)")
-        print(f"  Manual Attendance Dates: {len(manual_attendance_dates)} day(s)")
-
-        # Parse dates
-        start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
-        end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
-        skip_dates = parse_skip_dates(skip_dates_str)
-
-        # Step 2: Fetch all transactions (handle pagination)
-        all_transactions = fetch_all_transactions(client, card_number)
-
-        # Step 3: Get latest processed date and filter new transactions
-        print(f"\nIncremental Processing:")
-        latest_processed_date = get_latest_processed_date(existing_output, username)
-        new_transactions = filter_new_transactions(all_transactions, latest_processed_date)
-
-        # Step 4: Filter by station, type, and date range
-        print(f"\nFiltering Transactions:")
-        filtered_transactions = filter_transactions(
-            transactions=new_transactions,
-            target_station=target_station,
-            start_date=start_date,
-            end_date=end_date
-        )
-        print(f"  Filtered to {len(filtered_transactions)} relevant transactions")
-        print(f"    (Touch off at '{target_station}' within date range)")
-
-        # Step 5: Calculate attendance days (working days only)
-        print(f"\nCalculating Attendance Days:")
-        attendance_days = calculate_attendance_days(
-            transactions=filtered_transactions,
-            skip_dates=skip_dates,
-            vic_holidays=vic_holidays
-        )
-        print(f"  Found {len(attendance_days)} working day(s) with attendance")
-
-        # Determine latest transaction datetime from filtered transactions
-        latest_txn_datetime = None
-        if filtered_transactions:
-            # Get the latest datetime from filtered transactions
-            latest_txn_datetime_str = max(
-                txn["transactionDateTime"] for txn in filtered_transactions
-            )
-            latest_txn_datetime = datetime.fromisoformat(latest_txn_datetime_str)
-
-        # Step 6: Update output data for user
-        print(f"\nUpdating Output:")
-        updated_output = update_user_output(
-            existing_output=existing_output,
-            username=username,
-            new_attendance_days=attendance_days,
-            latest_txn_datetime=latest_txn_datetime,
-            target_station=target_station,
-            start_date=start_date,
-            end_date=end_date,
-            skip_dates=skip_dates,
-            vic_holidays=vic_holidays,
-            manual_attendance_dates=manual_attendance_dates
+        card_numbers = user_card_numbers(user_credentials)
+        settings = settings or compile_user_entry(username, user_config)
+
+        logger.info("Configuration:")
+        if card_numbers == (DISCOVER_CARDS,):
+            logger.info("  Card Numbers: all cards on the account")
+        else:
+            logger.info("  Card Numbers: %s", ', '.join(card_numbers))
+        logger.info("  Target Station: %s", settings.target_station)
+        logger.info("  Date Range: %s to %s", settings.start_date, settings.effective_end_date())
+        logger.info("  Skip Dates: %d day(s)", len(settings.skip_dates))
+        logger.info("  Manual Attendance Dates: %d day(s)", len(settings.manual_dates))
+
+        # Step 2: Fetch all transactions (handle pagination), unless this run already did
+        all_transactions = fetch_user_transactions(username, card_numbers, client, checkpoint)
+
+        # Parse each transaction timestamp exactly once; later steps use the records
+        transaction_records = normalize_transactions(all_transactions)
+        if transaction_sink is not None:
+            transaction_sink[username] = transaction_records
+
+        # Steps 3-6: filter, calculate attendance days and update output
+        updated_output = compute_user_output(
+            settings,
+            transaction_records,
+            existing_output,
+            vic_holidays,
+            # Months before the current Melbourne month are closed and get compacted
+            compact_before=datetime.now(MELBOURNE_TZ).date().replace(day=1)
         )
 
-        print(f"\n✓ Successfully processed user: {username}")
+        logger.info("")
+        logger.info("✓ Successfully processed user: %s", username)
         return (True, updated_output, None)
 
     except Exception as e:
-        print(f"\n✗ ERROR processing user '{username}': {type(e).__name__}")
-        print(f"  Details: {str(e)}")
+        logger.error("")
+        logger.error("✗ ERROR processing user '%s': %s", username, type(e).__name__)
+        logger.error("  Details: %s", e)
         return (False, None, e)
 
 
-def main() -> int:
-    """Main orchestration function for multi-user attendance tracking.
-
-    Orchestrates:
-    - Load and validate user config
-    - Initialize MykiAPIClient once (reuse for all users)
-    - Initialize Melbourne VIC holidays object
-    - Load existing output file
-    - Loop through all users sequentially
-    - Collect successes and failures
-    - Merge all successful user outputs
-    - Save combined output file
-    - Print summary
+def _env_flag(name: str) -> bool:
+    """Read a boolean environment variable (1/true/yes)."""
+    return os.getenv(name, '').lower() in ('1', 'true', 'yes')
+
+
+@dataclass
+class TrackerOptions:
+    """Output and processing options for run_tracking().
+
+    Attributes:
+        output_dir: Directory for the output files (OUTPUT_DIR)
+        layout: "single", "sharded" or "sqlite" (OUTPUT_LAYOUT)
+        encoding: "json" or "bitset" (OUTPUT_ENCODING)
+        fsync: Flush the output to disk before returning (OUTPUT_FSYNC)
+        precompress: Add minified/.gz/.br copies and version.json (OUTPUT_PRECOMPRESS)
+        event_log: Append the run's changes to events.jsonl (OUTPUT_EVENT_LOG)
+        export: "parquet" or "arrow" for a columnar export, "" for none (OUTPUT_EXPORT)
+        workers: Worker processes for the statistics stage, 1 = serial (MYKI_PROCESS_WORKERS)
+    """
+    output_dir: str = "output"
+    layout: str = "single"
+    encoding: str = "json"
+    fsync: bool = False
+    precompress: bool = False
+    event_log: bool = False
+    export: str = ""
+    workers: int = 1
+
+    @classmethod
+    def from_env(cls) -> "TrackerOptions":
+        """Build options from the OUTPUT_* environment variables."""
+        return cls(
+            # Support environment variable override for Docker permission issues
+            output_dir=os.getenv('OUTPUT_DIR', 'output'),
+            layout=os.getenv('OUTPUT_LAYOUT', 'single'),
+            encoding=os.getenv('OUTPUT_ENCODING', 'json'),
+            fsync=_env_flag('OUTPUT_FSYNC'),
+            precompress=_env_flag('OUTPUT_PRECOMPRESS'),
+            event_log=_env_flag('OUTPUT_EVENT_LOG'),
+            export=os.getenv('OUTPUT_EXPORT', ''),
+            workers=process_workers()
+        )
+
+    def validate(self) -> None:
+        """Check layout, encoding and export format.
+
+        Raises:
+            ValueError: If any of them is unknown
+        """
+        if self.layout not in OUTPUT_LAYOUTS:
+            raise ValueError(
+                f"Unknown OUTPUT_LAYOUT '{self.layout}' (expected one of: {', '.join(OUTPUT_LAYOUTS)})"
+            )
+        if self.encoding not in OUTPUT_ENCODINGS:
+            raise ValueError(
+                f"Unknown OUTPUT_ENCODING '{self.encoding}' (expected one of: {', '.join(OUTPUT_ENCODINGS)})"
+            )
+        if self.export:
+            # pyarrow is heavy; only import the exporter when an export is requested
+            from columnar_export import EXPORT_FORMATS
+            if self.export not in EXPORT_FORMATS:
+                raise ValueError(
+                    f"Unknown OUTPUT_EXPORT '{self.export}' (expected one of: {', '.join(EXPORT_FORMATS)})"
+                )
+
+
+@dataclass
+class RunResult:
+    """Outcome of run_tracking().
+
+    Attributes:
+        usernames: Users that were processed, in config order
+        successes: Users processed successfully
+        failures: List of (username, exception) for users that failed
+        output: Output as saved (None if no user succeeded)
+        written: True if the output file changed on disk
+    """
+    usernames: List[str]
+    successes: List[str] = field(default_factory=list)
+    failures: List[Tuple[str, Exception]] = field(default_factory=list)
+    output: Optional[Dict] = None
+    written: bool = False
+
+    @property
+    def exit_code(self) -> int:
+        """0 if all users succeeded, 1 if any failed."""
+        return 1 if self.failures else 0
+
+
+def _load_output(options: TrackerOptions) -> Dict:
+    """Load the existing output for the configured layout."""
+    if options.layout == "sharded":
+        return load_sharded_output(options.output_dir)
+    if options.layout == "sqlite":
+        return load_sqlite_output(options.output_dir)
+    return load_existing_output(os.path.join(options.output_dir, 'attendance.json'))
+
+
+def _save_output(final_output: Dict, config: TrackerConfig, options: TrackerOptions) -> bool:
+    """Save the output for the configured layout, keeping only the config's users."""
+    if options.layout == "sharded":
+        return save_sharded_output(
+            final_output,
+            output_dir=options.output_dir,
+            config_path=config.config_path,
+            encoding=options.encoding,
+            fsync=options.fsync,
+            users=config.usernames
+        )
+    if options.layout == "sqlite":
+        return save_sqlite_output(
+            final_output,
+            output_dir=options.output_dir,
+            config_path=config.config_path,
+            encoding=options.encoding,
+            fsync=options.fsync,
+            precompress=options.precompress,
+            users=config.usernames
+        )
+    return save_output(
+        final_output,
+        output_path=os.path.join(options.output_dir, 'attendance.json'),
+        config_path=config.config_path,
+        encoding=options.encoding,
+        fsync=options.fsync,
+        precompress=options.precompress,
+        users=config.usernames
+    )
+
+
+def _process_users_parallel(
+    usernames: List[str],
+    config: TrackerConfig,
+    clients: Mapping[str, MykiAPIClient],
+    existing_output: Dict,
+    transaction_sink: Optional[Dict],
+    checkpoint: Optional[RunState],
+    workers: int,
+    executor: Optional[Executor] = None,
+    profiler: Optional[RunProfiler] = None
+) -> Dict[str, Tuple[bool, Optional[Dict], Optional[Exception]]]:
+    """Fetch users one by one, then compute their outputs in a process pool.
+
+    With a profiler, each worker profiles its user's computation and the
+    parent writes it as that user's scope.
 
     Returns:
-        Exit code: 0 if all users succeed, 1 if any failures
+        Dictionary {username: (success, user output entry or None, error or None)}
+    """
+    outcomes = {}
+    tasks = []
+    # Same cut-off for every worker, even if the pool runs across midnight
+    compact_before = datetime.now(MELBOURNE_TZ).date().replace(day=1)
+
+    logger.info("")
+    logger.info("Fetching transactions for %d users", len(usernames))
+    for username in usernames:
+        # Set environment variable for session file lookup (multi-user support)
+        os.environ['MYKI_AUTH_USERNAME_KEY'] = username
+        try:
+            card_numbers = user_card_numbers(config.credentials[username])
+            transactions = fetch_user_transactions(username, card_numbers, clients[username], checkpoint)
+        except Exception as e:
+            logger.error("")
+            logger.error("✗ ERROR fetching transactions for user '%s': %s", username, type(e).__name__)
+            logger.error("  Details: %s", e)
+            outcomes[username] = (False, None, e)
+            continue
+
+        # Parsed once here: the worker and the export sink share the records
+        transaction_records = normalize_transactions(transactions)
+        if transaction_sink is not None:
+            transaction_sink[username] = transaction_records
+        tasks.append(UserTask(
+            settings=config.settings[username],
+            transaction_records=transaction_records,
+            existing_user=existing_output.get(username),
+            compact_before=compact_before,
+            profile=profiler is not None
+        ))
+
+    logger.info("")
+    logger.info("Computing statistics for %d users (%s worker processes)", len(tasks), workers)
+    profiles: Dict[str, Dict] = {}
+    results = process_users(tasks, workers=workers, executor=executor, profiles=profiles)
+    for username, user_data, error in results:
+        outcomes[username] = (error is None, user_data, error)
+    for username, profile in profiles.items():
+        profiler.add_profile(f"user-{username}", **profile)
+    return outcomes
+
+
+def run_tracking(
+    config: TrackerConfig,
+    sessions: Optional[Mapping[str, MykiAPIClient]] = None,
+    options: Optional[TrackerOptions] = None,
+    checkpoint: Optional[RunState] = None,
+    executor: Optional[Executor] = None,
+    profiler: Optional[RunProfiler] = None,
+    unavailable: Optional[Mapping[str, Exception]] = None
+) -> RunResult:
+    """Track attendance for every user in an already-parsed config.
+
+    Loads the existing output, processes users, then saves the output (plus
+    the optional columnar export and event log). The config is used as given:
+    no config file is read or written.
+
+    Users are processed sequentially unless options.workers > 1 and enough
+    users are pending (see processing_pool.use_process_pool): then all users
+    are fetched first and their statistics computed in a process pool. The
+    output is the same either way.
+
+    With a checkpoint, each user's result is cached in it as soon as it is
+    processed, users already processed in the run are skipped (their cached
+    results are merged into the output), and the checkpoint is removed once
+    the output is saved if no user fails.
+
+    Args:
+        config: Parsed config and credentials (see load_tracker_config)
+        sessions: API client per username (optional). Users without one
+                 share a client built from the saved session data.
+        options: Output options (default: TrackerOptions.from_env())
+        checkpoint: Run checkpoint to resume and update (optional, see run_state)
+        executor: Executor for the statistics stage (optional, default: a
+                 ProcessPoolExecutor with options.workers processes)
+        profiler: Profiles each user's processing (in the worker on the
+                 process-pool path), the statistics pool and the output
+                 save (optional, see run_profiler)
+        unavailable: Users that can't be processed in this run, with the
+                    reason (e.g. no saved session). They are reported as
+                    failures and their existing output is kept.
+
+    Returns:
+        RunResult with per-user outcomes and the saved output
+
+    Raises:
+        ValueError: If the options are invalid or no saved session exists
 
     Note:
-        - Uses saved session from Phase 1 authentication (no passwords needed)
-        - Uses print statements for logging (no complex framework)
-        - Follows fail-fast for missing config/invalid schema
-        - Follows graceful degradation for per-user API failures
-        - One user's failure doesn't prevent other users from processing
+        One user's failure doesn't prevent other users from processing;
+        failures are collected in the result rather than raised.
     """
-    print("=" * 80)
-    print("Myki Attendance Tracker - Work Attendance Monitor")
-    print("=" * 80)
+    options = options or TrackerOptions.from_env()
+    options.validate()
+    sessions = sessions or {}
+    unavailable = unavailable or {}
+    result = RunResult(usernames=config.usernames)
+    resumed = {}
+    if checkpoint is not None:
+        for username in result.usernames:
+            user_data = checkpoint.load_user_output(username)
+            if user_data is not None:
+                resumed[username] = user_data
+    pending = [
+        username for username in result.usernames
+        if username not in resumed and username not in unavailable
+    ]
+
+    # Initialize MykiAPIClient once (reuse for all users without their own session)
+    shared_client = None
+    if any(username not in sessions for username in pending):
+        logger.info("")
+        logger.info("-" * 80)
+        logger.info("Initializing Myki API Client")
+        logger.info("-" * 80)
+        shared_client = MykiAPIClient()
+        logger.info("✓ MykiAPIClient initialized (session auto-loaded)")
+
+    vic_holidays = get_vic_holidays()
+
+    output_export = options.export
+    if output_export:
+        from columnar_export import export_available, export_columnar
+        if not export_available():
+            logger.warning("WARNING: OUTPUT_EXPORT=%s needs pyarrow (pip install pyarrow) - skipping export",
+                           output_export)
+            output_export = ''
+    transaction_sink = {} if output_export else None
+
+    # Load existing output file
+    logger.info("")
+    logger.info("-" * 80)
+    logger.info("Loading Existing Output")
+    logger.info("-" * 80)
+    existing_output = _load_output(options)
+    # Kept unchanged for the event log diff (update_user_output copies, never mutates)
+    previous_output = existing_output
+    if resumed:
+        existing_output = {**existing_output, **resumed}
+
+    logger.info("")
+    logger.info("-" * 80)
+    logger.info("Processing Users")
+    logger.info("-" * 80)
+
+    computed = {}
+    if executor is not None or use_process_pool(len(pending), options.workers):
+        with profile_scope(profiler, "statistics-pool"):
+            computed = _process_users_parallel(
+                pending,
+                config,
+                {username: sessions.get(username, shared_client) for username in pending},
+                existing_output,
+                transaction_sink,
+                checkpoint,
+                workers=options.workers,
+                executor=executor,
+                profiler=profiler
+            )
 
-    try:
-        # Step 1: Get config path from CLI argument or use default
-        if len(sys.argv) > 1:
-            config_path = sys.argv[1]
+    # Merge users in config order (computed in the pool, or processed one by one here)
+    for username in result.usernames:
+        if username in unavailable:
+            logger.warning("")
+            logger.warning("✗ Skipping user '%s': %s", username, unavailable[username])
+            result.failures.append((username, unavailable[username]))
+            continue
+        if username not in pending:
+            logger.info("")
+            logger.info("✓ Skipping user '%s' (already processed in run %s)", username, checkpoint.run_id)
+            result.successes.append(username)
+            continue
+
+        if username in computed:
+            success, user_data, error = computed[username]
+            user_output = {**existing_output, username: user_data} if success else None
         else:
-            config_path = "config/myki_tracker_config.json"
+            # Set environment variable for session file lookup (multi-user support)
+            os.environ['MYKI_AUTH_USERNAME_KEY'] = username
 
-        print(f"\nConfiguration file: {config_path}")
+            # Process user (catch all exceptions)
+            # Note: Passwords not needed - MykiAPIClient uses saved session from Phase 1
+            with profile_scope(profiler, f"user-{username}"):
+                success, user_output, error = process_user(
+                    username=username,
+                    user_config=config.users[username],
+                    user_credentials=config.credentials[username],
+                    client=sessions.get(username, shared_client),
+                    existing_output=existing_output,
+                    vic_holidays=vic_holidays,
+                    transaction_sink=transaction_sink,
+                    checkpoint=checkpoint,
+                    settings=config.settings[username]
+                )
+
+        if success:
+            result.successes.append(username)
+            if checkpoint is not None:
+                # Keep this user's result so a crash later in the run doesn't lose it
+                checkpoint.save_user_output(username, user_output[username])
+            # Merge user output into existing_output for next user
+            existing_output = user_output
+        else:
+            result.failures.append((username, error))
+
+    if not result.successes:
+        if checkpoint is not None and not result.failures:
+            checkpoint.finish()
+        return result
+
+    # The last successful user output contains all merged data
+    final_output = existing_output
+    result.output = final_output
+
+    logger.info("")
+    logger.info("-" * 80)
+    logger.info("Saving Output")
+    logger.info("-" * 80)
+    with profile_scope(profiler, "save-output"):
+        result.written = _save_output(final_output, config, options)
+
+    if output_export:
+        export_columnar(
+            {k: v for k, v in final_output.items() if k in result.usernames},
+            export_dir=os.path.join(options.output_dir, 'export'),
+            fmt=output_export,
+            transactions=transaction_sink
+        )
 
-        # Step 2: Load and validate user config
-        print("\n" + "-" * 80)
-        print("Loading Configuration")
-        print("-" * 80)
+    if options.event_log:
+        record_run(os.path.join(options.output_dir, EVENT_LOG_FILENAME), previous_output, final_output,
+                   fsync=options.fsync, run_id=checkpoint.run_id if checkpoint is not None else None)
 
-        user_config = load_unified_config(config_path)
-        validate_user_config(user_config)
+    if checkpoint is not None and not result.failures:
+        checkpoint.finish()
 
-        # Step 2.5: Load user credentials from environment variables
-        print("\n" + "-" * 80)
-        print("Loading Credentials")
-        print("-" * 80)
+    return result
 
-        user_credentials = load_user_credentials(user_config)
 
-        # Step 3: Initialize MykiAPIClient once (reuse for all users)
-        print("\n" + "-" * 80)
-        print("Initializing Myki API Client")
-        print("-" * 80)
-        client = MykiAPIClient()
-        print("✓ MykiAPIClient initialized (session auto-loaded)")
+def report_run(result: RunResult) -> int:
+    """Log the summary and error details of a run.
 
-        # Step 4: Initialize Melbourne VIC holidays object
-        vic_holidays = VIC_HOLIDAYS
+    Args:
+        result: RunResult from run_tracking()
 
-        # Step 5: Load existing output file
-        print("\n" + "-" * 80)
-        print("Loading Existing Output")
-        print("-" * 80)
-        # Support environment variable override for Docker permission issues
-        output_path = os.path.join(os.getenv('OUTPUT_DIR', 'output'), 'attendance.json')
-        existing_output = load_existing_output(output_path)
+    Returns:
+        Exit code: 0 if all users succeed, 1 if any failures
+    """
+    logger.info("")
+    logger.info("=" * 80)
+    logger.info("Summary")
+    logger.info("=" * 80)
+
+    logger.info("Total users: %d", len(result.usernames))
+    logger.info("  ✓ Successful: %d", len(result.successes))
+    logger.info("  ✗ Failed: %d", len(result.failures))
+
+    # Log error details for failures
+    if result.failures:
+        import requests
+
+        logger.error("")
+        logger.error("-" * 80)
+        logger.error("Error Details")
+        logger.error("-" * 80)
+
+        for username, error in result.failures:
+            logger.error("")
+            logger.error("User: %s", username)
+            logger.error("  Error Type: %s", type(error).__name__)
+            logger.error("  Error Message: %s", error)
+
+            # Add specific guidance based on error type
+            if isinstance(error, requests.HTTPError):
+                if hasattr(error, 'response') and error.response:
+                    logger.error("  HTTP Status: %s", error.response.status_code)
+                    logger.error("  Suggestion: Check API connectivity and authentication")
+            elif isinstance(error, ValueError):
+                logger.error("  Suggestion: Check configuration file for invalid values")
+            elif isinstance(error, KeyError):
+                logger.error("  Suggestion: Check configuration file for missing required fields")
+
+    if result.failures:
+        logger.error("")
+        logger.error("=" * 80)
+        logger.error("⚠ COMPLETED WITH ERRORS - Some users failed to process")
+        logger.error("=" * 80)
+    else:
+        logger.info("")
+        logger.info("=" * 80)
+        logger.info("✓ COMPLETED SUCCESSFULLY - All users processed")
+        logger.info("=" * 80)
+    return result.exit_code
 
-        # Step 6: Initialize results tracking
-        successes = []
-        failures = []
 
-        # Step 7: Loop through all users sequentially
-        print("\n" + "-" * 80)
-        print("Processing Users")
-        print("-" * 80)
+def main() -> int:
+    """CLI entry point for multi-user attendance tracking.
 
-        # Filter out comment keys (those starting with underscore)
-        usernames = [k for k in user_config.keys() if not k.startswith("_")]
+    Loads and validates the config file given on the command line (default:
+    config/myki_tracker_config.json), runs run_tracking() with options from
+    the OUTPUT_* environment variables and prints the summary. Progress is
+    checkpointed per user; --resume continues an interrupted run. --profile
+    writes cProfile/tracemalloc reports to output/profile/<run id>/. --quiet
+    only logs warnings and errors, --log-json logs JSON lines (see run_log).
 
-        for username in usernames:
-            user_cfg = user_config[username]
-            user_creds = user_credentials[username]
+    Usage:
+        python src/myki_attendance_tracker.py [config_path] [--resume] [--profile] [--quiet] [--log-json]
 
-            # Set environment variable for session file lookup (multi-user support)
-            os.environ['MYKI_AUTH_USERNAME_KEY'] = username
+    config_path may also be a .jsonl or .csv user manifest (see user_manifest).
 
-            # Process user (catch all exceptions)
-            # Note: Passwords not needed - MykiAPIClient uses saved session from Phase 1
-            success, user_output, error = process_user(
-                username=username,
-                user_config=user_cfg,
-                user_credentials=user_creds,
-                client=client,
-                existing_output=existing_output,
-                vic_holidays=vic_holidays
-            )
+    Returns:
+        Exit code: 0 if all users succeed, 1 if any failures
+
+    Note:
+        - Uses saved session from Phase 1 authentication (no passwords needed)
+        - Follows fail-fast for missing config/invalid schema
+        - Follows graceful degradation for per-user API failures
+    """
+    try:
+        configure_logging(
+            log_format="json" if "--log-json" in sys.argv[1:] else None,
+            quiet="--quiet" in sys.argv[1:]
+        )
+    except ValueError as e:
+        print(f"✗ ERROR: {e}")
+        return 1
 
-            if success:
-                successes.append((username, user_output))
-                # Merge user output into existing_output for next user
-                if user_output is not None:
-                    existing_output = user_output
-            else:
-                failures.append((username, error))
-
-        # Step 8: Merge all successful user outputs
-        if successes:
-            # The last successful user output contains all merged data
-            final_output = successes[-1][1] if successes else {}
-
-            # Step 9: Save combined output file
-            if final_output is not None:
-                print("\n" + "-" * 80)
-                print("Saving Output")
-                print("-" * 80)
-                save_output(final_output, output_path=output_path, config_path=config_path)
-
-        # Step 10: Print summary
-        print("\n" + "=" * 80)
-        print("Summary")
-        print("=" * 80)
-
-        total_users = len(usernames)
-        success_count = len(successes)
-        failure_count = len(failures)
-
-        print(f"Total users: {total_users}")
-        print(f"  ✓ Successful: {success_count}")
-        print(f"  ✗ Failed: {failure_count}")
-
-        # Step 11: Print error details for failures
-        if failures:
-            print("\n" + "-" * 80)
-            print("Error Details")
-            print("-" * 80)
-
-            for username, error in failures:
-                print(f"\nUser: {username}")
-                print(f"  Error Type: {type(error).__name__}")
-                print(f"  Error Message: {str(error)}")
-
-                # Add specific guidance based on error type
-                if isinstance(error, requests.HTTPError):
-                    if hasattr(error, 'response') and error.response:
-                        print(f"  HTTP Status: {error.response.status_code}")
-                        print(f"  Suggestion: Check API connectivity and authentication")
-                elif isinstance(error, ValueError):
-                    print(f"  Suggestion: Check configuration file for invalid values")
-                elif isinstance(error, KeyError):
-                    print(f"  Suggestion: Check configuration file for missing required fields")
-
-        # Step 12: Return exit code
-        if failure_count > 0:
-            print("\n" + "=" * 80)
-            print("⚠ COMPLETED WITH ERRORS - Some users failed to process")
-            print("=" * 80)
-            return 1  # Exit code 1 indicates failures
+    logger.info("=" * 80)
+    logger.info("Myki Attendance Tracker - Work Attendance Monitor")
+    logger.info("=" * 80)
+
+    profiler = None
+    try:
+        # Get config path from CLI argument or use default
+        args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+        resume = "--resume" in sys.argv[1:]
+        if args:
+            config_path = args[0]
         else:
-            print("\n" + "=" * 80)
-            print("✓ COMPLETED SUCCESSFULLY - All users processed")
-            print("=" * 80)
-            return 0  # Exit code 0 indicates success
+            config_path = "config/myki_tracker_config.json"
+
+        logger.info("")
+        logger.info("Configuration file: %s", config_path)
+
+        options = TrackerOptions.from_env()
+        if "--profile" in sys.argv[1:]:
+            profiler = RunProfiler(options.output_dir)
+
+        # Load and validate user config and credentials
+        logger.info("")
+        logger.info("-" * 80)
+        logger.info("Loading Configuration")
+        logger.info("-" * 80)
+        with profile_scope(profiler, "load-config"):
+            config = load_tracker_config(config_path)
+
+        checkpoint = RunState.open(options.output_dir, resume=resume, fsync=options.fsync)
+        with profile_scope(profiler, "tracking"):
+            result = run_tracking(config, options=options, checkpoint=checkpoint, profiler=profiler)
+        return report_run(result)
 
     except FileNotFoundError as e:
-        print(f"\n✗ ERROR: {str(e)}")
+        logger.error("")
+        logger.error("✗ ERROR: %s", e)
         return 1
-    except json.JSONDecodeError as e:
-        print(f"\n✗ ERROR: Malformed JSON in config file")
-        print(f"  Details: {e.msg} at position {e.pos}")
+    except json_codec.JSONDecodeError as e:
+        logger.error("")
+        logger.error("✗ ERROR: Malformed JSON in config file")
+        logger.error("  Details: %s at position %s", e.msg, e.pos)
         return 1
     except ValueError as e:
-        print(f"\n✗ ERROR: Configuration validation failed")
-        print(f"  Details: {str(e)}")
+        logger.error("")
+        logger.error("✗ ERROR: Configuration validation failed")
+        logger.error("  Details: %s", e)
         return 1
     except Exception as e:
-        print(f"\n✗ UNEXPECTED ERROR: {type(e).__name__}")
-        print(f"  Details: {str(e)}")
+        logger.error("")
+        logger.error("✗ UNEXPECTED ERROR: %s", type(e).__name__)
+        logger.error("  Details: %s", e)
         return 1
+    finally:
+        if profiler is not None:
+            profiler.close()
 
 
 if __name__ == '__main__':
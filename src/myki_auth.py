@@ -5,9 +5,9 @@ that bypasses Cloudflare Turnstile detection by leveraging browser trust signals
 """
 
 import os
+import re
 import time
 import random
-import json
 from typing import Dict, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
@@ -16,6 +16,11 @@ from playwright.sync_api import sync_playwright, Browser, BrowserContext, Page
 
 from profile_manager import ProfileManager
 from auth_loader import get_session_suffix
+import json_codec
+from run_log import get_logger
+
+
+logger = get_logger(__name__)
 
 
 class MykiAuthenticator:
@@ -37,7 +42,8 @@ class MykiAuthenticator:
 
         self.profile_manager = ProfileManager()
 
-    def launch_browser_with_profile(self, playwright, profile_dir: Path) -> BrowserContext:
+    @staticmethod
+    def launch_browser_with_profile(playwright, profile_dir: Path) -> BrowserContext:
         """Launch browser with copied profile to bypass Cloudflare.
 
         Args:
@@ -47,7 +53,8 @@ class MykiAuthenticator:
         Returns:
             Browser context
         """
-        print("\nLaunching Chrome with profile...")
+        logger.info("")
+        logger.info("Launching Chrome with profile...")
 
         context = playwright.chromium.launch_persistent_context(
             user_data_dir=str(profile_dir),
@@ -60,7 +67,7 @@ class MykiAuthenticator:
             # Use profile's natural locale/timezone settings - don't override
         )
 
-        print("  ✓ Chrome launched")
+        logger.info("  ✓ Chrome launched")
         return context
 
     def check_cloudflare(self, page: Page, wait_seconds: int = 15) -> bool:
@@ -73,19 +80,20 @@ class MykiAuthenticator:
         Returns:
             True if Cloudflare cleared, False if still blocking
         """
-        print(f"\nWaiting {wait_seconds} seconds for Cloudflare check...")
+        logger.info("")
+        logger.info("Waiting %s seconds for Cloudflare check...", wait_seconds)
         time.sleep(wait_seconds)
 
         try:
             cf_verifying = page.locator('text=Verifying').first.is_visible(timeout=2000)
             if cf_verifying:
-                print("  ⚠ Cloudflare 'Verifying' message still present")
+                logger.warning("  ⚠ Cloudflare 'Verifying' message still present")
                 return False
             else:
-                print("  ✓ No Cloudflare blocking detected")
+                logger.info("  ✓ No Cloudflare blocking detected")
                 return True
         except:
-            print("  ✓ No Cloudflare blocking detected")
+            logger.info("  ✓ No Cloudflare blocking detected")
             return True
 
     def check_login_form(self, page: Page) -> Tuple[bool, bool]:
@@ -97,7 +105,8 @@ class MykiAuthenticator:
         Returns:
             Tuple of (form_found, form_enabled)
         """
-        print("\nChecking for login form...")
+        logger.info("")
+        logger.info("Checking for login form...")
         time.sleep(3)
 
         try:
@@ -106,9 +115,9 @@ class MykiAuthenticator:
             ).first
 
             if username_field.is_visible(timeout=5000):
-                print("  ✓ Username field found")
+                logger.info("  ✓ Username field found")
                 is_enabled = username_field.is_enabled()
-                print(f"  ✓ Username field enabled: {is_enabled}")
+                logger.info("  ✓ Username field enabled: %s", is_enabled)
 
                 if is_enabled:
                     password_field = page.locator(
@@ -116,18 +125,18 @@ class MykiAuthenticator:
                     ).first
 
                     if password_field.is_visible(timeout=2000):
-                        print("  ✓ Password field found")
+                        logger.info("  ✓ Password field found")
                         is_pass_enabled = password_field.is_enabled()
-                        print(f"  ✓ Password field enabled: {is_pass_enabled}")
+                        logger.info("  ✓ Password field enabled: %s", is_pass_enabled)
                         return (True, is_pass_enabled)
 
                 return (True, False)
             else:
-                print("  ✗ Login form not visible")
+                logger.error("  ✗ Login form not visible")
                 return (False, False)
 
         except Exception as e:
-            print(f"  ✗ Login form check error: {e}")
+            logger.error("  ✗ Login form check error: %s", e)
             return (False, False)
 
     def add_human_behavior(self, page: Page):
@@ -136,7 +145,8 @@ class MykiAuthenticator:
         Args:
             page: Playwright page
         """
-        print("\nSimulating human behavior...")
+        logger.info("")
+        logger.info("Simulating human behavior...")
 
         # Random mouse movements
         for _ in range(3):
@@ -151,7 +161,7 @@ class MykiAuthenticator:
         page.evaluate("window.scrollBy(0, -50)")
         time.sleep(random.uniform(0.3, 0.7))
 
-        print("  ✓ Human behavior simulated")
+        logger.info("  ✓ Human behavior simulated")
 
     def fill_login_form(self, page: Page) -> Dict:
         """Fill and submit login form with human-like behavior.
@@ -162,14 +172,15 @@ class MykiAuthenticator:
         Returns:
             Dictionary containing authentication request and response details
         """
-        print("\nFilling login form...")
+        logger.info("")
+        logger.info("Filling login form...")
 
         # Set up network monitoring to capture auth POST request and response
         auth_request_data = {}
 
         def handle_request(request):
             if '/authenticate' in request.url and request.method == 'POST':
-                print(f"  → Captured authenticate POST request: {request.url}")
+                logger.info("  → Captured authenticate POST request: %s", request.url)
                 auth_request_data['url'] = request.url
                 auth_request_data['method'] = request.method
                 auth_request_data['headers'] = request.headers
@@ -177,7 +188,7 @@ class MykiAuthenticator:
 
         def handle_response(response):
             if '/authenticate' in response.url and response.request.method == 'POST':
-                print(f"  → Captured authenticate response: {response.status}")
+                logger.info("  → Captured authenticate response: %s", response.status)
                 auth_request_data['response_status'] = response.status
                 auth_request_data['response_headers'] = dict(response.headers)
 
@@ -187,29 +198,28 @@ class MykiAuthenticator:
                     auth_request_data['response_body'] = response_text
                     # Try to parse as JSON
                     try:
-                        import json
-                        response_json = json.loads(response_text)
+                        response_json = json_codec.loads(response_text)
                         auth_request_data['response_json'] = response_json
-                        print(f"  → Response JSON captured")
+                        logger.info("  → Response JSON captured")
 
                         # Look for Bearer token in response
                         if 'token' in response_json:
-                            print(f"  → Found 'token' in response!")
+                            logger.info("  → Found 'token' in response!")
                         if 'accessToken' in response_json:
-                            print(f"  → Found 'accessToken' in response!")
+                            logger.info("  → Found 'accessToken' in response!")
                         if 'bearerToken' in response_json:
-                            print(f"  → Found 'bearerToken' in response!")
+                            logger.info("  → Found 'bearerToken' in response!")
 
-                    except json.JSONDecodeError:
-                        print(f"  → Response is not JSON")
+                    except json_codec.JSONDecodeError:
+                        logger.info("  → Response is not JSON")
                 except Exception as e:
-                    print(f"  ⚠ Could not read response body: {e}")
+                    logger.warning("  ⚠ Could not read response body: %s", e)
 
         page.on('request', handle_request)
         page.on('response', handle_response)
 
         # Wait and observe like a human would
-        print("  - Pausing to 'read' the page...")
+        logger.info("  - Pausing to 'read' the page...")
         time.sleep(random.uniform(2.0, 4.0))
 
         # Add some mouse movement before clicking
@@ -224,7 +234,7 @@ class MykiAuthenticator:
 
         # Type username slowly with realistic delays
         username_field.type(self.username, delay=random.randint(80, 150))
-        print("  ✓ Username typed")
+        logger.info("  ✓ Username typed")
 
         # Pause between fields
         time.sleep(random.uniform(0.5, 1.2))
@@ -238,10 +248,10 @@ class MykiAuthenticator:
 
         # Type password slowly
         password_field.type(self.password, delay=random.randint(80, 150))
-        print("  ✓ Password typed")
+        logger.info("  ✓ Password typed")
 
         # Human pause before clicking submit
-        print("  - Pausing before submit...")
+        logger.info("  - Pausing before submit...")
         time.sleep(random.uniform(1.5, 3.0))
 
         # Use more specific selector for login button
@@ -251,14 +261,14 @@ class MykiAuthenticator:
 
         # Verify button is visible and enabled
         if not login_button.is_visible(timeout=5000):
-            print("  ✗ Login button not visible!")
+            logger.error("  ✗ Login button not visible!")
             return auth_request_data
 
         if not login_button.is_enabled():
-            print("  ✗ Login button not enabled!")
+            logger.error("  ✗ Login button not enabled!")
             return auth_request_data
 
-        print("  ✓ Login button is visible and enabled")
+        logger.info("  ✓ Login button is visible and enabled")
 
         # Get button position and move mouse
         box = login_button.bounding_box()
@@ -268,19 +278,20 @@ class MykiAuthenticator:
             time.sleep(random.uniform(0.3, 0.6))
 
         # Click login button
-        print("\nClicking login button...")
+        logger.info("")
+        logger.info("Clicking login button...")
         try:
             login_button.click(timeout=10000)
-            print("  ✓ Login button clicked")
+            logger.info("  ✓ Login button clicked")
         except Exception as e:
-            print(f"  ✗ Error clicking login button: {e}")
+            logger.error("  ✗ Error clicking login button: %s", e)
             # Try JavaScript click as fallback
-            print("  → Trying JavaScript click...")
+            logger.info("  → Trying JavaScript click...")
             page.evaluate('document.querySelector("button.login-form__button[type=submit]").click()')
-            print("  ✓ JavaScript click executed")
+            logger.info("  ✓ JavaScript click executed")
 
         # Wait for authenticate request to complete
-        print("  - Waiting for authentication request...")
+        logger.info("  - Waiting for authentication request...")
         time.sleep(random.uniform(3.0, 5.0))
 
         return auth_request_data
@@ -295,14 +306,15 @@ class MykiAuthenticator:
         Returns:
             True if dashboard loaded, False otherwise
         """
-        print(f"\nWaiting for dashboard (timeout: {timeout}s)...")
+        logger.info("")
+        logger.info("Waiting for dashboard (timeout: %ss)...", timeout)
 
         # First check for Cloudflare blocking message
         try:
             refresh_msg = page.locator('text=Please refresh and try again').first
             if refresh_msg.is_visible(timeout=2000):
-                print("  ✗ Cloudflare blocked login submission")
-                print("  ✗ Error: 'Please refresh and try again' message detected")
+                logger.error("  ✗ Cloudflare blocked login submission")
+                logger.error("  ✗ Error: 'Please refresh and try again' message detected")
                 return False
         except:
             pass  # No refresh message, continue
@@ -316,7 +328,7 @@ class MykiAuthenticator:
                     login_btn.element_handle()
                 )
                 if is_disabled:
-                    print("  ✗ Login button disabled - Cloudflare blocked submission")
+                    logger.error("  ✗ Login button disabled - Cloudflare blocked submission")
                     return False
         except:
             pass
@@ -332,15 +344,15 @@ class MykiAuthenticator:
                 # If we can still see username field, we're not on dashboard
                 username_field = page.locator('input[name="username"]').first
                 if username_field.is_visible(timeout=1000):
-                    print("  ✗ Still on login page - authentication failed")
+                    logger.error("  ✗ Still on login page - authentication failed")
                     return False
             except:
                 pass  # Username field not visible, good sign
 
-            print("  ✓ Dashboard loaded successfully")
+            logger.info("  ✓ Dashboard loaded successfully")
             return True
         except Exception as e:
-            print(f"  ✗ Dashboard not loaded: {e}")
+            logger.error("  ✗ Dashboard not loaded: %s", e)
             return False
 
     def extract_cookies(self, context: BrowserContext) -> Dict:
@@ -352,13 +364,14 @@ class MykiAuthenticator:
         Returns:
             Dictionary of cookies
         """
-        print("\nExtracting cookies...")
+        logger.info("")
+        logger.info("Extracting cookies...")
         cookies = context.cookies()
 
         cookie_dict = {}
         for cookie in cookies:
             cookie_dict[cookie['name']] = cookie['value']
-            print(f"  ✓ {cookie['name']}")
+            logger.info("  ✓ %s", cookie['name'])
 
         return cookie_dict
 
@@ -371,7 +384,8 @@ class MykiAuthenticator:
         Returns:
             Dictionary of headers
         """
-        print("\nExtracting headers...")
+        logger.info("")
+        logger.info("Extracting headers...")
 
         headers = {
             'User-Agent': page.evaluate('navigator.userAgent'),
@@ -379,9 +393,9 @@ class MykiAuthenticator:
             'Referer': 'https://transport.vic.gov.au/',
         }
 
-        print(f"  ✓ User-Agent: {headers['User-Agent'][:50]}...")
-        print(f"  ✓ Origin: {headers['Origin']}")
-        print(f"  ✓ Referer: {headers['Referer']}")
+        logger.info("  ✓ User-Agent: %s...", headers['User-Agent'][:50])
+        logger.info("  ✓ Origin: %s", headers['Origin'])
+        logger.info("  ✓ Referer: %s", headers['Referer'])
 
         return headers
 
@@ -412,34 +426,35 @@ class MykiAuthenticator:
             if isinstance(response_json, dict) and 'data' in response_json:
                 bearer_token = response_json['data'].get('token')
                 if bearer_token:
-                    print(f"\n  ✓ Extracted Bearer token from auth response")
-                    print(f"    Token: {bearer_token[:50]}...")
+                    logger.info("")
+                    logger.info("  ✓ Extracted Bearer token from auth response")
+                    logger.info("    Token: %s...", bearer_token[:50])
 
         # Save cookies (with user suffix if multi-user)
         cookies_file = auth_data_dir / f'cookies{suffix}.json'
-        with open(cookies_file, 'w') as f:
-            json.dump(cookies, f, indent=2)
-        print(f"  ✓ Cookies saved to: {cookies_file}")
+        with open(cookies_file, 'wb') as f:
+            json_codec.dump(cookies, f, indent=2)
+        logger.info("  ✓ Cookies saved to: %s", cookies_file)
 
         # Save headers (with user suffix if multi-user)
         headers_file = auth_data_dir / f'headers{suffix}.json'
-        with open(headers_file, 'w') as f:
-            json.dump(headers, f, indent=2)
-        print(f"  ✓ Headers saved to: {headers_file}")
+        with open(headers_file, 'wb') as f:
+            json_codec.dump(headers, f, indent=2)
+        logger.info("  ✓ Headers saved to: %s", headers_file)
 
         # Save auth request data (with user suffix if multi-user)
         if auth_request_data:
             auth_request_file = auth_data_dir / f'auth_request{suffix}.json'
-            with open(auth_request_file, 'w') as f:
-                json.dump(auth_request_data, f, indent=2)
-            print(f"  ✓ Auth request data saved to: {auth_request_file}")
+            with open(auth_request_file, 'wb') as f:
+                json_codec.dump(auth_request_data, f, indent=2)
+            logger.info("  ✓ Auth request data saved to: %s", auth_request_file)
 
         # Save Bearer token separately for easy access (with user suffix if multi-user)
         if bearer_token:
             bearer_token_file = auth_data_dir / f'bearer_token{suffix}.txt'
             with open(bearer_token_file, 'w') as f:
                 f.write(bearer_token)
-            print(f"  ✓ Bearer token saved to: {bearer_token_file}")
+            logger.info("  ✓ Bearer token saved to: %s", bearer_token_file)
 
         # Save combined session data with timestamp (with user suffix if multi-user)
         session_data = {
@@ -450,168 +465,276 @@ class MykiAuthenticator:
             'bearer_token': bearer_token
         }
         session_file = auth_data_dir / f'session{suffix}.json'
-        with open(session_file, 'w') as f:
-            json.dump(session_data, f, indent=2)
-        print(f"  ✓ Complete session saved to: {session_file}")
+        with open(session_file, 'wb') as f:
+            json_codec.dump(session_data, f, indent=2)
+        logger.info("  ✓ Complete session saved to: %s", session_file)
 
         # Also save a timestamped backup (with user suffix if multi-user)
         backup_file = auth_data_dir / f'session{suffix}_{timestamp}.json'
-        with open(backup_file, 'w') as f:
-            json.dump(session_data, f, indent=2)
-        print(f"  ✓ Backup saved to: {backup_file}")
+        with open(backup_file, 'wb') as f:
+            json_codec.dump(session_data, f, indent=2)
+        logger.info("  ✓ Backup saved to: %s", backup_file)
 
-    def authenticate(self) -> Tuple[Optional[Dict], Optional[Dict], Optional[Dict], bool]:
+    def authenticate(
+        self, browser: Optional["WarmBrowser"] = None
+    ) -> Tuple[Optional[Dict], Optional[Dict], Optional[Dict], bool]:
         """Perform full authentication flow.
 
+        Args:
+            browser: Warm browser to log in with (optional). Without one, the
+                    profile is copied and Chrome is launched (and closed) for
+                    this login only.
+
         Returns:
             Tuple of (cookies, headers, auth_request_data, success)
         """
-        print("=" * 60)
-        print("MYKI AUTHENTICATION WITH PROFILE-BASED CLOUDFLARE BYPASS")
-        print("=" * 60)
+        logger.info("=" * 60)
+        logger.info("MYKI AUTHENTICATION WITH PROFILE-BASED CLOUDFLARE BYPASS")
+        logger.info("=" * 60)
+
+        if browser is not None:
+            try:
+                logger.info("")
+                logger.info("1-2. Reusing warm browser...")
+                context = browser.new_session()
+                page = context.new_page()
+                try:
+                    return self._login(context, page)
+                finally:
+                    page.close()
+            except Exception as e:
+                logger.error("")
+                logger.exception("✗ Authentication error: %s", e)
+                # Relaunch on the next login in case the browser is what failed
+                browser.close()
+                return (None, None, None, False)
 
         try:
             # Copy Chrome profile
-            print("\n1. Copying Chrome profile...")
+            logger.info("")
+            logger.info("1. Copying Chrome profile...")
             profile_dir = self.profile_manager.copy_profile()
-            print(f"  ✓ Profile ready: {profile_dir}")
+            logger.info("  ✓ Profile ready: %s", profile_dir)
 
             with sync_playwright() as p:
                 # Launch browser with profile
-                print("\n2. Launching browser with profile...")
+                logger.info("")
+                logger.info("2. Launching browser with profile...")
                 context = self.launch_browser_with_profile(p, profile_dir)
                 page = context.pages[0] if context.pages else context.new_page()
 
                 try:
-                    # Navigate to Myki
-                    print("\n3. Navigating to Myki portal...")
-                    page.goto(self.MYKI_URL, wait_until='domcontentloaded')
-                    print("  ✓ Page loaded")
-
-                    # Wait for Cloudflare Turnstile to complete
-                    print("\n4. Waiting for Cloudflare Turnstile to complete...")
-                    print("   (Invisible Turnstile widget needs time to verify)")
-                    time.sleep(35)  # Give Turnstile time to complete in background
-
-                    cloudflare_cleared = self.check_cloudflare(page, wait_seconds=0)
-
-                    if not cloudflare_cleared:
-                        print("  ⚠ Waiting additional 15 seconds...")
-                        time.sleep(15)
-                        cloudflare_cleared = self.check_cloudflare(page, wait_seconds=0)
-
-                    # Check login form
-                    print("\n5. Verifying login form...")
-                    form_found, form_enabled = self.check_login_form(page)
-
-                    if not form_found or not form_enabled:
-                        # Take screenshot
-                        screenshots_dir = os.getenv('SCREENSHOTS_DIR', 'screenshots')
-                        screenshot_path = os.path.join(screenshots_dir, 'auth_form_not_ready.png')
-                        page.screenshot(path=screenshot_path, full_page=True)
-                        print(f"\n  ✗ Login form not ready. Screenshot: {screenshot_path}")
-                        return (None, None, None, False)
-
-                    # Fill and submit login
-                    print("\n6. Logging in...")
-                    auth_request_data = self.fill_login_form(page)
-
-                    # Display captured auth request
-                    if auth_request_data:
-                        print("\n  → Authentication request captured:")
-                        print(f"     URL: {auth_request_data.get('url', 'N/A')}")
-                        print(f"     Method: {auth_request_data.get('method', 'N/A')}")
-                        if auth_request_data.get('headers'):
-                            print(f"     Headers: {len(auth_request_data['headers'])} headers captured")
-
-                    # Wait for dashboard
-                    print("\n7. Waiting for dashboard...")
-                    dashboard_loaded = self.wait_for_dashboard(page)
-
-                    if not dashboard_loaded:
-                        screenshots_dir = os.getenv('SCREENSHOTS_DIR', 'screenshots')
-                        screenshot_path = os.path.join(screenshots_dir, 'auth_dashboard_failed.png')
-                        page.screenshot(path=screenshot_path, full_page=True)
-                        print(f"\n  ✗ Dashboard not loaded. Screenshot: {screenshot_path}")
-                        return (None, None, None, False)
-
-                    # Extract session data
-                    print("\n8. Extracting session data...")
-                    cookies = self.extract_cookies(context)
-                    headers = self.extract_headers(page)
-
-                    # Success!
-                    print("\n" + "=" * 60)
-                    print("AUTHENTICATION SUCCESSFUL!")
-                    print("=" * 60)
-                    print(f"\nExtracted {len(cookies)} cookies")
-                    print(f"Extracted {len(headers)} headers")
-                    if auth_request_data:
-                        print(f"Captured authentication POST request with {len(auth_request_data.get('headers', {}))} headers")
-
-                    # Save authentication data to files
-                    print("\n9. Saving authentication data to files...")
-                    self.save_auth_data(cookies, headers, auth_request_data)
-
-                    # Take success screenshot
-                    screenshots_dir = os.getenv('SCREENSHOTS_DIR', 'screenshots')
-                    screenshot_path = os.path.join(screenshots_dir, 'auth_success.png')
-                    page.screenshot(path=screenshot_path, full_page=True)
-                    print(f"\nScreenshot saved: {screenshot_path}")
-
-                    # Keep browser open briefly
-                    print("\nKeeping browser open for 5 seconds...")
-                    time.sleep(5)
-
-                    return (cookies, headers, auth_request_data, True)
-
+                    return self._login(context, page)
                 finally:
                     context.close()
 
         except Exception as e:
-            print(f"\n✗ Authentication error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error("")
+            logger.exception("✗ Authentication error: %s", e)
             return (None, None, None, False)
 
         finally:
             # Cleanup profile
             self.profile_manager.cleanup()
 
+    def _login(self, context: BrowserContext, page: Page) -> Tuple[Optional[Dict], Optional[Dict], Optional[Dict], bool]:
+        """Log in on an open page and save the session (steps 3-9 of authenticate)."""
+        # Navigate to Myki
+        logger.info("")
+        logger.info("3. Navigating to Myki portal...")
+        page.goto(self.MYKI_URL, wait_until='domcontentloaded')
+        logger.info("  ✓ Page loaded")
+
+        # Wait for Cloudflare Turnstile to complete
+        logger.info("")
+        logger.info("4. Waiting for Cloudflare Turnstile to complete...")
+        logger.info("   (Invisible Turnstile widget needs time to verify)")
+        time.sleep(35)  # Give Turnstile time to complete in background
+
+        cloudflare_cleared = self.check_cloudflare(page, wait_seconds=0)
+
+        if not cloudflare_cleared:
+            logger.warning("  ⚠ Waiting additional 15 seconds...")
+            time.sleep(15)
+            cloudflare_cleared = self.check_cloudflare(page, wait_seconds=0)
+
+        # Check login form
+        logger.info("")
+        logger.info("5. Verifying login form...")
+        form_found, form_enabled = self.check_login_form(page)
+
+        if not form_found or not form_enabled:
+            # Take screenshot
+            screenshots_dir = os.getenv('SCREENSHOTS_DIR', 'screenshots')
+            screenshot_path = os.path.join(screenshots_dir, 'auth_form_not_ready.png')
+            page.screenshot(path=screenshot_path, full_page=True)
+            logger.error("")
+            logger.error("  ✗ Login form not ready. Screenshot: %s", screenshot_path)
+            return (None, None, None, False)
+
+        # Fill and submit login
+        logger.info("")
+        logger.info("6. Logging in...")
+        auth_request_data = self.fill_login_form(page)
+
+        # Display captured auth request
+        if auth_request_data:
+            logger.info("")
+            logger.info("  → Authentication request captured:")
+            logger.info("     URL: %s", auth_request_data.get('url', 'N/A'))
+            logger.info("     Method: %s", auth_request_data.get('method', 'N/A'))
+            if auth_request_data.get('headers'):
+                logger.info("     Headers: %d headers captured", len(auth_request_data['headers']))
+
+        # Wait for dashboard
+        logger.info("")
+        logger.info("7. Waiting for dashboard...")
+        dashboard_loaded = self.wait_for_dashboard(page)
+
+        if not dashboard_loaded:
+            screenshots_dir = os.getenv('SCREENSHOTS_DIR', 'screenshots')
+            screenshot_path = os.path.join(screenshots_dir, 'auth_dashboard_failed.png')
+            page.screenshot(path=screenshot_path, full_page=True)
+            logger.error("")
+            logger.error("  ✗ Dashboard not loaded. Screenshot: %s", screenshot_path)
+            return (None, None, None, False)
+
+        # Extract session data
+        logger.info("")
+        logger.info("8. Extracting session data...")
+        cookies = self.extract_cookies(context)
+        headers = self.extract_headers(page)
+
+        # Success!
+        logger.info("")
+        logger.info("=" * 60)
+        logger.info("AUTHENTICATION SUCCESSFUL!")
+        logger.info("=" * 60)
+        logger.info("")
+        logger.info("Extracted %d cookies", len(cookies))
+        logger.info("Extracted %d headers", len(headers))
+        if auth_request_data:
+            logger.info("Captured authentication POST request with %s headers", len(auth_request_data.get('headers', {})))
+
+        # Save authentication data to files
+        logger.info("")
+        logger.info("9. Saving authentication data to files...")
+        self.save_auth_data(cookies, headers, auth_request_data)
+
+        # Take success screenshot
+        screenshots_dir = os.getenv('SCREENSHOTS_DIR', 'screenshots')
+        screenshot_path = os.path.join(screenshots_dir, 'auth_success.png')
+        page.screenshot(path=screenshot_path, full_page=True)
+        logger.info("")
+        logger.info("Screenshot saved: %s", screenshot_path)
+
+        # Keep browser open briefly
+        logger.info("")
+        logger.info("Keeping browser open for 5 seconds...")
+        time.sleep(5)
+
+        return (cookies, headers, auth_request_data, True)
+
+
+class WarmBrowser:
+    """Chrome kept running between logins (used by the scheduler daemon).
+
+    The profile is copied and Chrome is launched on first use, then reused by
+    every authenticate(browser=...) call until close(). Each login starts
+    from a fresh Myki session: all cookies except Cloudflare's clearance
+    cookies are cleared, so one user's login never leaks into the next.
+    """
+
+    # Cloudflare trust cookies kept between logins
+    CLOUDFLARE_COOKIES = ("cf_clearance", "__cf_bm")
+
+    def __init__(self):
+        """Initialize without launching (Chrome starts on the first login)."""
+        self.profile_manager = ProfileManager()
+        self._playwright = None
+        self._context: Optional[BrowserContext] = None
+
+    def new_session(self) -> BrowserContext:
+        """Browser context for the next login, launching Chrome if needed."""
+        if self._context is None:
+            logger.info("")
+            logger.info("Launching warm browser...")
+            profile_dir = self.profile_manager.copy_profile()
+            self._playwright = sync_playwright().start()
+            self._context = MykiAuthenticator.launch_browser_with_profile(self._playwright, profile_dir)
+            self._context.on("close", lambda _: self._forget_context())
+        else:
+            keep = "|".join(re.escape(name) for name in self.CLOUDFLARE_COOKIES)
+            self._context.clear_cookies(name=re.compile(f"^(?!(?:{keep})$)"))
+            logger.info("  ✓ Warm browser ready (session cookies cleared)")
+        return self._context
+
+    def _forget_context(self) -> None:
+        """Called when Chrome closes or crashes; the next login relaunches it."""
+        self._context = None
+
+    def close(self) -> None:
+        """Close Chrome, stop Playwright and remove the copied profile."""
+        context, self._context = self._context, None
+        try:
+            if context is not None:
+                context.close()
+        except Exception as e:
+            logger.warning("Warning: Could not close warm browser: %s", e)
+        finally:
+            if self._playwright is not None:
+                self._playwright.stop()
+                self._playwright = None
+            self.profile_manager.cleanup()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+
+def main(browser: Optional[WarmBrowser] = None):
+    """Main entry point.
 
-def main():
-    """Main entry point."""
+    Args:
+        browser: Warm browser to reuse (optional, see WarmBrowser)
+    """
     try:
         authenticator = MykiAuthenticator()
-        cookies, headers, auth_request_data, success = authenticator.authenticate()
+        cookies, headers, auth_request_data, success = authenticator.authenticate(browser)
 
         if success:
-            print("\n" + "=" * 60)
-            print("SESSION DATA READY FOR API CALLS")
-            print("=" * 60)
-            print(f"\nCookies: {list(cookies.keys())}")
-            print(f"Headers: {list(headers.keys())}")
+            logger.info("")
+            logger.info("=" * 60)
+            logger.info("SESSION DATA READY FOR API CALLS")
+            logger.info("=" * 60)
+            logger.info("")
+            logger.info("Cookies: %s", list(cookies.keys()))
+            logger.info("Headers: %s", list(headers.keys()))
 
             if auth_request_data and auth_request_data.get('headers'):
-                print(f"\nAuthentication POST request headers:")
+                logger.info("")
+                logger.info("Authentication POST request headers:")
                 for key, value in auth_request_data['headers'].items():
                     # Don't print full cookie values for security
                     if key.lower() == 'cookie':
-                        print(f"  {key}: [REDACTED]")
+                        logger.info("  %s: [REDACTED]", key)
                     else:
-                        print(f"  {key}: {value}")
+                        logger.info("  %s: %s", key, value)
 
             return 0
         else:
-            print("\n" + "=" * 60)
-            print("AUTHENTICATION FAILED")
-            print("=" * 60)
+            logger.error("")
+            logger.error("=" * 60)
+            logger.error("AUTHENTICATION FAILED")
+            logger.error("=" * 60)
             return 1
 
     except Exception as e:
-        print(f"\nFatal error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.error("")
+        logger.exception("Fatal error: %s", e)
         return 1
 
 
@@ -0,0 +1,186 @@
+"""Compact bitset encoding of the attendance output for Myki Attendance Tracker.
+
+With the bitset encoding, each user's date lists are replaced by a `calendar`
+object holding one base64 bitset per year for each kind of day:
+
+    "calendar": {
+        "attended": {"2025": "AAAAgAE..."},   # attendanceDays + attendanceHistory
+        "manual":   {"2025": "..."},          # manualAttendanceDates
+        "skip":     {"2025": "..."},          # skipDates
+        "working":  {"2025": "..."}           # working days in the statistics period
+    }
+
+Bit (day_of_year - 1) is bit (n % 8) of byte (n // 8), and trailing zero bytes
+are dropped. A year of attended days fits in at most 46 bytes, or 64 base64
+characters, instead of about 13 characters per date. metadata.encoding is set
+to BITSET_ENCODING so readers know to decode. The dashboard's dataFetcher has
+a matching decoder.
+"""
+
+import base64
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+
+from attendance_history import expand_history
+from working_days import WorkingDayCalendar, get_vic_holidays
+
+
+BITSET_ENCODING = "bitset-v1"
+
+# Output encodings accepted by save_output()
+OUTPUT_ENCODINGS = ("json", "bitset")
+
+# Distinct (period, skip dates) combinations whose working-day bitsets are kept
+WORKING_BITSET_CACHE_SIZE = 4096
+
+# calendar key -> user field holding the ISO date list it replaces
+_ENCODED_FIELDS = {
+    "manual": "manualAttendanceDates",
+    "skip": "skipDates",
+}
+
+
+def encode_day_bitsets(days: Iterable[str]) -> Dict[str, str]:
+    """Encode ISO date strings as per-year base64 day-of-year bitsets.
+
+    Args:
+        days: ISO date strings (YYYY-MM-DD); duplicates are ignored
+
+    Returns:
+        Dictionary {year: base64 bitset}, sorted by year
+    """
+    by_year: Dict[int, bytearray] = {}
+    for day in days:
+        day_date = date(int(day[0:4]), int(day[5:7]), int(day[8:10]))
+        index = day_date.timetuple().tm_yday - 1
+        bits = by_year.setdefault(day_date.year, bytearray(46))
+        bits[index // 8] |= 1 << (index % 8)
+
+    return {
+        str(year): base64.b64encode(bytes(bits).rstrip(b"\x00")).decode("ascii")
+        for year, bits in sorted(by_year.items())
+    }
+
+
+def decode_day_bitsets(bitsets: Dict[str, str]) -> List[str]:
+    """Decode per-year base64 day-of-year bitsets back into ISO date strings.
+
+    Args:
+        bitsets: Dictionary {year: base64 bitset} from encode_day_bitsets()
+
+    Returns:
+        Sorted list of ISO date strings (YYYY-MM-DD)
+    """
+    days = []
+    for year in sorted(bitsets or {}, key=int):
+        first_ordinal = date(int(year), 1, 1).toordinal()
+        for byte_index, byte in enumerate(base64.b64decode(bitsets[year])):
+            for bit in range(8):
+                if byte & (1 << bit):
+                    days.append(date.fromordinal(first_ordinal + byte_index * 8 + bit).isoformat())
+    return days
+
+
+@lru_cache(maxsize=WORKING_BITSET_CACHE_SIZE)
+def _working_day_bitsets(period_start: str, period_end: str, skip_dates: Tuple[str, ...]) -> Dict[str, str]:
+    """Encoded working days of a period (cached: users and saves with the same inputs share it)."""
+    try:
+        start_date = datetime.strptime(period_start, '%Y-%m-%d').date()
+        end_date = datetime.strptime(period_end, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        return {}
+
+    calendar = WorkingDayCalendar(
+        start_date, end_date, [datetime.strptime(d, '%Y-%m-%d').date() for d in skip_dates], get_vic_holidays()
+    )
+    return encode_day_bitsets(d.isoformat() for d in calendar.iter_working_days(start_date, end_date))
+
+
+def _working_days(user_data: Dict) -> Dict[str, str]:
+    """Encoded working days in the user's statistics period (empty if no statistics)."""
+    statistics = user_data.get("statistics") or {}
+    period_start, period_end = statistics.get("periodStart"), statistics.get("periodEnd")
+    if period_start is None or period_end is None:
+        return {}
+    skip_dates = tuple(sorted(user_data.get("skipDates", [])))
+    return dict(_working_day_bitsets(period_start, period_end, skip_dates))
+
+
+def encode_user_output(user_data: Dict) -> Dict:
+    """Replace a user's date lists with a bitset calendar.
+
+    Args:
+        user_data: User output dictionary (not modified)
+
+    Returns:
+        New user dictionary with `calendar` instead of attendanceDays,
+        attendanceHistory, manualAttendanceDates and skipDates
+    """
+    attended = expand_history(user_data.get("attendanceHistory") or {})
+    attended.extend(user_data.get("attendanceDays", []))
+
+    calendar = {
+        "attended": encode_day_bitsets(attended),
+        "manual": encode_day_bitsets(user_data.get("manualAttendanceDates", [])),
+        "skip": encode_day_bitsets(user_data.get("skipDates", [])),
+        "working": _working_days(user_data),
+    }
+
+    encoded = {
+        key: value for key, value in user_data.items()
+        if key not in ("attendanceDays", "attendanceHistory") and key not in _ENCODED_FIELDS.values()
+    }
+    encoded["calendar"] = calendar
+    return encoded
+
+
+def decode_user_output(user_data: Dict) -> Dict:
+    """Restore a user's date lists from its bitset calendar.
+
+    Args:
+        user_data: User dictionary produced by encode_user_output() (not modified)
+
+    Returns:
+        New user dictionary with attendanceDays, manualAttendanceDates and
+        skipDates as ISO date lists (closed months are re-compacted on the
+        next update_user_output call)
+    """
+    decoded = {key: value for key, value in user_data.items() if key != "calendar"}
+    calendar = user_data.get("calendar") or {}
+
+    decoded["attendanceDays"] = decode_day_bitsets(calendar.get("attended", {}))
+    for calendar_key, field in _ENCODED_FIELDS.items():
+        decoded[field] = decode_day_bitsets(calendar.get(calendar_key, {}))
+
+    return decoded
+
+
+def encode_output(output_data: Dict) -> Dict:
+    """Encode every user in an output dictionary and mark metadata.encoding."""
+    encoded = {}
+    for key, value in output_data.items():
+        if key == "metadata":
+            encoded[key] = dict(value, encoding=BITSET_ENCODING)
+        else:
+            encoded[key] = encode_user_output(value)
+    return encoded
+
+
+def decode_output(output_data: Dict) -> Dict:
+    """Decode an output dictionary if metadata.encoding says it is bitset-encoded.
+
+    Args:
+        output_data: Output dictionary as loaded from JSON
+
+    Returns:
+        Output dictionary with plain ISO date lists (unchanged if not encoded)
+    """
+    metadata = output_data.get("metadata") or {}
+    if metadata.get("encoding") != BITSET_ENCODING:
+        return output_data
+
+    return {
+        key: value if key == "metadata" else decode_user_output(value)
+        for key, value in output_data.items()
+    }
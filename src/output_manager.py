@@ -3,70 +3,77 @@
 Handles loading existing output, filtering new transactions, updating user data, and saving output.
 """
 
-import json
-from datetime import datetime, timezone, date, timedelta
+import gzip
+import hashlib
+import os
+import stat
+import tempfile
+from datetime import datetime, timezone, date
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-
-from working_days import is_working_day
-
-
-def calculate_statistics(
-    attendance_days: List[str],
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+from urllib.parse import quote
+
+try:
+    import brotli
+except ImportError:  # optional: .br artifacts are skipped without it
+    brotli = None
+
+import json_codec
+from working_days import WorkingDayCalendar
+from attendance_history import compact_days, history_contains, history_day_count, history_bounds
+from output_encoding import (
+    BITSET_ENCODING,
+    OUTPUT_ENCODINGS,
+    encode_output,
+    decode_output,
+    encode_user_output,
+    decode_user_output,
+)
+from output_store import AttendanceStore, STORE_FILENAME
+from transaction_processor import TransactionLike, iter_transaction_records, datetime_to_epoch
+from run_log import get_logger
+
+
+logger = get_logger(__name__)
+
+
+# Bump when the layout of the stored statisticsState changes (forces a full rebuild)
+STATISTICS_STATE_VERSION = 1
+
+
+def _count_by_month(days: Iterable[str]) -> Dict[str, int]:
+    """Count ISO date strings (YYYY-MM-DD) per month key (YYYY-MM)."""
+    counts: Dict[str, int] = {}
+    for day in days:
+        month_key = day[:7]
+        counts[month_key] = counts.get(month_key, 0) + 1
+    return counts
+
+
+def _build_statistics(
+    monthly_working_days: Dict[str, int],
+    monthly_attended: Dict[str, int],
+    days_attended: int,
+    first_attendance: Optional[str],
+    last_attendance: Optional[str],
     start_date: date,
-    end_date: date,
-    skip_dates: List[date],
-    vic_holidays,
-    manual_attendance_dates: List[str] = None
+    end_date: date
 ) -> Dict:
-    """Calculate attendance statistics for a user.
+    """Assemble the statistics dictionary from per-month counters.
 
     Args:
-        attendance_days: List of ISO date strings when user attended (PTV-detected)
+        monthly_working_days: {month_key: working days} for months with working days
+        monthly_attended: {month_key: attended days} (PTV and manual attendance)
+        days_attended: Total attended days (PTV and manual attendance)
+        first_attendance: First PTV attendance day, or None
+        last_attendance: Last PTV attendance day, or None
         start_date: Period start date
         end_date: Period end date
-        skip_dates: Dates to exclude from working days
-        vic_holidays: Melbourne VIC holidays object
-        manual_attendance_dates: List of ISO date strings for manually recorded attendance (optional)
 
     Returns:
         Dictionary containing overall and monthly statistics
-
-    Note:
-        Manual attendance dates are included in total attendance calculations.
     """
-    # Convert attendance days to date objects for easier processing
-    attendance_date_objects = [
-        datetime.strptime(day, '%Y-%m-%d').date() for day in attendance_days
-    ]
-
-    # Convert manual attendance dates to date objects
-    manual_date_objects = []
-    if manual_attendance_dates:
-        manual_date_objects = [
-            datetime.strptime(day, '%Y-%m-%d').date() for day in manual_attendance_dates
-        ]
-
-    # Combine PTV and manual attendance dates for total calculation
-    all_attendance_dates = attendance_date_objects + manual_date_objects
-
-    # Calculate total working days and build monthly working days map
-    total_working_days = 0
-    monthly_working_days = {}  # {month_key: count}
-    current_date = start_date
-
-    while current_date <= end_date:
-        if is_working_day(current_date, skip_dates, vic_holidays):
-            total_working_days += 1
-
-            # Track monthly working days
-            month_key = current_date.strftime('%Y-%m')
-            monthly_working_days[month_key] = monthly_working_days.get(month_key, 0) + 1
-
-        current_date += timedelta(days=1)
-
-    # Calculate attendance stats (include manual attendance in total)
-    days_attended = len(all_attendance_dates)
+    total_working_days = sum(monthly_working_days.values())
     days_missed = max(0, total_working_days - days_attended)
 
     # Calculate overall percentage (avoid division by zero)
@@ -75,23 +82,11 @@ def calculate_statistics(
     else:
         attendance_percentage = 0.0
 
-    # Get first and last attendance dates
-    first_attendance = attendance_days[0] if attendance_days else None
-    last_attendance = attendance_days[-1] if attendance_days else None
-
-    # Calculate monthly statistics (include both PTV and manual attendance)
-    monthly_attendance = {}  # {month_key: [attendance_dates]}
-    for att_date in all_attendance_dates:
-        month_key = att_date.strftime('%Y-%m')
-        if month_key not in monthly_attendance:
-            monthly_attendance[month_key] = []
-        monthly_attendance[month_key].append(att_date)
-
     # Build monthly statistics array
     monthly_stats = []
     for month_key in sorted(monthly_working_days.keys()):
         working_days_in_month = monthly_working_days[month_key]
-        attended_days_in_month = len(monthly_attendance.get(month_key, []))
+        attended_days_in_month = monthly_attended.get(month_key, 0)
         missed_days_in_month = working_days_in_month - attended_days_in_month
 
         # Calculate monthly percentage
@@ -121,6 +116,175 @@ def calculate_statistics(
     }
 
 
+def _monthly_working_days(calendar: WorkingDayCalendar, start_date: date, end_date: date) -> Dict[str, int]:
+    """Working days per month in [start_date, end_date], leaving out months without any."""
+    return {
+        month_key: count
+        for month_key, count in calendar.iter_months(start_date, end_date)
+        if count > 0
+    }
+
+
+def calculate_statistics(
+    attendance_days: List[str],
+    start_date: date,
+    end_date: date,
+    skip_dates: List[date],
+    vic_holidays,
+    manual_attendance_dates: List[str] = None,
+    calendar: Optional[WorkingDayCalendar] = None
+) -> Dict:
+    """Calculate attendance statistics for a user.
+
+    Args:
+        attendance_days: List of ISO date strings when user attended (PTV-detected)
+        start_date: Period start date
+        end_date: Period end date
+        skip_dates: Dates to exclude from working days
+        vic_holidays: Melbourne VIC holidays object
+        manual_attendance_dates: List of ISO date strings for manually recorded attendance (optional)
+        calendar: Precompiled WorkingDayCalendar for the user (optional). When
+                 given, it is used instead of skip_dates/vic_holidays.
+
+    Returns:
+        Dictionary containing overall and monthly statistics
+
+    Note:
+        Manual attendance dates are included in total attendance calculations.
+        Recomputes everything from scratch; update_user_output uses
+        update_statistics() to only touch the months that changed.
+    """
+    manual_attendance_dates = manual_attendance_dates or []
+
+    if calendar is None:
+        calendar = WorkingDayCalendar(start_date, end_date, skip_dates, vic_holidays)
+
+    # Monthly attendance includes both PTV and manual attendance
+    monthly_attended = _count_by_month(attendance_days)
+    for month_key, count in _count_by_month(manual_attendance_dates).items():
+        monthly_attended[month_key] = monthly_attended.get(month_key, 0) + count
+
+    return _build_statistics(
+        monthly_working_days=_monthly_working_days(calendar, start_date, end_date),
+        monthly_attended=monthly_attended,
+        days_attended=len(attendance_days) + len(manual_attendance_dates),
+        first_attendance=attendance_days[0] if attendance_days else None,
+        last_attendance=attendance_days[-1] if attendance_days else None,
+        start_date=start_date,
+        end_date=end_date
+    )
+
+
+def update_statistics(
+    attendance_days: List[str],
+    added_days: List[str],
+    start_date: date,
+    end_date: date,
+    calendar: WorkingDayCalendar,
+    manual_attendance_dates: Optional[List[str]] = None,
+    previous_state: Optional[Dict] = None,
+    attendance_history: Optional[Dict] = None
+) -> Tuple[Dict, Dict]:
+    """Update statistics incrementally from the state stored by the previous run.
+
+    The state keeps per-month working-day and PTV attendance counters plus a
+    fingerprint of the working-day calendar. When the fingerprint still matches
+    (same start date, skip dates and holidays up to the previous period end),
+    only the months from the previous end month onwards are recounted and the
+    newly added days are added to their month counters. Otherwise (config,
+    holidays or period changed, or no usable state) everything is rebuilt.
+
+    Args:
+        attendance_days: Sorted, de-duplicated PTV attendance days (YYYY-MM-DD)
+                        of the open month(s)
+        added_days: PTV days (open or compacted) that were not there in the previous run
+        start_date: Period start date
+        end_date: Period end date
+        calendar: WorkingDayCalendar for the user
+        manual_attendance_dates: List of ISO date strings for manual attendance (optional)
+        previous_state: statisticsState stored by the previous run (optional)
+        attendance_history: Closed-month summaries (attendanceHistory), counted
+                           as PTV attendance alongside attendance_days (optional)
+
+    Returns:
+        Tuple of (statistics, state): the same statistics calculate_statistics()
+        returns, and the state to store for the next run
+    """
+    manual_attendance_dates = manual_attendance_dates or []
+    attendance_history = attendance_history or {}
+    ptv_day_count = len(attendance_days) + history_day_count(attendance_history)
+    state = previous_state if isinstance(previous_state, dict) else {}
+    if state.get("version") != STATISTICS_STATE_VERSION:
+        state = {}
+
+    # Working days per month: reuse closed months if the calendar is unchanged
+    try:
+        previous_end = datetime.strptime(state.get("periodEnd"), '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        previous_end = None
+
+    if (previous_end is not None
+            and state.get("periodStart") == start_date.strftime('%Y-%m-%d')
+            and start_date <= previous_end <= end_date
+            and state.get("fingerprint") == calendar.fingerprint(start_date, previous_end)):
+        reopened_month = previous_end.strftime('%Y-%m')
+        monthly_working_days = {
+            month_key: count
+            for month_key, count in state.get("workingDays", {}).items()
+            if month_key < reopened_month
+        }
+        monthly_working_days.update(
+            _monthly_working_days(calendar, max(start_date, previous_end.replace(day=1)), end_date)
+        )
+    else:
+        monthly_working_days = _monthly_working_days(calendar, start_date, end_date)
+
+    # PTV attendance per month: add the new days if the counters match the stored days
+    previous_attended = state.get("attendedDays")
+    if (isinstance(previous_attended, dict)
+            and state.get("attendanceDayCount") == ptv_day_count - len(added_days)):
+        attended_by_month = dict(previous_attended)
+        for month_key, count in _count_by_month(added_days).items():
+            attended_by_month[month_key] = attended_by_month.get(month_key, 0) + count
+    else:
+        attended_by_month = {month_key: entry["count"] for month_key, entry in attendance_history.items()}
+        for month_key, count in _count_by_month(attendance_days).items():
+            attended_by_month[month_key] = attended_by_month.get(month_key, 0) + count
+
+    # Manual attendance comes from config each run, so it is always counted fresh
+    monthly_attended = dict(attended_by_month)
+    for month_key, count in _count_by_month(manual_attendance_dates).items():
+        monthly_attended[month_key] = monthly_attended.get(month_key, 0) + count
+
+    # First/last PTV attendance across compacted months and open days
+    first_attendance, last_attendance = history_bounds(attendance_history)
+    if attendance_days:
+        first_attendance = min(first_attendance or attendance_days[0], attendance_days[0])
+        last_attendance = max(last_attendance or attendance_days[-1], attendance_days[-1])
+
+    statistics = _build_statistics(
+        monthly_working_days=monthly_working_days,
+        monthly_attended=monthly_attended,
+        days_attended=ptv_day_count + len(manual_attendance_dates),
+        first_attendance=first_attendance,
+        last_attendance=last_attendance,
+        start_date=start_date,
+        end_date=end_date
+    )
+
+    new_state = {
+        "version": STATISTICS_STATE_VERSION,
+        "periodStart": start_date.strftime('%Y-%m-%d'),
+        "periodEnd": end_date.strftime('%Y-%m-%d'),
+        "fingerprint": calendar.fingerprint(start_date, end_date),
+        "workingDays": monthly_working_days,
+        "attendedDays": attended_by_month,
+        "attendanceDayCount": ptv_day_count
+    }
+
+    return statistics, new_state
+
+
 def load_existing_output(output_path: str = "output/attendance.json") -> Dict:
     """Load existing output JSON file for incremental processing.
 
@@ -131,6 +295,7 @@ def load_existing_output(output_path: str = "output/attendance.json") -> Dict:
         Dictionary containing existing output data.
         Returns empty dict {} if file doesn't exist.
         Returns empty dict {} if file contains malformed JSON (logs warning).
+        Bitset-encoded files (see save_output) are decoded back into date lists.
 
     Example:
         >>> existing = load_existing_output()
@@ -141,36 +306,36 @@ def load_existing_output(output_path: str = "output/attendance.json") -> Dict:
 
     # If file doesn't exist, return empty dict (first run)
     if not path.exists():
-        print(f"No existing output file found at: {path.absolute()}")
-        print("This is the first run - will process all transactions")
+        logger.info("No existing output file found at: %s", path.absolute())
+        logger.info("This is the first run - will process all transactions")
         return {}
 
     # File exists - try to load it
     try:
-        with open(path, 'r') as f:
-            output_data = json.load(f)
+        with open(path, 'rb') as f:
+            output_data = decode_output(json_codec.load(f))
 
-        print(f"Loaded existing output from: {path.absolute()}")
+        logger.info("Loaded existing output from: %s", path.absolute())
 
         # Count users in existing output (exclude metadata)
         user_count = len([k for k in output_data.keys() if k != "metadata"])
-        print(f"Found existing data for {user_count} user(s)")
+        logger.info("Found existing data for %s user(s)", user_count)
 
         return output_data
 
-    except json.JSONDecodeError as e:
+    except json_codec.JSONDecodeError as e:
         # Malformed JSON - log warning and return empty dict
-        print(f"WARNING: Existing output file contains malformed JSON: {e}")
-        print(f"  File: {path.absolute()}")
-        print(f"  Error: {e.msg} at position {e.pos}")
-        print("  Returning empty dict - will overwrite file on save")
+        logger.warning("WARNING: Existing output file contains malformed JSON: %s", e)
+        logger.warning("  File: %s", path.absolute())
+        logger.warning("  Error: %s at position %s", e.msg, e.pos)
+        logger.warning("  Returning empty dict - will overwrite file on save")
         return {}
 
     except Exception as e:
         # Other unexpected errors
-        print(f"WARNING: Unexpected error loading existing output: {e}")
-        print(f"  File: {path.absolute()}")
-        print("  Returning empty dict - will overwrite file on save")
+        logger.warning("WARNING: Unexpected error loading existing output: %s", e)
+        logger.warning("  File: %s", path.absolute())
+        logger.warning("  Returning empty dict - will overwrite file on save")
         return {}
 
 
@@ -196,56 +361,61 @@ def get_latest_processed_date(existing_output: Dict, username: str) -> Optional[
     """
     # Check if user exists in output
     if username not in existing_output:
-        print(f"  User '{username}' not found in existing output (new user)")
+        logger.info("  User '%s' not found in existing output (new user)", username)
         return None
 
     user_data = existing_output[username]
 
     # Check if latestProcessedDate field exists
     if "latestProcessedDate" not in user_data:
-        print(f"  No latestProcessedDate for user '{username}' (first run)")
+        logger.info("  No latestProcessedDate for user '%s' (first run)", username)
         return None
 
     latest_date_str = user_data["latestProcessedDate"]
 
     # Check if latestProcessedDate is null/None
     if latest_date_str is None:
-        print(f"  latestProcessedDate is null for user '{username}' (first run)")
+        logger.info("  latestProcessedDate is null for user '%s' (first run)", username)
         return None
 
     # Parse ISO datetime string to datetime object
     try:
         latest_datetime = datetime.fromisoformat(latest_date_str)
-        print(f"  Latest processed date for '{username}': {latest_date_str}")
+        logger.info("  Latest processed date for '%s': %s", username, latest_date_str)
         return latest_datetime
 
     except (ValueError, AttributeError) as e:
-        print(f"  WARNING: Invalid latestProcessedDate format for user '{username}': {latest_date_str}")
-        print(f"  Error: {e}")
-        print(f"  Treating as first run (returning None)")
+        logger.warning("  WARNING: Invalid latestProcessedDate format for user '%s': %s",
+                       username, latest_date_str)
+        logger.warning("  Error: %s", e)
+        logger.warning("  Treating as first run (returning None)")
         return None
 
 
 def filter_new_transactions(
-    transactions: List[Dict[str, Any]],
+    transactions: List[TransactionLike],
     latest_processed_date: Optional[datetime]
-) -> List[Dict[str, Any]]:
+) -> List[TransactionLike]:
     """Filter transactions to only those after latest_processed_date.
 
     Used for incremental processing - only process transactions that haven't
     been seen before. Compares transaction datetime with latest_processed_date.
 
     Args:
-        transactions: List of transaction dictionaries from API
+        transactions: List of transaction dictionaries from API, or
+                     TransactionRecords from normalize_transactions()
         latest_processed_date: datetime object representing latest processed transaction.
                               If None, returns all transactions (first run).
 
     Returns:
-        List of transaction dictionaries where transactionDateTime > latest_processed_date.
+        List of transactions (dicts or records) where transactionDateTime > latest_processed_date.
         If latest_processed_date is None, returns all transactions unchanged.
 
     Note:
         Uses STRICT GREATER THAN (>), not >= to avoid reprocessing the latest transaction.
+        Comparison is by actual instant, so timestamps in different UTC offsets
+        (AEST/AEDT) compare correctly; timestamps without an offset are treated
+        as Melbourne local time.
 
     Example:
         >>> transactions = [
@@ -259,29 +429,33 @@ def filter_new_transactions(
     """
     # First run - no existing processed date
     if latest_processed_date is None:
-        print(f"  No latest processed date - returning all {len(transactions)} transactions (first run)")
+        logger.info("  No latest processed date - returning all %d transactions (first run)", len(transactions))
         return transactions
 
     # Incremental run - filter to only new transactions
+    latest_epoch = datetime_to_epoch(latest_processed_date)
     new_transactions = []
-
-    for txn in transactions:
-        try:
-            txn_datetime_str = txn.get("transactionDateTime", "")
-            txn_datetime = datetime.fromisoformat(txn_datetime_str)
-
-            # Only include transactions AFTER latest processed date
-            # Use strict > to avoid reprocessing the latest transaction
-            if txn_datetime > latest_processed_date:
-                new_transactions.append(txn)
-
-        except (ValueError, AttributeError):
-            # Skip transactions with invalid datetime format
-            print(f"  Warning: Skipping transaction with invalid datetime: {txn.get('transactionDateTime')}")
+    invalid_count = 0
+    first_invalid = None
+
+    for txn, record in iter_transaction_records(transactions):
+        if record is None:
+            # Skip transactions with invalid datetime format (reported once below)
+            if not invalid_count:
+                first_invalid = txn.get("transactionDateTime")
+            invalid_count += 1
             continue
 
-    print(f"  Filtered to {len(new_transactions)} new transactions (after {latest_processed_date.isoformat()})")
-    print(f"  Skipped {len(transactions) - len(new_transactions)} already-processed transactions")
+        # Only include transactions AFTER latest processed date
+        # Use strict > to avoid reprocessing the latest transaction
+        if record.epoch > latest_epoch:
+            new_transactions.append(txn)
+
+    if invalid_count:
+        logger.warning("  Warning: Skipped %d transaction(s) with invalid datetime (first: %r)",
+                       invalid_count, first_invalid)
+    logger.info("  Filtered to %d new transactions (after %s)", len(new_transactions), latest_processed_date.isoformat())
+    logger.info("  Skipped %s already-processed transactions", len(transactions) - len(new_transactions) - invalid_count)
 
     return new_transactions
 
@@ -296,7 +470,9 @@ def update_user_output(
     end_date: Optional[date] = None,
     skip_dates: Optional[List[date]] = None,
     vic_holidays = None,
-    manual_attendance_dates: Optional[List[str]] = None
+    manual_attendance_dates: Optional[List[str]] = None,
+    calendar: Optional[WorkingDayCalendar] = None,
+    compact_before: Optional[date] = None
 ) -> Dict:
     """Update user output with new attendance data and calculate statistics.
 
@@ -314,6 +490,11 @@ def update_user_output(
         end_date: Period end date for statistics calculation (optional)
         skip_dates: Dates to exclude from working days (optional)
         vic_holidays: Melbourne VIC holidays object (optional)
+        manual_attendance_dates: List of ISO date strings for manual attendance (optional)
+        calendar: Precompiled WorkingDayCalendar for the user (optional, reused
+                 for statistics instead of rebuilding one)
+        compact_before: First day of the open month (optional). Attendance days
+                       in earlier months are frozen into attendanceHistory.
 
     Returns:
         Updated output dictionary with merged user data and statistics
@@ -321,9 +502,12 @@ def update_user_output(
     Logic:
         - Merges new_attendance_days with existing attendanceDays (no duplicates)
         - Sorts merged days in chronological order
+        - Moves days of closed months into attendanceHistory summaries
+          (months before compact_before, or already summarized months)
         - Updates latestProcessedDate to max(existing, new)
         - Sets targetStation
-        - Calculates statistics (if date range provided)
+        - Calculates statistics (if date range provided), updating only the
+          months affected since the previous run (see update_statistics)
         - Sets lastUpdated to current ISO timestamp (UTC)
 
     Example:
@@ -351,22 +535,29 @@ def update_user_output(
 
     # Step 1: Merge attendance days (remove duplicates, sort)
     existing_days = user_data.get("attendanceDays", [])
+    existing_history = user_data.get("attendanceHistory") or {}
 
-    # Combine existing and new days
-    all_days = existing_days + new_attendance_days
-
-    # Remove duplicates by converting to set, then back to list
-    unique_days = list(set(all_days))
+    # Days not seen before (drive the incremental statistics update)
+    known_days = set(existing_days)
+    added_days = sorted(
+        day for day in set(new_attendance_days)
+        if day not in known_days and not history_contains(existing_history, day)
+    )
 
-    # Sort in chronological order
-    unique_days.sort()
+    # Only the open (recent) days are held as a list; closed months are summaries
+    unique_days = sorted(known_days.union(added_days))
+    history, unique_days = compact_days(existing_history, unique_days, compact_before)
 
     user_data["attendanceDays"] = unique_days
+    if history:
+        user_data["attendanceHistory"] = history
 
-    print(f"  Merged attendance days for '{username}':")
-    print(f"    Existing: {len(existing_days)} days")
-    print(f"    New: {len(new_attendance_days)} days")
-    print(f"    Total unique: {len(unique_days)} days")
+    logger.info("  Merged attendance days for '%s':", username)
+    logger.info("    Existing: %s days", len(existing_days) + history_day_count(existing_history))
+    logger.info("    New: %d days", len(new_attendance_days))
+    logger.info("    Total unique: %s days", len(unique_days) + history_day_count(history))
+    if len(history) > len(existing_history):
+        logger.debug("    Compacted %s closed month(s) into attendanceHistory", len(history) - len(existing_history))
 
     # Step 2: Update latestProcessedDate (use max of existing and new)
     existing_latest_str = user_data.get("latestProcessedDate")
@@ -396,10 +587,10 @@ def update_user_output(
     # Convert to ISO string
     if new_latest_dt is not None:
         user_data["latestProcessedDate"] = new_latest_dt.isoformat()
-        print(f"    Updated latestProcessedDate: {user_data['latestProcessedDate']}")
+        logger.debug("    Updated latestProcessedDate: %s", user_data['latestProcessedDate'])
     else:
         user_data["latestProcessedDate"] = None
-        print(f"    latestProcessedDate: null (no transactions processed)")
+        logger.debug("    latestProcessedDate: null (no transactions processed)")
 
     # Step 3: Set targetStation
     user_data["targetStation"] = target_station
@@ -407,20 +598,20 @@ def update_user_output(
     # Step 4: Set lastUpdated to current timestamp (ISO format, UTC)
     current_timestamp = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
     user_data["lastUpdated"] = current_timestamp
-    print(f"    Updated lastUpdated: {current_timestamp}")
+    logger.debug("    Updated lastUpdated: %s", current_timestamp)
 
     # Step 5: Add skip dates to output (convert date objects to ISO strings)
     if skip_dates is not None:
         skip_dates_iso = [d.strftime('%Y-%m-%d') for d in skip_dates]
         skip_dates_iso.sort()  # Sort chronologically
         user_data["skipDates"] = skip_dates_iso
-        print(f"    Added {len(skip_dates_iso)} skip dates to output")
+        logger.debug("    Added %d skip dates to output", len(skip_dates_iso))
 
     # Step 5.5: Add manual attendance dates to output (sorted chronologically)
     if manual_attendance_dates is not None and len(manual_attendance_dates) > 0:
         manual_dates_sorted = sorted(manual_attendance_dates)
         user_data["manualAttendanceDates"] = manual_dates_sorted
-        print(f"    Added {len(manual_dates_sorted)} manual attendance dates to output")
+        logger.debug("    Added %d manual attendance dates to output", len(manual_dates_sorted))
     else:
         user_data["manualAttendanceDates"] = []
 
@@ -428,20 +619,25 @@ def update_user_output(
     if start_date is not None and end_date is not None and skip_dates is not None and vic_holidays is not None:
         # Use manual_attendance_dates if provided, otherwise empty list
         manual_dates = manual_attendance_dates if manual_attendance_dates is not None else []
-        statistics = calculate_statistics(
+        if calendar is None:
+            calendar = WorkingDayCalendar(start_date, end_date, skip_dates, vic_holidays)
+        statistics, statistics_state = update_statistics(
             attendance_days=unique_days,
+            added_days=added_days,
             start_date=start_date,
             end_date=end_date,
-            skip_dates=skip_dates,
-            vic_holidays=vic_holidays,
-            manual_attendance_dates=manual_dates
+            calendar=calendar,
+            manual_attendance_dates=manual_dates,
+            previous_state=user_data.get("statisticsState"),
+            attendance_history=history
         )
         user_data["statistics"] = statistics
-        print(f"  Statistics:")
-        print(f"    Total working days: {statistics['totalWorkingDays']}")
-        print(f"    Days attended: {statistics['daysAttended']}")
-        print(f"    Days missed: {statistics['daysMissed']}")
-        print(f"    Attendance rate: {statistics['attendancePercentage']}%")
+        user_data["statisticsState"] = statistics_state
+        logger.info(
+            "  Statistics: %d working day(s), %d attended, %d missed, %s%% attendance",
+            statistics['totalWorkingDays'], statistics['daysAttended'],
+            statistics['daysMissed'], statistics['attendancePercentage']
+        )
 
     # Update the output dictionary
     updated_output[username] = user_data
@@ -449,31 +645,273 @@ def update_user_output(
     return updated_output
 
 
+def _read_config_users(config_path: str) -> Optional[List[str]]:
+    """Read the usernames listed in a config file.
+
+    Args:
+        config_path: Path to config file listing valid users
+
+    Returns:
+        List of usernames, or None if the config file is missing or invalid
+    """
+    try:
+        with open(config_path, 'rb') as f:
+            config = json_codec.load(f)
+    except FileNotFoundError:
+        logger.warning("  Warning: Config file not found at %s, skipping user cleanup", config_path)
+        return None
+    except json_codec.JSONDecodeError:
+        logger.warning("  Warning: Config file is not valid JSON, skipping user cleanup")
+        return None
+
+    # Get user keys from config (handle both 'users' key and root-level users)
+    if 'users' in config:
+        return [k for k in config['users'].keys() if not k.startswith('_')]
+    return [k for k in config.keys() if not k.startswith('_') and k != 'metadata']
+
+
+def _filter_config_users(output_data: Dict, config_path: str, users: Optional[Iterable[str]] = None) -> Dict:
+    """Drop users (and metadata) that are not in the config.
+
+    Args:
+        output_data: Dictionary containing user output data
+        config_path: Path to config file listing valid users (read only if
+                    users is None)
+        users: Usernames to keep, when the caller already has the parsed config
+
+    Returns:
+        Filtered user data; output_data unchanged (metadata included) if the
+        config file is missing or invalid
+    """
+    if users is None:
+        users = _read_config_users(config_path)
+        if users is None:
+            return output_data
+    valid_users = set(users)
+
+    # Filter output_data to only include valid users
+    filtered_output = {}
+    removed_users = []
+
+    for username, user_data in output_data.items():
+        if username == "metadata":
+            continue  # Skip metadata, the caller adds it fresh
+
+        if username in valid_users:
+            filtered_output[username] = user_data
+        else:
+            removed_users.append(username)
+
+    # Log cleanup actions
+    if removed_users:
+        logger.info("  Removed %d user(s) no longer in config: %s", len(removed_users), ', '.join(removed_users))
+
+    return filtered_output
+
+
+def _output_metadata(config_path: str, user_count: int) -> Dict[str, Any]:
+    """Build the metadata section written with the output."""
+    return {
+        "generatedAt": datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        "configPath": config_path,
+        "totalUsers": user_count
+    }
+
+
+# Fields that change on every run without the data changing; left out of content_hash()
+_VOLATILE_METADATA_FIELDS = ("generatedAt", "contentHash")
+_VOLATILE_USER_FIELDS = ("lastUpdated",)
+
+
+def content_hash(output_data: Dict) -> str:
+    """Hash of the output's semantic payload.
+
+    Run timestamps (metadata.generatedAt, each user's lastUpdated) and the
+    stored contentHash itself are ignored, so two saves of the same data give
+    the same hash. Key order does not matter.
+
+    Args:
+        output_data: Output dictionary (metadata plus users) as written to disk
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    payload = {}
+    for key, value in output_data.items():
+        if key == "metadata" and isinstance(value, dict):
+            value = {k: v for k, v in value.items() if k not in _VOLATILE_METADATA_FIELDS}
+        elif isinstance(value, dict):
+            value = {k: v for k, v in value.items() if k not in _VOLATILE_USER_FIELDS}
+        payload[key] = value
+
+    return hashlib.sha256(json_codec.dumps_bytes(payload, sort_keys=True)).hexdigest()
+
+
+def write_atomic(path: Path, content: bytes, fsync: bool = False) -> None:
+    """Write a file atomically: temp file in the same directory, then os.replace().
+
+    Readers (and the next run) see either the old file or the new one, never a
+    partial write. With fsync=True the data and the directory entry are flushed
+    to disk before returning.
+
+    Args:
+        path: Destination file
+        content: Bytes to write
+        fsync: Flush file data and directory entry to disk (slower, crash-safe)
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+
+        # mkstemp creates 0600 files; keep the existing file's mode (or 0644)
+        mode = stat.S_IMODE(path.stat().st_mode) if path.exists() else 0o644
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+    if fsync and hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+# Name of the content-hash file written next to the precompressed artifacts
+VERSION_FILENAME = "version.json"
+
+
+def write_precompressed_artifacts(output_with_metadata: Dict, output_path: str, fsync: bool = False) -> Dict:
+    """Write minified, gzip and brotli copies of the output plus version.json.
+
+    For output/attendance.json this writes, in the same directory:
+    attendance.min.json, attendance.min.json.gz, attendance.min.json.br (only
+    if the optional brotli package is installed) and version.json. Compression
+    is deterministic, so unchanged data gives byte-identical artifacts. Static
+    hosts or CDNs can serve the .gz/.br files directly, e.g. with nginx
+    gzip_static/brotli_static.
+
+    Args:
+        output_with_metadata: Output exactly as written by save_output (metadata included)
+        output_path: Path of the main output file the artifacts sit next to
+        fsync: Flush files to disk before returning (default: False)
+
+    Returns:
+        The version.json content:
+        {
+            "contentHash": "5d41402abc4b2a76...",
+            "generatedAt": "2025-11-01T14:30:00Z",
+            "files": {
+                "json": {"file": "attendance.min.json", "size": 1234, "sha256": "..."},
+                "gzip": {"file": "attendance.min.json.gz", "size": 321, "sha256": "..."},
+                "brotli": {"file": "attendance.min.json.br", "size": 280, "sha256": "..."}
+            }
+        }
+    """
+    path = Path(output_path)
+    minified = json_codec.dumps_bytes(output_with_metadata)
+    base_name = f"{path.stem}.min.json"
+
+    variants = {
+        "json": (base_name, minified),
+        "gzip": (f"{base_name}.gz", gzip.compress(minified, compresslevel=9, mtime=0)),
+    }
+    if brotli is not None:
+        variants["brotli"] = (f"{base_name}.br", brotli.compress(minified, quality=11))
+
+    files = {}
+    for name, (file_name, content) in variants.items():
+        write_atomic(path.parent / file_name, content, fsync=fsync)
+        files[name] = {
+            "file": file_name,
+            "size": len(content),
+            "sha256": hashlib.sha256(content).hexdigest()
+        }
+
+    metadata = output_with_metadata.get("metadata", {})
+    version = {
+        "contentHash": metadata.get("contentHash") or content_hash(output_with_metadata),
+        "generatedAt": metadata.get("generatedAt"),
+        "files": files
+    }
+    write_atomic(path.parent / VERSION_FILENAME, json_codec.dumps_bytes(version, indent=2), fsync=fsync)
+
+    logger.info("  Precompressed artifacts: %s", ", ".join(
+        f"{entry['file']} ({entry['size']} bytes)" for entry in files.values()
+    ))
+    return version
+
+
+def _artifacts_current(output_path: Path, expected_hash: Optional[str]) -> bool:
+    """Check whether version.json next to output_path already describes expected_hash."""
+    try:
+        with open(output_path.parent / VERSION_FILENAME, 'rb') as f:
+            version = json_codec.load(f)
+    except (OSError, json_codec.JSONDecodeError):
+        return False
+
+    return (version.get("contentHash") == expected_hash
+            and all((output_path.parent / entry["file"]).exists() for entry in version.get("files", {}).values())
+            and ("brotli" in version.get("files", {})) == (brotli is not None))
+
+
 def save_output(
     output_data: Dict,
     output_path: str = "output/attendance.json",
-    config_path: str = "config/myki_tracker_config.json"
-) -> None:
+    config_path: str = "config/myki_tracker_config.json",
+    encoding: str = "json",
+    fsync: bool = False,
+    precompress: bool = False,
+    users: Optional[Iterable[str]] = None
+) -> bool:
     """Save output data to JSON file with metadata.
 
     Creates output directory if it doesn't exist. Adds metadata section
-    with generatedAt timestamp, config path, and user count. Writes JSON
-    with proper formatting (indent=2) for human readability.
+    with generatedAt timestamp, config path, user count and content hash.
+    Writes JSON with proper formatting (indent=2) for human readability.
 
     Filters output to only include users that exist in the config file,
     removing any stale user data from previous runs.
 
+    The file is written atomically (temp file + rename), so a crash never
+    leaves a half-written file for load_existing_output(). If the content hash
+    (payload without run timestamps) matches the one in output_data's metadata,
+    as loaded from the existing file, and the file still exists, nothing is
+    written at all, which keeps the git-committed output unchanged.
+
     Args:
         output_data: Dictionary containing user output data
         output_path: Path to output JSON file (default: output/attendance.json)
         config_path: Path to config file used (for metadata)
+        encoding: "json" (default) writes date lists as ISO strings; "bitset"
+                 replaces them with per-year base64 bitsets (see output_encoding)
+        fsync: Flush the file to disk before returning (default: False)
+        precompress: Also write minified/.gz/.br copies and version.json
+                    (see write_precompressed_artifacts, default: False)
+        users: Usernames to keep (default: read them from config_path)
+
+    Returns:
+        True if the file was written, False if the data was unchanged
+
+    Raises:
+        ValueError: If encoding is not one of OUTPUT_ENCODINGS
 
     Output Structure:
         {
             "metadata": {
                 "generatedAt": "2025-11-01T14:30:00Z",
                 "configPath": "config/myki_tracker_config.json",
-                "totalUsers": 1
+                "totalUsers": 1,
+                "contentHash": "5d41402abc4b2a76..."
             },
             "username": {
                 "attendanceDays": ["2025-04-15", "2025-04-16"],
@@ -488,57 +926,46 @@ def save_output(
         >>> save_output(output, "output/attendance.json")
         Saved output to: /path/to/output/attendance.json
     """
-    path = Path(output_path)
-
-    # Create output directory if it doesn't exist
-    path.parent.mkdir(parents=True, exist_ok=True)
-    print(f"\nSaving output to: {path.absolute()}")
+    return _write_output(output_data, output_path, config_path, encoding, fsync, precompress, users)[0]
 
-    # Load config to get list of valid users
-    try:
-        with open(config_path, 'r') as f:
-            config = json.load(f)
-
-        # Get user keys from config (handle both 'users' key and root-level users)
-        if 'users' in config:
-            valid_users = set([k for k in config['users'].keys() if not k.startswith('_')])
-        else:
-            valid_users = set([k for k in config.keys() if not k.startswith('_') and k != 'metadata'])
 
-        # Filter output_data to only include valid users
-        filtered_output = {}
-        removed_users = []
+def _write_output(
+    output_data: Dict,
+    output_path: str,
+    config_path: str,
+    encoding: str,
+    fsync: bool,
+    precompress: bool,
+    users: Optional[Iterable[str]] = None
+) -> Tuple[bool, Dict]:
+    """Implementation of save_output().
 
-        for username, user_data in output_data.items():
-            if username == "metadata":
-                continue  # Skip metadata, we'll add it fresh below
+    Returns:
+        Tuple of (True if the file was written, the saved output with
+        metadata before any bitset encoding)
+    """
+    if encoding not in OUTPUT_ENCODINGS:
+        raise ValueError(f"Unknown output encoding '{encoding}' (expected one of: {', '.join(OUTPUT_ENCODINGS)})")
 
-            if username in valid_users:
-                filtered_output[username] = user_data
-            else:
-                removed_users.append(username)
+    path = Path(output_path)
 
-        # Log cleanup actions
-        if removed_users:
-            print(f"  Removed {len(removed_users)} user(s) no longer in config: {', '.join(removed_users)}")
+    # Create output directory if it doesn't exist
+    path.parent.mkdir(parents=True, exist_ok=True)
+    logger.info("")
+    logger.info("Saving output to: %s", path.absolute())
 
-        output_data = filtered_output
+    # Hash of the data as it was loaded (carried in the loaded metadata)
+    previous_hash = (output_data.get("metadata") or {}).get("contentHash")
 
-    except FileNotFoundError:
-        print(f"  Warning: Config file not found at {config_path}, skipping user cleanup")
-    except json.JSONDecodeError:
-        print(f"  Warning: Config file is not valid JSON, skipping user cleanup")
+    # Only keep users that exist in the config file
+    output_data = _filter_config_users(output_data, config_path, users)
 
     # Count users (exclude metadata key if already present)
     user_count = len([k for k in output_data.keys() if k != "metadata"])
 
     # Add metadata section
     output_with_metadata = {
-        "metadata": {
-            "generatedAt": datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
-            "configPath": config_path,
-            "totalUsers": user_count
-        }
+        "metadata": _output_metadata(config_path, user_count)
     }
 
     # Add all user data (preserve existing order)
@@ -546,17 +973,304 @@ def save_output(
         if username != "metadata":  # Skip metadata if already in output_data
             output_with_metadata[username] = user_data
 
+    # Optional compact encoding of the date lists
+    saved_output = output_with_metadata
+    if encoding == "bitset":
+        output_with_metadata = encode_output(output_with_metadata)
+
+    new_hash = content_hash(output_with_metadata)
+    saved_output["metadata"]["contentHash"] = new_hash
+    if new_hash == previous_hash and path.exists():
+        logger.info("✓ Output unchanged for %s user(s) - skipping write", user_count)
+        logger.info("  File: %s", path.absolute())
+        if precompress and not _artifacts_current(path, new_hash):
+            # Artifacts missing or stale (e.g. precompress just enabled): build from the kept file
+            with open(path, 'rb') as f:
+                write_precompressed_artifacts(json_codec.load(f), str(path), fsync=fsync)
+        return False, saved_output
+    output_with_metadata["metadata"]["contentHash"] = new_hash
+
     # Write JSON with proper formatting (indent=2 for readability)
     try:
-        with open(path, 'w') as f:
-            json.dump(output_with_metadata, f, indent=2)
+        write_atomic(path, json_codec.dumps_bytes(output_with_metadata, indent=2), fsync=fsync)
 
-        print(f"✓ Successfully saved output for {user_count} user(s)")
-        print(f"  File: {path.absolute()}")
-        print(f"  Size: {path.stat().st_size} bytes")
+        logger.info("✓ Successfully saved output for %s user(s)", user_count)
+        logger.info("  File: %s", path.absolute())
+        logger.info("  Size: %s bytes", path.stat().st_size)
+
+        if precompress:
+            write_precompressed_artifacts(output_with_metadata, str(path), fsync=fsync)
+        return True, saved_output
 
     except Exception as e:
-        print(f"✗ ERROR: Failed to save output file")
-        print(f"  File: {path.absolute()}")
-        print(f"  Error: {e}")
+        logger.error("✗ ERROR: Failed to save output file")
+        logger.error("  File: %s", path.absolute())
+        logger.error("  Error: %s", e)
         raise  # Re-raise to allow caller to handle
+
+
+# Output layouts: one attendance.json, index.json plus one file per user, or
+# a SQLite store with attendance.json as its export
+OUTPUT_LAYOUTS = ("single", "sharded", "sqlite")
+
+SHARD_INDEX_FILENAME = "index.json"
+SHARD_DIRNAME = "users"
+
+
+def _shard_file(username: str) -> str:
+    """Shard path (relative to the output directory) for a username."""
+    return f"{SHARD_DIRNAME}/{quote(username, safe='')}.json"
+
+
+def _read_shard_index(index_path: Path) -> Dict:
+    """Read an existing index.json, returning {} if missing or unreadable."""
+    try:
+        with open(index_path, 'rb') as f:
+            index = json_codec.load(f)
+    except (OSError, json_codec.JSONDecodeError):
+        return {}
+    return index if isinstance(index, dict) else {}
+
+
+def save_sharded_output(
+    output_data: Dict,
+    output_dir: str = "output",
+    config_path: str = "config/myki_tracker_config.json",
+    encoding: str = "json",
+    fsync: bool = False,
+    users: Optional[Iterable[str]] = None
+) -> bool:
+    """Save output as one JSON file per user plus an index.json manifest.
+
+    Same user cleanup, encodings and atomic writes as save_output(). A shard
+    is only rewritten when its content hash (ignoring lastUpdated) differs
+    from the one recorded in the previous index, and shards of users no
+    longer in the output are deleted. index.json itself is left untouched if
+    no shard changed. The dashboard loads index.json and then fetches only
+    the selected user.
+
+    Args:
+        output_data: Dictionary containing user output data
+        output_dir: Directory for index.json and the users/ shards (default: output)
+        config_path: Path to config file used (for metadata)
+        encoding: "json" (default) or "bitset" (see save_output)
+        fsync: Flush files to disk before returning (default: False)
+        users: Usernames to keep (default: read them from config_path)
+
+    Returns:
+        True if any file was written or removed, False if nothing changed
+
+    Raises:
+        ValueError: If encoding is not one of OUTPUT_ENCODINGS
+
+    Index Structure:
+        {
+            "metadata": {
+                "generatedAt": "2025-11-01T14:30:00Z",
+                "configPath": "config/myki_tracker_config.json",
+                "totalUsers": 1,
+                "layout": "sharded"
+            },
+            "users": {
+                "koustubh": {
+                    "file": "users/koustubh.json",
+                    "sha256": "9f2c...",        # hash of the shard file bytes
+                    "size": 2048,
+                    "contentHash": "41d0..."    # content_hash() of the user data
+                }
+            }
+        }
+    """
+    if encoding not in OUTPUT_ENCODINGS:
+        raise ValueError(f"Unknown output encoding '{encoding}' (expected one of: {', '.join(OUTPUT_ENCODINGS)})")
+
+    directory = Path(output_dir)
+    index_path = directory / SHARD_INDEX_FILENAME
+    (directory / SHARD_DIRNAME).mkdir(parents=True, exist_ok=True)
+    logger.info("")
+    logger.info("Saving sharded output to: %s", directory.absolute())
+
+    # Only keep users that exist in the config file
+    output_data = _filter_config_users(output_data, config_path, users)
+    users = {username: data for username, data in output_data.items() if username != "metadata"}
+
+    previous_index = _read_shard_index(index_path)
+    previous_entries = previous_index.get("users", {})
+
+    metadata = _output_metadata(config_path, len(users))
+    metadata["layout"] = "sharded"
+    if encoding == "bitset":
+        metadata["encoding"] = BITSET_ENCODING
+
+    entries = {}
+    written = 0
+    try:
+        for username, user_data in users.items():
+            if encoding == "bitset":
+                user_data = encode_user_output(user_data)
+
+            user_hash = content_hash({username: user_data})
+            shard_file = _shard_file(username)
+            previous = previous_entries.get(username)
+            if (isinstance(previous, dict) and previous.get("contentHash") == user_hash
+                    and previous.get("file") == shard_file and (directory / shard_file).exists()):
+                entries[username] = previous  # Unchanged since the last save
+                continue
+
+            content = json_codec.dumps_bytes(user_data, indent=2)
+            entries[username] = {
+                "file": shard_file,
+                "sha256": hashlib.sha256(content).hexdigest(),
+                "size": len(content),
+                "contentHash": user_hash
+            }
+            write_atomic(directory / shard_file, content, fsync=fsync)
+            written += 1
+
+        # Remove shards of users that are no longer in the output (changes the index)
+        for username, entry in previous_entries.items():
+            if username not in entries and isinstance(entry, dict) and "file" in entry:
+                stale_path = directory / entry["file"]
+                if stale_path.exists():
+                    stale_path.unlink()
+                    logger.info("  Removed shard for user no longer in output: %s", username)
+
+        index = {"metadata": metadata, "users": entries}
+        if content_hash(index) == content_hash(previous_index) and index_path.exists():
+            logger.info("✓ Output unchanged for %d user(s) - skipping write", len(users))
+            logger.info("  Index: %s", index_path.absolute())
+            return False
+
+        write_atomic(index_path, json_codec.dumps_bytes(index, indent=2), fsync=fsync)
+
+        logger.info("✓ Successfully saved output for %d user(s)", len(users))
+        logger.info("  Index: %s", index_path.absolute())
+        logger.info("  Shards written: %s (unchanged: %s)", written, len(users) - written)
+        return True
+
+    except Exception as e:
+        logger.error("✗ ERROR: Failed to save sharded output")
+        logger.error("  Directory: %s", directory.absolute())
+        logger.error("  Error: %s", e)
+        raise  # Re-raise to allow caller to handle
+
+
+def load_sharded_output(output_dir: str = "output") -> Dict:
+    """Load output written by save_sharded_output() for incremental processing.
+
+    Args:
+        output_dir: Directory containing index.json and the users/ shards
+
+    Returns:
+        Dictionary in the same shape as load_existing_output() returns
+        (metadata plus one key per user). Returns empty dict {} if index.json
+        doesn't exist or is malformed. Users whose shard is missing, corrupt
+        or doesn't match its recorded hash are left out (logs warning), so
+        they are reprocessed as new users.
+    """
+    directory = Path(output_dir)
+    index_path = directory / SHARD_INDEX_FILENAME
+
+    if not index_path.exists():
+        logger.info("No existing output index found at: %s", index_path.absolute())
+        logger.info("This is the first run - will process all transactions")
+        return {}
+
+    index = _read_shard_index(index_path)
+    if not isinstance(index.get("users"), dict):
+        logger.warning("WARNING: Output index is malformed: %s", index_path.absolute())
+        logger.warning("  Returning empty dict - will overwrite files on save")
+        return {}
+
+    metadata = index.get("metadata") or {}
+    output_data = {"metadata": metadata}
+
+    for username, entry in index["users"].items():
+        shard_path = directory / entry.get("file", _shard_file(username))
+        try:
+            content = shard_path.read_bytes()
+            if hashlib.sha256(content).hexdigest() != entry.get("sha256"):
+                raise ValueError("content hash does not match index")
+            user_data = json_codec.loads(content)
+        except (OSError, ValueError) as e:
+            logger.warning("WARNING: Skipping shard for user '%s': %s", username, e)
+            continue
+
+        if metadata.get("encoding") == BITSET_ENCODING:
+            user_data = decode_user_output(user_data)
+        output_data[username] = user_data
+
+    logger.info("Loaded existing sharded output from: %s", directory.absolute())
+    logger.info("Found existing data for %s user(s)", len(output_data) - 1)
+
+    return output_data
+
+
+def save_sqlite_output(
+    output_data: Dict,
+    output_dir: str = "output",
+    config_path: str = "config/myki_tracker_config.json",
+    encoding: str = "json",
+    fsync: bool = False,
+    precompress: bool = False,
+    users: Optional[Iterable[str]] = None
+) -> bool:
+    """Save output to the SQLite store and export it as attendance.json.
+
+    The store (output/attendance.db, see output_store.AttendanceStore) holds
+    the same users as the JSON export, including metadata.contentHash, so
+    unchanged runs still skip rewriting the JSON file.
+
+    Args:
+        output_data: Dictionary containing user output data
+        output_dir: Directory for attendance.db and attendance.json (default: output)
+        config_path: Path to config file used (for metadata and user cleanup)
+        encoding: Encoding of the JSON export (see save_output)
+        fsync: Flush the store and the export to disk before returning
+        precompress: Also write precompressed copies of the export (see save_output)
+        users: Usernames to keep (default: read them from config_path)
+
+    Returns:
+        True if the JSON export was written, False if the data was unchanged
+    """
+    written, saved_output = _write_output(
+        output_data, os.path.join(output_dir, "attendance.json"), config_path, encoding, fsync, precompress, users
+    )
+
+    with AttendanceStore(os.path.join(output_dir, STORE_FILENAME), fsync=fsync) as store:
+        user_count = store.save_output(saved_output)
+    logger.info("✓ Stored %s user(s) in: %s", user_count, Path(output_dir, STORE_FILENAME).absolute())
+
+    return written
+
+
+def load_sqlite_output(output_dir: str = "output") -> Dict:
+    """Load output from the SQLite store for incremental processing.
+
+    Args:
+        output_dir: Directory containing attendance.db
+
+    Returns:
+        Dictionary in the same shape as load_existing_output() returns.
+        If the store doesn't exist yet (e.g. only the attendance.json export
+        is kept in git), the export is loaded instead and the store is
+        rebuilt from it on the next save. Returns empty dict {} if neither
+        exists.
+    """
+    db_path = Path(output_dir) / STORE_FILENAME
+    export_path = Path(output_dir) / "attendance.json"
+    if not db_path.exists() and export_path.exists():
+        logger.info("No output store found at: %s - loading the JSON export instead", db_path.absolute())
+        return load_existing_output(str(export_path))
+    if not db_path.exists():
+        logger.info("No existing output store found at: %s", db_path.absolute())
+        logger.info("This is the first run - will process all transactions")
+        return {}
+
+    with AttendanceStore(str(db_path)) as store:
+        output_data = store.load_output()
+
+    logger.info("Loaded existing output from store: %s", db_path.absolute())
+    logger.info("Found existing data for %d user(s)", len([k for k in output_data if k != 'metadata']))
+
+    return output_data
@@ -0,0 +1,409 @@
+"""SQLite-backed attendance store for Myki Attendance Tracker.
+
+Holds the same data as the output JSON in indexed tables, so reports can
+query it directly instead of loading and scanning the whole file:
+
+    users            one row per user (station, dates, statistics as JSON,
+                     position in the output)
+    attendance_days  (username, day) for every attended day
+    manual_days      (username, day) for manual attendance dates
+    skip_days        (username, day) for skip dates
+    monthly_stats    (username, month) rows from statistics.monthlyBreakdown
+
+Days are ISO date strings (YYYY-MM-DD) and months are YYYY-MM, so range
+queries use the indexes directly. Closed months held as attendanceHistory
+in the JSON are stored as plain day rows too; users.history_through records
+the last compacted month so load_output() can rebuild the same history.
+
+Example:
+    >>> with AttendanceStore("output/attendance.db") as store:
+    ...     store.users_below(50.0, "2025-05")
+    [('bob', 35.0)]
+"""
+
+import sqlite3
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import json_codec
+from attendance_history import compact_days, expand_history
+from transaction_processor import MELBOURNE_TZ
+
+
+STORE_FILENAME = "attendance.db"
+
+# Bump when the schema changes (stored in PRAGMA user_version)
+STORE_SCHEMA_VERSION = 2
+
+# Schema version -> statements that upgrade a store from the previous version
+_MIGRATIONS = {
+    2: ("ALTER TABLE users ADD COLUMN position INTEGER",),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    target_station TEXT,
+    latest_processed_date TEXT,
+    last_updated TEXT,
+    statistics TEXT,
+    statistics_state TEXT,
+    history_through TEXT,
+    extra TEXT,
+    position INTEGER
+);
+CREATE TABLE IF NOT EXISTS attendance_days (
+    username TEXT NOT NULL REFERENCES users(username) ON DELETE CASCADE,
+    day TEXT NOT NULL,
+    PRIMARY KEY (username, day)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS attendance_days_by_day ON attendance_days(day, username);
+CREATE TABLE IF NOT EXISTS manual_days (
+    username TEXT NOT NULL REFERENCES users(username) ON DELETE CASCADE,
+    day TEXT NOT NULL,
+    PRIMARY KEY (username, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS skip_days (
+    username TEXT NOT NULL REFERENCES users(username) ON DELETE CASCADE,
+    day TEXT NOT NULL,
+    PRIMARY KEY (username, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS monthly_stats (
+    username TEXT NOT NULL REFERENCES users(username) ON DELETE CASCADE,
+    month TEXT NOT NULL,
+    working_days INTEGER NOT NULL,
+    days_attended INTEGER NOT NULL,
+    days_missed INTEGER NOT NULL,
+    attendance_percentage REAL NOT NULL,
+    PRIMARY KEY (username, month)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS monthly_stats_by_month ON monthly_stats(month, attendance_percentage);
+"""
+
+# Table -> user field holding the ISO date list it stores
+_DAY_TABLES = {
+    "manual_days": "manualAttendanceDates",
+    "skip_days": "skipDates",
+}
+
+# User fields with their own columns or tables (anything else goes into `extra`)
+_STORED_FIELDS = {
+    "targetStation", "latestProcessedDate", "lastUpdated", "statistics", "statisticsState",
+    "attendanceDays", "attendanceHistory", "manualAttendanceDates", "skipDates",
+}
+
+_WEEKDAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+
+def _to_json(value) -> Optional[str]:
+    return None if value is None else json_codec.dumps(value)
+
+
+def _from_json(value: Optional[str]):
+    return None if value is None else json_codec.loads(value)
+
+
+def _month_after(month: Optional[str]) -> Optional[date]:
+    """First day of the month after a YYYY-MM key (None for None)."""
+    if month is None:
+        return None
+    year, month_number = int(month[:4]), int(month[5:7])
+    return date(year + month_number // 12, month_number % 12 + 1, 1)
+
+
+class AttendanceStore:
+    """SQLite store for attendance output with reporting queries."""
+
+    def __init__(self, db_path: str = f"output/{STORE_FILENAME}", fsync: bool = False):
+        """Open (or create) the store.
+
+        Args:
+            db_path: Path to the SQLite database file (created if missing)
+            fsync: Use synchronous=FULL so each commit is flushed to disk
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute(f"PRAGMA synchronous = {'FULL' if fsync else 'NORMAL'}")
+
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if not 0 <= version <= STORE_SCHEMA_VERSION:
+            self.conn.close()
+            raise ValueError(
+                f"Unsupported store schema version {version} in {self.db_path} "
+                f"(expected {STORE_SCHEMA_VERSION})"
+            )
+        with self.conn:
+            if version > 0:
+                for upgrade in range(version + 1, STORE_SCHEMA_VERSION + 1):
+                    for statement in _MIGRATIONS[upgrade]:
+                        self.conn.execute(statement)
+            self.conn.executescript(_SCHEMA)
+            self.conn.execute(f"PRAGMA user_version = {STORE_SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
+
+    def __enter__(self) -> "AttendanceStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    # Writing
+
+    def _sync_days(self, table: str, username: str, days) -> None:
+        """Make a user's rows in a day table match days (only the difference is written)."""
+        stored = {row[0] for row in self.conn.execute(
+            f"SELECT day FROM {table} WHERE username = ?", (username,)
+        )}
+        wanted = set(days)
+
+        self.conn.executemany(
+            f"DELETE FROM {table} WHERE username = ? AND day = ?",
+            [(username, day) for day in stored - wanted]
+        )
+        self.conn.executemany(
+            f"INSERT INTO {table} (username, day) VALUES (?, ?)",
+            [(username, day) for day in sorted(wanted - stored)]
+        )
+
+    def _save_user(self, username: str, user_data: Dict, position: int) -> None:
+        """Insert or update one user (at a position in the output) and its day and monthly rows."""
+        extra = {key: value for key, value in user_data.items() if key not in _STORED_FIELDS}
+        history = user_data.get("attendanceHistory") or {}
+        self.conn.execute(
+            """
+            INSERT INTO users (username, target_station, latest_processed_date, last_updated,
+                               statistics, statistics_state, history_through, extra, position)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(username) DO UPDATE SET
+                target_station = excluded.target_station,
+                latest_processed_date = excluded.latest_processed_date,
+                last_updated = excluded.last_updated,
+                statistics = excluded.statistics,
+                statistics_state = excluded.statistics_state,
+                history_through = excluded.history_through,
+                extra = excluded.extra,
+                position = excluded.position
+            """,
+            (
+                username,
+                user_data.get("targetStation"),
+                user_data.get("latestProcessedDate"),
+                user_data.get("lastUpdated"),
+                _to_json(user_data.get("statistics")),
+                _to_json(user_data.get("statisticsState")),
+                max(history) if history else None,
+                _to_json(extra) if extra else None,
+                position,
+            )
+        )
+
+        attended = expand_history(history)
+        attended.extend(user_data.get("attendanceDays", []))
+        self._sync_days("attendance_days", username, attended)
+        for table, field in _DAY_TABLES.items():
+            self._sync_days(table, username, user_data.get(field, []))
+
+        monthly = (user_data.get("statistics") or {}).get("monthlyBreakdown", [])
+        self.conn.execute("DELETE FROM monthly_stats WHERE username = ?", (username,))
+        self.conn.executemany(
+            """
+            INSERT INTO monthly_stats (username, month, working_days, days_attended,
+                                       days_missed, attendance_percentage)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (username, m["month"], m["workingDays"], m["daysAttended"],
+                 m["daysMissed"], m["attendancePercentage"])
+                for m in monthly
+            ]
+        )
+
+    def save_output(self, output_data: Dict) -> int:
+        """Replace the store contents with an output dictionary (in one transaction).
+
+        Users missing from output_data are deleted. Day tables are updated
+        by difference, so a daily run only inserts its new days.
+
+        Args:
+            output_data: Output dictionary (users plus optional metadata)
+
+        Returns:
+            Number of users stored
+        """
+        users = {key: value for key, value in output_data.items()
+                 if key != "metadata" and value is not None}
+
+        with self.conn:
+            stored = {row[0] for row in self.conn.execute("SELECT username FROM users")}
+            self.conn.executemany(
+                "DELETE FROM users WHERE username = ?",
+                [(username,) for username in stored - set(users)]
+            )
+            for position, (username, user_data) in enumerate(users.items()):
+                self._save_user(username, user_data, position)
+
+            self.conn.execute("DELETE FROM metadata")
+            self.conn.executemany(
+                "INSERT INTO metadata (key, value) VALUES (?, ?)",
+                [(key, _to_json(value)) for key, value in (output_data.get("metadata") or {}).items()]
+            )
+
+        return len(users)
+
+    # Reading
+
+    def _days(self, table: str, username: str) -> List[str]:
+        return [row[0] for row in self.conn.execute(
+            f"SELECT day FROM {table} WHERE username = ? ORDER BY day", (username,)
+        )]
+
+    def load_output(self) -> Dict:
+        """Export the store as an output dictionary.
+
+        Returns:
+            Output dictionary (metadata plus one key per user, in the order
+            they were saved). Returns an empty dict {} if the store has no
+            users, matching load_existing_output().
+        """
+        output: Dict = {}
+        rows = self.conn.execute(
+            """
+            SELECT username, target_station, latest_processed_date, last_updated,
+                   statistics, statistics_state, history_through, extra
+            FROM users ORDER BY position, username
+            """
+        ).fetchall()
+
+        for username, station, latest, last_updated, statistics, state, history_through, extra in rows:
+            history, attendance_days = compact_days(
+                {}, self._days("attendance_days", username), _month_after(history_through)
+            )
+            user_data = {
+                "attendanceDays": attendance_days,
+                "manualAttendanceDates": self._days("manual_days", username),
+                "skipDates": self._days("skip_days", username),
+                "latestProcessedDate": latest,
+                "targetStation": station,
+                "lastUpdated": last_updated,
+            }
+            if history:
+                user_data["attendanceHistory"] = history
+            if statistics is not None:
+                user_data["statistics"] = _from_json(statistics)
+            if state is not None:
+                user_data["statisticsState"] = _from_json(state)
+            user_data.update(_from_json(extra) or {})
+            output[username] = user_data
+
+        if not output:
+            return {}
+
+        metadata = {key: _from_json(value) for key, value in self.conn.execute(
+            "SELECT key, value FROM metadata"
+        )}
+        if metadata:
+            output = dict({"metadata": metadata}, **output)
+        return output
+
+    # Queries
+
+    def attendance_between(
+        self,
+        start_date: date,
+        end_date: date,
+        username: Optional[str] = None
+    ) -> List[Tuple[str, str]]:
+        """Attended days within [start_date, end_date].
+
+        Args:
+            start_date: First day (inclusive)
+            end_date: Last day (inclusive)
+            username: Only this user (default: all users)
+
+        Returns:
+            List of (username, ISO date) tuples ordered by day, then username
+        """
+        query = "SELECT username, day FROM attendance_days WHERE day BETWEEN ? AND ?"
+        params: list = [start_date.isoformat(), end_date.isoformat()]
+        if username is not None:
+            query += " AND username = ?"
+            params.append(username)
+        return self.conn.execute(query + " ORDER BY day, username", params).fetchall()
+
+    def users_below(self, threshold: float, month: Optional[str] = None) -> List[Tuple[str, float]]:
+        """Users whose attendance percentage for a month is below threshold.
+
+        Args:
+            threshold: Attendance percentage (0-100)
+            month: Month key YYYY-MM (default: current month in Melbourne)
+
+        Returns:
+            List of (username, attendance percentage) tuples, lowest first
+        """
+        if month is None:
+            month = datetime.now(MELBOURNE_TZ).strftime('%Y-%m')
+        return self.conn.execute(
+            """
+            SELECT username, attendance_percentage FROM monthly_stats
+            WHERE month = ? AND attendance_percentage < ?
+            ORDER BY attendance_percentage, username
+            """,
+            (month, threshold)
+        ).fetchall()
+
+    def weekday_distribution(
+        self,
+        username: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> Dict[str, int]:
+        """Number of attended days per weekday.
+
+        Args:
+            username: Only this user (default: all users)
+            start_date: First day (inclusive, default: no lower bound)
+            end_date: Last day (inclusive, default: no upper bound)
+
+        Returns:
+            Dictionary {weekday name: attended days}, Monday first, with
+            every weekday present
+        """
+        conditions = []
+        params: list = []
+        if username is not None:
+            conditions.append("username = ?")
+            params.append(username)
+        if start_date is not None:
+            conditions.append("day >= ?")
+            params.append(start_date.isoformat())
+        if end_date is not None:
+            conditions.append("day <= ?")
+            params.append(end_date.isoformat())
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        # strftime('%w') is 0 for Sunday; shift so Monday is 0 like date.weekday()
+        rows = self.conn.execute(
+            f"""
+            SELECT (CAST(strftime('%w', day) AS INTEGER) + 6) % 7 AS weekday, COUNT(*)
+            FROM attendance_days {where}
+            GROUP BY weekday
+            """,
+            params
+        ).fetchall()
+
+        distribution = {name: 0 for name in _WEEKDAY_NAMES}
+        for weekday, count in rows:
+            distribution[_WEEKDAY_NAMES[weekday]] = count
+        return distribution
@@ -0,0 +1,278 @@
+"""Process-pool attendance and statistics computation for Myki Attendance Tracker.
+
+Once a user's transactions are fetched, the rest of the pipeline (filtering,
+attendance days, history compaction, statistics) is pure CPU work that only
+reads that user's config and existing output entry. For large user sets,
+run_tracking() fetches every user first, normalises their transactions once
+(the same records feed the columnar export) and then ships one UserTask per
+user to a process pool:
+
+    UserTask(settings, transaction_records, existing_user, compact_before, profile)
+        -> worker: compute_user_output() on {username: existing_user}
+        -> (user_data, captured log, profile stats with --profile)
+
+Results are merged in config order, so the output (and the log, which each
+worker captures and the parent writes out in order) is the same as a serial
+run. Small user sets stay serial: the pool only pays off once its start-up
+and pickling cost is spread over enough users.
+"""
+
+import contextlib
+import io
+import os
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from config_manager import UserSettings
+from output_manager import get_latest_processed_date, filter_new_transactions, update_user_output
+from transaction_batch import (
+    TransactionBatch,
+    use_columnar,
+    filter_new_transactions_batch,
+    filter_transactions_batch,
+    calculate_attendance_days_batch
+)
+from transaction_processor import (
+    TransactionRecord,
+    filter_transactions,
+    calculate_attendance_days,
+    latest_transaction_datetime
+)
+from run_log import get_logger
+from run_profiler import worker_profile
+from working_days import get_vic_holidays, WorkingDayCalendar
+
+
+logger = get_logger(__name__)
+
+
+# Pending users at which run_tracking() switches to the process pool
+DEFAULT_PARALLEL_MIN_USERS = 32
+
+
+def process_workers() -> int:
+    """Worker processes for the statistics stage (MYKI_PROCESS_WORKERS, default 1 = serial).
+
+    0 uses one worker per CPU.
+    """
+    workers = int(os.getenv('MYKI_PROCESS_WORKERS', '1'))
+    if workers == 0:
+        return os.cpu_count() or 1
+    return max(workers, 1)
+
+
+def use_process_pool(user_count: int, workers: int) -> bool:
+    """Decide whether a run has enough users for the process pool.
+
+    Args:
+        user_count: Number of users still to process
+        workers: Worker processes available (1 = serial)
+
+    Returns:
+        True if workers > 1 and user_count reaches the threshold
+        (MYKI_PARALLEL_MIN_USERS environment variable, default 32)
+    """
+    threshold = int(os.getenv('MYKI_PARALLEL_MIN_USERS', DEFAULT_PARALLEL_MIN_USERS))
+    return workers > 1 and user_count >= max(threshold, 1)
+
+
+def compute_user_output(
+    settings: UserSettings,
+    transaction_records: List[TransactionRecord],
+    existing_output: Dict,
+    vic_holidays,
+    compact_before: Optional[date] = None
+) -> Dict:
+    """Turn a user's normalised transactions into their updated output.
+
+    Steps 3-6 of process_user: filter new transactions (incremental
+    processing), filter by station, type and date range, calculate
+    attendance days (working days only) and update the user's output.
+
+    Args:
+        settings: The user's compiled config (see config_manager.compile_user_entry)
+        transaction_records: Fetched transactions (see normalize_transactions)
+        existing_output: Existing output data (only the user's entry is read)
+        vic_holidays: Melbourne VIC holidays object
+        compact_before: Months before this date are compacted into attendanceHistory
+
+    Returns:
+        Updated output dictionary (see update_user_output)
+    """
+    username = settings.username
+    target_station = settings.target_station
+    start_date = settings.start_date
+    end_date = settings.effective_end_date()
+    skip_dates = settings.skip_dates
+
+    # Working-day lookups for this user, shared by attendance and statistics
+    calendar = WorkingDayCalendar(start_date, end_date, skip_dates, vic_holidays)
+
+    # Large backfills run on a columnar batch (same results, vectorised filters)
+    columnar = use_columnar(len(transaction_records))
+    if columnar:
+        logger.info("  Using columnar pipeline for %d transactions", len(transaction_records))
+        transaction_records = TransactionBatch.from_records(transaction_records)
+
+    # Step 3: Get latest processed date and filter new transactions
+    logger.info("")
+    logger.info("Incremental Processing:")
+    latest_processed_date = get_latest_processed_date(existing_output, username)
+    new_filter_function = filter_new_transactions_batch if columnar else filter_new_transactions
+    new_transactions = new_filter_function(transaction_records, latest_processed_date)
+
+    # Step 4: Filter by station, type, and date range
+    logger.info("")
+    logger.info("Filtering Transactions:")
+    filter_function = filter_transactions_batch if columnar else filter_transactions
+    filtered_transactions = filter_function(
+        new_transactions,
+        target_station=target_station,
+        start_date=start_date,
+        end_date=end_date
+    )
+    logger.info("  Filtered to %d relevant transactions", len(filtered_transactions))
+    logger.info("    (Touch off at '%s' within date range)", target_station)
+
+    # Step 5: Calculate attendance days (working days only)
+    logger.info("")
+    logger.info("Calculating Attendance Days:")
+    attendance_function = calculate_attendance_days_batch if columnar else calculate_attendance_days
+    attendance_days = attendance_function(
+        filtered_transactions,
+        skip_dates=skip_dates,
+        vic_holidays=vic_holidays,
+        calendar=calendar
+    )
+    logger.info("  Found %d working day(s) with attendance", len(attendance_days))
+
+    # Determine latest transaction datetime from filtered transactions
+    if columnar:
+        latest_txn_datetime = filtered_transactions.latest_datetime()
+    else:
+        latest_txn_datetime = latest_transaction_datetime(filtered_transactions)
+
+    # Step 6: Update output data for user
+    logger.info("")
+    logger.info("Updating Output:")
+    return update_user_output(
+        existing_output=existing_output,
+        username=username,
+        new_attendance_days=attendance_days,
+        latest_txn_datetime=latest_txn_datetime,
+        target_station=target_station,
+        start_date=start_date,
+        end_date=end_date,
+        skip_dates=skip_dates,
+        vic_holidays=vic_holidays,
+        manual_attendance_dates=settings.manual_attendance_dates,
+        calendar=calendar,
+        compact_before=compact_before
+    )
+
+
+@dataclass
+class UserTask:
+    """Picklable input of one user's statistics computation.
+
+    Attributes:
+        settings: The user's compiled config
+        transaction_records: Fetched transactions, normalised by the parent
+                            (see normalize_transactions)
+        existing_user: User's entry in the existing output (None for a new user)
+        compact_before: Months before this date are compacted (same for all users)
+        profile: Profile the computation and return the stats (--profile)
+    """
+    settings: UserSettings
+    transaction_records: List[TransactionRecord]
+    existing_user: Optional[Dict]
+    compact_before: Optional[date] = None
+    profile: bool = False
+
+
+def _run_task(task: UserTask) -> Tuple[Optional[Dict], str, Optional[Exception], Optional[Dict]]:
+    """Worker entry point: compute one user's output with its log captured.
+
+    Returns:
+        Tuple (user output entry or None, captured log, exception or None,
+        profile for RunProfiler.add_profile() if task.profile, else None)
+    """
+    username = task.settings.username
+    existing_output = {username: task.existing_user} if task.existing_user is not None else {}
+    log = io.StringIO()
+    profile = {} if task.profile else None
+    with contextlib.redirect_stdout(log):
+        try:
+            with worker_profile(profile) if profile is not None else contextlib.nullcontext():
+                updated_output = compute_user_output(
+                    task.settings,
+                    task.transaction_records,
+                    existing_output,
+                    get_vic_holidays(),
+                    compact_before=task.compact_before
+                )
+        except Exception as e:
+            return (None, log.getvalue(), e, profile)
+    return (updated_output[username], log.getvalue(), None, profile)
+
+
+def process_users(
+    tasks: Sequence[UserTask],
+    workers: int = 1,
+    executor: Optional[Executor] = None,
+    profiles: Optional[Dict[str, Dict]] = None
+) -> List[Tuple[str, Optional[Dict], Optional[Exception]]]:
+    """Compute the output of many users in parallel.
+
+    Args:
+        tasks: One UserTask per user
+        workers: Worker processes for the pool created here (ignored with executor)
+        executor: Executor to submit to instead of a new ProcessPoolExecutor
+                 (left running, so callers such as the scheduler can reuse it)
+        profiles: Dictionary that receives {username: worker profile} for
+                 tasks with profile=True (see RunProfiler.add_profile)
+
+    Returns:
+        List of (username, user output entry or None, exception or None), in
+        task order. Each worker's log is printed in the same order.
+
+    Note:
+        One user's failure doesn't affect the others; it is returned, not raised.
+    """
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=max(workers, 1))
+
+    results = []
+    try:
+        futures = [executor.submit(_run_task, task) for task in tasks]
+        for task, future in zip(tasks, futures):
+            username = task.settings.username
+            logger.info("")
+            logger.info("=" * 60)
+            logger.info("Processing user: %s", username)
+            logger.info("=" * 60)
+            try:
+                user_data, log, error, profile = future.result()
+            except Exception as e:  # worker crashed or the result couldn't be pickled
+                user_data, log, error, profile = None, "", e, None
+            sys.stdout.write(log)
+            if profiles is not None and profile is not None:
+                profiles[username] = profile
+
+            if error is None:
+                logger.info("")
+                logger.info("✓ Successfully processed user: %s", username)
+            else:
+                logger.error("")
+                logger.error("✗ ERROR processing user '%s': %s", username, type(error).__name__)
+                logger.error("  Details: %s", error)
+            results.append((username, user_data, error))
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+    return results
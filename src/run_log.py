@@ -0,0 +1,218 @@
+"""Level-controlled run logging for Myki Attendance Tracker.
+
+The workflow (browser authentication, API client, transaction fetch and
+filtering, output updates, the process pool and the tracker CLI) logs
+through loggers under "myki" instead of printing:
+
+    from run_log import get_logger
+    logger = get_logger(__name__)
+
+Settings (environment variables, or the --quiet/--log-json CLI flags):
+    MYKI_LOG_LEVEL    DEBUG, INFO (default), WARNING or ERROR. DEBUG adds a
+                      line per API request and per fetched page.
+    MYKI_LOG_QUIET    1 = WARNING (production runs; same as --quiet)
+    MYKI_LOG_FORMAT   text (default, the usual console output) or json (one
+                      JSON object per line: ts, level, logger, msg)
+    MYKI_LOG_WARNING_LIMIT
+                      Warnings of one kind logged per minute before the rest
+                      are suppressed (default 10, 0 = no limit). The next one
+                      logged reports how many were suppressed. Warnings are
+                      grouped by logger and %-style message template, so
+                      repeatable warnings pass their values as arguments.
+
+Blank separator lines in the console output are logged as empty messages
+(logger.info("")); the JSON format drops them.
+
+Loops that skip many items log one aggregated warning (e.g. "Skipped 120
+transaction(s) with invalid datetime") rather than one line per item.
+Records go to whatever sys.stdout is when they are emitted, so
+contextlib.redirect_stdout() captures them (see processing_pool).
+"""
+
+import logging
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+import json_codec
+
+
+LOGGER_NAME = "myki"
+
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+LOG_FORMATS = ("text", "json")
+
+DEFAULT_WARNING_LIMIT = 10
+WARNING_LIMIT_INTERVAL = 60.0
+
+_configured = False
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """StreamHandler writing to the current sys.stdout (not the one at creation)."""
+
+    def __init__(self):
+        super().__init__(sys.stdout)
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class TextFormatter(logging.Formatter):
+    """The plain console output: just the message."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = record.getMessage()
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            message += f" ({suppressed} similar message(s) suppressed)"
+        if record.exc_info:
+            message += "\n" + self.formatException(record.exc_info)
+        return message
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record: ts, level, logger, msg (plus suppressed, exc)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "msg": record.getMessage().strip(),
+        }
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            entry["suppressed"] = suppressed
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json_codec.dumps(entry)
+
+
+class WarningRateLimiter(logging.Filter):
+    """Drop repeats of the same warning beyond a limit per interval.
+
+    Only WARNING records are limited; errors are always logged.
+
+    Warnings are keyed by logger and message template, so "Skipping %s"
+    with different values counts as one kind of warning. The first warning
+    let through after some were dropped carries their count in `suppressed`.
+    """
+
+    def __init__(self, limit: int = DEFAULT_WARNING_LIMIT, interval: float = WARNING_LIMIT_INTERVAL):
+        super().__init__()
+        self.limit = limit
+        self.interval = interval
+        # (logger, template) -> [window start, logged in window, suppressed]
+        self._windows: Dict[Tuple[str, str], list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.limit <= 0 or record.levelno != logging.WARNING:
+            return True
+
+        now = time.monotonic()
+        window = self._windows.setdefault((record.name, str(record.msg)), [now, 0, 0])
+        if now - window[0] >= self.interval:
+            window[0], window[1] = now, 0
+        if window[1] >= self.limit:
+            window[2] += 1
+            return False
+
+        window[1] += 1
+        if window[2]:
+            record.suppressed = window[2]
+            window[2] = 0
+        return True
+
+
+def _has_message(record: logging.LogRecord) -> bool:
+    """Filter out blank separator lines (JSON output has no use for them)."""
+    return bool(record.getMessage().strip()) or bool(record.exc_info)
+
+
+def _resolve_settings(level: Optional[str], log_format: Optional[str], quiet: bool) -> Tuple[str, str, int]:
+    """Validated (level, format, warning limit) from the arguments and environment."""
+    if quiet or os.getenv('MYKI_LOG_QUIET', '').lower() in ('1', 'true', 'yes'):
+        level = "WARNING"
+    level = (level or os.getenv('MYKI_LOG_LEVEL') or "INFO").upper()
+    log_format = (log_format or os.getenv('MYKI_LOG_FORMAT') or "text").lower()
+    if level not in LOG_LEVELS:
+        raise ValueError(f"Invalid log level '{level}' (expected one of: {', '.join(LOG_LEVELS)})")
+    if log_format not in LOG_FORMATS:
+        raise ValueError(f"Invalid log format '{log_format}' (expected one of: {', '.join(LOG_FORMATS)})")
+    warning_limit = int(os.getenv('MYKI_LOG_WARNING_LIMIT', DEFAULT_WARNING_LIMIT))
+    return level, log_format, warning_limit
+
+
+def _install(level: str, log_format: str, warning_limit: int = DEFAULT_WARNING_LIMIT) -> logging.Logger:
+    """Replace the handler of the "myki" logger."""
+    global _configured
+
+    handler = _StdoutHandler()
+    handler.setFormatter(JsonLinesFormatter() if log_format == "json" else TextFormatter())
+    handler.addFilter(WarningRateLimiter(warning_limit))
+    if log_format == "json":
+        handler.addFilter(_has_message)
+
+    logger = logging.getLogger(LOGGER_NAME)
+    for old_handler in list(logger.handlers):
+        logger.removeHandler(old_handler)
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    logger.propagate = False
+    _configured = True
+    return logger
+
+
+def configure_logging(
+    level: Optional[str] = None,
+    log_format: Optional[str] = None,
+    quiet: bool = False
+) -> logging.Logger:
+    """Set up the "myki" logger (replacing an earlier setup).
+
+    Args:
+        level: Log level name (default: MYKI_LOG_LEVEL, or WARNING with MYKI_LOG_QUIET)
+        log_format: 'text' or 'json' (default: MYKI_LOG_FORMAT)
+        quiet: Only log warnings and errors (overrides level)
+
+    Returns:
+        The "myki" logger
+
+    Raises:
+        ValueError: If the level, format or MYKI_LOG_WARNING_LIMIT is invalid
+
+    Note:
+        The resulting level and format are exported to the environment, so
+        tracker runs started by the workflow and pool workers log the same way.
+    """
+    level, log_format, warning_limit = _resolve_settings(level, log_format, quiet)
+    os.environ['MYKI_LOG_LEVEL'] = level
+    os.environ['MYKI_LOG_FORMAT'] = log_format
+    return _install(level, log_format, warning_limit)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger for a module (myki.<name>).
+
+    Until configure_logging() is called, logging is set up from the
+    environment (falling back to INFO text output if it is invalid).
+
+    Args:
+        name: Module name, usually __name__ (a script is named after its file)
+    """
+    if not _configured:
+        try:
+            _install(*_resolve_settings(None, None, False))
+        except ValueError:
+            _install("INFO", "text")
+    if name == "__main__":
+        name = os.path.splitext(os.path.basename(sys.argv[0]))[0] or name
+    return logging.getLogger(f"{LOGGER_NAME}.{name.rsplit('.', 1)[-1]}")
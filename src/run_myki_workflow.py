@@ -6,8 +6,14 @@ if authentication succeeds. Supports custom config file path.
 Usage:
     python run_myki_workflow.py                              # Use default config
     python run_myki_workflow.py config/custom_config.json   # Use custom config
+    python run_myki_workflow.py config/users.jsonl           # Use a user manifest (.jsonl/.csv)
+    python run_myki_workflow.py --resume                     # Continue an interrupted run
+    python run_myki_workflow.py --profile                    # Write per-phase profiles to output/profile/
+    python run_myki_workflow.py --quiet                      # Only log warnings and errors
+    python run_myki_workflow.py --log-json                   # Log JSON lines (see run_log.py)
 """
 
+import logging
 import sys
 import os
 from pathlib import Path
@@ -16,17 +22,22 @@ from datetime import datetime
 # Add src directory to path to allow imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from myki_auth import main as auth_main
-from myki_attendance_tracker import main as tracker_main
-from config_manager import load_unified_config, validate_user_config, load_user_credentials
+from config_manager import load_tracker_config
 from dotenv import load_dotenv
+from run_log import configure_logging, get_logger
+from run_profiler import profile_scope
+from run_state import AUTH_RESUME_MAX_AGE, RunState
 
 
-def print_header(title, char="=", width=80):
-    """Print a formatted header."""
-    print("\n" + char * width)
-    print(title)
-    print(char * width)
+logger = get_logger(__name__)
+
+
+def print_header(title, char="=", width=80, level=logging.INFO):
+    """Log a formatted header (failure banners use level=logging.ERROR, so --quiet shows them)."""
+    logger.log(level, "")
+    logger.log(level, char * width)
+    logger.log(level, title)
+    logger.log(level, char * width)
 
 
 def validate_unified_config_requirements(config_path):
@@ -36,7 +47,8 @@ def validate_unified_config_requirements(config_path):
         config_path: Path to unified config file
 
     Returns:
-        Tuple of (success: bool, error_message: str or None)
+        Tuple of (config: TrackerConfig or None, error_message: str or None).
+        The config is compiled once here and shared by both phases.
     """
     # Load .env file
     load_dotenv()
@@ -47,34 +59,27 @@ def validate_unified_config_requirements(config_path):
 
     # Check if config file exists
     if not Path(config_path).exists():
-        return False, (
+        return None, (
             f"Config file not found: {config_path}\n"
             f"  Create config file first (see config/myki_config.example.json)"
         )
 
-    print(f"✓ Config file found: {config_path}")
+    logger.info("✓ Config file found: %s", config_path)
 
-    # Try to load and validate unified config
+    # Try to load and validate the config (or manifest) and its credentials
     try:
-        user_config = load_unified_config(config_path)
-        validate_user_config(user_config)
+        config = load_tracker_config(config_path)
     except FileNotFoundError as e:
-        return False, f"Config file error: {str(e)}"
+        return None, f"Config file error: {str(e)}"
     except ValueError as e:
-        return False, f"Config validation error: {str(e)}"
+        return None, f"Config validation error: {str(e)}"
     except Exception as e:
-        return False, f"Config error: {str(e)}"
-
-    # Validate user credentials exist in environment
-    try:
-        user_credentials = load_user_credentials(user_config)
-        print(f"✓ Credentials loaded for {len(user_credentials)} user(s)")
-    except ValueError as e:
-        return False, str(e)
+        return None, f"Config error: {str(e)}"
 
-    print(f"✓ Configuration validated for {len(user_config)} user(s)")
+    logger.info("✓ Credentials loaded for %d user(s)", len(config.credentials))
+    logger.info("✓ Configuration validated for %d user(s)", len(config.usernames))
 
-    return True, None
+    return config, None
 
 
 def run_preflight_checks(config_path):
@@ -84,65 +89,38 @@ def run_preflight_checks(config_path):
         config_path: Path to config file
 
     Returns:
-        bool: True if all checks pass, False otherwise
+        TrackerConfig if all checks pass, None otherwise
     """
     print_header("PRE-FLIGHT VALIDATION")
-    print("Checking unified configuration...")
-    print()
+    logger.info("Checking unified configuration...")
+    logger.info("")
 
     # Validate unified config (covers both Phase 1 auth and Phase 2 tracking)
-    success, error = validate_unified_config_requirements(config_path)
-    if not success:
-        print(f"❌ Configuration validation failed:\n{error}")
-        return False
+    config, error = validate_unified_config_requirements(config_path)
+    if config is None:
+        logger.error("❌ Configuration validation failed:\n%s", error)
+        return None
 
-    print()
-    print("✅ All pre-flight checks passed")
-    print("Ready to proceed with authentication and tracking")
+    logger.info("")
+    logger.info("✅ All pre-flight checks passed")
+    logger.info("Ready to proceed with authentication and tracking")
 
-    return True
+    return config
 
 
-def main():
-    """Run the complete Myki workflow: auth then tracking.
+def authenticate_users(user_config, user_credentials, browser=None, checkpoint=None):
+    """Authenticate every user sequentially (Phase 1), saving one session per user.
+
+    Args:
+        user_config: User config dictionary (TrackerConfig.users, see load_tracker_config)
+        user_credentials: Credentials per user (TrackerConfig.credentials)
+        browser: myki_auth.WarmBrowser to reuse between logins (optional)
+        checkpoint: run_state.RunState (optional). Users authenticated in this
+                   run whose session is still fresh are skipped.
 
     Returns:
-        Exit code: 0 if both phases succeed, 1 if any phase fails
+        List of display names of users whose authentication failed
     """
-    start_time = datetime.now()
-
-    print_header("MYKI WORKFLOW ORCHESTRATOR")
-    print(f"Start time: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
-
-    # Get config path from CLI args if provided
-    config_path = None
-    if len(sys.argv) > 1:
-        config_path = sys.argv[1]
-        print(f"Using config file: {config_path}")
-    else:
-        config_path = "config/myki_config.json"
-        print(f"Using default config file: {config_path}")
-
-    # PRE-FLIGHT VALIDATION: Check all requirements before starting
-    if not run_preflight_checks(config_path):
-        print_header("❌ WORKFLOW ABORTED - Pre-flight checks failed", char="=")
-        print("\nPlease fix the above issues and try again.")
-
-        end_time = datetime.now()
-        duration = end_time - start_time
-        print(f"\nEnd time: {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"Total duration: {duration}")
-
-        return 1
-
-    # Load unified config (validation already done in pre-flight)
-    load_dotenv()
-    user_config = load_unified_config(config_path)
-    user_credentials = load_user_credentials(user_config)
-
-    # Phase 1: Authentication (Multi-User)
-    print_header("PHASE 1: MULTI-USER AUTHENTICATION")
-
     # Save original sys.argv to restore later
     original_argv = sys.argv.copy()
 
@@ -161,9 +139,16 @@ def main():
         myki_password = creds["password"]
         display_name = creds["display_username"]
 
-        print(f"\n{'─' * 80}")
-        print(f"Authenticating: {display_name}")
-        print(f"{'─' * 80}")
+        if checkpoint is not None and checkpoint.completed(config_key, "authenticated", AUTH_RESUME_MAX_AGE):
+            auth_successes.append(display_name)
+            logger.info("")
+            logger.info("  ✓ %s already authenticated in run %s - skipping", display_name, checkpoint.run_id)
+            continue
+
+        logger.info("")
+        logger.info('─' * 80)
+        logger.info("Authenticating: %s", display_name)
+        logger.info('─' * 80)
 
         # Set environment variables for this user
         # Use actual Myki username from credentials (may differ from config key)
@@ -175,109 +160,189 @@ def main():
         sys.argv = [sys.argv[0]]
 
         try:
-            auth_exit_code = auth_main()
+            # Imported here so Playwright is only loaded when authenticating
+            from myki_auth import main as auth_main
+            auth_exit_code = auth_main(browser)
             if auth_exit_code == 0:
                 auth_successes.append(display_name)
-                print(f"  ✓ {display_name} authenticated successfully")
+                if checkpoint is not None:
+                    checkpoint.mark(config_key, "authenticated")
+                logger.info("  ✓ %s authenticated successfully", display_name)
             else:
                 auth_failures.append(display_name)
-                print(f"  ✗ {display_name} authentication failed (exit code {auth_exit_code})")
+                logger.error("  ✗ %s authentication failed (exit code %s)", display_name, auth_exit_code)
         except Exception as e:
             auth_failures.append(display_name)
-            print(f"  ✗ {display_name} authentication error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("  ✗ %s authentication error: %s", display_name, e)
 
     # Restore original sys.argv
     sys.argv = original_argv
 
     # Print authentication summary
-    print(f"\n{'=' * 80}")
-    print(f"Authentication Summary")
-    print(f"{'=' * 80}")
-    print(f"Total users: {len(usernames)}")
-    print(f"  ✓ Successful: {len(auth_successes)}")
-    print(f"  ✗ Failed: {len(auth_failures)}")
+    logger.info("")
+    logger.info("=" * 80)
+    logger.info("Authentication Summary")
+    logger.info("=" * 80)
+    logger.info("Total users: %d", len(usernames))
+    logger.info("  ✓ Successful: %d", len(auth_successes))
+    logger.info("  ✗ Failed: %d", len(auth_failures))
 
     if auth_failures:
-        print(f"\nFailed authentications:")
+        logger.error("")
+        logger.error("Failed authentications:")
         for username in auth_failures:
-            print(f"  - {username}")
+            logger.error("  - %s", username)
+
+    return auth_failures
+
+
+def run_workflow(profiler=None):
+    """Run the complete Myki workflow: auth then tracking.
+
+    Args:
+        profiler: run_profiler.RunProfiler wrapping each phase (optional)
+
+    Returns:
+        Exit code: 0 if both phases succeed, 1 if any phase fails
+    """
+    start_time = datetime.now()
+
+    print_header("MYKI WORKFLOW ORCHESTRATOR")
+    logger.info("Start time: %s", start_time.strftime('%Y-%m-%d %H:%M:%S'))
+
+    # Get config path from CLI args if provided
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    resume = "--resume" in sys.argv[1:]
+    config_path = None
+    if args:
+        config_path = args[0]
+        logger.info("Using config file: %s", config_path)
+    else:
+        config_path = "config/myki_config.json"
+        logger.info("Using default config file: %s", config_path)
+
+    # PRE-FLIGHT VALIDATION: Check all requirements before starting
+    with profile_scope(profiler, "preflight"):
+        config = run_preflight_checks(config_path)
+    if config is None:
+        print_header("❌ WORKFLOW ABORTED - Pre-flight checks failed", char="=", level=logging.ERROR)
+        logger.error("")
+        logger.error("Please fix the above issues and try again.")
+
+        end_time = datetime.now()
+        duration = end_time - start_time
+        logger.info("")
+        logger.info("End time: %s", end_time.strftime('%Y-%m-%d %H:%M:%S'))
+        logger.info("Total duration: %s", duration)
+
+        return 1
+
+    # Config was loaded, validated and compiled once in pre-flight
+    user_config = config.users
+    user_credentials = config.credentials
+
+    # Phase 1: Authentication (Multi-User)
+    print_header("PHASE 1: MULTI-USER AUTHENTICATION")
+
+    # Per-user progress, so a rerun with --resume skips finished work
+    from myki_attendance_tracker import TrackerOptions, report_run, run_tracking
+    options = TrackerOptions.from_env()
+    checkpoint = RunState.open(options.output_dir, resume=resume, fsync=options.fsync)
+
+    with profile_scope(profiler, "phase1-authentication"):
+        auth_failures = authenticate_users(user_config, user_credentials, checkpoint=checkpoint)
 
     # If ANY user failed, abort
     if auth_failures:
-        print_header("❌ WORKFLOW FAILED - Some authentications did not succeed", char="=")
-        print("\nPhase 2 (Attendance Tracking) will NOT run.")
-        print("Please fix authentication issues and try again.")
+        print_header("❌ WORKFLOW FAILED - Some authentications did not succeed", char="=", level=logging.ERROR)
+        logger.error("")
+        logger.error("Phase 2 (Attendance Tracking) will NOT run.")
+        logger.error("Please fix authentication issues and try again.")
 
         end_time = datetime.now()
         duration = end_time - start_time
-        print(f"\nEnd time: {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"Total duration: {duration}")
+        logger.info("")
+        logger.info("End time: %s", end_time.strftime('%Y-%m-%d %H:%M:%S'))
+        logger.info("Total duration: %s", duration)
 
         return 1
 
     print_header("✅ PHASE 1 COMPLETE - All users authenticated successfully")
-    print("\nProceeding to Phase 2...")
+    logger.info("")
+    logger.info("Proceeding to Phase 2...")
 
     # Phase 2: Attendance Tracking
     print_header("PHASE 2: ATTENDANCE TRACKING")
 
-    # Create temporary config file with users section for Phase 2
-    # (Phase 2 doesn't need auth credentials - uses saved session from Phase 1)
-    import tempfile
-    import json
-
-    temp_config_file = None
+    # Phase 2 gets the config already loaded for Phase 1; it doesn't need auth
+    # credentials beyond the card numbers (uses saved session from Phase 1)
     try:
-        # Write users config to temporary file
-        # Note: user_config is already extracted from the "users" section,
-        # so we need to wrap it back in "users" for load_unified_config() to work
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump({"users": user_config}, f, indent=2)
-            temp_config_file = f.name
-
-        print(f"Created temporary config for Phase 2: {temp_config_file}")
-
-        # Set up sys.argv for tracker_main with temp config
-        sys.argv = [sys.argv[0], temp_config_file]
-
-        tracker_exit_code = tracker_main()
+        with profile_scope(profiler, "phase2-tracking"):
+            result = run_tracking(config, options=options, checkpoint=checkpoint, profiler=profiler)
+        tracker_exit_code = report_run(result)
     except Exception as e:
-        print(f"\n❌ ATTENDANCE TRACKING ERROR: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.error("")
+        logger.exception("❌ ATTENDANCE TRACKING ERROR: %s", e)
         tracker_exit_code = 1
-    finally:
-        # Clean up temporary config file
-        if temp_config_file and Path(temp_config_file).exists():
-            os.unlink(temp_config_file)
-
-        # Restore original sys.argv
-        sys.argv = original_argv
 
     # Print final summary
     end_time = datetime.now()
     duration = end_time - start_time
 
     if tracker_exit_code != 0:
-        print_header("⚠️  WORKFLOW COMPLETED WITH ERRORS")
-        print("\nPhase 1 (Authentication): ✅ Success")
-        print("Phase 2 (Attendance Tracking): ❌ Failed")
-        print(f"\nEnd time: {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"Total duration: {duration}")
+        print_header("⚠️  WORKFLOW COMPLETED WITH ERRORS", level=logging.ERROR)
+        logger.info("")
+        logger.info("Phase 1 (Authentication): ✅ Success")
+        logger.error("Phase 2 (Attendance Tracking): ❌ Failed")
+        logger.info("")
+        logger.info("End time: %s", end_time.strftime('%Y-%m-%d %H:%M:%S'))
+        logger.info("Total duration: %s", duration)
         return 1
 
     # Success!
     print_header("✅ WORKFLOW COMPLETE - All phases successful")
-    print("\nPhase 1 (Authentication): ✅ Success")
-    print("Phase 2 (Attendance Tracking): ✅ Success")
-    print(f"\nEnd time: {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"Total duration: {duration}")
+    logger.info("")
+    logger.info("Phase 1 (Authentication): ✅ Success")
+    logger.info("Phase 2 (Attendance Tracking): ✅ Success")
+    logger.info("")
+    logger.info("End time: %s", end_time.strftime('%Y-%m-%d %H:%M:%S'))
+    logger.info("Total duration: %s", duration)
 
     return 0
 
 
+def main():
+    """CLI entry point: run the workflow, profiled with --profile.
+
+    --quiet and --log-json set up logging for both phases (see run_log).
+
+    Returns:
+        Exit code: 0 if both phases succeed, 1 if any phase fails
+    """
+    # .env may set MYKI_LOG_* too, so load it before logging is set up
+    load_dotenv()
+    try:
+        configure_logging(
+            log_format="json" if "--log-json" in sys.argv[1:] else None,
+            quiet="--quiet" in sys.argv[1:]
+        )
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    profiler = None
+    if "--profile" in sys.argv[1:]:
+        from myki_attendance_tracker import TrackerOptions
+        from run_profiler import RunProfiler
+        profiler = RunProfiler(TrackerOptions.from_env().output_dir)
+
+    try:
+        return run_workflow(profiler)
+    finally:
+        if profiler is not None:
+            profiler.close()
+
+
 if __name__ == '__main__':
     exit_code = main()
     sys.exit(exit_code)
@@ -0,0 +1,250 @@
+"""Opt-in per-phase profiling for Myki workflow runs (--profile).
+
+With --profile, each phase of a run and each user's process_user call is
+wrapped in a profiling scope. Every scope writes into a run-scoped directory
+output/profile/<run id>/:
+
+    003-user-koustubh.pstats   cProfile data (python -m pstats, snakeviz, ...)
+    003-user-koustubh.txt      Top functions by cumulative and own time and
+                               peak traced memory
+    summary.json               Wall time, peak memory and files per scope
+
+Scopes nest: a phase's profile includes the users processed inside it.
+Outermost scopes (phases) also list the top allocation sites by growth;
+tracemalloc snapshots are too slow to take for every user. Users computed in
+the process pool are profiled inside the worker (worker_profile) and written
+by the parent with add_profile(), nested in the enclosing scope.
+Without --profile no profiler exists and callers use profile_scope(None, ...),
+which is a no-op context manager: cProfile, pstats and tracemalloc are not
+even imported.
+"""
+
+import contextlib
+import io
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import quote
+
+import json_codec
+from event_log import new_run_id
+from run_log import get_logger
+
+
+logger = get_logger(__name__)
+
+
+PROFILE_DIRNAME = "profile"
+
+# Functions and allocation sites listed in each text report
+DEFAULT_TOP_N = 30
+
+
+class _Scope:
+    """One active profiling scope."""
+
+    def __init__(self, name: str, seq: int):
+        import cProfile
+
+        self.name = name
+        self.seq = seq
+        self.profile = cProfile.Profile()
+        # Profiles of all nested scopes (children, grandchildren, ...)
+        self.children: List["cProfile.Profile"] = []
+        self.peak = 0
+        self.start_memory = 0
+        self.start_snapshot = None
+        self.start_time = 0.0
+
+
+class _RecordedProfile:
+    """cProfile stats recorded in another process, in the shape pstats.Stats loads."""
+
+    def __init__(self, stats: Dict):
+        self._recorded = stats
+        self.stats: Dict = {}
+
+    def create_stats(self) -> None:
+        # pstats.Stats takes `stats` and clears it, so hand out a copy each time
+        self.stats = dict(self._recorded)
+
+
+class RunProfiler:
+    """Writes cProfile and tracemalloc reports per scope into one run directory."""
+
+    def __init__(self, output_dir: str = "output", run_id: Optional[str] = None, top_n: int = DEFAULT_TOP_N):
+        """Create the run's profile directory.
+
+        Args:
+            output_dir: Output directory holding profile/
+            run_id: Directory name (default: a new run id)
+            top_n: Functions and allocation sites listed per report
+        """
+        self.run_id = run_id or new_run_id()
+        self.profile_dir = Path(output_dir) / PROFILE_DIRNAME / self.run_id
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        self.top_n = top_n
+        self.scopes: List[Dict] = []
+        self._stack: List[_Scope] = []
+        self._started = 0
+        self._started_tracemalloc = False
+
+    def _update_peaks(self) -> None:
+        """Fold the traced peak since the last transition into every open scope."""
+        import tracemalloc
+
+        peak = tracemalloc.get_traced_memory()[1]
+        for scope in self._stack:
+            scope.peak = max(scope.peak, peak)
+        tracemalloc.reset_peak()
+
+    @contextlib.contextmanager
+    def scope(self, name: str):
+        """Profile the code inside the with block as one scope.
+
+        Only one cProfile profiler can be active, so an enclosing scope is
+        paused while a nested one runs and gets its stats (including those of
+        scopes nested deeper still) added at the end.
+        """
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+        self._started += 1
+        scope = _Scope(name, self._started)
+        parent = self._stack[-1] if self._stack else None
+        if parent is not None:
+            parent.profile.disable()
+        self._update_peaks()
+        self._stack.append(scope)
+
+        scope.start_memory = tracemalloc.get_traced_memory()[0]
+        if parent is None:
+            scope.start_snapshot = tracemalloc.take_snapshot()
+        scope.start_time = time.perf_counter()
+        scope.profile.enable()
+        try:
+            yield
+        finally:
+            scope.profile.disable()
+            elapsed = time.perf_counter() - scope.start_time
+            self._update_peaks()
+            self._stack.pop()
+            self._write(scope, elapsed)
+            if parent is not None:
+                parent.children.append(scope.profile)
+                parent.children.extend(scope.children)
+                parent.profile.enable()
+
+    def add_profile(self, name: str, stats: Dict, seconds: float, peak: int = 0) -> None:
+        """Write a scope profiled elsewhere (see worker_profile) as if it had run here.
+
+        The stats are also added to the enclosing scope, if any.
+
+        Args:
+            name: Scope name
+            stats: cProfile stats dictionary (Profile.stats after create_stats())
+            seconds: Wall time of the scope
+            peak: Peak traced memory in bytes (0 if unknown)
+        """
+        parent = self._stack[-1] if self._stack else None
+        if parent is not None:
+            parent.profile.disable()
+
+        self._started += 1
+        scope = _Scope(name, self._started)
+        scope.profile = _RecordedProfile(stats)
+        scope.peak = peak
+        self._write(scope, seconds)
+
+        if parent is not None:
+            parent.children.append(scope.profile)
+            parent.profile.enable()
+
+    def _write(self, scope: _Scope, elapsed: float) -> None:
+        """Write a scope's .pstats file and text report."""
+        import pstats
+        import tracemalloc
+
+        stem = f"{scope.seq:03d}-{quote(scope.name, safe='')}"
+
+        report = io.StringIO()
+        stats = pstats.Stats(scope.profile, stream=report)
+        for child in scope.children:
+            stats.add(child)
+        stats.dump_stats(str(self.profile_dir / f"{stem}.pstats"))
+
+        report.write(f"Scope: {scope.name}\n")
+        report.write(f"Wall time: {elapsed:.3f}s\n")
+        report.write(f"Traced memory: {scope.start_memory / 2 ** 20:.1f} MiB at start, "
+                     f"{scope.peak / 2 ** 20:.1f} MiB peak\n")
+
+        for sort_key in ("cumulative", "tottime"):
+            report.write(f"\nTop {self.top_n} functions by {sort_key}:\n")
+            stats.sort_stats(sort_key).print_stats(self.top_n)
+
+        if scope.start_snapshot is not None:
+            growth = tracemalloc.take_snapshot().compare_to(scope.start_snapshot, 'lineno')
+            report.write(f"\nTop {self.top_n} allocation sites by growth:\n")
+            for stat in growth[:self.top_n]:
+                report.write(f"  {stat}\n")
+
+        (self.profile_dir / f"{stem}.txt").write_text(report.getvalue(), encoding='utf-8')
+        self.scopes.append({
+            "scope": scope.name,
+            "seconds": round(elapsed, 6),
+            "peakTracedBytes": scope.peak,
+            "pstats": f"{stem}.pstats",
+            "report": f"{stem}.txt",
+        })
+
+    def close(self) -> None:
+        """Write summary.json and stop tracemalloc if this profiler started it."""
+        import tracemalloc
+
+        summary = {"runId": self.run_id, "scopes": self.scopes}
+        (self.profile_dir / "summary.json").write_bytes(json_codec.dumps_bytes(summary, indent=2))
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        logger.info("")
+        logger.info("Profile written to %s (%d scope(s))", self.profile_dir, len(self.scopes))
+
+
+@contextlib.contextmanager
+def worker_profile(result: Dict):
+    """Profile the with block in a pool worker for RunProfiler.add_profile().
+
+    Args:
+        result: Dictionary that receives the picklable keyword arguments of
+               add_profile(): stats, seconds and peak (traced memory, only
+               measured if tracemalloc was not already running)
+    """
+    import cProfile
+    import tracemalloc
+
+    started_tracemalloc = not tracemalloc.is_tracing()
+    if started_tracemalloc:
+        tracemalloc.start()
+    profile = cProfile.Profile()
+    start_time = time.perf_counter()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        result["seconds"] = time.perf_counter() - start_time
+        result["peak"] = tracemalloc.get_traced_memory()[1] if started_tracemalloc else 0
+        if started_tracemalloc:
+            tracemalloc.stop()
+        profile.create_stats()
+        result["stats"] = profile.stats
+
+
+def profile_scope(profiler: Optional[RunProfiler], name: str):
+    """profiler.scope(name), or a no-op context manager when profiling is off."""
+    if profiler is None:
+        return contextlib.nullcontext()
+    return profiler.scope(name)
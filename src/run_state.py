@@ -0,0 +1,175 @@
+"""Per-user run checkpoints for resumable Myki workflow runs.
+
+A run records when each user finishes each stage in
+output/.run_state/state.json:
+
+    {
+        "runId": "20250502T074500Z-1a2b3c4d",
+        "startedAt": "2025-05-02T07:45:00Z",
+        "users": {
+            "koustubh": {"authenticated": "2025-05-02T07:46:10Z",
+                         "fetched": "2025-05-02T07:52:31Z",
+                         "processed": "2025-05-02T07:52:32Z"}
+        }
+    }
+
+Stages:
+    authenticated  Session saved by Phase 1 (reused on resume while still fresh)
+    fetched        Transactions fetched; cached in .run_state/transactions/
+    processed      User output computed; cached in .run_state/users/
+
+With --resume, a run continues the previous checkpoint, skips completed
+work and merges the cached user output into the output it saves. The full
+output is only written at the end of a run. The checkpoint is removed once a
+run finishes without failures.
+"""
+
+import shutil
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import quote
+
+import json_codec
+from event_log import new_run_id
+from output_manager import write_atomic
+from run_log import get_logger
+
+
+logger = get_logger(__name__)
+
+
+RUN_STATE_DIRNAME = ".run_state"
+STATE_FILENAME = "state.json"
+
+STAGES = ("authenticated", "fetched", "processed")
+
+# Sessions are valid for about 20 minutes; older logins are redone on resume
+AUTH_RESUME_MAX_AGE = timedelta(minutes=15)
+
+_TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime(_TIMESTAMP_FORMAT)
+
+
+class RunState:
+    """Checkpoint of one workflow run, persisted after every completed stage."""
+
+    def __init__(self, state_dir: str, state: Dict, fsync: bool = False):
+        """Wrap a loaded or new checkpoint (use RunState.open)."""
+        self.state_dir = Path(state_dir)
+        self.state = state
+        self.fsync = fsync
+
+    @classmethod
+    def open(cls, output_dir: str = "output", resume: bool = False, fsync: bool = False) -> "RunState":
+        """Start a new run, or continue the previous one.
+
+        Args:
+            output_dir: Output directory holding .run_state/
+            resume: Continue the previous checkpoint if there is one
+            fsync: Flush the checkpoint to disk after every update
+
+        Returns:
+            RunState (a new run if resume is False or nothing can be resumed)
+        """
+        state_dir = Path(output_dir) / RUN_STATE_DIRNAME
+        state_path = state_dir / STATE_FILENAME
+
+        if resume:
+            try:
+                with open(state_path, 'rb') as f:
+                    state = json_codec.load(f)
+                run_state = cls(str(state_dir), state, fsync)
+                logger.info("Resuming run %s (%s)", state['runId'], run_state.summary())
+                return run_state
+            except FileNotFoundError:
+                logger.info("No interrupted run to resume - starting a new run")
+            except (json_codec.JSONDecodeError, KeyError) as e:
+                logger.warning("WARNING: Ignoring unreadable checkpoint %s: %s", state_path, e)
+
+        # A new run: drop the previous checkpoint and its cached transactions
+        shutil.rmtree(state_dir, ignore_errors=True)
+        run_state = cls(str(state_dir), {"runId": new_run_id(), "startedAt": _now(), "users": {}}, fsync)
+        run_state._save()
+        return run_state
+
+    @property
+    def run_id(self) -> str:
+        return self.state["runId"]
+
+    def _write(self, path: Path, content: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(path, content, fsync=self.fsync)
+
+    def _save(self) -> None:
+        self._write(self.state_dir / STATE_FILENAME, json_codec.dumps_bytes(self.state, indent=2))
+
+    def completed(self, username: str, stage: str, max_age: Optional[timedelta] = None) -> bool:
+        """Check whether a user finished a stage in this run (at most max_age ago, if given)."""
+        finished_at = self.state["users"].get(username, {}).get(stage)
+        if finished_at is None:
+            return False
+        if max_age is None:
+            return True
+        finished = datetime.strptime(finished_at, _TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+        return datetime.now(timezone.utc) - finished <= max_age
+
+    def mark(self, username: str, stage: str) -> None:
+        """Record that a user finished a stage and persist the checkpoint.
+
+        Raises:
+            ValueError: If stage is not one of STAGES
+        """
+        if stage not in STAGES:
+            raise ValueError(f"Unknown run stage '{stage}' (expected one of: {', '.join(STAGES)})")
+        self.state["users"].setdefault(username, {})[stage] = _now()
+        self._save()
+
+    def _transactions_path(self, username: str) -> Path:
+        return self.state_dir / "transactions" / f"{quote(username, safe='')}.json"
+
+    def save_transactions(self, username: str, transactions: List[Dict]) -> None:
+        """Cache a user's fetched transactions and mark the user as fetched."""
+        self._write(self._transactions_path(username), json_codec.dumps_bytes(transactions))
+        self.mark(username, "fetched")
+
+    def load_transactions(self, username: str) -> Optional[List[Dict]]:
+        """Cached transactions of a user fetched in this run (None if not fetched)."""
+        if not self.completed(username, "fetched"):
+            return None
+        try:
+            with open(self._transactions_path(username), 'rb') as f:
+                return json_codec.load(f)
+        except (OSError, json_codec.JSONDecodeError):
+            return None
+
+    def _user_path(self, username: str) -> Path:
+        return self.state_dir / "users" / f"{quote(username, safe='')}.json"
+
+    def save_user_output(self, username: str, user_data: Dict) -> None:
+        """Cache a user's computed output and mark the user as processed."""
+        self._write(self._user_path(username), json_codec.dumps_bytes(user_data))
+        self.mark(username, "processed")
+
+    def load_user_output(self, username: str) -> Optional[Dict]:
+        """Cached output of a user processed in this run (None if not processed)."""
+        if not self.completed(username, "processed"):
+            return None
+        try:
+            with open(self._user_path(username), 'rb') as f:
+                return json_codec.load(f)
+        except (OSError, json_codec.JSONDecodeError):
+            return None
+
+    def summary(self) -> str:
+        """Number of users per completed stage, e.g. "3 authenticated, 1 fetched, 1 processed"."""
+        users = self.state["users"].values()
+        return ", ".join(f"{sum(1 for u in users if stage in u)} {stage}" for stage in STAGES)
+
+    def finish(self) -> None:
+        """Remove the checkpoint after a run that completed without failures."""
+        shutil.rmtree(self.state_dir, ignore_errors=True)
+        logger.info("Run %s complete - checkpoint removed", self.run_id)
@@ -0,0 +1,480 @@
+"""Long-running scheduler daemon for the Myki workflow.
+
+Instead of starting a fresh container (Python, Xvfb, Chrome, config, holidays)
+for every run, the daemon stays resident and runs the workflow (Phase 1
+authentication, then Phase 2 tracking) on an interval or a cron expression.
+Between cycles it keeps:
+
+- the parsed config and credentials, re-read only when the config file's
+  mtime changes
+- the VIC holiday calendar (loaded once per process)
+- one requests.Session per user, so API connections are pooled
+- the statistics process pool, once there are enough users for it
+  (MYKI_PROCESS_WORKERS, see processing_pool)
+- optionally a warm Chrome (--warm-browser), launched on the first login
+
+With --tracker-only, users without a saved session are skipped and reported
+(skippedUsers in the status file); the other users are still tracked.
+
+After every cycle it writes a status file (default:
+output/scheduler_status.json) that the health check reads.
+
+Usage:
+    python src/scheduler.py config/myki_config.json --interval 3600
+    python src/scheduler.py config/myki_config.json --cron "30 19 * * 1-5" --warm-browser
+    python src/scheduler.py --health                     # exit 0 if the daemon is healthy
+
+Cron expressions have the usual five fields (minute hour day-of-month month
+day-of-week) with *, lists, ranges and steps, evaluated in Melbourne time.
+Environment defaults: SCHEDULER_INTERVAL, SCHEDULER_CRON,
+SCHEDULER_WARM_BROWSER=1, SCHEDULER_STATUS_FILE.
+"""
+
+import argparse
+import os
+import signal
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+import json_codec
+from config_manager import TrackerConfig, load_tracker_config
+from myki_api_client import MykiAPIClient
+from myki_attendance_tracker import TrackerOptions, report_run, run_tracking
+from output_manager import write_atomic
+from processing_pool import use_process_pool
+from run_log import configure_logging, get_logger
+from run_myki_workflow import authenticate_users, print_header
+from transaction_processor import MELBOURNE_TZ
+
+
+logger = get_logger(__name__)
+
+
+STATUS_FILENAME = "scheduler_status.json"
+
+# Default for --max-delay: how late a scheduled run may be before the daemon counts as unhealthy
+DEFAULT_MAX_DELAY = 3600
+
+# (lowest, highest) value per cron field
+_CRON_FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+
+def _parse_cron_field(field: str, lowest: int, highest: int) -> Set[int]:
+    """Parse one cron field (e.g. "*/15", "1-5", "0,30") into its values."""
+    values = set()
+    for part in field.split(","):
+        range_part, _, step_part = part.partition("/")
+        step = int(step_part) if step_part else 1
+        if range_part == "*":
+            start, end = lowest, highest
+        elif "-" in range_part:
+            start, end = (int(v) for v in range_part.split("-", 1))
+        else:
+            start = int(range_part)
+            end = highest if step_part else start
+        if step < 1 or not lowest <= start <= end <= highest:
+            raise ValueError(f"Invalid cron field '{field}' (allowed range {lowest}-{highest})")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """Five-field cron expression evaluated in Melbourne time."""
+
+    def __init__(self, expression: str):
+        """Parse a cron expression.
+
+        Raises:
+            ValueError: If the expression is not five valid fields
+        """
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields (minute hour day month weekday): '{expression}'")
+
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            _parse_cron_field(field, lowest, highest) for field, (lowest, highest) in zip(fields, _CRON_FIELDS)
+        )
+        # Cron weekdays: 0 and 7 are Sunday; date.weekday(): Monday is 0
+        self.weekdays = {(day - 1) % 7 for day in weekdays}
+        # As in cron, if both day fields are restricted, a day matching either one runs
+        self._any_day = fields[2] == "*" or fields[4] == "*"
+
+    def _matches_day(self, day: date) -> bool:
+        if day.month not in self.months:
+            return False
+        day_match = day.day in self.days
+        weekday_match = day.weekday() in self.weekdays
+        return day_match and weekday_match if self._any_day else day_match or weekday_match
+
+    def next_after(self, now: datetime, last_start: Optional[datetime] = None) -> datetime:
+        """First matching minute after now (timezone-aware, Melbourne time)."""
+        local_now = now.astimezone(MELBOURNE_TZ)
+        day = local_now.date()
+        # Eight years covers every valid day-of-month/month combination (e.g. 29 February)
+        for _ in range(366 * 8):
+            if self._matches_day(day):
+                for hour in sorted(self.hours):
+                    for minute in sorted(self.minutes):
+                        candidate = datetime(day.year, day.month, day.day, hour, minute, tzinfo=MELBOURNE_TZ)
+                        if candidate > local_now:
+                            return candidate
+            day += timedelta(days=1)
+        raise ValueError(f"Cron expression never matches: '{self.expression}'")
+
+    def __str__(self) -> str:
+        return f"cron '{self.expression}' (Melbourne time)"
+
+
+class IntervalSchedule:
+    """Fixed interval between run starts; the first run starts immediately."""
+
+    def __init__(self, seconds: int):
+        if seconds <= 0:
+            raise ValueError(f"Interval must be positive, got {seconds}")
+        self.seconds = seconds
+
+    def next_after(self, now: datetime, last_start: Optional[datetime] = None) -> datetime:
+        """Next run start: now for the first run, else last_start + interval (never in the past)."""
+        if last_start is None:
+            return now
+        return max(now, last_start + timedelta(seconds=self.seconds))
+
+    def __str__(self) -> str:
+        return f"every {self.seconds}s"
+
+
+class ConfigCache:
+    """Parsed config that is only re-read when the config file's mtime changes."""
+
+    def __init__(self, config_path: str):
+        self.config_path = config_path
+        self._mtime_ns: Optional[int] = None
+        self._config: Optional[TrackerConfig] = None
+
+    def get(self) -> TrackerConfig:
+        """Current config, reloading it if the file changed.
+
+        If a changed file fails to load, the previous config is kept.
+
+        Raises:
+            FileNotFoundError, ValueError: If there is no config to fall back to
+        """
+        mtime_ns = os.stat(self.config_path).st_mtime_ns
+        if self._config is not None and mtime_ns == self._mtime_ns:
+            return self._config
+
+        try:
+            self._config = load_tracker_config(self.config_path)
+        except Exception as e:
+            if self._config is None:
+                raise
+            logger.warning("WARNING: Could not reload %s (%s: %s) - keeping previous config",
+                           self.config_path, type(e).__name__, e)
+        self._mtime_ns = mtime_ns
+        return self._config
+
+
+def _utc_timestamp(value: Optional[datetime]) -> Optional[str]:
+    return value.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ') if value else None
+
+
+class SchedulerDaemon:
+    """Runs the workflow on a schedule, keeping state warm between cycles."""
+
+    def __init__(
+        self,
+        config_path: str,
+        schedule,
+        status_path: str,
+        warm_browser: bool = False,
+        tracker_only: bool = False
+    ):
+        """Initialize the daemon.
+
+        Args:
+            config_path: Unified config file (re-read when its mtime changes)
+            schedule: CronSchedule or IntervalSchedule
+            status_path: Status file written after every cycle
+            warm_browser: Keep Chrome running between logins
+            tracker_only: Skip Phase 1 and track with the saved sessions
+        """
+        self.config = ConfigCache(config_path)
+        self.schedule = schedule
+        self.status_path = Path(status_path)
+        self.tracker_only = tracker_only
+        self.browser = None
+        if warm_browser and not tracker_only:
+            from myki_auth import WarmBrowser
+            self.browser = WarmBrowser()
+
+        self._http_sessions: Dict = {}
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._stop = threading.Event()
+        self.status = {
+            "status": "starting",
+            "pid": os.getpid(),
+            "schedule": str(schedule),
+            "startedAt": _utc_timestamp(datetime.now(timezone.utc)),
+            "cycles": 0,
+            "consecutiveFailures": 0,
+            "lastRunStart": None,
+            "lastRunEnd": None,
+            "lastExitCode": None,
+            "lastError": None,
+            "failedUsers": [],
+            "skippedUsers": [],
+            "nextRun": None,
+        }
+
+    def _write_status(self, **changes) -> None:
+        self.status.update(changes)
+        write_atomic(self.status_path, json_codec.dumps_bytes(self.status, indent=2))
+
+    def _sessions(self, config: TrackerConfig) -> Tuple[Dict[str, MykiAPIClient], Dict[str, Exception]]:
+        """API client per user from this cycle's saved sessions, on pooled connections.
+
+        Returns:
+            Tuple of ({username: client}, {username: error} for users without
+            a usable saved session)
+        """
+        import requests
+
+        sessions, missing = {}, {}
+        for username in config.usernames:
+            if username not in self._http_sessions:
+                self._http_sessions[username] = requests.Session()
+            # Session file lookup is per user (see auth_loader.get_session_suffix)
+            os.environ['MYKI_AUTH_USERNAME_KEY'] = username
+            try:
+                sessions[username] = MykiAPIClient(http_session=self._http_sessions[username])
+            except ValueError as e:
+                missing[username] = e
+        return sessions, missing
+
+    def _pool(self, config: TrackerConfig, options: TrackerOptions) -> Optional[ProcessPoolExecutor]:
+        """Statistics process pool kept across cycles (None while there are too few users)."""
+        if not use_process_pool(len(config.usernames), options.workers):
+            return None
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=options.workers)
+        return self._executor
+
+    def run_cycle(self) -> int:
+        """Run the workflow once.
+
+        Returns:
+            Exit code: 0 if authentication and tracking succeed for all users
+        """
+        started = datetime.now(timezone.utc)
+        self._write_status(status="running", lastRunStart=_utc_timestamp(started))
+        print_header(f"SCHEDULED RUN {self.status['cycles'] + 1} - {started.astimezone(MELBOURNE_TZ):%Y-%m-%d %H:%M %Z}")
+
+        failed_users: List[str] = []
+        skipped_users: List[str] = []
+        error = None
+        try:
+            config = self.config.get()
+
+            if not self.tracker_only:
+                print_header("PHASE 1: MULTI-USER AUTHENTICATION")
+                failed_users = authenticate_users(config.users, config.credentials, self.browser)
+
+            if failed_users:
+                error = "Authentication failed"
+                exit_code = 1
+            else:
+                print_header("PHASE 2: ATTENDANCE TRACKING")
+                sessions, missing = self._sessions(config)
+                skipped_users = list(missing)
+                options = TrackerOptions.from_env()
+                result = run_tracking(config, sessions=sessions, options=options,
+                                      executor=self._pool(config, options), unavailable=missing)
+                failed_users = [username for username, _ in result.failures]
+                exit_code = report_run(result)
+                if missing:
+                    first_error = next(iter(missing.values()))
+                    error = f"No saved session for {', '.join(skipped_users)} ({first_error})"
+                elif failed_users:
+                    error = "Tracking failed"
+        except Exception as e:
+            logger.error("")
+            logger.error("❌ SCHEDULED RUN ERROR: %s: %s", type(e).__name__, e, exc_info=True)
+            error = f"{type(e).__name__}: {e}"
+            exit_code = 1
+
+        self._write_status(
+            status="ok" if exit_code == 0 else "failed",
+            cycles=self.status["cycles"] + 1,
+            consecutiveFailures=0 if exit_code == 0 else self.status["consecutiveFailures"] + 1,
+            lastRunEnd=_utc_timestamp(datetime.now(timezone.utc)),
+            lastExitCode=exit_code,
+            lastError=error,
+            failedUsers=failed_users,
+            skippedUsers=skipped_users,
+        )
+        return exit_code
+
+    def stop(self, *_) -> None:
+        """Stop after the current cycle (also used as the SIGTERM/SIGINT handler)."""
+        logger.info("")
+        logger.info("Scheduler stopping...")
+        self._stop.set()
+
+    def run_forever(self) -> int:
+        """Run cycles on the schedule until stopped.
+
+        Returns:
+            Exit code of the last cycle (0 if none ran)
+        """
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, self.stop)
+            signal.signal(signal.SIGINT, self.stop)
+
+        print_header("MYKI SCHEDULER DAEMON")
+        logger.info("Schedule: %s", self.schedule)
+        logger.info("Status file: %s", self.status_path.absolute())
+
+        exit_code = 0
+        last_start = None
+        try:
+            while not self._stop.is_set():
+                now = datetime.now(timezone.utc)
+                next_run = self.schedule.next_after(now, last_start)
+                self._write_status(nextRun=_utc_timestamp(next_run))
+                if next_run > now:
+                    logger.info("")
+                    logger.info("Next run: %s", next_run.astimezone(MELBOURNE_TZ).strftime('%Y-%m-%d %H:%M %Z'))
+                if self._stop.wait(max(0.0, (next_run - now).total_seconds())):
+                    break
+
+                last_start = datetime.now(timezone.utc)
+                exit_code = self.run_cycle()
+        finally:
+            self.close()
+            self._write_status(status="stopped", nextRun=None)
+
+        return exit_code
+
+    def close(self) -> None:
+        """Release the warm browser, the process pool and pooled connections."""
+        if self.browser is not None:
+            self.browser.close()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        for http_session in self._http_sessions.values():
+            http_session.close()
+        self._http_sessions = {}
+
+
+def check_health(status_path: str, max_delay: int = DEFAULT_MAX_DELAY) -> int:
+    """Check the daemon's status file.
+
+    Healthy means the last cycle succeeded (or none has run yet), and neither
+    the next run nor the current one is more than max_delay seconds late.
+
+    Returns:
+        0 if healthy, 1 if not
+    """
+    try:
+        with open(status_path, 'rb') as f:
+            status = json_codec.load(f)
+    except (OSError, json_codec.JSONDecodeError) as e:
+        print(f"UNHEALTHY: cannot read status file {status_path}: {e}")
+        return 1
+
+    if status.get("lastExitCode") not in (None, 0):
+        print(f"UNHEALTHY: last run failed ({status.get('lastError')}, users: {status.get('failedUsers')})")
+        return 1
+
+    # A running cycle must finish, and a waiting daemon must start its next run, within max_delay
+    running = status.get("status") == "running"
+    deadline = status.get("lastRunStart") if running else status.get("nextRun")
+    if deadline:
+        overdue = (
+            datetime.now(timezone.utc)
+            - datetime.strptime(deadline, '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=timezone.utc)
+        ).total_seconds()
+        if overdue > max_delay:
+            what = "run started" if running else "run scheduled for"
+            print(f"UNHEALTHY: {what} {deadline} is {int(overdue)}s overdue")
+            return 1
+
+    print(f"HEALTHY: {status.get('status')}, {status.get('cycles', 0)} cycle(s), last run ended {status.get('lastRunEnd')}")
+    return 0
+
+
+def main() -> int:
+    """CLI entry point: run the daemon or check its health."""
+    parser = argparse.ArgumentParser(description="Run the Myki workflow on a schedule")
+    parser.add_argument("config_path", nargs="?", default="config/myki_config.json",
+                        help="Unified config file (default: config/myki_config.json)")
+    schedule_group = parser.add_mutually_exclusive_group()
+    schedule_group.add_argument("--interval", type=int,
+                                help="Seconds between run starts (default: SCHEDULER_INTERVAL)")
+    schedule_group.add_argument("--cron",
+                                help="Five-field cron expression in Melbourne time (default: SCHEDULER_CRON)")
+    parser.add_argument("--warm-browser", action="store_true",
+                        default=os.getenv('SCHEDULER_WARM_BROWSER', '').lower() in ('1', 'true', 'yes'),
+                        help="Keep Chrome running between logins (SCHEDULER_WARM_BROWSER=1)")
+    parser.add_argument("--tracker-only", action="store_true",
+                        help="Skip authentication and track with the saved sessions")
+    parser.add_argument("--once", action="store_true", help="Run one cycle now and exit")
+    parser.add_argument("--status-file",
+                        default=os.getenv('SCHEDULER_STATUS_FILE',
+                                          os.path.join(os.getenv('OUTPUT_DIR', 'output'), STATUS_FILENAME)),
+                        help="Status file for the health check (SCHEDULER_STATUS_FILE)")
+    parser.add_argument("--quiet", action="store_true", help="Only log warnings and errors (MYKI_LOG_QUIET=1)")
+    parser.add_argument("--log-json", action="store_true", help="Log JSON lines (MYKI_LOG_FORMAT=json)")
+    parser.add_argument("--health", action="store_true", help="Check the status file and exit")
+    parser.add_argument("--max-delay", type=int, default=DEFAULT_MAX_DELAY,
+                        help=f"Seconds a run may be overdue before --health fails (default: {DEFAULT_MAX_DELAY})")
+    args = parser.parse_args()
+
+    if args.health:
+        return check_health(args.status_file, args.max_delay)
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    # The environment only applies when no schedule flag was given, so a flag always wins
+    if args.cron is None and args.interval is None:
+        args.cron = os.getenv('SCHEDULER_CRON') or None
+        args.interval = os.getenv('SCHEDULER_INTERVAL') or None
+        if args.cron and args.interval:
+            parser.error("set only one of SCHEDULER_CRON and SCHEDULER_INTERVAL")
+
+    try:
+        configure_logging(log_format="json" if args.log_json else None, quiet=args.quiet)
+        if args.cron:
+            schedule = CronSchedule(args.cron)
+        elif args.interval or args.once:
+            schedule = IntervalSchedule(int(args.interval or 1))
+        else:
+            parser.error("a schedule is required: --interval SECONDS or --cron EXPRESSION")
+    except ValueError as e:
+        print(f"✗ ERROR: {e}")
+        return 1
+
+    daemon = SchedulerDaemon(
+        args.config_path,
+        schedule,
+        args.status_file,
+        warm_browser=args.warm_browser,
+        tracker_only=args.tracker_only
+    )
+    if args.once:
+        try:
+            return daemon.run_cycle()
+        finally:
+            daemon.close()
+    return daemon.run_forever()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
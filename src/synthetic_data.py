@@ -0,0 +1,430 @@
+"""Synthetic data generation for Myki Attendance Tracker scale testing.
+
+Produces Myki-shaped transactions and matching unified configs so the processing
+pipeline can be exercised at realistic scale without real accounts or API access.
+
+Usage:
+    python src/synthetic_data.py output/synthetic                # 10 users, 1 year
+    python src/synthetic_data.py output/synthetic --users 5000 --years 3
+"""
+
+import argparse
+import json
+import random
+import sys
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+from zoneinfo import ZoneInfo
+
+
+# Melbourne observes DST, so generated timestamps switch between +10:00 and +11:00
+MELBOURNE_TZ = ZoneInfo("Australia/Melbourne")
+
+# Real station names so generated configs look like the ones users write by hand
+STATIONS = [
+    "Heathmont Station",
+    "Melbourne Central",
+    "Flinders Street Station",
+    "Southern Cross Station",
+    "Parliament Station",
+    "Flagstaff Station",
+    "Richmond Station",
+    "Box Hill Station",
+    "Ringwood Station",
+    "Camberwell Station",
+    "Glenferrie Station",
+    "Footscray Station",
+    "Sunshine Station",
+    "Caulfield Station",
+    "Frankston Station",
+    "Dandenong Station",
+    "Clifton Hill Station",
+    "North Melbourne Station",
+    "South Yarra Station",
+    "Werribee Station",
+]
+
+# Timestamps the API has been seen to return (or could plausibly return) that
+# parse_transaction_date must reject gracefully
+MALFORMED_TIMESTAMPS = [
+    "",
+    "null",
+    "29/10/2025 13:04:45",
+    "2025-13-45T25:61:00+11:00",
+    "2025-10-29 13:04",
+    "not-a-date",
+]
+
+DEFAULT_START_DATE = date(2024, 1, 1)
+
+
+def generate_card_number(rng: random.Random) -> str:
+    """Generate a 15-digit Myki card number starting with the 3084 issuer prefix.
+
+    Args:
+        rng: Random number generator
+
+    Returns:
+        Card number string (e.g., "308425279093478")
+    """
+    return "3084" + "".join(str(rng.randint(0, 9)) for _ in range(11))
+
+
+def _period_end(start_date: date, years: int) -> date:
+    """Last day of a period of whole years (29 Feb starts end on 28 Feb in common years)."""
+    year = start_date.year + years
+    try:
+        anniversary = start_date.replace(year=year)
+    except ValueError:
+        anniversary = date(year, 3, 1)
+    return anniversary - timedelta(days=1)
+
+
+def _format_local(day: date, minutes: int) -> str:
+    """Format a Melbourne local time as ISO 8601 with the correct UTC offset."""
+    local_dt = datetime.combine(day, time(minutes // 60, minutes % 60), tzinfo=MELBOURNE_TZ)
+    return local_dt.isoformat(timespec='seconds')
+
+
+def _transaction(txn_type: str, timestamp: str, station: str) -> Dict[str, Any]:
+    """Build a transaction dict in the shape returned by the Myki API."""
+    return {
+        "transactionType": txn_type,
+        "serviceType": "Train",
+        "transactionDateTime": timestamp,
+        "zone": "1/2",
+        "GSTAmount": "0.0000",
+        "description": station,
+        "debitAmount": "-",
+        "creditAmount": "-",
+        "txnAmount": "0.0000",
+        "mykiBalance": "-",
+    }
+
+
+def generate_transactions(
+    target_station: str,
+    home_station: str,
+    start_date: date = DEFAULT_START_DATE,
+    years: int = 1,
+    attendance_rate: float = 0.6,
+    weekend_trip_rate: float = 0.1,
+    malformed_rate: float = 0.001,
+    seed: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Generate a card's transaction history across one or more years.
+
+    On attended weekdays the card touches on at home_station in the morning and
+    off at target_station, then back again in the evening. Occasional weekend
+    trips go to random stations. Timestamps carry the Melbourne offset for the
+    day, so histories spanning October/April cross DST changes.
+
+    Args:
+        target_station: Station the card touches off at on work days
+        home_station: Station the card starts and ends each day at
+        start_date: First day of history (inclusive)
+        years: Number of years of history to generate
+        attendance_rate: Probability a weekday is a commute day (0.0-1.0)
+        weekend_trip_rate: Probability a weekend day has a trip (0.0-1.0)
+        malformed_rate: Probability each transaction gets a malformed timestamp
+        seed: Random seed for reproducible output
+
+    Returns:
+        List of transaction dicts, newest first (as returned by the API)
+    """
+    rng = random.Random(seed)
+    end_date = _period_end(start_date, years)
+    transactions = []
+
+    current_date = start_date
+    while current_date <= end_date:
+        day_transactions = []
+
+        if current_date.weekday() < 5:
+            if rng.random() < attendance_rate:
+                morning = rng.randint(7 * 60, 9 * 60 + 30)
+                evening = rng.randint(16 * 60 + 30, 19 * 60)
+                travel = rng.randint(20, 55)
+                day_transactions = [
+                    ("Touch on", morning, home_station),
+                    ("Touch off", morning + travel, target_station),
+                    ("Touch on", evening, target_station),
+                    ("Touch off", evening + travel, home_station),
+                ]
+        elif rng.random() < weekend_trip_rate:
+            station = rng.choice(STATIONS)
+            outbound = rng.randint(9 * 60, 14 * 60)
+            inbound = outbound + rng.randint(90, 300)
+            day_transactions = [
+                ("Touch on", outbound, home_station),
+                ("Touch off", outbound + 30, station),
+                ("Touch on", inbound, station),
+                ("Touch off", min(inbound + 30, 23 * 60 + 59), home_station),
+            ]
+
+        for txn_type, minutes, station in day_transactions:
+            if rng.random() < malformed_rate:
+                timestamp = rng.choice(MALFORMED_TIMESTAMPS)
+            else:
+                timestamp = _format_local(current_date, minutes)
+            transactions.append(_transaction(txn_type, timestamp, station))
+
+        current_date += timedelta(days=1)
+
+    transactions.reverse()
+    return transactions
+
+
+def _random_weekdays(
+    rng: random.Random,
+    start_date: date,
+    end_date: date,
+    count: int,
+    exclude: Optional[set] = None
+) -> List[str]:
+    """Pick up to count distinct weekdays within [start_date, end_date] as ISO strings."""
+    span = (end_date - start_date).days + 1
+    exclude = exclude or set()
+    picked = set()
+    attempts = 0
+
+    while len(picked) < count and attempts < count * 10:
+        attempts += 1
+        day = start_date + timedelta(days=rng.randrange(span))
+        if day.weekday() >= 5:
+            continue
+        day_str = day.strftime('%Y-%m-%d')
+        if day_str not in exclude:
+            picked.add(day_str)
+
+    return sorted(picked)
+
+
+def generate_unified_config(
+    num_users: int,
+    start_date: date = DEFAULT_START_DATE,
+    years: int = 1,
+    skip_dates_per_user: int = 10,
+    manual_dates_per_user: int = 5,
+    seed: Optional[int] = None
+) -> Dict[str, Any]:
+    """Generate a unified config with many users.
+
+    Output has the same shape as config/myki_config.json and passes
+    validate_user_config. Skip and manual dates are distinct weekdays inside
+    each user's period.
+
+    Args:
+        num_users: Number of users to generate
+        start_date: startDate for every user
+        years: Length of each user's period in years
+        skip_dates_per_user: Number of skipDates per user
+        manual_dates_per_user: Number of manualAttendanceDates per user
+        seed: Random seed for reproducible output
+
+    Returns:
+        Unified config dictionary: {"users": {"user00001": {...}, ...}}
+    """
+    rng = random.Random(seed)
+    end_date = _period_end(start_date, years)
+    width = max(5, len(str(num_users)))
+    users = {}
+
+    for index in range(1, num_users + 1):
+        username = f"user{index:0{width}d}"
+        skip_dates = _random_weekdays(rng, start_date, end_date, skip_dates_per_user)
+        manual_dates = _random_weekdays(
+            rng, start_date, end_date, manual_dates_per_user, exclude=set(skip_dates)
+        )
+
+        users[username] = {
+            "username": f"Synthetic User {index}",
+            "targetStation": rng.choice(STATIONS),
+            "startDate": start_date.strftime('%Y-%m-%d'),
+            "endDate": end_date.strftime('%Y-%m-%d'),
+            "skipDates": skip_dates,
+            "manualAttendanceDates": manual_dates,
+        }
+
+    return {"users": users}
+
+
+def generate_credentials_env(user_config: Dict, seed: Optional[int] = None) -> Dict[str, str]:
+    """Generate the MYKI_* environment variables load_user_credentials expects.
+
+    Args:
+        user_config: Users section of a unified config
+        seed: Random seed for reproducible card numbers
+
+    Returns:
+        Dictionary of environment variable name to value
+    """
+    rng = random.Random(seed)
+    env = {}
+
+    for config_key in user_config.keys():
+        if config_key.startswith("_"):
+            continue
+        key_upper = config_key.upper()
+        env[f"MYKI_USERNAME_{key_upper}"] = f"{config_key}@example.com"
+        env[f"MYKI_CARDNUMBER_{key_upper}"] = generate_card_number(rng)
+        env[f"MYKI_PASSWORD_{key_upper}"] = "synthetic-password"
+
+    return env
+
+
+def generate_dataset(
+    num_users: int,
+    years: int = 1,
+    start_date: date = DEFAULT_START_DATE,
+    malformed_rate: float = 0.001,
+    seed: int = 0
+) -> Tuple[Dict[str, Any], Dict[str, str], Dict[str, List[Dict[str, Any]]]]:
+    """Generate a matching config, credentials and per-card transaction histories.
+
+    Each user's card touches off at the user's targetStation, so running the
+    pipeline over the dataset produces non-trivial attendance.
+
+    Args:
+        num_users: Number of users (one card each)
+        years: Years of history per card
+        start_date: First day of history and startDate for every user
+        malformed_rate: Probability each transaction gets a malformed timestamp
+        seed: Random seed for reproducible output
+
+    Returns:
+        Tuple of (unified_config, credentials_env, transactions_by_card)
+    """
+    config = generate_unified_config(num_users, start_date=start_date, years=years, seed=seed)
+    env = generate_credentials_env(config["users"], seed=seed)
+    rng = random.Random(seed)
+    transactions_by_card = {}
+
+    for username, user_cfg in config["users"].items():
+        card_number = env[f"MYKI_CARDNUMBER_{username.upper()}"]
+        home_station = rng.choice([s for s in STATIONS if s != user_cfg["targetStation"]])
+        transactions_by_card[card_number] = generate_transactions(
+            target_station=user_cfg["targetStation"],
+            home_station=home_station,
+            start_date=start_date,
+            years=years,
+            malformed_rate=malformed_rate,
+            seed=rng.randrange(2 ** 32)
+        )
+
+    return config, env, transactions_by_card
+
+
+def paginate_transactions(
+    transactions: List[Dict[str, Any]],
+    page_size: int = 100
+) -> Iterator[Dict[str, Any]]:
+    """Split transactions into API response pages.
+
+    Args:
+        transactions: Transactions to paginate (newest first)
+        page_size: Transactions per page
+
+    Yields:
+        Response dicts in the {"code", "message", "data"} shape the API returns
+    """
+    for offset in range(0, len(transactions), page_size):
+        yield {"code": 1, "message": "Success", "data": transactions[offset:offset + page_size]}
+
+
+class SyntheticMykiClient:
+    """Local stand-in for MykiAPIClient serving synthetic transactions.
+
+    Implements get_transactions with the same pagination contract as the real
+    API, including the 409 "txnTimestamp ... null" end-of-data signal, so
+    fetch_all_transactions and the tracker can run fully offline.
+    """
+
+    def __init__(self, transactions_by_card: Dict[str, List[Dict[str, Any]]], page_size: int = 100):
+        """Initialize the stand-in client.
+
+        Args:
+            transactions_by_card: Card number to transactions (newest first)
+            page_size: Transactions per page
+        """
+        self.transactions_by_card = transactions_by_card
+        self.page_size = page_size
+
+    def get_transactions(self, card_number: str, page: int = 0) -> Dict[str, Any]:
+        """Return one page of transactions for a card.
+
+        Args:
+            card_number: Myki card number
+            page: Page number for pagination
+
+        Returns:
+            Response dict with "data" list
+
+        Raises:
+            requests.HTTPError: 409 end-of-data signal once pages run out
+        """
+        transactions = self.transactions_by_card.get(card_number, [])
+        offset = page * self.page_size
+
+        if offset >= len(transactions):
+            import requests
+
+            response = requests.Response()
+            response.status_code = 409
+            response._content = json.dumps({
+                "message": "txnTimestamp: Expected a non-empty value. Got: null"
+            }).encode()
+            raise requests.HTTPError("409 Client Error: Conflict", response=response)
+
+        return {"code": 1, "message": "Success", "data": transactions[offset:offset + self.page_size]}
+
+
+def main() -> int:
+    """Write a synthetic config, credentials env file and transaction histories.
+
+    Returns:
+        Exit code: 0 on success
+    """
+    parser = argparse.ArgumentParser(description="Generate synthetic Myki data for scale testing")
+    parser.add_argument("output_dir", help="Directory to write generated files into")
+    parser.add_argument("--users", type=int, default=10, help="Number of users/cards (default: 10)")
+    parser.add_argument("--years", type=int, default=1, help="Years of history (default: 1)")
+    parser.add_argument("--start-date", default=DEFAULT_START_DATE.isoformat(),
+                        help="First day of history, YYYY-MM-DD")
+    parser.add_argument("--malformed-rate", type=float, default=0.001,
+                        help="Fraction of transactions with malformed timestamps")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    args = parser.parse_args()
+
+    start_date = datetime.strptime(args.start_date, '%Y-%m-%d').date()
+    config, env, transactions_by_card = generate_dataset(
+        num_users=args.users,
+        years=args.years,
+        start_date=start_date,
+        malformed_rate=args.malformed_rate,
+        seed=args.seed
+    )
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    with open(output_dir / "config.json", 'w') as f:
+        json.dump(config, f, indent=2)
+
+    with open(output_dir / "synthetic.env", 'w') as f:
+        for name, value in env.items():
+            f.write(f"{name}={value}\n")
+
+    with open(output_dir / "transactions.json", 'w') as f:
+        json.dump(transactions_by_card, f)
+
+    total = sum(len(txns) for txns in transactions_by_card.values())
+    print(f"✓ Generated {args.users} user(s), {total} transaction(s) over {args.years} year(s)")
+    print(f"  Output: {output_dir.absolute()}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
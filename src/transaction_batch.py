@@ -0,0 +1,268 @@
+"""Columnar transaction batches for Myki Attendance Tracker backfills.
+
+Holds normalised transactions as numpy arrays so station, type, date-range and
+working-day filtering become single boolean-mask expressions. Produces the same
+results as the per-transaction functions in transaction_processor and
+output_manager; used by process_user only for large transaction sets.
+
+numpy is optional and only imported once a transaction set reaches the
+columnar threshold. Without it, columnar_available() returns False and the
+tracker keeps using the per-record pipeline.
+"""
+
+import os
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Dict, Any, Iterable, Optional
+
+# numpy module, imported on first use by columnar_available() (None if missing)
+np = None
+_numpy_loaded = False
+
+from transaction_processor import (
+    TransactionRecord,
+    TransactionType,
+    normalize_transactions,
+    datetime_to_epoch,
+)
+from working_days import WorkingDayCalendar
+
+
+# Transaction count at which process_user switches to the columnar pipeline.
+# Override with MYKI_COLUMNAR_THRESHOLD (0 disables the columnar pipeline).
+DEFAULT_COLUMNAR_THRESHOLD = 50000
+
+# date.toordinal() of any Monday; (ordinal - MONDAY_ORDINAL) % 7 gives weekday()
+_MONDAY_ORDINAL = date(2024, 1, 1).toordinal()
+
+
+def columnar_available() -> bool:
+    """Check whether numpy is installed so columnar batches can be used.
+
+    numpy is imported on the first call rather than at module import, so
+    runs that never reach the columnar threshold don't pay its import cost.
+    """
+    global np, _numpy_loaded
+    if not _numpy_loaded:
+        _numpy_loaded = True
+        try:
+            import numpy
+        except ImportError:  # pragma: no cover - exercised only when numpy is missing
+            numpy = None
+        np = numpy
+    return np is not None
+
+
+def use_columnar(transaction_count: int) -> bool:
+    """Decide whether a transaction set is large enough for the columnar pipeline.
+
+    Args:
+        transaction_count: Number of transactions to process
+
+    Returns:
+        True if numpy is available and transaction_count reaches the threshold
+        (MYKI_COLUMNAR_THRESHOLD environment variable, default 50000)
+    """
+    threshold = int(os.getenv('MYKI_COLUMNAR_THRESHOLD', DEFAULT_COLUMNAR_THRESHOLD))
+    if threshold <= 0 or transaction_count < threshold:
+        return False
+
+    return columnar_available()
+
+
+class TransactionBatch:
+    """Columnar, array-backed set of normalised transactions.
+
+    Station names and transaction types are stored as interned integer codes;
+    `stations` maps a station code back to its name.
+    """
+
+    __slots__ = ("epochs", "utc_offsets", "date_ordinals", "station_codes", "type_codes", "stations")
+
+    def __init__(self, epochs, utc_offsets, date_ordinals, station_codes, type_codes, stations: List[str]):
+        """Initialize from pre-built column arrays (use from_records/from_transactions instead)."""
+        if not columnar_available():
+            raise ImportError("numpy is required for TransactionBatch. Install it with: pip install numpy")
+
+        self.epochs = epochs
+        self.utc_offsets = utc_offsets
+        self.date_ordinals = date_ordinals
+        self.station_codes = station_codes
+        self.type_codes = type_codes
+        self.stations = stations
+
+    @classmethod
+    def from_records(cls, records: Iterable[TransactionRecord]) -> "TransactionBatch":
+        """Build a batch from TransactionRecords.
+
+        Args:
+            records: TransactionRecords from normalize_transactions()
+
+        Returns:
+            TransactionBatch with one row per record, in input order
+        """
+        if not columnar_available():
+            raise ImportError("numpy is required for TransactionBatch. Install it with: pip install numpy")
+
+        records = list(records)
+        station_index: Dict[str, int] = {}
+        station_codes = [station_index.setdefault(r.station, len(station_index)) for r in records]
+
+        return cls(
+            epochs=np.fromiter((r.epoch for r in records), dtype=np.float64, count=len(records)),
+            utc_offsets=np.fromiter((r.utc_offset for r in records), dtype=np.int32, count=len(records)),
+            date_ordinals=np.fromiter((r.date_ordinal for r in records), dtype=np.int32, count=len(records)),
+            station_codes=np.array(station_codes, dtype=np.int32),
+            type_codes=np.fromiter((r.txn_type for r in records), dtype=np.int8, count=len(records)),
+            stations=list(station_index.keys())
+        )
+
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[Dict[str, Any]]) -> "TransactionBatch":
+        """Build a batch from API transaction dicts (invalid datetimes are dropped).
+
+        Args:
+            transactions: Transaction dictionaries from API
+
+        Returns:
+            TransactionBatch with one row per valid transaction
+        """
+        return cls.from_records(normalize_transactions(transactions))
+
+    def __len__(self) -> int:
+        return len(self.epochs)
+
+    def select(self, mask) -> "TransactionBatch":
+        """Return the rows where mask is True, sharing the station table."""
+        return TransactionBatch(
+            self.epochs[mask],
+            self.utc_offsets[mask],
+            self.date_ordinals[mask],
+            self.station_codes[mask],
+            self.type_codes[mask],
+            self.stations
+        )
+
+    def to_records(self) -> List[TransactionRecord]:
+        """Convert rows back into TransactionRecords (for parity checks and small results)."""
+        return [
+            TransactionRecord(float(epoch), int(offset), int(ordinal), self.stations[code], TransactionType(txn_type))
+            for epoch, offset, ordinal, code, txn_type in zip(
+                self.epochs, self.utc_offsets, self.date_ordinals, self.station_codes, self.type_codes
+            )
+        ]
+
+    def station_mask(self, target_station: str):
+        """Boolean mask of rows at target_station (exact, case-sensitive)."""
+        try:
+            code = self.stations.index(target_station)
+        except ValueError:
+            return np.zeros(len(self), dtype=bool)
+        return self.station_codes == code
+
+    def date_range_mask(self, start_date: date, end_date: date):
+        """Boolean mask of rows whose local date is within [start_date, end_date]."""
+        return (self.date_ordinals >= start_date.toordinal()) & (self.date_ordinals <= end_date.toordinal())
+
+    def after_mask(self, latest_processed_date: datetime):
+        """Boolean mask of rows strictly after latest_processed_date."""
+        return self.epochs > datetime_to_epoch(latest_processed_date)
+
+    def working_day_mask(self, calendar: WorkingDayCalendar):
+        """Boolean mask of rows on working days (weekday, not holiday, not skipped).
+
+        Args:
+            calendar: WorkingDayCalendar covering the batch's dates
+        """
+        weekday_mask = (self.date_ordinals - _MONDAY_ORDINAL) % 7 < 5
+        if len(self) == 0:
+            return weekday_mask
+
+        # Make sure holidays are expanded for every year present in the batch
+        calendar.cover(date.fromordinal(int(self.date_ordinals.min())),
+                       date.fromordinal(int(self.date_ordinals.max())))
+        non_working = np.fromiter(calendar.non_working_ordinals, dtype=np.int32)
+        return weekday_mask & ~np.isin(self.date_ordinals, non_working)
+
+    def latest_datetime(self) -> Optional[datetime]:
+        """Latest transaction datetime in its original UTC offset, or None if empty."""
+        if len(self) == 0:
+            return None
+        index = int(np.argmax(self.epochs))
+        tz = timezone(timedelta(seconds=int(self.utc_offsets[index])))
+        return datetime.fromtimestamp(float(self.epochs[index]), tz)
+
+
+def filter_new_transactions_batch(
+    batch: TransactionBatch,
+    latest_processed_date: Optional[datetime]
+) -> TransactionBatch:
+    """Columnar equivalent of output_manager.filter_new_transactions.
+
+    Args:
+        batch: TransactionBatch to filter
+        latest_processed_date: Latest processed datetime, or None on first run
+
+    Returns:
+        TransactionBatch of rows strictly after latest_processed_date
+    """
+    if latest_processed_date is None:
+        return batch
+    return batch.select(batch.after_mask(latest_processed_date))
+
+
+def filter_transactions_batch(
+    batch: TransactionBatch,
+    target_station: str,
+    start_date: date,
+    end_date: date
+) -> TransactionBatch:
+    """Columnar equivalent of transaction_processor.filter_transactions.
+
+    Args:
+        batch: TransactionBatch to filter
+        target_station: Exact station name to match (case-sensitive)
+        start_date: Start date for filtering (inclusive)
+        end_date: End date for filtering (inclusive)
+
+    Returns:
+        TransactionBatch of "Touch off" rows at target_station within the date range
+    """
+    mask = (
+        batch.station_mask(target_station)
+        & (batch.type_codes == TransactionType.TOUCH_OFF)
+        & batch.date_range_mask(start_date, end_date)
+    )
+    return batch.select(mask)
+
+
+def calculate_attendance_days_batch(
+    batch: TransactionBatch,
+    skip_dates: List[date],
+    vic_holidays,
+    calendar: Optional[WorkingDayCalendar] = None
+) -> List[str]:
+    """Columnar equivalent of transaction_processor.calculate_attendance_days.
+
+    Args:
+        batch: Filtered TransactionBatch
+        skip_dates: List of user skip dates as date objects
+        vic_holidays: Melbourne VIC holidays object from holidays package
+        calendar: Precompiled WorkingDayCalendar for the user (optional). When
+                 given, it is used instead of skip_dates/vic_holidays.
+
+    Returns:
+        Sorted list of ISO date strings (YYYY-MM-DD) of attended working days
+    """
+    if len(batch) == 0:
+        return []
+
+    if calendar is None:
+        calendar = WorkingDayCalendar(
+            date.fromordinal(int(batch.date_ordinals.min())),
+            date.fromordinal(int(batch.date_ordinals.max())),
+            skip_dates,
+            vic_holidays
+        )
+
+    ordinals = np.unique(batch.date_ordinals[batch.working_day_mask(calendar)])
+    return [date.fromordinal(ordinal).isoformat() for ordinal in ordinals.tolist()]
@@ -3,14 +3,24 @@
 Handles fetching transactions from Myki API with special pagination error handling.
 """
 
-from typing import List, Dict, Any
-
-import requests
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, List, Dict, Any, Sequence
 
 from myki_api_client import MykiAPIClient
+from run_log import get_logger
+
+if TYPE_CHECKING:
+    import requests
+
+
+logger = get_logger(__name__)
+
+
+# Cards of one user fetched at the same time (each card pages through the API on its own)
+MAX_CARD_FETCH_WORKERS = 4
 
 
-def is_special_pagination_error(http_error: requests.HTTPError) -> bool:
+def is_special_pagination_error(http_error: "requests.HTTPError") -> bool:
     """Check if HTTPError is the special pagination end-of-data signal.
 
     The Myki API returns 409 with message "txnTimestamp: Expected a non-empty
@@ -63,15 +73,18 @@ def fetch_all_transactions(client: MykiAPIClient, card_number: str) -> List[Dict
     Raises:
         requests.HTTPError: If API returns non-409 error or different 409 error
     """
+    import requests
+
     page = 0
     all_transactions = []
     MAX_PAGES = 5
 
-    print(f"\nFetching transactions for card {card_number}...")
+    logger.info("")
+    logger.info("Fetching transactions for card %s...", card_number)
 
     while page < MAX_PAGES:
         try:
-            print(f"  Fetching page {page}...")
+            logger.debug("  Fetching page %d...", page)
             response = client.get_transactions(card_number, page)
 
             # Extract transactions from response
@@ -89,7 +102,7 @@ def fetch_all_transactions(client: MykiAPIClient, card_number: str) -> List[Dict
 
             # Add to all transactions
             all_transactions.extend(page_transactions)
-            print(f"    Retrieved {len(page_transactions)} transactions")
+            logger.debug("    Retrieved %d transactions", len(page_transactions))
 
             # Move to next page
             page += 1
@@ -97,26 +110,93 @@ def fetch_all_transactions(client: MykiAPIClient, card_number: str) -> List[Dict
         except requests.HTTPError as e:
             # Check if this is the special pagination end-of-data error
             if is_special_pagination_error(e):
-                print(f"    Reached end of transaction data (page {page})")
+                logger.debug("    Reached end of transaction data (page %d)", page)
                 break  # Normal end of data - exit gracefully
             else:
                 # Different error - this is an actual failure
                 # NOTE: Use 'is not None' instead of truthy check because Response
                 # objects evaluate to False for error status codes
                 status_code = e.response.status_code if e.response is not None else 'unknown'
-                print(f"✗ API error on page {page}: {status_code}")
+                logger.error("✗ API error on page %s: %s", page, status_code)
 
                 if e.response is not None:
                     try:
                         error_json = e.response.json()
-                        print(f"  Error details: {error_json}")
+                        logger.error("  Error details: %s", error_json)
                     except:
-                        print(f"  Raw response: {e.response.text}")
+                        logger.error("  Raw response: %s", e.response.text)
 
                 raise  # Re-raise actual errors
 
     if page >= MAX_PAGES:
-        print(f"  Reached maximum page limit ({MAX_PAGES})")
+        logger.warning("  Reached maximum page limit (%d)", MAX_PAGES)
 
-    print(f"  Total transactions fetched: {len(all_transactions)}")
+    logger.info("  Total transactions fetched: %d (%s page(s))", len(all_transactions), page)
     return all_transactions
+
+
+def discover_card_numbers(client: MykiAPIClient) -> List[str]:
+    """List the card numbers on the client's account (MykiAPIClient.get_cards).
+
+    Args:
+        client: MykiAPIClient instance with the user's session
+
+    Returns:
+        Card numbers in the order the API lists them
+
+    Raises:
+        ValueError: If the account has no cards with a card number
+    """
+    response = client.get_cards()
+    if isinstance(response, dict):
+        cards = response.get('cards', response.get('data', []))
+    else:
+        cards = response
+
+    card_numbers = []
+    for card in cards or []:
+        if isinstance(card, dict):
+            number = card.get('mykiCardNumber') or card.get('cardNumber') or card.get('number')
+        else:
+            number = card
+        if number and str(number) not in card_numbers:
+            card_numbers.append(str(number))
+
+    if not card_numbers:
+        raise ValueError("No myki cards found on the account (get_cards returned no card numbers)")
+    logger.info("  Discovered %d card(s): %s", len(card_numbers), ', '.join(card_numbers))
+    return card_numbers
+
+
+def fetch_card_transactions(client: MykiAPIClient, card_numbers: Sequence[str]) -> List[Dict[str, Any]]:
+    """Fetch and merge the transactions of all of a user's cards.
+
+    Cards are fetched concurrently (up to MAX_CARD_FETCH_WORKERS at a time),
+    each with fetch_all_transactions(). Transactions are merged in card order,
+    so they can be filtered as if they came from one card.
+
+    Args:
+        client: MykiAPIClient instance with the user's session
+        card_numbers: Card numbers to fetch
+
+    Returns:
+        Transactions of all cards, card by card
+
+    Raises:
+        ValueError: If no card numbers are given
+        requests.HTTPError: If fetching any card fails. The user's run fails
+            as a whole: processing only part of the cards would move
+            latestProcessedDate past the missing card's transactions.
+    """
+    if not card_numbers:
+        raise ValueError("No myki card numbers to fetch transactions for")
+    if len(card_numbers) == 1:
+        return fetch_all_transactions(client, card_numbers[0])
+
+    workers = min(len(card_numbers), MAX_CARD_FETCH_WORKERS)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        card_transactions = list(executor.map(lambda card: fetch_all_transactions(client, card), card_numbers))
+
+    merged = [txn for transactions in card_transactions for txn in transactions]
+    logger.info("  Merged %d transactions from %d cards", len(merged), len(card_numbers))
+    return merged
@@ -1,14 +1,200 @@
 """Transaction processing and attendance calculation for Myki Attendance Tracker.
 
-Handles filtering transactions and calculating attendance days.
+Handles normalising API transactions into compact records, filtering transactions
+and calculating attendance days.
 """
 
-from datetime import date, datetime
-from typing import List, Dict, Any
+import sys
+from datetime import date, datetime, timedelta, timezone
+from enum import IntEnum
+from typing import TYPE_CHECKING, List, Dict, Any, Iterable, Iterator, NamedTuple, Optional, Tuple, Union
+from zoneinfo import ZoneInfo
 
-import holidays
+if TYPE_CHECKING:
+    import holidays
 
-from working_days import is_working_day
+from run_log import get_logger
+from working_days import is_working_day, WorkingDayCalendar
+
+
+logger = get_logger(__name__)
+
+# Myki API timestamps are Melbourne local time; used when a timestamp has no offset
+MELBOURNE_TZ = ZoneInfo("Australia/Melbourne")
+
+
+class TransactionType(IntEnum):
+    """Transaction type codes for the Myki API 'transactionType' field."""
+
+    OTHER = 0
+    TOUCH_ON = 1
+    TOUCH_OFF = 2
+
+
+_TRANSACTION_TYPES = {
+    "Touch on": TransactionType.TOUCH_ON,
+    "Touch off": TransactionType.TOUCH_OFF,
+}
+
+
+class TransactionRecord(NamedTuple):
+    """Normalised transaction with its timestamp parsed exactly once.
+
+    Attributes:
+        epoch: POSIX timestamp of the transaction (seconds since epoch, UTC)
+        utc_offset: UTC offset of the original timestamp in seconds (e.g. 39600 for +11:00)
+        date_ordinal: Local calendar date of the transaction as date.toordinal()
+        station: Station name from the API 'description' field (interned)
+        txn_type: TransactionType code
+    """
+
+    epoch: float
+    utc_offset: int
+    date_ordinal: int
+    station: str
+    txn_type: TransactionType
+
+    @property
+    def date(self) -> date:
+        """Local calendar date of the transaction."""
+        return date.fromordinal(self.date_ordinal)
+
+    def local_datetime(self) -> datetime:
+        """Rebuild the transaction datetime in its original UTC offset."""
+        tz = timezone(timedelta(seconds=self.utc_offset))
+        return datetime.fromtimestamp(self.epoch, tz)
+
+
+TransactionLike = Union[Dict[str, Any], TransactionRecord]
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# UTC offset in seconds per fixed-offset tzinfo seen in API timestamps
+_UTC_OFFSETS: Dict[Any, int] = {}
+
+
+def datetime_to_epoch(dt: datetime) -> float:
+    """Convert a datetime to a POSIX timestamp, treating naive values as Melbourne time.
+
+    Args:
+        dt: datetime object (timezone-aware or naive)
+
+    Returns:
+        POSIX timestamp in seconds
+    """
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=MELBOURNE_TZ)
+    return dt.timestamp()
+
+
+def normalize_transaction(txn: Dict[str, Any]) -> TransactionRecord:
+    """Normalise one API transaction dict into a TransactionRecord.
+
+    Timestamps without a UTC offset are interpreted as Melbourne local time.
+
+    Args:
+        txn: Transaction dictionary from API
+
+    Returns:
+        TransactionRecord for the transaction
+
+    Raises:
+        ValueError: If transactionDateTime is missing or not ISO 8601
+
+    Example:
+        >>> record = normalize_transaction({"transactionType": "Touch off",
+        ...     "transactionDateTime": "2025-10-29T13:04:45+11:00",
+        ...     "description": "Heathmont Station"})
+        >>> record.date, record.txn_type
+        (date(2025, 10, 29), <TransactionType.TOUCH_OFF: 2>)
+    """
+    transaction_datetime = txn.get("transactionDateTime", "")
+
+    try:
+        dt = datetime.fromisoformat(transaction_datetime)
+    except (ValueError, TypeError) as e:
+        raise ValueError(
+            f"Failed to parse transaction datetime: '{transaction_datetime}'. "
+            f"Expected ISO 8601 format (YYYY-MM-DDTHH:MM:SS+TZ). Error: {e}"
+        )
+
+    tzinfo = dt.tzinfo
+    utc_offset = _UTC_OFFSETS.get(tzinfo)
+    if utc_offset is None:
+        if tzinfo is None:
+            dt = dt.replace(tzinfo=MELBOURNE_TZ)
+        utc_offset = int(dt.utcoffset().total_seconds())
+        if isinstance(tzinfo, timezone):
+            # Fixed offsets repeat across every transaction; DST zones don't
+            _UTC_OFFSETS[tzinfo] = utc_offset
+
+    date_ordinal = dt.toordinal()
+    # Epoch by arithmetic - several times faster than dt.timestamp()
+    epoch = ((date_ordinal - _EPOCH_ORDINAL) * 86400 + dt.hour * 3600 + dt.minute * 60
+             + dt.second - utc_offset)
+    if dt.microsecond:
+        epoch += dt.microsecond / 1_000_000
+
+    return tuple.__new__(TransactionRecord, (
+        epoch,
+        utc_offset,
+        date_ordinal,
+        sys.intern(txn.get("description") or ""),
+        _TRANSACTION_TYPES.get(txn.get("transactionType"), TransactionType.OTHER)
+    ))
+
+
+def normalize_transactions(transactions: Iterable[Dict[str, Any]]) -> List[TransactionRecord]:
+    """Normalise API transaction dicts into TransactionRecords.
+
+    Transactions with an invalid transactionDateTime are dropped and reported
+    as a single aggregated warning.
+
+    Args:
+        transactions: Transaction dictionaries from API
+
+    Returns:
+        List of TransactionRecords in input order
+    """
+    records = []
+    invalid_count = 0
+
+    for txn in transactions:
+        try:
+            records.append(normalize_transaction(txn))
+        except ValueError:
+            invalid_count += 1
+
+    if invalid_count:
+        logger.warning("  Warning: Skipped %d transaction(s) with invalid datetime", invalid_count)
+
+    return records
+
+
+def iter_transaction_records(
+    transactions: Iterable[TransactionLike]
+) -> Iterator[Tuple[TransactionLike, Optional[TransactionRecord]]]:
+    """Pair each transaction with its TransactionRecord.
+
+    Records are passed through untouched; dicts are normalised on the fly.
+    Lets the filtering functions accept either form while returning the
+    caller's own objects.
+
+    Args:
+        transactions: Transaction dicts and/or TransactionRecords
+
+    Yields:
+        Tuples of (original transaction, record). Record is None if a dict
+        has an invalid transactionDateTime.
+    """
+    for txn in transactions:
+        if not isinstance(txn, dict):
+            yield txn, txn
+            continue
+        try:
+            yield txn, normalize_transaction(txn)
+        except ValueError:
+            yield txn, None
 
 
 def parse_transaction_date(transaction_datetime: str) -> date:
@@ -39,7 +225,7 @@ def parse_transaction_date(transaction_datetime: str) -> date:
         # Extract just the date portion (ignore time)
         return dt.date()
 
-    except (ValueError, AttributeError) as e:
+    except (ValueError, AttributeError, TypeError) as e:
         raise ValueError(
             f"Failed to parse transaction datetime: '{transaction_datetime}'. "
             f"Expected ISO 8601 format (YYYY-MM-DDTHH:MM:SS+TZ). Error: {e}"
@@ -47,11 +233,11 @@ def parse_transaction_date(transaction_datetime: str) -> date:
 
 
 def filter_transactions(
-    transactions: List[Dict[str, Any]],
+    transactions: List[TransactionLike],
     target_station: str,
     start_date: date,
     end_date: date
-) -> List[Dict[str, Any]]:
+) -> List[TransactionLike]:
     """Filter transactions by station, type, and date range.
 
     Filters transaction list to only include:
@@ -60,14 +246,15 @@ def filter_transactions(
     - Transactions within date range [start_date, end_date] (inclusive bounds)
 
     Args:
-        transactions: List of transaction dictionaries from API
+        transactions: List of transaction dictionaries from API, or
+                     TransactionRecords from normalize_transactions()
         target_station: Exact station name to match (case-sensitive)
                        (e.g., "Heathmont Station")
         start_date: Start date for filtering (inclusive)
         end_date: End date for filtering (inclusive)
 
     Returns:
-        Filtered list of transaction dictionaries matching all criteria
+        Filtered list of the input transactions (dicts or records) matching all criteria
 
     Example:
         >>> transactions = [
@@ -82,39 +269,55 @@ def filter_transactions(
         1  # Only the "Touch off" transaction
     """
     filtered = []
+    invalid_count = 0
+    first_invalid = None
+    start_ordinal = start_date.toordinal()
+    end_ordinal = end_date.toordinal()
 
     for txn in transactions:
-        # Filter 1: Exact station name match (case-sensitive)
-        if txn.get("description") != target_station:
-            continue
-
-        # Filter 2: Only "Touch off" transactions
-        if txn.get("transactionType") != "Touch off":
-            continue
-
-        # Filter 3: Date range (inclusive bounds)
-        try:
-            txn_date = parse_transaction_date(txn.get("transactionDateTime", ""))
+        if isinstance(txn, dict):
+            # Check station and type on the dict first so irrelevant
+            # transactions are never parsed
+            if txn.get("description") != target_station or txn.get("transactionType") != "Touch off":
+                continue
+            try:
+                date_ordinal = parse_transaction_date(txn.get("transactionDateTime", "")).toordinal()
+            except ValueError:
+                # Skip transactions with invalid date format (reported once below)
+                if not invalid_count:
+                    first_invalid = txn.get("transactionDateTime")
+                invalid_count += 1
+                continue
+        else:
+            # Filter 1: Exact station name match (case-sensitive)
+            if txn.station != target_station:
+                continue
 
-            # Check if within range (inclusive)
-            if not (start_date <= txn_date <= end_date):
+            # Filter 2: Only "Touch off" transactions
+            if txn.txn_type != TransactionType.TOUCH_OFF:
                 continue
 
-        except ValueError:
-            # Skip transactions with invalid date format
-            print(f"  Warning: Skipping transaction with invalid date: {txn.get('transactionDateTime')}")
+            date_ordinal = txn.date_ordinal
+
+        # Filter 3: Date range (inclusive bounds)
+        if not (start_ordinal <= date_ordinal <= end_ordinal):
             continue
 
         # All filters passed - include this transaction
         filtered.append(txn)
 
+    if invalid_count:
+        logger.warning("  Warning: Skipped %d transaction(s) with invalid date (first: %r)",
+                       invalid_count, first_invalid)
+
     return filtered
 
 
 def calculate_attendance_days(
-    transactions: List[Dict[str, Any]],
+    transactions: List[TransactionLike],
     skip_dates: List[date],
-    vic_holidays: holidays.HolidayBase
+    vic_holidays: "holidays.HolidayBase",
+    calendar: Optional[WorkingDayCalendar] = None
 ) -> List[str]:
     """Calculate attendance days from filtered transactions.
 
@@ -129,10 +332,12 @@ def calculate_attendance_days(
     If a working day has >= 1 "Touch off" transaction, it counts as attended.
 
     Args:
-        transactions: List of filtered transaction dictionaries (already filtered by
-                     station, type, and date range)
+        transactions: List of filtered transaction dictionaries or TransactionRecords
+                     (already filtered by station, type, and date range)
         skip_dates: List of user skip dates as date objects
         vic_holidays: Melbourne VIC holidays object from holidays package
+        calendar: Precompiled WorkingDayCalendar for the user (optional). When
+                 given, it is used instead of skip_dates/vic_holidays.
 
     Returns:
         List of ISO date strings (YYYY-MM-DD) representing attendance days,
@@ -149,29 +354,45 @@ def calculate_attendance_days(
         >>> attendance
         ['2025-05-19', '2025-05-20']  # Only working days, no duplicates
     """
-    # Step 1: Extract dates from transactions
-    transaction_dates = []
-    for txn in transactions:
-        try:
-            txn_date = parse_transaction_date(txn.get("transactionDateTime", ""))
-            transaction_dates.append(txn_date)
-        except ValueError:
-            # Skip transactions with invalid dates
-            continue
+    # Step 1: Extract unique dates from transactions (skip invalid dates)
+    transaction_ordinals = {
+        record.date_ordinal
+        for _, record in iter_transaction_records(transactions)
+        if record is not None
+    }
+
+    # Step 2: Sort in chronological order
+    unique_dates = sorted(date.fromordinal(ordinal) for ordinal in transaction_ordinals)
+
+    # Step 3: Filter to working days only (each unique date checked once)
+    if calendar is not None:
+        working_days = [day for day in unique_dates if calendar.is_working_day(day)]
+    else:
+        skip_date_set = set(skip_dates)
+        working_days = [
+            day for day in unique_dates if is_working_day(day, skip_date_set, vic_holidays)
+        ]
+
+    # Step 4: Convert to ISO date strings (YYYY-MM-DD)
+    attendance_days = [day.isoformat() for day in working_days]
 
-    # Step 2: Filter to working days only
-    working_days = []
-    for txn_date in transaction_dates:
-        if is_working_day(txn_date, skip_dates, vic_holidays):
-            working_days.append(txn_date)
+    return attendance_days
 
-    # Step 3: Remove duplicates (convert to set, then back to list)
-    unique_working_days = list(set(working_days))
 
-    # Step 4: Sort in chronological order
-    unique_working_days.sort()
+def latest_transaction_datetime(transactions: Iterable[TransactionLike]) -> Optional[datetime]:
+    """Return the latest transaction datetime, compared by actual instant.
 
-    # Step 5: Convert to ISO date strings (YYYY-MM-DD)
-    attendance_days = [day.strftime('%Y-%m-%d') for day in unique_working_days]
+    Args:
+        transactions: Transaction dicts and/or TransactionRecords
 
-    return attendance_days
+    Returns:
+        Latest datetime in its original UTC offset, or None if there are no
+        transactions with a valid datetime
+    """
+    latest = None
+
+    for _, record in iter_transaction_records(transactions):
+        if record is not None and (latest is None or record.epoch > latest.epoch):
+            latest = record
+
+    return latest.local_datetime() if latest is not None else None
@@ -0,0 +1,237 @@
+"""Streaming user manifests and secrets files for Myki Attendance Tracker.
+
+For large rollouts, users can be listed in a manifest instead of the unified
+config's `users` object. A manifest is read one row at a time, and each row is
+validated as it is read, so loading stays linear in the number of users.
+
+JSONL (.jsonl) - one user object per line, keyed by `user`:
+
+    {"user": "koustubh", "targetStation": "Heathmont Station", "startDate": "2025-04-15",
+     "skipDates": ["2025-06-20"]}
+
+CSV (.csv) - a header row, one user per row; list columns are ';'-separated:
+
+    user,targetStation,startDate,endDate,skipDates,manualAttendanceDates,username
+    koustubh,Heathmont Station,2025-04-15,,2025-03-15;2025-06-20,2025-05-10,
+
+Empty cells are left out, blank lines (and JSONL lines starting with '#') are
+skipped, and fields starting with '_' are comments. Credentials come from the
+environment as for the unified config, or from a secrets file with the same
+formats and the columns user,username,card_number,password (MYKI_SECRETS_FILE).
+"""
+
+import csv
+import os
+import stat
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import json_codec
+from config_manager import (
+    CREDENTIAL_FIELDS,
+    EnvSecretSource,
+    TrackerConfig,
+    UserSettings,
+    missing_credentials_error,
+    compile_user_entry,
+    resolve_user_credentials
+)
+from run_log import get_logger
+
+
+logger = get_logger(__name__)
+
+
+# File suffixes read as manifests by config_manager.load_tracker_config()
+MANIFEST_SUFFIXES = (".jsonl", ".csv")
+
+# CSV columns holding date lists
+_LIST_COLUMNS = ("skipDates", "manualAttendanceDates")
+
+# Missing secrets listed in the error before it is truncated
+_MISSING_SHOWN = 20
+
+
+def is_manifest(path: str) -> bool:
+    """Check whether a config path is a JSONL or CSV manifest (by suffix)."""
+    return Path(path).suffix.lower() in MANIFEST_SUFFIXES
+
+
+def iter_rows(path: str) -> Iterator[Tuple[int, Dict]]:
+    """Stream the rows of a JSONL or CSV file.
+
+    Args:
+        path: Path to a .jsonl or .csv file
+
+    Yields:
+        Tuples (line number, row dictionary). CSV rows only hold non-empty cells.
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        ValueError: If a row is malformed
+    """
+    if Path(path).suffix.lower() == ".csv":
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                if None in row:
+                    raise ValueError(f"{path}:{reader.line_num}: more cells than header columns")
+                row = {key.strip(): value.strip() for key, value in row.items() if value and value.strip()}
+                if row:
+                    yield reader.line_num, row
+        return
+
+    with open(path, 'rb') as f:
+        for line_num, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith(b'#'):
+                continue
+            try:
+                row = json_codec.loads(line)
+            except json_codec.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_num}: invalid JSON ({e})")
+            if not isinstance(row, dict):
+                raise ValueError(f"{path}:{line_num}: expected a JSON object per line")
+            yield line_num, row
+
+
+def _user_entry(path: str, line_num: int, row: Dict) -> Tuple[str, Dict]:
+    """Split a manifest row into (config key, user config)."""
+    username = row.get("user")
+    if not isinstance(username, str) or not username or username.startswith("_"):
+        raise ValueError(f"{path}:{line_num}: missing or invalid 'user'")
+
+    config = {key: value for key, value in row.items() if key != "user" and not key.startswith("_")}
+    for column in _LIST_COLUMNS:
+        if isinstance(config.get(column), str):
+            config[column] = [d.strip() for d in config[column].split(";") if d.strip()]
+    return username, config
+
+
+def iter_manifest(path: str) -> Iterator[Tuple[str, Dict, UserSettings]]:
+    """Stream and validate the users of a manifest.
+
+    Args:
+        path: Path to a .jsonl or .csv manifest
+
+    Yields:
+        Tuples (config key, user config, compiled UserSettings), in file order
+
+    Raises:
+        FileNotFoundError: If the manifest doesn't exist
+        ValueError: If a row is invalid or a user appears twice (with its line number)
+    """
+    seen = set()
+    for line_num, row in iter_rows(path):
+        username, config = _user_entry(path, line_num, row)
+        if username in seen:
+            raise ValueError(f"{path}:{line_num}: duplicate user '{username}'")
+        seen.add(username)
+
+        try:
+            settings = compile_user_entry(username, config)
+        except ValueError as e:
+            raise ValueError(f"{path}:{line_num}: {e}")
+        yield username, config, settings
+
+
+class FileSecretSource:
+    """Credentials from a JSONL or CSV secrets file (user,username,card_number,password)."""
+
+    hint = "Add a row per user with user,username,card_number,password to the secrets file."
+
+    def __init__(self, path: str):
+        """Read the secrets file once (rows are indexed by user).
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+            ValueError: If a row is malformed or a user appears twice
+        """
+        self.path = path
+        self.description = f"entries in secrets file {path}"
+        self._secrets: Dict[str, Dict[str, str]] = {}
+
+        mode = os.stat(path).st_mode
+        if os.name == 'posix' and mode & (stat.S_IRWXG | stat.S_IRWXO):
+            logger.warning("WARNING: Secrets file %s is readable by other users (chmod 600 %s)", path, path)
+
+        for line_num, row in iter_rows(path):
+            username = row.get("user")
+            if not isinstance(username, str) or not username:
+                raise ValueError(f"{path}:{line_num}: missing or invalid 'user'")
+            if username in self._secrets:
+                raise ValueError(f"{path}:{line_num}: duplicate user '{username}'")
+            self._secrets[username] = {
+                field: str(row[field]) for field in CREDENTIAL_FIELDS if row.get(field) is not None
+            }
+
+    def secret_name(self, config_key: str, field: str) -> str:
+        """How a missing credential field is reported."""
+        return f"{field} for user '{config_key}'"
+
+    def lookup(self, config_key: str) -> Dict[str, Optional[str]]:
+        """Credential fields for a config key (None where missing)."""
+        row = self._secrets.get(config_key, {})
+        return {field: row.get(field) for field in CREDENTIAL_FIELDS}
+
+
+def open_secret_source(secrets_path: Optional[str] = None):
+    """Secret source for a run.
+
+    Args:
+        secrets_path: Secrets file (default: MYKI_SECRETS_FILE environment variable)
+
+    Returns:
+        FileSecretSource if a secrets file is set, otherwise EnvSecretSource
+    """
+    secrets_path = secrets_path or os.getenv('MYKI_SECRETS_FILE')
+    if secrets_path:
+        return FileSecretSource(secrets_path)
+    return EnvSecretSource()
+
+
+def load_manifest_config(manifest_path: str, secrets=None) -> TrackerConfig:
+    """Load, validate and resolve credentials for a manifest in one pass.
+
+    Args:
+        manifest_path: Path to a .jsonl or .csv manifest
+        secrets: Secret source (default: open_secret_source())
+
+    Returns:
+        TrackerConfig ready to pass to run_tracking()
+
+    Raises:
+        FileNotFoundError: If the manifest (or secrets file) doesn't exist
+        ValueError: If a row is invalid, the manifest is empty or credentials are missing
+    """
+    if not Path(manifest_path).exists():
+        raise FileNotFoundError(
+            f"Configuration file not found: {manifest_path}\n"
+            f"  Create the manifest first (see user_manifest.py for the format)"
+        )
+
+    secrets = secrets or open_secret_source()
+    users: Dict[str, Dict] = {}
+    settings: Dict[str, UserSettings] = {}
+    credentials: Dict[str, Dict[str, str]] = {}
+    missing: List[str] = []
+
+    for username, config, user_settings in iter_manifest(manifest_path):
+        users[username] = config
+        settings[username] = user_settings
+        user_credentials, user_missing = resolve_user_credentials(username, config, secrets)
+        missing.extend(user_missing)
+        if user_credentials is not None:
+            credentials[username] = user_credentials
+
+    if not users:
+        raise ValueError(
+            f"Invalid manifest: no users in {manifest_path}\n"
+            f"  Add at least one user to track"
+        )
+    if missing:
+        raise missing_credentials_error(missing, secrets, limit=_MISSING_SHOWN)
+
+    logger.info("Loaded manifest from: %s", Path(manifest_path).absolute())
+    logger.info("  Users to track: %d (validated, credentials from %s)", len(users), secrets.description)
+    return TrackerConfig(users=users, credentials=credentials, config_path=manifest_path, settings=settings)
@@ -3,17 +3,44 @@
 Handles calculation of working days, excluding weekends, public holidays, and user skip dates.
 """
 
+import hashlib
+from bisect import bisect_left, bisect_right
 from datetime import date, datetime
-from typing import List
+from typing import TYPE_CHECKING, List, Iterable, Iterator, Optional, Tuple
 
-import holidays
+if TYPE_CHECKING:
+    import holidays
 
 
-# Initialize Melbourne VIC holidays at module level for reuse
-VIC_HOLIDAYS = holidays.country_holidays('AU', subdiv='VIC')
+# Melbourne VIC holidays, built on first use (see get_vic_holidays / VIC_HOLIDAYS)
+_vic_holidays = None
 
 
-def is_working_day(date_obj: date, skip_dates: List[date], vic_holidays: holidays.HolidayBase) -> bool:
+def get_vic_holidays() -> "holidays.HolidayBase":
+    """Melbourne VIC public holidays, shared by all users.
+
+    The holidays package is imported on the first call, so modules that only
+    import working_days (offline tools, tests) don't pay its import cost.
+    """
+    global _vic_holidays
+    if _vic_holidays is None:
+        import holidays
+        _vic_holidays = holidays.country_holidays('AU', subdiv='VIC')
+    return _vic_holidays
+
+
+def __getattr__(name: str):
+    # Keeps `from working_days import VIC_HOLIDAYS` working while staying lazy
+    if name == "VIC_HOLIDAYS":
+        return get_vic_holidays()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# date.toordinal() of a Monday; (ordinal - _MONDAY_ORDINAL) % 7 == weekday()
+_MONDAY_ORDINAL = date(2024, 1, 1).toordinal()
+
+
+def is_working_day(date_obj: date, skip_dates: List[date], vic_holidays: "holidays.HolidayBase") -> bool:
     """Determine if a given date is a working day.
 
     Working day is defined as:
@@ -30,7 +57,7 @@ def is_working_day(date_obj: date, skip_dates: List[date], vic_holidays: holiday
         True if working day, False otherwise
     """
     # Check if it's a weekday (Monday=0 to Friday=4)
-    is_weekday = date_obj.weekday() in range(0, 5)
+    is_weekday = date_obj.weekday() < 5
 
     # Check if it's NOT a public holiday
     is_not_holiday = date_obj not in vic_holidays
@@ -42,6 +69,191 @@ def is_working_day(date_obj: date, skip_dates: List[date], vic_holidays: holiday
     return is_weekday and is_not_holiday and is_not_skipped
 
 
+class WorkingDayCalendar:
+    """Precompiled working-day lookups for one user's period.
+
+    Built once per user: holds skip dates and public holidays as a frozenset of
+    date ordinals, so each working-day check is a weekday test plus one set
+    lookup. Holidays are expanded up front for every year in [start_date,
+    end_date]; dates outside those years extend the coverage on first use.
+
+    Example:
+        >>> calendar = WorkingDayCalendar(date(2025, 1, 1), date(2025, 12, 31),
+        ...                               [date(2025, 3, 4)], get_vic_holidays())
+        >>> calendar.is_working_day(date(2025, 3, 4))
+        False
+        >>> calendar.count_between(date(2025, 1, 1), date(2025, 1, 31))
+        21
+    """
+
+    __slots__ = (
+        "start_date",
+        "end_date",
+        "_vic_holidays",
+        "_skip_ordinals",
+        "_first_year",
+        "_last_year",
+        "_non_working",
+        "_non_working_weekdays",
+    )
+
+    def __init__(
+        self,
+        start_date: date,
+        end_date: date,
+        skip_dates: Iterable[date] = (),
+        vic_holidays: Optional["holidays.HolidayBase"] = None
+    ):
+        """Initialize the calendar.
+
+        Args:
+            start_date: Period start date (first year to pre-expand holidays for)
+            end_date: Period end date (last year to pre-expand holidays for)
+            skip_dates: User skip dates as date objects
+            vic_holidays: Holidays object (default: get_vic_holidays())
+        """
+        self.start_date = start_date
+        self.end_date = end_date
+        self._vic_holidays = vic_holidays if vic_holidays is not None else get_vic_holidays()
+        self._skip_ordinals = frozenset(d.toordinal() for d in skip_dates)
+        self._first_year = start_date.year
+        self._last_year = end_date.year
+        self._compile()
+
+    def _compile(self) -> None:
+        """Expand holidays for the covered years and rebuild the ordinal sets."""
+        for year in range(self._first_year, self._last_year + 1):
+            # Membership test makes the holidays object populate the whole year
+            date(year, 1, 1) in self._vic_holidays
+
+        holiday_ordinals = {
+            d.toordinal() for d in self._vic_holidays.keys()
+            if self._first_year <= d.year <= self._last_year
+        }
+        self._non_working = frozenset(holiday_ordinals | self._skip_ordinals)
+        self._non_working_weekdays = sorted(
+            o for o in self._non_working if date.fromordinal(o).weekday() < 5
+        )
+
+    def _cover(self, first_year: int, last_year: int) -> None:
+        """Extend holiday coverage to include [first_year, last_year]."""
+        if first_year < self._first_year or last_year > self._last_year:
+            self._first_year = min(first_year, self._first_year)
+            self._last_year = max(last_year, self._last_year)
+            self._compile()
+
+    def cover(self, start_date: date, end_date: date) -> None:
+        """Make sure holidays are expanded for every year in [start_date, end_date]."""
+        self._cover(start_date.year, end_date.year)
+
+    @property
+    def skip_ordinals(self) -> frozenset:
+        """Skip dates as a frozenset of date ordinals."""
+        return self._skip_ordinals
+
+    @property
+    def non_working_ordinals(self) -> frozenset:
+        """Holiday and skip dates (covered years) as a frozenset of date ordinals."""
+        return self._non_working
+
+    def is_working_day(self, date_obj: date) -> bool:
+        """Determine if a date is a working day (same rules as is_working_day()).
+
+        Args:
+            date_obj: Date to check
+
+        Returns:
+            True if weekday AND NOT holiday AND NOT skipped, False otherwise
+        """
+        if date_obj.weekday() >= 5:
+            return False
+        if not self._first_year <= date_obj.year <= self._last_year:
+            self._cover(date_obj.year, date_obj.year)
+        return date_obj.toordinal() not in self._non_working
+
+    def count_between(self, start_date: date, end_date: date) -> int:
+        """Count working days in [start_date, end_date] (inclusive).
+
+        Counts weekdays arithmetically and subtracts holidays/skip dates that fall
+        on weekdays, so cost is independent of the range length.
+
+        Args:
+            start_date: Range start (inclusive)
+            end_date: Range end (inclusive)
+
+        Returns:
+            Number of working days; 0 if end_date is before start_date
+        """
+        if end_date < start_date:
+            return 0
+
+        self._cover(start_date.year, end_date.year)
+        first, last = start_date.toordinal(), end_date.toordinal()
+
+        full_weeks, remainder = divmod(last - first + 1, 7)
+        weekdays = full_weeks * 5
+        first_weekday = start_date.weekday()
+        weekdays += sum(1 for offset in range(remainder) if (first_weekday + offset) % 7 < 5)
+
+        excluded = (bisect_right(self._non_working_weekdays, last)
+                    - bisect_left(self._non_working_weekdays, first))
+
+        return weekdays - excluded
+
+    def iter_months(self, start_date: date, end_date: date) -> Iterator[Tuple[str, int]]:
+        """Iterate calendar months overlapping [start_date, end_date].
+
+        Args:
+            start_date: Range start (inclusive)
+            end_date: Range end (inclusive)
+
+        Yields:
+            Tuples of (month key "YYYY-MM", working days in that month within the range)
+        """
+        year, month = start_date.year, start_date.month
+
+        while (year, month) <= (end_date.year, end_date.month):
+            month_start = max(date(year, month, 1), start_date)
+            next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+            month_end = min(date.fromordinal(date(next_year, next_month, 1).toordinal() - 1), end_date)
+
+            yield f"{year:04d}-{month:02d}", self.count_between(month_start, month_end)
+
+            year, month = next_year, next_month
+
+    def fingerprint(self, start_date: date, end_date: date) -> str:
+        """Hash of everything that determines working days in [start_date, end_date].
+
+        Covers the range itself and the holidays/skip dates that fall on weekdays
+        within it, so two calendars with the same fingerprint give the same
+        working-day counts for the range. Used to detect when stored statistics
+        are stale (config, holidays or period changed).
+
+        Args:
+            start_date: Range start (inclusive)
+            end_date: Range end (inclusive)
+
+        Returns:
+            Hex digest string
+        """
+        self._cover(start_date.year, end_date.year)
+        first, last = start_date.toordinal(), end_date.toordinal()
+        excluded = self._non_working_weekdays[
+            bisect_left(self._non_working_weekdays, first):bisect_right(self._non_working_weekdays, last)
+        ]
+
+        payload = f"{first}:{last}:" + ",".join(map(str, excluded))
+        return hashlib.sha256(payload.encode("ascii")).hexdigest()[:16]
+
+    def iter_working_days(self, start_date: date, end_date: date) -> Iterator[date]:
+        """Iterate working days in [start_date, end_date] in chronological order."""
+        self._cover(start_date.year, end_date.year)
+
+        for ordinal in range(start_date.toordinal(), end_date.toordinal() + 1):
+            if (ordinal - _MONDAY_ORDINAL) % 7 < 5 and ordinal not in self._non_working:
+                yield date.fromordinal(ordinal)
+
+
 def parse_skip_dates(skip_dates_str: List[str]) -> List[date]:
     """Parse skip dates from ISO string format to date objects.
 
@@ -0,0 +1,65 @@
+"""Tests for atomic, write-if-changed output persistence."""
+
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from src.output_manager import save_output, load_existing_output, content_hash
+
+
+def _output():
+    return {"user1": {"attendanceDays": ["2025-05-01"], "lastUpdated": "2025-05-01T00:00:00Z"}}
+
+
+@pytest.fixture
+def paths(tmp_path):
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"users": {"user1": {}}}))
+    return tmp_path / "attendance.json", str(config_path)
+
+
+class TestAtomicOutput:
+    """Tests for save_output atomic writes and content hashing."""
+
+    def test_content_hash_ignores_run_timestamps(self):
+        """Test: generatedAt and lastUpdated do not change the hash; data does."""
+        first = dict(_output(), metadata={"generatedAt": "2025-05-01T00:00:00Z", "totalUsers": 1})
+        second = {"metadata": {"totalUsers": 1, "generatedAt": "2025-06-01T00:00:00Z"},
+                  "user1": dict(_output()["user1"], lastUpdated="2025-06-01T00:00:00Z")}
+
+        assert content_hash(first) == content_hash(second)
+        second["user1"]["attendanceDays"] = ["2025-05-02"]
+        assert content_hash(first) != content_hash(second)
+
+    def test_unchanged_output_is_not_rewritten(self, paths):
+        """Test: Saving the loaded data again (new lastUpdated only) skips the write."""
+        output_path, config_path = paths
+        assert save_output(_output(), str(output_path), config_path) is True
+        before = output_path.read_bytes()
+
+        loaded = load_existing_output(str(output_path))
+        loaded["user1"]["lastUpdated"] = "2099-01-01T00:00:00Z"
+
+        assert save_output(loaded, str(output_path), config_path) is False
+        assert output_path.read_bytes() == before
+
+        loaded["user1"]["attendanceDays"].append("2025-05-02")
+        assert save_output(loaded, str(output_path), config_path, fsync=True) is True
+        assert json.loads(output_path.read_text())["user1"]["attendanceDays"][-1] == "2025-05-02"
+
+    def test_failed_write_keeps_previous_file(self, paths):
+        """Test: An error mid-write leaves the old file intact and no temp files."""
+        output_path, config_path = paths
+        save_output(_output(), str(output_path), config_path)
+        before = output_path.read_bytes()
+
+        changed = _output()
+        changed["user1"]["attendanceDays"] = ["2025-05-03"]
+        with patch("src.output_manager.os.replace", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                save_output(changed, str(output_path), config_path)
+
+        assert output_path.read_bytes() == before
+        assert sorted(os.listdir(output_path.parent)) == ["attendance.json", "config.json"]
@@ -0,0 +1,84 @@
+"""Tests for closed-month attendance history compaction."""
+
+from datetime import date
+
+from src.attendance_history import (
+    add_days,
+    compact_days,
+    expand_history,
+    history_bounds,
+    history_contains,
+)
+from src.output_manager import update_user_output, calculate_statistics
+from src.working_days import VIC_HOLIDAYS
+
+
+class TestAttendanceHistory:
+    """Tests for month bitmask summaries."""
+
+    def test_round_trip(self):
+        """Test: Days survive compaction and expansion unchanged."""
+        days = ["2025-01-01", "2025-01-31", "2025-02-14", "2025-03-03"]
+
+        history, remaining = compact_days({}, days, before=date(2025, 3, 1))
+
+        assert remaining == ["2025-03-03"]
+        assert history["2025-01"] == {"mask": (1 << 0) | (1 << 30), "count": 2}
+        assert expand_history(history) == days[:3]
+        assert history_bounds(history) == ("2025-01-01", "2025-02-14")
+        assert history_contains(history, "2025-01-31")
+        assert not history_contains(history, "2025-01-30")
+
+    def test_add_days_does_not_modify_input(self):
+        """Test: Summaries are replaced, never mutated in place."""
+        history = add_days({}, ["2025-01-02"])
+        entry = history["2025-01"]
+
+        updated = add_days(history, ["2025-01-03", "2025-01-02"])
+
+        assert entry == {"mask": 0b10, "count": 1}
+        assert updated["2025-01"] == {"mask": 0b110, "count": 2}
+        assert add_days(updated, ["2025-01-03"]) is updated
+
+
+class TestCompactedOutput:
+    """Tests for update_user_output with closed-month compaction."""
+
+    def _update(self, output, new_days, compact_before=None):
+        return update_user_output(
+            existing_output=output,
+            username="user1",
+            new_attendance_days=new_days,
+            latest_txn_datetime=None,
+            target_station="Test Station",
+            start_date=date(2025, 1, 1),
+            end_date=date(2025, 4, 30),
+            skip_dates=[],
+            vic_holidays=VIC_HOLIDAYS,
+            compact_before=compact_before
+        )
+
+    def test_closed_months_compacted_and_statistics_unchanged(self):
+        """Test: Only the open month stays a list and statistics match the flat list."""
+        days = ["2025-01-06", "2025-02-03", "2025-02-04", "2025-04-01"]
+
+        output = self._update({}, days, compact_before=date(2025, 4, 1))
+        user = output["user1"]
+
+        assert user["attendanceDays"] == ["2025-04-01"]
+        assert sorted(user["attendanceHistory"]) == ["2025-01", "2025-02"]
+        expected = calculate_statistics(days, date(2025, 1, 1), date(2025, 4, 30), [], VIC_HOLIDAYS)
+        assert user["statistics"] == expected
+
+    def test_late_days_merge_into_closed_months(self):
+        """Test: A new day in a compacted month goes into its summary, not the list."""
+        output = self._update({}, ["2025-01-06", "2025-04-01"], compact_before=date(2025, 4, 1))
+
+        output = self._update(output, ["2025-01-07", "2025-01-06", "2025-04-02"])
+        user = output["user1"]
+
+        assert user["attendanceDays"] == ["2025-04-01", "2025-04-02"]
+        assert user["attendanceHistory"]["2025-01"]["count"] == 2
+        assert user["statistics"]["daysAttended"] == 4
+        assert user["statistics"]["firstAttendance"] == "2025-01-06"
+        assert user["statistics"]["lastAttendance"] == "2025-04-02"
@@ -0,0 +1,73 @@
+"""Tests for the columnar Parquet / Arrow IPC export."""
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+ds = pytest.importorskip("pyarrow.dataset")
+
+from src.columnar_export import attendance_table, transactions_table, export_columnar
+from src.transaction_processor import normalize_transactions
+
+
+OUTPUT = {
+    "metadata": {"totalUsers": 2},
+    "alice": {
+        "attendanceDays": ["2025-01-06", "2025-01-07"],
+        "attendanceHistory": {"2024-12": {"mask": 1 << 1, "count": 1}},
+        "manualAttendanceDates": ["2025-01-07", "2025-01-08"],
+        "targetStation": "Heathmont Station",
+    },
+    "bob": {"attendanceDays": ["2025-01-06"], "targetStation": "Melbourne Central"},
+}
+
+
+class TestColumnarExport:
+    """Tests for attendance/transaction tables and the partitioned export."""
+
+    def test_attendance_table_types_and_flags(self):
+        """Test: One typed row per attended day with PTV/manual flags."""
+        table = attendance_table(OUTPUT)
+
+        assert table.schema.field("date").type == pa.date32()
+        assert pa.types.is_dictionary(table.schema.field("station").type)
+        assert table.schema.field("ptv").type == pa.bool_()
+        rows = [(r["user"], r["date"].isoformat(), r["ptv"], r["manual"]) for r in table.to_pylist()]
+        assert rows == [
+            ("alice", "2024-12-02", True, False),
+            ("alice", "2025-01-06", True, False),
+            ("alice", "2025-01-07", True, True),
+            ("alice", "2025-01-08", False, True),
+            ("bob", "2025-01-06", True, False),
+        ]
+
+    def test_transactions_table(self):
+        """Test: Transactions keep UTC instant, original offset, local date and type."""
+        records = normalize_transactions([
+            {"transactionType": "Touch off", "transactionDateTime": "2025-01-06T17:45:00+11:00",
+             "description": "Heathmont Station"},
+            {"transactionType": "Top up", "transactionDateTime": "2025-01-06T08:00:00+11:00",
+             "description": "Heathmont Station"},
+        ])
+
+        rows = transactions_table({"alice": records}).to_pylist()
+
+        assert [r["type"] for r in rows] == ["Other", "Touch off"]  # ordered by time
+        assert rows[1]["utc_offset"] == 11 * 3600
+        assert rows[1]["timestamp"].isoformat() == "2025-01-06T06:45:00+00:00"
+        assert rows[1]["date"].isoformat() == "2025-01-06"
+
+    @pytest.mark.parametrize("fmt, dataset_format", [("parquet", "parquet"), ("arrow", "ipc")])
+    def test_export_partitions_by_user_and_year(self, tmp_path, fmt, dataset_format):
+        """Test: Datasets are hive-partitioned; a re-export drops partitions of removed users."""
+        export_dir = tmp_path / "export"
+
+        written = export_columnar(OUTPUT, str(export_dir), fmt)
+
+        assert (export_dir / "attendance" / "user=alice" / "year=2024").is_dir()
+        dataset = ds.dataset(written["attendance"], format=dataset_format, partitioning="hive")
+        assert dataset.to_table(filter=ds.field("year") == 2025).num_rows == 4
+
+        export_columnar({"bob": OUTPUT["bob"]}, str(export_dir), fmt)
+
+        assert not (export_dir / "attendance" / "user=alice").exists()
+        assert "transactions" not in written
@@ -0,0 +1,137 @@
+"""Tests for the append-only attendance event log and its compaction."""
+
+import json
+
+from src.event_log import (
+    output_events,
+    append_events,
+    read_events,
+    replay_events,
+    compact_event_log,
+    record_run,
+)
+
+
+def _user(days, history=None, skip=None, statistics=None, last_updated="2025-05-01T00:00:00Z"):
+    user = {
+        "attendanceDays": days,
+        "skipDates": skip or [],
+        "manualAttendanceDates": [],
+        "targetStation": "Test Station",
+        "latestProcessedDate": None,
+        "lastUpdated": last_updated,
+        "statistics": statistics or {"daysAttended": len(days)},
+    }
+    if history:
+        user["attendanceHistory"] = history
+    return user
+
+
+PREVIOUS = {
+    "metadata": {"totalUsers": 1},
+    "alice": _user(["2025-05-01"], history={"2025-04": {"mask": 3, "count": 2}}, skip=["2025-05-05"]),
+}
+CURRENT = {
+    "metadata": {"totalUsers": 2},
+    "alice": _user(["2025-05-01", "2025-05-02"], history={"2025-04": {"mask": 7, "count": 3}},
+                   skip=["2025-05-06"], statistics={"daysAttended": 5},
+                   last_updated="2025-05-02T00:00:00Z"),
+    "bob": _user(["2025-05-02"], last_updated="2025-05-02T00:00:00Z"),
+}
+
+
+class TestEventLog:
+    """Tests for event_log diffing, appending, replay and compaction."""
+
+    def test_output_events_describe_only_changes(self):
+        """Test: New days (list and history), skip changes, statistics and fields become events."""
+        events = output_events(PREVIOUS, CURRENT)
+        alice = [(e["type"], e.get("date")) for e in events if e["user"] == "alice"]
+
+        assert alice == [
+            ("day_attended", "2025-04-03"),
+            ("day_attended", "2025-05-02"),
+            ("skip_date_added", "2025-05-06"),
+            ("skip_date_removed", "2025-05-05"),
+            ("statistics_recomputed", None),
+        ]
+        assert [e["type"] for e in events if e["user"] == "bob"][0] == "day_attended"
+        assert output_events(CURRENT, CURRENT) == []
+
+    def test_record_run_replays_to_current_output(self, tmp_path):
+        """Test: A new log starts with a snapshot; replaying it reproduces the run's output."""
+        log_path = tmp_path / "events.jsonl"
+
+        record_run(str(log_path), PREVIOUS, CURRENT, compact_bytes=0)
+
+        events = read_events(str(log_path))
+        assert events[0]["type"] == "snapshot"
+        assert len({e["runId"] for e in events}) == 1
+        replayed = replay_events(events)
+        assert replayed["bob"]["attendanceDays"] == ["2025-05-02"]
+        # lastUpdated is not logged, so it keeps the snapshot's value
+        assert replayed["alice"] == dict(CURRENT["alice"], lastUpdated=PREVIOUS["alice"]["lastUpdated"])
+
+    def test_statistics_events_carry_only_changed_months(self, tmp_path):
+        """Test: statistics_recomputed holds changed totals and months; replay merges them."""
+        def month(key, attended):
+            return {"month": key, "workingDays": 20, "daysAttended": attended,
+                    "daysMissed": 20 - attended, "attendancePercentage": attended * 5.0}
+
+        previous_stats = {"daysAttended": 12, "periodEnd": "2025-05-31",
+                          "monthlyBreakdown": [month("2025-03", 10), month("2025-04", 2)]}
+        current_stats = {"daysAttended": 13, "periodEnd": "2025-05-31",
+                         "monthlyBreakdown": [month("2025-04", 3), month("2025-05", 0)]}
+        previous = {"metadata": {}, "alice": _user([], statistics=previous_stats)}
+        current = {"metadata": {}, "alice": _user([], statistics=current_stats)}
+
+        [event] = output_events(previous, current)
+        assert event["totals"] == {"daysAttended": 13}
+        assert [entry["month"] for entry in event["months"]] == ["2025-04", "2025-05"]
+        assert event["removedMonths"] == ["2025-03"]
+
+        log_path = tmp_path / "events.jsonl"
+        record_run(str(log_path), previous, current, compact_bytes=0)
+        assert replay_events(read_events(str(log_path)))["alice"]["statistics"] == current_stats
+
+    def test_statistics_events_replay_removed_totals(self, tmp_path):
+        """Test: Statistics keys that disappear are listed and removed on replay."""
+        previous_stats = {"daysAttended": 2, "firstAttendance": "2025-05-01", "streak": 2}
+        current_stats = {"daysAttended": 2, "firstAttendance": None}
+        previous = {"metadata": {}, "alice": _user([], statistics=previous_stats)}
+        current = {"metadata": {}, "alice": _user([], statistics=current_stats)}
+
+        [event] = output_events(previous, current)
+        assert event["totals"] == {"firstAttendance": None}
+        assert event["removedTotals"] == ["streak"]
+
+        log_path = tmp_path / "events.jsonl"
+        record_run(str(log_path), previous, current, compact_bytes=0)
+        assert replay_events(read_events(str(log_path)))["alice"]["statistics"] == current_stats
+
+    def test_appends_never_rewrite_and_survive_torn_line(self, tmp_path):
+        """Test: Appends add lines to the end; a line cut short by a crash is skipped."""
+        log_path = tmp_path / "events.jsonl"
+        append_events(str(log_path), [{"type": "day_attended", "user": "bob", "date": "2025-05-01"}])
+        before = log_path.read_bytes()
+        with open(log_path, 'ab') as f:
+            f.write(b'{"type": "day_att')  # crash mid-append
+
+        append_events(str(log_path), [{"type": "day_attended", "user": "bob", "date": "2025-05-02"}])
+
+        assert log_path.read_bytes().startswith(before)
+        assert replay_events(read_events(str(log_path)))["bob"]["attendanceDays"] == ["2025-05-01", "2025-05-02"]
+
+    def test_compaction_keeps_state_in_one_snapshot(self, tmp_path):
+        """Test: Compaction replaces the log with one snapshot event equal to the replayed state."""
+        log_path = tmp_path / "events.jsonl"
+        record_run(str(log_path), PREVIOUS, CURRENT, compact_bytes=0)
+        replayed = replay_events(read_events(str(log_path)))
+
+        compacted = compact_event_log(str(log_path))
+
+        lines = log_path.read_text().splitlines()
+        assert len(lines) == 1
+        assert json.loads(lines[0])["type"] == "snapshot"
+        assert compacted == replayed
+        assert replay_events(read_events(str(log_path))) == replayed
@@ -0,0 +1,83 @@
+"""Tests for incremental statistics maintenance across runs."""
+
+from datetime import date, timedelta
+
+from src.output_manager import update_user_output, calculate_statistics
+from src.working_days import VIC_HOLIDAYS
+
+
+START = date(2025, 1, 1)
+
+
+def _run(output, new_days, end_date, skip_dates=(), manual=None):
+    """Run update_user_output for a single user and return the updated output."""
+    return update_user_output(
+        existing_output=output,
+        username="user1",
+        new_attendance_days=list(new_days),
+        latest_txn_datetime=None,
+        target_station="Test Station",
+        start_date=START,
+        end_date=end_date,
+        skip_dates=list(skip_dates),
+        vic_holidays=VIC_HOLIDAYS,
+        manual_attendance_dates=manual
+    )
+
+
+def _full(output, end_date, skip_dates=(), manual=None):
+    """Statistics recomputed from scratch for the stored attendance days."""
+    return calculate_statistics(
+        output["user1"]["attendanceDays"], START, end_date, list(skip_dates), VIC_HOLIDAYS, manual or []
+    )
+
+
+class TestIncrementalStatistics:
+    """Tests that incremental updates match a full recomputation."""
+
+    def test_daily_runs_match_full_recompute(self):
+        """Test: Daily runs with a moving period end give full-recompute results."""
+        output = {}
+        manual = ["2025-02-03"]
+        end_date = date(2025, 1, 20)
+
+        while end_date <= date(2025, 4, 10):
+            output = _run(output, [end_date.isoformat()] if end_date.weekday() < 5 else [], end_date,
+                          manual=manual)
+            assert output["user1"]["statistics"] == _full(output, end_date, manual=manual)
+            end_date += timedelta(days=3)
+
+        state = output["user1"]["statisticsState"]
+        assert state["periodEnd"] == output["user1"]["statistics"]["periodEnd"]
+        assert state["attendanceDayCount"] == len(output["user1"]["attendanceDays"])
+
+    def test_only_open_months_are_recounted(self):
+        """Test: Closed months are taken from the stored state when the calendar is unchanged."""
+        output = _run({}, ["2025-01-06"], date(2025, 2, 14))
+        state = output["user1"]["statisticsState"]
+        state["workingDays"]["2025-01"] = 99  # marker: must be reused, not recounted
+
+        output = _run(output, ["2025-02-17"], date(2025, 2, 20))
+
+        breakdown = {m["month"]: m for m in output["user1"]["statistics"]["monthlyBreakdown"]}
+        assert breakdown["2025-01"]["workingDays"] == 99
+        assert breakdown["2025-02"]["daysAttended"] == 1
+
+    def test_config_change_forces_rebuild(self):
+        """Test: A new skip date in a closed month invalidates the stored state."""
+        output = _run({}, ["2025-01-06"], date(2025, 3, 31))
+        skip_dates = [date(2025, 1, 7)]
+
+        output = _run(output, [], date(2025, 3, 31), skip_dates=skip_dates)
+
+        assert output["user1"]["statistics"] == _full(output, date(2025, 3, 31), skip_dates=skip_dates)
+
+    def test_edited_attendance_days_force_recount(self):
+        """Test: Counters are rebuilt if attendanceDays no longer match the stored state."""
+        output = _run({}, ["2025-01-06", "2025-01-07"], date(2025, 1, 31))
+        output["user1"]["attendanceDays"] = ["2025-01-06"]  # edited outside the tracker
+
+        output = _run(output, ["2025-01-08"], date(2025, 1, 31))
+
+        assert output["user1"]["statistics"] == _full(output, date(2025, 1, 31))
+        assert output["user1"]["statistics"]["daysAttended"] == 2
@@ -0,0 +1,67 @@
+"""Tests for the JSON codec and its stdlib fallback."""
+
+import io
+import json
+
+import pytest
+
+from src import json_codec
+
+
+SAMPLE = {
+    "user1": {
+        "attendanceDays": ["2025-05-01", "2025-05-02"],
+        "targetStation": "Flinders Street Station",
+        "statistics": {"attendanceRate": 66.67, "totalWorkingDays": 3},
+        "note": "café",
+    },
+    "metadata": {"totalUsers": 1, "empty": {}, "none": None},
+}
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, monkeypatch):
+    """Run each test with orjson (if installed) and with the stdlib fallback."""
+    if request.param == "orjson":
+        if json_codec.orjson is None:
+            pytest.skip("orjson is not installed")
+    else:
+        monkeypatch.setattr(json_codec, "orjson", None)
+    return request.param
+
+
+class TestJsonCodec:
+    """Tests for json_codec encoding and decoding."""
+
+    def test_indent_matches_stdlib_layout(self, backend):
+        """Test: indent=2 output matches json.dumps(indent=2) apart from ASCII escaping."""
+        expected = json.dumps(SAMPLE, indent=2, ensure_ascii=False)
+
+        assert json_codec.dumps(SAMPLE, indent=2) == expected
+        assert json_codec.dumps_bytes(SAMPLE, indent=2) == expected.encode("utf-8")
+
+    def test_compact_and_sorted(self, backend):
+        """Test: Compact output has no spaces; sort_keys orders keys, default keeps insertion order."""
+        assert json_codec.dumps({"b": 1, "a": [1, 2]}) == '{"b":1,"a":[1,2]}'
+        assert json_codec.dumps({"b": 1, "a": [1, 2]}, sort_keys=True) == '{"a":[1,2],"b":1}'
+        assert json_codec.dumps({1: "x"}) == '{"1":"x"}'
+
+    def test_round_trip_and_files(self, backend):
+        """Test: loads accepts str and bytes; load/dump work with text and binary files."""
+        content = json_codec.dumps_bytes(SAMPLE, indent=2)
+        assert json_codec.loads(content) == SAMPLE
+        assert json_codec.loads(content.decode("utf-8")) == SAMPLE
+
+        binary = io.BytesIO()
+        json_codec.dump(SAMPLE, binary)
+        text = io.StringIO()
+        json_codec.dump(SAMPLE, text)
+
+        assert json_codec.load(io.BytesIO(binary.getvalue())) == SAMPLE
+        assert json_codec.load(io.StringIO(text.getvalue())) == SAMPLE
+
+    def test_invalid_json_raises_decode_error(self, backend):
+        """Test: Invalid JSON raises json.JSONDecodeError with either backend."""
+        with pytest.raises(json.JSONDecodeError):
+            json_codec.loads(b"{not json")
+        assert json_codec.backend_name() == backend
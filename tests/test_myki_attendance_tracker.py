@@ -204,6 +204,43 @@ class TestConfigurationLoading:
         effective_skip_dates = get_effective_skip_dates(loaded_config, "testuser")
         assert effective_skip_dates == []
 
+    def test_config_is_compiled_once_into_frozen_settings(self):
+        """Test: Users compile into frozen UserSettings with parsed, conflict-resolved dates."""
+        import dataclasses
+        import pickle
+        from datetime import date
+        from src.config_manager import compile_user_config
+
+        settings = compile_user_config({
+            "_comment": "ignored",
+            "testuser": {
+                "targetStation": "Test Station",
+                "startDate": "2025-01-01",
+                "skipDates": ["2025-01-06", "2025-01-07", "2025-01-06"],
+                "manualAttendanceDates": ["2025-01-09", "2025-01-07"]
+            }
+        })
+
+        user = settings["testuser"]
+        assert list(settings) == ["testuser"]
+        assert user.skip_dates == frozenset({date(2025, 1, 6)})  # manual attendance wins
+        assert user.manual_attendance_dates == ("2025-01-07", "2025-01-09")
+        assert user.end_date is None
+        assert user.effective_end_date(today=date(2025, 3, 1)) == date(2025, 3, 1)
+        assert pickle.loads(pickle.dumps(user)) == user
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            user.target_station = "Other Station"
+
+    def test_tracker_config_compiles_and_validates_users(self):
+        """Test: TrackerConfig built in memory compiles (and so validates) its users."""
+        from src.config_manager import TrackerConfig
+
+        config = TrackerConfig(users={"u": {"targetStation": "X", "startDate": "2025-01-01"}}, credentials={})
+        assert config.settings["u"].target_station == "X"
+
+        with pytest.raises(ValueError, match="startDate"):
+            TrackerConfig(users={"u": {"targetStation": "X", "startDate": "2025/01/01"}}, credentials={})
+
 
 # ============================================================================
 # Task Group 3: Working Days Calculation Logic Tests
@@ -1201,3 +1238,206 @@ class TestMainOrchestration:
         # Clean up temp file
         import os
         os.unlink(config_path)
+
+
+# ============================================================================
+# In-process API: run_tracking()
+# ============================================================================
+
+def _mock_session(transactions):
+    """API client mock returning one page of transactions, then the end-of-pagination 409."""
+    import requests
+
+    def get_transactions(card_number, page):
+        if page == 0:
+            return {"transactions": transactions}
+        response = MagicMock()
+        response.status_code = 409
+        response.json.return_value = {
+            "code": 409,
+            "message": "txnTimestamp: Expected a non-empty value. Got: null"
+        }
+        raise requests.HTTPError(response=response)
+
+    client = MagicMock()
+    client.get_transactions.side_effect = get_transactions
+    return client
+
+
+class TestRunTracking:
+    """Tests for the programmatic run_tracking() API."""
+
+    def _config(self, config_path=None):
+        from src.config_manager import TrackerConfig
+
+        return TrackerConfig(
+            users={"user1": {"targetStation": "Station A", "startDate": "2025-05-01", "endDate": "2025-05-31"}},
+            credentials={"user1": {"username": "user1", "card_number": "111111111111111",
+                                   "password": "password1", "display_username": "user1"}},
+            config_path=config_path
+        )
+
+    def test_in_memory_config_with_sessions(self, tmp_path):
+        """Test: Config objects and sessions are used as given; no config file or saved session is read."""
+        from src.attendance_history import expand_history
+        from src.myki_attendance_tracker import TrackerOptions, run_tracking
+
+        # A stale user from an earlier run is dropped using the in-memory config
+        (tmp_path / "attendance.json").write_text(json.dumps({"olduser": {"attendanceDays": []}}))
+        session = _mock_session([{
+            "transactionType": "Touch off",
+            "transactionDateTime": "2025-05-15T17:00:00+10:00",
+            "description": "Station A"
+        }])
+
+        with patch('src.myki_attendance_tracker.MykiAPIClient') as mock_api_class:
+            result = run_tracking(
+                self._config(),
+                sessions={"user1": session},
+                options=TrackerOptions(output_dir=str(tmp_path))
+            )
+
+        mock_api_class.assert_not_called()
+        assert result.exit_code == 0
+        assert result.successes == ["user1"]
+        assert result.written is True
+
+        saved = json.loads((tmp_path / "attendance.json").read_text())
+        assert set(saved) == {"metadata", "user1"}
+        assert saved["metadata"]["configPath"] is None
+        user_data = saved["user1"]
+        # May 2025 is a closed month, so it is compacted into the history
+        assert expand_history(user_data.get("attendanceHistory", {})) + user_data["attendanceDays"] == ["2025-05-15"]
+
+    def test_failures_are_collected(self, tmp_path):
+        """Test: A failing user is reported in the result, not raised."""
+        from src.myki_attendance_tracker import TrackerOptions, run_tracking
+
+        session = MagicMock()
+        session.get_transactions.side_effect = KeyError("card")
+
+        result = run_tracking(
+            self._config(),
+            sessions={"user1": session},
+            options=TrackerOptions(output_dir=str(tmp_path))
+        )
+
+        assert result.exit_code == 1
+        assert [username for username, _ in result.failures] == ["user1"]
+        assert result.output is None
+        assert not (tmp_path / "attendance.json").exists()
+
+    def test_invalid_options_are_rejected(self, tmp_path):
+        """Test: Unknown layout fails before any user is processed."""
+        from src.myki_attendance_tracker import TrackerOptions, run_tracking
+
+        with pytest.raises(ValueError, match="OUTPUT_LAYOUT"):
+            run_tracking(self._config(), sessions={"user1": MagicMock()},
+                         options=TrackerOptions(output_dir=str(tmp_path), layout="csv"))
+
+    def test_process_pool_matches_serial_run(self, tmp_path, monkeypatch):
+        """Test: The process-pool statistics stage saves the same output as a serial run."""
+        from src.config_manager import TrackerConfig
+        from src.myki_attendance_tracker import TrackerOptions, run_tracking
+
+        usernames = [f"user{i}" for i in range(4)]
+        config = TrackerConfig(
+            users={u: {"targetStation": "Station A", "startDate": "2025-05-01", "endDate": "2025-05-31"}
+                   for u in usernames},
+            credentials={u: {"username": u, "card_number": f"card-{u}", "password": "x", "display_username": u}
+                         for u in usernames}
+        )
+
+        def sessions():
+            clients = {
+                u: _mock_session([{
+                    "transactionType": "Touch off",
+                    "transactionDateTime": f"2025-05-{12 + i:02d}T17:00:00+10:00",
+                    "description": "Station A"
+                }])
+                for i, u in enumerate(usernames)
+            }
+            # One failing user doesn't affect the others
+            clients["user2"].get_transactions.side_effect = ConnectionError("connection reset")
+            return clients
+
+        monkeypatch.setenv("MYKI_PARALLEL_MIN_USERS", "2")
+        serial = run_tracking(config, sessions=sessions(),
+                              options=TrackerOptions(output_dir=str(tmp_path / "serial")))
+        pooled = run_tracking(config, sessions=sessions(),
+                              options=TrackerOptions(output_dir=str(tmp_path / "pool"), workers=2))
+
+        assert pooled.successes == serial.successes == ["user0", "user1", "user3"]
+        assert [u for u, _ in pooled.failures] == ["user2"]
+        serial_output = json.loads((tmp_path / "serial" / "attendance.json").read_text())
+        pooled_output = json.loads((tmp_path / "pool" / "attendance.json").read_text())
+        for output in (serial_output, pooled_output):
+            for username in serial.successes:
+                output[username].pop("lastUpdated")
+            output.pop("metadata")
+        assert pooled_output == serial_output
+        assert list(pooled_output) == ["user0", "user1", "user3"]
+
+    def test_process_pool_parses_each_transaction_once(self, tmp_path, monkeypatch):
+        """Test: With an export, the pool path normalises transactions once for workers and the export."""
+        pytest.importorskip("pyarrow")
+        from concurrent.futures import ThreadPoolExecutor
+        import transaction_processor
+        from src.config_manager import TrackerConfig
+        from src.myki_attendance_tracker import TrackerOptions, run_tracking
+
+        usernames = ["user0", "user1"]
+        config = TrackerConfig(
+            users={u: {"targetStation": "Station A", "startDate": "2025-05-01", "endDate": "2025-05-31"}
+                   for u in usernames},
+            credentials={u: {"username": u, "card_number": f"card-{u}", "password": "x", "display_username": u}
+                         for u in usernames}
+        )
+        sessions = {u: _mock_session([{
+            "transactionType": "Touch off",
+            "transactionDateTime": "2025-05-12T17:00:00+10:00",
+            "description": "Station A"
+        }]) for u in usernames}
+
+        parsed = []
+        normalize_transaction = transaction_processor.normalize_transaction
+        monkeypatch.setattr(transaction_processor, "normalize_transaction",
+                            lambda txn: parsed.append(txn) or normalize_transaction(txn))
+
+        # Threads keep the workers in this process, so their parsing is counted too
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            result = run_tracking(config, sessions=sessions, executor=executor,
+                                  options=TrackerOptions(output_dir=str(tmp_path), export="parquet"))
+
+        assert result.successes == usernames
+        assert len(parsed) == 2
+        assert (tmp_path / "export").exists()
+
+    @pytest.mark.parametrize("card_number", ["card-a; card-b", "auto"])
+    def test_transactions_of_all_cards_are_merged(self, tmp_path, card_number):
+        """Test: A user with several cards (configured or discovered) gets attendance from all of them."""
+        from src.attendance_history import expand_history
+        from src.myki_attendance_tracker import TrackerOptions, run_tracking
+
+        config = self._config()
+        config.credentials["user1"]["card_number"] = card_number
+        cards = {
+            card: _mock_session([{
+                "transactionType": "Touch off",
+                "transactionDateTime": f"2025-05-{day}T17:00:00+10:00",
+                "description": "Station A"
+            }])
+            for card, day in (("card-a", "14"), ("card-b", "15"))
+        }
+        session = MagicMock()
+        session.get_cards.return_value = [{"mykiCardNumber": "card-a"}, {"mykiCardNumber": "card-b"}]
+        session.get_transactions.side_effect = lambda card, page: cards[card].get_transactions(card, page)
+
+        result = run_tracking(config, sessions={"user1": session}, options=TrackerOptions(output_dir=str(tmp_path)))
+
+        assert result.successes == ["user1"]
+        assert {call.args[0] for call in session.get_transactions.call_args_list} == {"card-a", "card-b"}
+        assert session.get_cards.called == (card_number == "auto")
+        user_data = result.output["user1"]
+        days = expand_history(user_data.get("attendanceHistory", {})) + user_data["attendanceDays"]
+        assert days == ["2025-05-14", "2025-05-15"]
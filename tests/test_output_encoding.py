@@ -0,0 +1,97 @@
+"""Tests for the bitset output encoding."""
+
+import json
+from datetime import date
+
+from src.output_encoding import (
+    BITSET_ENCODING,
+    _working_day_bitsets,
+    encode_day_bitsets,
+    decode_day_bitsets,
+    encode_user_output,
+    decode_user_output,
+)
+from src.output_manager import save_output, load_existing_output, update_user_output
+from src.working_days import VIC_HOLIDAYS
+
+
+class TestDayBitsets:
+    """Tests for per-year day-of-year bitsets."""
+
+    def test_round_trip_across_years(self):
+        """Test: Leap-year and year-boundary days decode to the same dates."""
+        days = ["2024-01-01", "2024-02-29", "2024-12-31", "2025-01-01", "2025-12-31"]
+
+        bitsets = encode_day_bitsets(reversed(days + ["2024-02-29"]))
+
+        assert list(bitsets) == ["2024", "2025"]
+        assert decode_day_bitsets(bitsets) == days
+        assert decode_day_bitsets({}) == []
+
+    def test_year_of_days_is_small(self):
+        """Test: A full year of days encodes in at most 64 base64 characters."""
+        days = [date.fromordinal(date(2025, 1, 1).toordinal() + i).isoformat() for i in range(365)]
+
+        assert len(encode_day_bitsets(days)["2025"]) <= 64
+
+
+class TestEncodedOutput:
+    """Tests for encoding users in save_output and decoding on load."""
+
+    def _user(self):
+        output = update_user_output(
+            existing_output={},
+            username="user1",
+            new_attendance_days=["2025-01-06", "2025-02-03"],
+            latest_txn_datetime=None,
+            target_station="Test Station",
+            start_date=date(2025, 1, 1),
+            end_date=date(2025, 2, 28),
+            skip_dates=[date(2025, 1, 7)],
+            vic_holidays=VIC_HOLIDAYS,
+            manual_attendance_dates=["2025-01-08"],
+            compact_before=date(2025, 2, 1)
+        )
+        return output["user1"]
+
+    def test_user_round_trip(self):
+        """Test: Date lists (including compacted history) survive encoding."""
+        user = self._user()
+
+        encoded = encode_user_output(user)
+        decoded = decode_user_output(encoded)
+
+        assert "attendanceDays" not in encoded and "attendanceHistory" not in encoded
+        assert decoded["attendanceDays"] == ["2025-01-06", "2025-02-03"]
+        assert decoded["manualAttendanceDates"] == ["2025-01-08"]
+        assert decoded["skipDates"] == ["2025-01-07"]
+        assert decoded["statistics"] == user["statistics"]
+        assert len(decode_day_bitsets(encoded["calendar"]["working"])) == user["statistics"]["totalWorkingDays"]
+
+    def test_working_days_are_computed_once_per_period(self):
+        """Test: Users (and saves) with the same period and skip dates share the working-day bitsets."""
+        user = self._user()
+        other = dict(user, skipDates=list(reversed(user["skipDates"])))
+        _working_day_bitsets.cache_clear()
+
+        first = encode_user_output(user)["calendar"]["working"]
+        second = encode_user_output(other)["calendar"]["working"]
+
+        assert first == second
+        assert _working_day_bitsets.cache_info().misses == 1
+        assert _working_day_bitsets.cache_info().hits == 1
+
+    def test_save_and_load_bitset_file(self, tmp_path):
+        """Test: save_output writes the bitset encoding and load_existing_output decodes it."""
+        output_file = tmp_path / "attendance.json"
+        config_file = tmp_path / "config.json"
+        config_file.write_text(json.dumps({"users": {"user1": {}}}))
+
+        save_output({"user1": self._user()}, str(output_file), str(config_file), encoding="bitset")
+
+        raw = json.loads(output_file.read_text())
+        assert raw["metadata"]["encoding"] == BITSET_ENCODING
+        assert "calendar" in raw["user1"]
+
+        loaded = load_existing_output(str(output_file))
+        assert loaded["user1"]["attendanceDays"] == ["2025-01-06", "2025-02-03"]
@@ -0,0 +1,142 @@
+"""Tests for the SQLite output store and its query API."""
+
+import json
+from datetime import date
+
+import pytest
+
+from src.output_manager import save_sqlite_output, load_sqlite_output
+from src.output_store import AttendanceStore
+
+
+def _month(month, working, attended):
+    return {"month": month, "workingDays": working, "daysAttended": attended,
+            "daysMissed": working - attended,
+            "attendancePercentage": round(attended / working * 100, 2)}
+
+
+def _user(days, history=None, monthly=None):
+    user = {
+        "attendanceDays": days,
+        "manualAttendanceDates": [],
+        "latestProcessedDate": None,
+        "targetStation": "Test Station",
+        "lastUpdated": "2025-05-10T00:00:00Z",
+        "skipDates": ["2025-05-09"],
+        "statistics": {"monthlyBreakdown": monthly or []},
+    }
+    if history:
+        user["attendanceHistory"] = history
+    return user
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"users": {"alice": {}, "bob": {}}}))
+    return str(path)
+
+
+@pytest.fixture
+def store(tmp_path):
+    with AttendanceStore(str(tmp_path / "attendance.db")) as attendance_store:
+        attendance_store.save_output({
+            # 2025-05-05 is a Monday
+            "alice": _user(["2025-05-05", "2025-05-06", "2025-05-12"],
+                           monthly=[_month("2025-05", 21, 3)]),
+            "bob": _user(["2025-05-06", "2025-05-07"], history={"2025-04": {"mask": 1 << 29, "count": 1}},
+                         monthly=[_month("2025-04", 20, 1), _month("2025-05", 21, 18)]),
+        })
+        yield attendance_store
+
+
+class TestOutputStore:
+    """Tests for AttendanceStore and the sqlite output layout."""
+
+    def test_round_trip_keeps_history_and_skips_unchanged_export(self, tmp_path, config_path):
+        """Test: The store loads back the saved output; an unchanged save leaves the JSON alone."""
+        output = {
+            "alice": dict(_user(["2025-05-01"], history={"2025-04": {"mask": 5, "count": 2}}), note="kept"),
+            "carol": _user([]),  # not in config
+        }
+
+        assert save_sqlite_output(output, str(tmp_path), config_path) is True
+        loaded = load_sqlite_output(str(tmp_path))
+
+        assert set(loaded) == {"metadata", "alice"}
+        assert loaded["alice"] == output["alice"]
+        assert loaded["metadata"]["contentHash"]
+        assert save_sqlite_output(loaded, str(tmp_path), config_path) is False
+        assert json.loads((tmp_path / "attendance.json").read_text())["alice"]["note"] == "kept"
+
+    def test_missing_store_is_rebuilt_from_export(self, tmp_path, config_path):
+        """Test: Without attendance.db (not committed), the JSON export seeds the next run."""
+        output = {"alice": _user(["2025-05-01"], history={"2025-04": {"mask": 5, "count": 2}})}
+        save_sqlite_output(output, str(tmp_path), config_path)
+        (tmp_path / "attendance.db").unlink()
+
+        loaded = load_sqlite_output(str(tmp_path))
+
+        assert loaded["alice"] == output["alice"]
+
+    def test_save_applies_differences_and_removes_users(self, store):
+        """Test: Re-saving replaces day rows and deletes users (with their rows) that are gone."""
+        store.save_output({"alice": _user(["2025-05-05", "2025-05-13"])})
+
+        assert store.attendance_between(date(2025, 5, 1), date(2025, 5, 31)) == [
+            ("alice", "2025-05-05"), ("alice", "2025-05-13")
+        ]
+        assert store.conn.execute("SELECT COUNT(*) FROM skip_days WHERE username = 'bob'").fetchone()[0] == 0
+        assert load_sqlite_output(str(store.db_path.parent))["alice"]["skipDates"] == ["2025-05-09"]
+
+    def test_round_trip_keeps_user_order(self, tmp_path):
+        """Test: Users load back in the order they were saved, like the JSON layouts."""
+        output = {"metadata": {"totalUsers": 3}, "zoe": _user([]), "alice": _user([]), "mike": _user([])}
+        with AttendanceStore(str(tmp_path / "attendance.db")) as attendance_store:
+            attendance_store.save_output(output)
+            assert list(attendance_store.load_output()) == ["metadata", "zoe", "alice", "mike"]
+
+            attendance_store.save_output({"mike": _user([]), "zoe": _user([])})
+            assert list(attendance_store.load_output()) == ["mike", "zoe"]
+
+    def test_opens_version_1_store(self, tmp_path):
+        """Test: A store created before the position column is upgraded in place."""
+        import sqlite3
+
+        db_path = tmp_path / "attendance.db"
+        conn = sqlite3.connect(str(db_path))
+        conn.executescript("""
+            CREATE TABLE users (username TEXT PRIMARY KEY, target_station TEXT, latest_processed_date TEXT,
+                                last_updated TEXT, statistics TEXT, statistics_state TEXT,
+                                history_through TEXT, extra TEXT);
+            PRAGMA user_version = 1;
+        """)
+        conn.close()
+
+        with AttendanceStore(str(db_path)) as attendance_store:
+            attendance_store.save_output({"bob": _user(["2025-05-06"]), "alice": _user([])})
+            assert list(attendance_store.load_output()) == ["bob", "alice"]
+
+    def test_attendance_between_and_users_below(self, store):
+        """Test: Date-range query includes history days; users_below uses the monthly stats."""
+        assert store.attendance_between(date(2025, 4, 30), date(2025, 5, 6)) == [
+            ("bob", "2025-04-30"), ("alice", "2025-05-05"), ("alice", "2025-05-06"), ("bob", "2025-05-06")
+        ]
+        assert store.attendance_between(date(2025, 5, 1), date(2025, 5, 31), username="bob") == [
+            ("bob", "2025-05-06"), ("bob", "2025-05-07")
+        ]
+        assert store.users_below(50.0, "2025-05") == [("alice", 14.29)]
+        assert store.users_below(50.0, "2025-04") == [("bob", 5.0)]
+
+    def test_weekday_distribution(self, store):
+        """Test: Attended days are counted per weekday, Monday first."""
+        distribution = store.weekday_distribution()
+
+        assert list(distribution)[:2] == ["Monday", "Tuesday"]
+        assert distribution["Monday"] == 2
+        assert distribution["Tuesday"] == 2
+        assert distribution["Wednesday"] == 2  # 2025-04-30 and 2025-05-07
+        assert store.weekday_distribution(username="alice", end_date=date(2025, 5, 6)) == {
+            "Monday": 1, "Tuesday": 1, "Wednesday": 0, "Thursday": 0,
+            "Friday": 0, "Saturday": 0, "Sunday": 0
+        }
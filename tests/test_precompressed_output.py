@@ -0,0 +1,66 @@
+"""Tests for minified and precompressed output artifacts."""
+
+import gzip
+import json
+
+import pytest
+
+from src import output_manager
+from src.output_manager import save_output, load_existing_output
+
+
+@pytest.fixture
+def paths(tmp_path):
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"users": {"user1": {}}}))
+    return tmp_path / "attendance.json", str(config_path)
+
+
+def _output(days):
+    return {"user1": {"attendanceDays": days, "lastUpdated": "2025-05-01T00:00:00Z"}}
+
+
+class TestPrecompressedOutput:
+    """Tests for save_output(precompress=True)."""
+
+    def test_artifacts_match_output(self, paths):
+        """Test: Minified and gzip copies decode to the saved output; version.json has the hash."""
+        output_path, config_path = paths
+
+        save_output(_output(["2025-05-01"]), str(output_path), config_path, precompress=True)
+
+        saved = json.loads(output_path.read_text())
+        version = json.loads((output_path.parent / "version.json").read_text())
+        minified = output_path.parent / "attendance.min.json"
+
+        assert version["contentHash"] == saved["metadata"]["contentHash"]
+        assert json.loads(minified.read_text()) == saved
+        assert len(minified.read_bytes()) < len(output_path.read_bytes())
+        assert json.loads(gzip.decompress((output_path.parent / "attendance.min.json.gz").read_bytes())) == saved
+        assert version["files"]["json"]["size"] == len(minified.read_bytes())
+
+    def test_brotli_variant_when_available(self, paths):
+        """Test: A .br copy is written when the optional brotli package is installed."""
+        brotli = pytest.importorskip("brotli")
+        output_path, config_path = paths
+
+        save_output(_output(["2025-05-01"]), str(output_path), config_path, precompress=True)
+
+        compressed = (output_path.parent / "attendance.min.json.br").read_bytes()
+        assert json.loads(brotli.decompress(compressed)) == json.loads(output_path.read_text())
+
+    def test_unchanged_output_backfills_missing_artifacts(self, paths, monkeypatch):
+        """Test: Enabling precompress on unchanged data writes artifacts without touching the output."""
+        monkeypatch.setattr(output_manager, "brotli", None)
+        output_path, config_path = paths
+        save_output(_output(["2025-05-01"]), str(output_path), config_path)
+        before = output_path.read_bytes()
+
+        written = save_output(load_existing_output(str(output_path)), str(output_path), config_path,
+                              precompress=True)
+
+        assert written is False
+        assert output_path.read_bytes() == before
+        version = json.loads((output_path.parent / "version.json").read_text())
+        assert set(version["files"]) == {"json", "gzip"}
+        assert version["generatedAt"] == json.loads(before)["metadata"]["generatedAt"]
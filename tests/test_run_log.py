@@ -0,0 +1,85 @@
+"""Tests for level-controlled run logging (quiet mode, JSON lines, rate limits)."""
+
+import json
+import logging
+from datetime import datetime
+
+import pytest
+
+from src.output_manager import filter_new_transactions
+from src.run_log import WarningRateLimiter, configure_logging, get_logger
+
+
+@pytest.fixture(autouse=True)
+def default_logging(monkeypatch):
+    for name in ("MYKI_LOG_LEVEL", "MYKI_LOG_FORMAT", "MYKI_LOG_QUIET", "MYKI_LOG_WARNING_LIMIT"):
+        monkeypatch.delenv(name, raising=False)
+    yield
+    configure_logging("INFO", "text")
+
+
+def _warning(message, *args):
+    return logging.LogRecord("myki.test", logging.WARNING, __file__, 1, message, args, None)
+
+
+class TestRunLog:
+
+    def test_json_lines_format(self, capsys):
+        configure_logging(log_format="json")
+        logger = get_logger("src.transaction_fetcher")
+        logger.info("")
+        logger.info("  Retrieved %d transactions", 25)
+
+        # The blank separator line is dropped, leaving one JSON object
+
+        entry = json.loads(capsys.readouterr().out)
+        assert entry["level"] == "info"
+        assert entry["logger"] == "myki.transaction_fetcher"
+        assert entry["msg"] == "Retrieved 25 transactions"
+
+    def test_quiet_mode_only_logs_warnings(self, capsys, monkeypatch):
+        monkeypatch.setenv("MYKI_LOG_QUIET", "1")
+        configure_logging()
+        logger = get_logger("test")
+        logger.info("progress")
+        logger.warning("something is off")
+
+        assert capsys.readouterr().out == "something is off\n"
+
+    def test_rate_limiter_reports_suppressed_warnings(self):
+        limiter = WarningRateLimiter(limit=2, interval=3600)
+        allowed = [limiter.filter(_warning("Skipping shard %s", n)) for n in range(5)]
+        assert allowed == [True, True, False, False, False]
+
+        # Another template has its own budget, and the next window reports what was dropped
+        assert limiter.filter(_warning("Other warning"))
+        limiter.interval = 0
+        record = _warning("Skipping shard %s", 5)
+        assert limiter.filter(record)
+        assert record.suppressed == 3
+
+    def test_rate_limiter_only_limits_warnings(self):
+        limiter = WarningRateLimiter(limit=1, interval=3600)
+        errors = [logging.LogRecord("myki.test", logging.ERROR, __file__, 1, "Failed %s", (n,), None)
+                  for n in range(3)]
+        assert all(limiter.filter(record) for record in errors)
+
+    def test_quiet_mode_keeps_failure_banners(self, capsys):
+        from src.run_myki_workflow import print_header
+
+        configure_logging(quiet=True)
+        print_header("PHASE 1: MULTI-USER AUTHENTICATION")
+        print_header("❌ WORKFLOW FAILED", level=logging.ERROR)
+
+        assert capsys.readouterr().out.splitlines() == ["", "=" * 80, "❌ WORKFLOW FAILED", "=" * 80]
+
+    def test_invalid_datetimes_are_one_aggregated_warning(self, capsys):
+        configure_logging("WARNING")
+        transactions = [{"transactionDateTime": f"bad-{n}"} for n in range(50)]
+        transactions.append({"transactionDateTime": "2025-05-17T17:00:00+10:00"})
+
+        latest = datetime.fromisoformat("2025-05-16T00:00:00+10:00")
+        assert len(filter_new_transactions(transactions, latest)) == 1
+
+        lines = capsys.readouterr().out.splitlines()
+        assert lines == ["  Warning: Skipped 50 transaction(s) with invalid datetime (first: 'bad-0')"]
@@ -0,0 +1,110 @@
+"""Tests for the opt-in per-phase profiler (--profile)."""
+
+import json
+import pstats
+import tracemalloc
+from unittest.mock import MagicMock
+
+from src.config_manager import TrackerConfig
+from src.myki_attendance_tracker import TrackerOptions, run_tracking
+from src.run_profiler import RunProfiler, profile_scope
+
+
+def _busy(n):
+    return sum(len(str(i)) for i in range(n))
+
+
+class TestRunProfiler:
+
+    def test_nested_scopes_write_reports(self, tmp_path):
+        profiler = RunProfiler(str(tmp_path), run_id="run1", top_n=5)
+        with profile_scope(profiler, "phase"):
+            _busy(1000)
+            with profile_scope(profiler, "user-a/b"):
+                data = [bytearray(1024) for _ in range(512)]
+                _busy(2000)
+            del data
+        profiler.close()
+
+        profile_dir = tmp_path / "profile" / "run1"
+        summary = json.loads((profile_dir / "summary.json").read_text())
+        assert [s["scope"] for s in summary["scopes"]] == ["user-a/b", "phase"]
+        user, phase = summary["scopes"]
+        assert user["pstats"] == "002-user-a%2Fb.pstats"
+        assert phase["peakTracedBytes"] >= user["peakTracedBytes"] >= 512 * 1024
+
+        # The phase profile includes the nested user's functions
+        phase_stats = pstats.Stats(str(profile_dir / phase["pstats"]))
+        assert any(func[2] == "_busy" and stats[0] == 2 for func, stats in phase_stats.stats.items())
+
+        report = (profile_dir / phase["report"]).read_text()
+        assert "functions by cumulative" in report
+        assert "allocation sites by growth" in report
+        assert not tracemalloc.is_tracing()
+
+    def test_outer_scope_includes_grandchildren(self, tmp_path):
+        profiler = RunProfiler(str(tmp_path), run_id="run1", top_n=5)
+        with profile_scope(profiler, "phase"):
+            with profile_scope(profiler, "user"):
+                with profile_scope(profiler, "fetch"):
+                    _busy(1000)
+        profiler.close()
+
+        profile_dir = tmp_path / "profile" / "run1"
+        summary = json.loads((profile_dir / "summary.json").read_text())
+        assert [s["scope"] for s in summary["scopes"]] == ["fetch", "user", "phase"]
+        for scope in summary["scopes"]:
+            stats = pstats.Stats(str(profile_dir / scope["pstats"]))
+            assert any(func[2] == "_busy" for func in stats.stats), scope["scope"]
+
+    def test_profiling_off_is_a_no_op(self):
+        with profile_scope(None, "phase"):
+            assert not tracemalloc.is_tracing()
+
+    def test_run_tracking_profiles_each_user(self, tmp_path):
+        config = TrackerConfig(
+            users={u: {"targetStation": "Station A", "startDate": "2025-05-01", "endDate": "2025-05-31"}
+                   for u in ("user1", "user2")},
+            credentials={u: {"username": u, "card_number": u, "password": "x", "display_username": u}
+                         for u in ("user1", "user2")}
+        )
+        session = MagicMock()
+        session.get_transactions.side_effect = ConnectionError("offline")
+
+        profiler = RunProfiler(str(tmp_path), run_id="run2")
+        run_tracking(config, sessions={"user1": session, "user2": session},
+                     options=TrackerOptions(output_dir=str(tmp_path)), profiler=profiler)
+        profiler.close()
+
+        summary = json.loads((tmp_path / "profile" / "run2" / "summary.json").read_text())
+        assert [s["scope"] for s in summary["scopes"]] == ["user-user1", "user-user2"]
+
+    def test_process_pool_profiles_each_user_in_the_worker(self, tmp_path, monkeypatch):
+        users = ("user1", "user2")
+        config = TrackerConfig(
+            users={u: {"targetStation": "Station A", "startDate": "2025-05-01", "endDate": "2025-05-31"}
+                   for u in users},
+            credentials={u: {"username": u, "card_number": u, "password": "x", "display_username": u}
+                         for u in users}
+        )
+        sessions = {}
+        for username in users:
+            session = MagicMock()
+            session.get_transactions.return_value = {"transactions": []}
+            sessions[username] = session
+        monkeypatch.setenv("MYKI_PARALLEL_MIN_USERS", "2")
+
+        profiler = RunProfiler(str(tmp_path), run_id="run3")
+        result = run_tracking(config, sessions=sessions,
+                              options=TrackerOptions(output_dir=str(tmp_path), workers=2), profiler=profiler)
+        profiler.close()
+
+        assert result.successes == list(users)
+        profile_dir = tmp_path / "profile" / "run3"
+        summary = json.loads((profile_dir / "summary.json").read_text())
+        assert [s["scope"] for s in summary["scopes"]] == ["user-user1", "user-user2", "statistics-pool", "save-output"]
+        # Worker stats are written per user and included in the enclosing pool scope
+        for name in ("user-user1", "statistics-pool"):
+            scope = next(s for s in summary["scopes"] if s["scope"] == name)
+            stats = pstats.Stats(str(profile_dir / scope["pstats"]))
+            assert any(func[2] == "compute_user_output" for func in stats.stats), name
@@ -0,0 +1,146 @@
+"""Tests for per-user run checkpoints and resumable tracking runs."""
+
+import json
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.config_manager import TrackerConfig
+from src.myki_attendance_tracker import TrackerOptions, run_tracking
+from src.run_state import RUN_STATE_DIRNAME, RunState
+
+
+TRANSACTIONS = [{
+    "transactionType": "Touch off",
+    "transactionDateTime": "2025-05-15T17:00:00+10:00",
+    "description": "Station A"
+}]
+
+
+def _session(transactions=TRANSACTIONS):
+    """API client mock returning one page, then the end-of-pagination 409."""
+    import requests
+
+    def get_transactions(card_number, page):
+        if page == 0:
+            return {"transactions": transactions}
+        response = MagicMock()
+        response.status_code = 409
+        response.json.return_value = {"code": 409, "message": "txnTimestamp: Expected a non-empty value. Got: null"}
+        raise requests.HTTPError(response=response)
+
+    client = MagicMock()
+    client.get_transactions.side_effect = get_transactions
+    return client
+
+
+def _failing_session():
+    client = MagicMock()
+    client.get_transactions.side_effect = ConnectionError("connection reset")
+    return client
+
+
+def _config(*usernames):
+    return TrackerConfig(
+        users={u: {"targetStation": "Station A", "startDate": "2025-05-01", "endDate": "2025-05-31"} for u in usernames},
+        credentials={u: {"username": u, "card_number": f"card-{u}", "password": "x", "display_username": u}
+                     for u in usernames}
+    )
+
+
+class TestRunState:
+
+    def test_stages_survive_resume_and_finish_removes_checkpoint(self, tmp_path):
+        state = RunState.open(str(tmp_path))
+        state.mark("user1", "authenticated")
+        state.save_transactions("user1", TRANSACTIONS)
+
+        resumed = RunState.open(str(tmp_path), resume=True)
+        assert resumed.run_id == state.run_id
+        assert resumed.completed("user1", "authenticated", max_age=timedelta(minutes=15))
+        assert not resumed.completed("user1", "authenticated", max_age=timedelta(seconds=-1))
+        assert resumed.load_transactions("user1") == TRANSACTIONS
+        assert resumed.load_transactions("user2") is None
+
+        resumed.finish()
+        assert not (tmp_path / RUN_STATE_DIRNAME).exists()
+
+    def test_new_run_discards_previous_checkpoint(self, tmp_path):
+        state = RunState.open(str(tmp_path))
+        state.mark("user1", "processed")
+
+        fresh = RunState.open(str(tmp_path))
+
+        assert fresh.run_id != state.run_id
+        assert not fresh.completed("user1", "processed")
+        with pytest.raises(ValueError):
+            fresh.mark("user1", "uploaded")
+
+
+class TestResumableTracking:
+
+    def test_resume_skips_processed_users(self, tmp_path):
+        options = TrackerOptions(output_dir=str(tmp_path))
+        config = _config("user1", "user2")
+
+        # First run: user1 finishes, user2 fails
+        checkpoint = RunState.open(str(tmp_path))
+        result = run_tracking(config, sessions={"user1": _session(), "user2": _failing_session()},
+                              options=options, checkpoint=checkpoint)
+        assert result.exit_code == 1
+
+        # The output holds the user that finished; user1's result is also checkpointed
+        assert RunState.open(str(tmp_path), resume=True).load_user_output("user1") == result.output["user1"]
+        saved = json.loads((tmp_path / "attendance.json").read_text())
+        assert "user1" in saved and "user2" not in saved
+
+        # Resumed run: user1 is not fetched again
+        user1_session = _session()
+        checkpoint = RunState.open(str(tmp_path), resume=True)
+        result = run_tracking(config, sessions={"user1": user1_session, "user2": _session()},
+                              options=options, checkpoint=checkpoint)
+
+        assert result.exit_code == 0
+        assert result.successes == ["user1", "user2"]
+        user1_session.get_transactions.assert_not_called()
+        saved = json.loads((tmp_path / "attendance.json").read_text())
+        assert {"user1", "user2"} <= set(saved)
+        assert not (tmp_path / RUN_STATE_DIRNAME).exists()
+
+    def test_resume_reuses_fetched_transactions(self, tmp_path):
+        checkpoint = RunState.open(str(tmp_path))
+        checkpoint.save_transactions("user1", TRANSACTIONS)
+
+        checkpoint = RunState.open(str(tmp_path), resume=True)
+        result = run_tracking(_config("user1"), sessions={"user1": _failing_session()},
+                              options=TrackerOptions(output_dir=str(tmp_path)), checkpoint=checkpoint)
+
+        assert result.exit_code == 0
+        assert (tmp_path / "attendance.json").exists()
+
+    def test_resume_after_crash_merges_checkpointed_users(self, tmp_path):
+        options = TrackerOptions(output_dir=str(tmp_path), event_log=True)
+        config = _config("user1", "user2")
+        first = run_tracking(_config("user1"), sessions={"user1": _session()},
+                             options=TrackerOptions(output_dir=str(tmp_path / "first")))
+
+        # Killed after user1 was processed: no output file was written yet
+        checkpoint = RunState.open(str(tmp_path))
+        checkpoint.save_user_output("user1", first.output["user1"])
+        assert not (tmp_path / "attendance.json").exists()
+
+        user1_session = _session()
+        checkpoint = RunState.open(str(tmp_path), resume=True)
+        result = run_tracking(config, sessions={"user1": user1_session, "user2": _session()},
+                              options=options, checkpoint=checkpoint)
+
+        assert result.exit_code == 0
+        user1_session.get_transactions.assert_not_called()
+        saved = json.loads((tmp_path / "attendance.json").read_text())
+        assert saved["user1"]["attendanceDays"] == first.output["user1"]["attendanceDays"]
+        assert "user2" in saved
+        # One event log append for the whole run, covering the resumed user too
+        events = [json.loads(line) for line in (tmp_path / "events.jsonl").read_text().splitlines()]
+        assert {event["runId"] for event in events} == {checkpoint.run_id}
+        assert {event.get("user") for event in events if event["type"] == "day_attended"} == {"user1", "user2"}
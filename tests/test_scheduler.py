@@ -0,0 +1,209 @@
+"""Tests for the scheduler daemon (schedules, config reload, cycles, health check)."""
+
+import json
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.scheduler import CronSchedule, ConfigCache, IntervalSchedule, SchedulerDaemon, check_health
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"users": {
+        "user1": {"targetStation": "Station A", "startDate": "2025-05-01", "endDate": "2025-05-31"}
+    }}))
+    monkeypatch.setenv("MYKI_USERNAME_USER1", "user1")
+    monkeypatch.setenv("MYKI_CARDNUMBER_USER1", "111111111111111")
+    monkeypatch.setenv("MYKI_PASSWORD_USER1", "password1")
+    return path
+
+
+class TestSchedules:
+
+    def test_cron_weekdays_in_melbourne_time(self):
+        schedule = CronSchedule("30 19 * * 1-5")
+
+        # Friday 8pm in Melbourne -> Monday 7:30pm
+        next_run = schedule.next_after(datetime(2025, 5, 2, 10, 0, tzinfo=timezone.utc))
+
+        assert next_run.isoformat() == "2025-05-05T19:30:00+10:00"
+
+    def test_cron_rare_dates_and_invalid_expressions(self):
+        leap_day = CronSchedule("0 0 29 2 *").next_after(datetime(2025, 3, 1, tzinfo=timezone.utc))
+        assert leap_day.date().isoformat() == "2028-02-29"
+
+        for expression in ("* * * *", "61 * * * *", "*/0 * * * *"):
+            with pytest.raises(ValueError):
+                CronSchedule(expression)
+
+    def test_interval_runs_first_cycle_immediately(self):
+        schedule = IntervalSchedule(3600)
+        now = datetime(2025, 5, 2, tzinfo=timezone.utc)
+
+        assert schedule.next_after(now) == now
+        assert schedule.next_after(now, last_start=now - timedelta(minutes=10)) == now + timedelta(minutes=50)
+        assert schedule.next_after(now, last_start=now - timedelta(hours=2)) == now
+
+
+class TestConfigCache:
+
+    def test_reloads_only_when_mtime_changes(self, config_file):
+        cache = ConfigCache(str(config_file))
+        first = cache.get()
+        assert cache.get() is first
+
+        config = json.loads(config_file.read_text())
+        config["users"]["user1"]["targetStation"] = "Station B"
+        config_file.write_text(json.dumps(config))
+        os.utime(config_file, ns=(0, os.stat(config_file).st_mtime_ns + 1))
+
+        assert cache.get().users["user1"]["targetStation"] == "Station B"
+
+    def test_keeps_previous_config_if_reload_fails(self, config_file):
+        cache = ConfigCache(str(config_file))
+        first = cache.get()
+
+        config_file.write_text("{not json")
+        os.utime(config_file, ns=(0, os.stat(config_file).st_mtime_ns + 1))
+
+        assert cache.get() is first
+
+
+class TestSchedulerDaemon:
+
+    def test_tracker_only_cycle_writes_output_and_status(self, tmp_path, config_file, monkeypatch):
+        import requests
+
+        monkeypatch.setenv("OUTPUT_DIR", str(tmp_path / "output"))
+        status_path = tmp_path / "status.json"
+
+        def get_transactions(card_number, page):
+            if page == 0:
+                return {"transactions": [{
+                    "transactionType": "Touch off",
+                    "transactionDateTime": "2025-05-15T17:00:00+10:00",
+                    "description": "Station A"
+                }]}
+            response = MagicMock()
+            response.status_code = 409
+            response.json.return_value = {"code": 409, "message": "txnTimestamp: Expected a non-empty value. Got: null"}
+            raise requests.HTTPError(response=response)
+
+        client = MagicMock()
+        client.get_transactions.side_effect = get_transactions
+
+        daemon = SchedulerDaemon(str(config_file), IntervalSchedule(60), str(status_path), tracker_only=True)
+        with patch('src.scheduler.MykiAPIClient', return_value=client) as mock_api_class:
+            assert daemon.run_cycle() == 0
+            assert daemon.run_cycle() == 0
+        daemon.close()
+
+        # One pooled HTTP session per user, reused across cycles
+        http_sessions = [call.kwargs["http_session"] for call in mock_api_class.call_args_list]
+        assert len(http_sessions) == 2 and http_sessions[0] is http_sessions[1]
+
+        status = json.loads(status_path.read_text())
+        assert status["status"] == "ok"
+        assert status["cycles"] == 2
+        assert status["lastExitCode"] == 0
+        assert (tmp_path / "output" / "attendance.json").exists()
+        assert check_health(str(status_path)) == 0
+
+    def test_failed_cycle_is_unhealthy(self, tmp_path, config_file):
+        status_path = tmp_path / "status.json"
+        daemon = SchedulerDaemon(str(config_file), IntervalSchedule(60), str(status_path), tracker_only=True)
+
+        with patch('src.scheduler.MykiAPIClient', side_effect=ValueError("No authentication data found")):
+            assert daemon.run_cycle() == 1
+
+        status = json.loads(status_path.read_text())
+        assert status["consecutiveFailures"] == 1
+        assert "No authentication data" in status["lastError"]
+        assert check_health(str(status_path)) == 1
+
+
+    def test_tracker_only_cycle_skips_users_without_session(self, tmp_path, config_file, monkeypatch):
+        config = json.loads(config_file.read_text())
+        config["users"]["user2"] = dict(config["users"]["user1"])
+        config_file.write_text(json.dumps(config))
+        monkeypatch.setenv("MYKI_USERNAME_USER2", "user2")
+        monkeypatch.setenv("MYKI_CARDNUMBER_USER2", "222222222222222")
+        monkeypatch.setenv("MYKI_PASSWORD_USER2", "password2")
+        monkeypatch.setenv("OUTPUT_DIR", str(tmp_path / "output"))
+        status_path = tmp_path / "status.json"
+
+        client = MagicMock()
+        client.get_transactions.return_value = {"transactions": []}
+
+        def api_client(http_session):
+            if os.environ['MYKI_AUTH_USERNAME_KEY'] == "user1":
+                raise ValueError("No authentication data found")
+            return client
+
+        daemon = SchedulerDaemon(str(config_file), IntervalSchedule(60), str(status_path), tracker_only=True)
+        with patch('src.scheduler.MykiAPIClient', side_effect=api_client):
+            assert daemon.run_cycle() == 1
+        daemon.close()
+
+        client.get_transactions.assert_called()
+        status = json.loads(status_path.read_text())
+        assert status["skippedUsers"] == ["user1"]
+        assert status["failedUsers"] == ["user1"]
+        assert "user1" in status["lastError"]
+        assert "user2" in json.loads((tmp_path / "output" / "attendance.json").read_text())
+
+
+class TestCommandLine:
+
+    @pytest.fixture
+    def started(self, monkeypatch):
+        """Run main() with the daemon mocked out; returns the schedule it was given."""
+        for name in ("MYKI_LOG_LEVEL", "MYKI_LOG_FORMAT", "SCHEDULER_CRON", "SCHEDULER_INTERVAL"):
+            monkeypatch.delenv(name, raising=False)
+        monkeypatch.setattr("dotenv.load_dotenv", lambda *args, **kwargs: False)
+
+        def start(*argv):
+            from src import scheduler
+            monkeypatch.setattr(sys, "argv", ["scheduler.py", *argv])
+            with patch.object(scheduler, "SchedulerDaemon") as daemon_class:
+                daemon_class.return_value.run_forever.return_value = 0
+                assert scheduler.main() == 0
+            return daemon_class.call_args.args[1]
+        return start
+
+    def test_interval_flag_overrides_cron_environment(self, started, monkeypatch):
+        monkeypatch.setenv("SCHEDULER_CRON", "30 19 * * 1-5")
+
+        schedule = started("--interval", "60")
+
+        assert isinstance(schedule, IntervalSchedule)
+        assert schedule.seconds == 60
+
+    def test_schedule_from_environment(self, started, monkeypatch):
+        monkeypatch.setenv("SCHEDULER_INTERVAL", "120")
+        assert started().seconds == 120
+
+        monkeypatch.delenv("SCHEDULER_INTERVAL")
+        monkeypatch.setenv("SCHEDULER_CRON", "0 8 * * *")
+        assert isinstance(started(), CronSchedule)
+
+
+class TestHealthCheck:
+
+    def _write(self, path, **status):
+        path.write_text(json.dumps(dict({"status": "ok", "lastExitCode": 0}, **status)))
+        return str(path)
+
+    def test_overdue_run_is_unhealthy(self, tmp_path):
+        stamp = lambda delta: (datetime.now(timezone.utc) + delta).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+        assert check_health(self._write(tmp_path / "a.json", nextRun=stamp(timedelta(minutes=5)))) == 0
+        assert check_health(self._write(tmp_path / "b.json", nextRun=stamp(-timedelta(hours=2)))) == 1
+        assert check_health(self._write(tmp_path / "c.json", status="running",
+                                        lastRunStart=stamp(-timedelta(hours=2)))) == 1
+        assert check_health(str(tmp_path / "missing.json")) == 1
@@ -0,0 +1,71 @@
+"""Tests for per-user sharded output with an index.json manifest."""
+
+import json
+
+import pytest
+
+from src.output_manager import save_sharded_output, load_sharded_output
+
+
+def _user(days):
+    return {"attendanceDays": days, "targetStation": "Test Station", "skipDates": []}
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"users": {"alice": {}, "bob": {}}}))
+    return str(path)
+
+
+class TestShardedOutput:
+    """Tests for save_sharded_output / load_sharded_output."""
+
+    def test_round_trip_and_index(self, tmp_path, config_path):
+        """Test: Each user gets a shard listed in index.json with hash and size."""
+        output_dir = tmp_path / "output"
+        output = {"alice": _user(["2025-05-01"]), "bob": _user([]), "carol": _user([])}
+
+        save_sharded_output(output, str(output_dir), config_path)
+
+        index = json.loads((output_dir / "index.json").read_text())
+        assert index["metadata"]["layout"] == "sharded"
+        assert index["metadata"]["totalUsers"] == 2
+        assert set(index["users"]) == {"alice", "bob"}  # carol is not in config
+        alice = index["users"]["alice"]
+        assert (output_dir / alice["file"]).stat().st_size == alice["size"]
+
+        loaded = load_sharded_output(str(output_dir))
+        assert loaded["alice"] == output["alice"]
+        assert loaded["bob"] == output["bob"]
+
+    def test_only_changed_shards_rewritten(self, tmp_path, config_path):
+        """Test: Unchanged users keep their shard file; removed users lose theirs."""
+        output_dir = tmp_path / "output"
+        alice_shard = output_dir / "users" / "alice.json"
+        bob_shard = output_dir / "users" / "bob.json"
+        save_sharded_output({"alice": _user(["2025-05-01"]), "bob": _user([])}, str(output_dir), config_path)
+        bob_shard.write_text(bob_shard.read_text() + " ")  # marker: detect a rewrite
+
+        save_sharded_output({"alice": _user(["2025-05-01", "2025-05-02"]), "bob": _user([])},
+                            str(output_dir), config_path)
+
+        assert bob_shard.read_text().endswith(" ")  # unchanged content, not rewritten
+        assert json.loads(alice_shard.read_text())["attendanceDays"][-1] == "2025-05-02"
+
+        save_sharded_output({"alice": _user(["2025-05-01", "2025-05-02"])}, str(output_dir), config_path)
+
+        assert not bob_shard.exists()
+
+    def test_corrupt_shard_is_skipped(self, tmp_path, config_path):
+        """Test: A shard that doesn't match its hash is left out on load."""
+        output_dir = tmp_path / "output"
+        save_sharded_output({"alice": _user(["2025-05-01"]), "bob": _user([])},
+                            str(output_dir), config_path, encoding="bitset")
+        (output_dir / "users" / "bob.json").write_text("{}")
+
+        loaded = load_sharded_output(str(output_dir))
+
+        assert loaded["alice"]["attendanceDays"] == ["2025-05-01"]
+        assert "bob" not in loaded
+        assert load_sharded_output(str(tmp_path / "missing")) == {}
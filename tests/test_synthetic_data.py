@@ -0,0 +1,122 @@
+"""Tests for synthetic data generation used in scale testing."""
+
+from datetime import date
+
+import pytest
+
+from src.synthetic_data import (
+    generate_transactions,
+    generate_unified_config,
+    generate_credentials_env,
+    generate_dataset,
+    SyntheticMykiClient,
+)
+
+
+class TestSyntheticTransactions:
+    """Tests for Myki-shaped transaction generation."""
+
+    def test_same_seed_produces_same_transactions(self):
+        """Test: Generation is reproducible for a given seed."""
+        first = generate_transactions("Melbourne Central", "Heathmont Station", seed=42)
+        second = generate_transactions("Melbourne Central", "Heathmont Station", seed=42)
+
+        assert first == second
+        assert len(first) > 0
+
+    def test_transactions_have_api_shape_and_cross_dst(self):
+        """Test: Transactions carry API keys and both AEST and AEDT offsets."""
+        transactions = generate_transactions(
+            "Melbourne Central", "Heathmont Station",
+            start_date=date(2024, 1, 1), years=1, malformed_rate=0.0, seed=1
+        )
+
+        for txn in transactions:
+            assert {"transactionType", "transactionDateTime", "description"} <= set(txn.keys())
+            assert txn["transactionType"] in ("Touch on", "Touch off")
+
+        offsets = {txn["transactionDateTime"][-6:] for txn in transactions}
+        assert offsets == {"+10:00", "+11:00"}
+
+        # Newest first, as the API returns them
+        assert transactions[0]["transactionDateTime"] > transactions[-1]["transactionDateTime"]
+
+    def test_malformed_timestamps_are_injected(self):
+        """Test: malformed_rate produces timestamps the processor must reject."""
+        from src.transaction_processor import parse_transaction_date
+
+        transactions = generate_transactions(
+            "Melbourne Central", "Heathmont Station", malformed_rate=0.5, seed=3
+        )
+
+        malformed = 0
+        for txn in transactions:
+            try:
+                parse_transaction_date(txn["transactionDateTime"])
+            except ValueError:
+                malformed += 1
+
+        assert malformed > 0
+
+
+class TestSyntheticConfig:
+    """Tests for unified config and credential generation."""
+
+    def test_generated_config_passes_validation(self):
+        """Test: Generated config is accepted by validate_user_config."""
+        from src.config_manager import validate_user_config
+
+        config = generate_unified_config(50, years=2, seed=7)
+
+        assert len(config["users"]) == 50
+        validate_user_config(config["users"])
+
+    def test_leap_day_start_date(self):
+        """Test: A period starting on 29 February ends on 28 February of a common year."""
+        from src.config_manager import validate_user_config
+
+        config = generate_unified_config(3, start_date=date(2024, 2, 29), years=1, seed=3)
+        validate_user_config(config["users"])
+        assert {u["endDate"] for u in config["users"].values()} == {"2025-02-28"}
+
+        transactions = generate_transactions(
+            "Melbourne Central", "Heathmont Station", start_date=date(2024, 2, 29), years=1, seed=3
+        )
+        assert max(t["transactionDateTime"] for t in transactions) < "2025-03-01"
+
+    def test_manual_dates_do_not_overlap_skip_dates(self):
+        """Test: Manual attendance dates are distinct from skip dates."""
+        config = generate_unified_config(20, skip_dates_per_user=30, manual_dates_per_user=30, seed=5)
+
+        for user_cfg in config["users"].values():
+            assert not set(user_cfg["skipDates"]) & set(user_cfg["manualAttendanceDates"])
+
+    def test_credentials_env_loads(self, monkeypatch):
+        """Test: Generated environment satisfies load_user_credentials."""
+        from src.config_manager import load_user_credentials
+
+        config = generate_unified_config(3, seed=11)
+        for name, value in generate_credentials_env(config["users"], seed=11).items():
+            monkeypatch.setenv(name, value)
+
+        credentials = load_user_credentials(config["users"])
+
+        assert set(credentials.keys()) == set(config["users"].keys())
+        assert all(len(c["card_number"]) == 15 for c in credentials.values())
+
+
+class TestSyntheticMykiClient:
+    """Tests for the offline stand-in API client."""
+
+    def test_fetch_all_transactions_reads_all_pages(self):
+        """Test: fetch_all_transactions stops on the synthetic 409 end-of-data signal."""
+        from src.transaction_fetcher import fetch_all_transactions
+
+        config, env, transactions_by_card = generate_dataset(1, seed=9)
+        card_number = next(iter(transactions_by_card))
+        transactions = transactions_by_card[card_number][:250]
+        client = SyntheticMykiClient({card_number: transactions}, page_size=100)
+
+        fetched = fetch_all_transactions(client, card_number)
+
+        assert fetched == transactions
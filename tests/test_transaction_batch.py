@@ -0,0 +1,82 @@
+"""Tests for columnar TransactionBatch filtering against the per-record pipeline."""
+
+from datetime import date, datetime
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.transaction_processor import (
+    normalize_transactions,
+    filter_transactions,
+    calculate_attendance_days,
+    latest_transaction_datetime,
+)
+from src.output_manager import filter_new_transactions
+from src.transaction_batch import (
+    TransactionBatch,
+    use_columnar,
+    filter_new_transactions_batch,
+    filter_transactions_batch,
+    calculate_attendance_days_batch,
+)
+from src.synthetic_data import generate_transactions
+
+
+@pytest.fixture
+def transactions():
+    return generate_transactions(
+        "Melbourne Central", "Heathmont Station",
+        start_date=date(2023, 1, 1), years=3, malformed_rate=0.01, seed=21
+    )
+
+
+class TestTransactionBatchParity:
+    """Columnar results must match the existing functions exactly."""
+
+    def test_filters_and_attendance_match(self, transactions):
+        """Test: New/station/type/date filters and attendance days match record pipeline."""
+        from src.working_days import VIC_HOLIDAYS
+
+        records = normalize_transactions(transactions)
+        batch = TransactionBatch.from_records(records)
+        latest = datetime.fromisoformat("2023-09-01T12:00:00+10:00")
+        start, end = date(2023, 3, 1), date(2025, 6, 30)
+        skip_dates = [date(2023, 5, 2), date(2024, 8, 14), date(2025, 1, 6)]
+
+        expected_new = filter_new_transactions(records, latest)
+        expected_filtered = filter_transactions(expected_new, "Melbourne Central", start, end)
+        expected_days = calculate_attendance_days(expected_filtered, skip_dates, VIC_HOLIDAYS)
+
+        new_batch = filter_new_transactions_batch(batch, latest)
+        filtered_batch = filter_transactions_batch(new_batch, "Melbourne Central", start, end)
+        days = calculate_attendance_days_batch(filtered_batch, skip_dates, VIC_HOLIDAYS)
+
+        assert new_batch.to_records() == expected_new
+        assert filtered_batch.to_records() == expected_filtered
+        assert days == expected_days
+        assert filtered_batch.latest_datetime() == latest_transaction_datetime(expected_filtered)
+
+    def test_unknown_station_and_empty_batch(self, transactions):
+        """Test: Unknown station yields an empty batch with no latest datetime."""
+        from src.working_days import VIC_HOLIDAYS
+
+        batch = TransactionBatch.from_transactions(transactions)
+        filtered = filter_transactions_batch(batch, "Nowhere Station", date(2023, 1, 1), date(2025, 12, 31))
+
+        assert len(filtered) == 0
+        assert filtered.latest_datetime() is None
+        assert calculate_attendance_days_batch(filtered, [], VIC_HOLIDAYS) == []
+
+
+class TestUseColumnar:
+    """Tests for the columnar pipeline threshold."""
+
+    def test_threshold_from_environment(self, monkeypatch):
+        """Test: MYKI_COLUMNAR_THRESHOLD controls when the columnar pipeline is used."""
+        monkeypatch.setenv("MYKI_COLUMNAR_THRESHOLD", "100")
+        assert use_columnar(100)
+        assert not use_columnar(99)
+
+        monkeypatch.setenv("MYKI_COLUMNAR_THRESHOLD", "0")
+        assert not use_columnar(10 ** 6)
@@ -0,0 +1,115 @@
+"""Tests for single-parse transaction normalisation into TransactionRecords."""
+
+import sys
+from datetime import date, datetime
+
+import pytest
+
+from src.transaction_processor import (
+    TransactionRecord,
+    TransactionType,
+    normalize_transaction,
+    normalize_transactions,
+    filter_transactions,
+    calculate_attendance_days,
+    latest_transaction_datetime,
+)
+from src.output_manager import filter_new_transactions
+from src.synthetic_data import generate_transactions
+
+
+class TestNormalizeTransaction:
+    """Tests for converting API dicts into TransactionRecords."""
+
+    def test_record_fields(self):
+        """Test: Record holds epoch, offset, local date ordinal, station and type."""
+        record = normalize_transaction({
+            "transactionType": "Touch off",
+            "transactionDateTime": "2025-10-29T13:04:45+11:00",
+            "description": "Heathmont Station"
+        })
+
+        assert record.date == date(2025, 10, 29)
+        assert record.date_ordinal == date(2025, 10, 29).toordinal()
+        assert record.utc_offset == 11 * 3600
+        assert record.station == "Heathmont Station"
+        assert record.txn_type == TransactionType.TOUCH_OFF
+        assert record.local_datetime().isoformat() == "2025-10-29T13:04:45+11:00"
+
+    def test_unknown_type_and_naive_timestamp(self):
+        """Test: Unknown types map to OTHER; naive timestamps are read as Melbourne time."""
+        record = normalize_transaction({
+            "transactionType": "Top up",
+            "transactionDateTime": "2025-01-15 12:00",
+            "description": "Heathmont Station"
+        })
+
+        assert record.txn_type == TransactionType.OTHER
+        assert record.utc_offset == 11 * 3600  # AEDT in January
+
+    def test_invalid_timestamps_dropped(self):
+        """Test: normalize_transactions drops unparseable timestamps."""
+        transactions = [
+            {"transactionDateTime": "2025-05-15T17:00:00+10:00"},
+            {"transactionDateTime": "not-a-date"},
+            {"transactionDateTime": None},
+            {},
+        ]
+
+        records = normalize_transactions(transactions)
+
+        assert len(records) == 1
+        with pytest.raises(ValueError):
+            normalize_transaction({"transactionDateTime": "29/10/2025"})
+
+    def test_record_smaller_than_dict(self):
+        """Test: A record uses well under the memory of the API dict it replaces."""
+        txn = generate_transactions("Melbourne Central", "Heathmont Station",
+                                    malformed_rate=0.0, seed=1)[0]
+        record = normalize_transaction(txn)
+
+        dict_size = sys.getsizeof(txn) + sum(sys.getsizeof(v) for v in txn.values())
+        record_size = sys.getsizeof(record) + sys.getsizeof(record.epoch) + sys.getsizeof(record.date_ordinal)
+
+        assert record_size * 3 < dict_size
+
+
+class TestRecordPipeline:
+    """Tests that record inputs give identical results to dict inputs."""
+
+    def test_filters_match_dict_pipeline(self):
+        """Test: filter/attendance functions agree for dicts and records."""
+        from src.working_days import VIC_HOLIDAYS
+
+        transactions = generate_transactions(
+            "Melbourne Central", "Heathmont Station",
+            start_date=date(2024, 1, 1), years=2, malformed_rate=0.01, seed=4
+        )
+        records = normalize_transactions(transactions)
+        start, end = date(2024, 3, 1), date(2025, 10, 31)
+        latest = datetime.fromisoformat("2024-06-01T00:00:00+10:00")
+
+        dict_filtered = filter_transactions(transactions, "Melbourne Central", start, end)
+        record_filtered = filter_transactions(records, "Melbourne Central", start, end)
+
+        assert all(isinstance(r, TransactionRecord) for r in record_filtered)
+        assert [normalize_transaction(t) for t in dict_filtered] == record_filtered
+        assert (calculate_attendance_days(dict_filtered, [], VIC_HOLIDAYS) ==
+                calculate_attendance_days(record_filtered, [], VIC_HOLIDAYS))
+
+        dict_new = filter_new_transactions(transactions, latest)
+        record_new = filter_new_transactions(records, latest)
+        assert [normalize_transaction(t) for t in dict_new] == record_new
+
+    def test_latest_datetime_compares_instants_across_dst(self):
+        """Test: Latest transaction is chosen by instant, not by raw string order."""
+        records = normalize_transactions([
+            # DST ends 2025-04-06 03:00 AEDT; the +10:00 timestamp is 40 minutes later
+            {"transactionDateTime": "2025-04-06T02:30:00+11:00"},
+            {"transactionDateTime": "2025-04-06T02:10:00+10:00"},
+        ])
+
+        latest = latest_transaction_datetime(records)
+
+        assert latest.isoformat() == "2025-04-06T02:10:00+10:00"
+        assert latest_transaction_datetime([]) is None
@@ -0,0 +1,92 @@
+"""Tests for streaming user manifests and secrets files."""
+
+import json
+import os
+
+import pytest
+
+from src.config_manager import load_tracker_config
+from src.user_manifest import FileSecretSource, iter_manifest, load_manifest_config
+
+
+SECRETS_CSV = (
+    "user,username,card_number,password\n"
+    "koustubh,koustubh25,308412345678901,secret1\n"
+    "john,john@example.com,308498765432109,secret2\n"
+)
+
+
+def _write(path, content):
+    path.write_text(content)
+    os.chmod(path, 0o600)
+    return str(path)
+
+
+class TestManifest:
+
+    def test_csv_and_jsonl_manifests_load_the_same_users(self, tmp_path):
+        csv_path = _write(tmp_path / "users.csv", (
+            "user,targetStation,startDate,endDate,skipDates,manualAttendanceDates,username\n"
+            "koustubh,Heathmont Station,2025-04-15,2025-06-15,2025-04-18;2025-06-02,2025-05-15,\n"
+            "\n"
+            "john,Melbourne Central,2025-01-01,,,,John\n"
+        ))
+        jsonl_path = _write(tmp_path / "users.jsonl", "\n".join([
+            json.dumps({"user": "koustubh", "targetStation": "Heathmont Station", "startDate": "2025-04-15",
+                        "endDate": "2025-06-15", "skipDates": ["2025-04-18", "2025-06-02"],
+                        "manualAttendanceDates": ["2025-05-15"], "_note": "comment"}),
+            "# comment line",
+            json.dumps({"user": "john", "targetStation": "Melbourne Central", "startDate": "2025-01-01",
+                        "username": "John"}),
+        ]))
+        secrets = FileSecretSource(_write(tmp_path / "secrets.csv", SECRETS_CSV))
+
+        from_csv = load_manifest_config(csv_path, secrets)
+        from_jsonl = load_manifest_config(jsonl_path, secrets)
+
+        assert from_csv.users == from_jsonl.users
+        assert from_csv.usernames == ["koustubh", "john"]
+        assert from_csv.users["koustubh"]["skipDates"] == ["2025-04-18", "2025-06-02"]
+        assert "endDate" not in from_csv.users["john"]
+        assert from_csv.credentials["john"] == {
+            "username": "john@example.com",
+            "card_number": "308498765432109",
+            "password": "secret2",
+            "display_username": "John"
+        }
+
+    def test_invalid_rows_report_line_numbers(self, tmp_path):
+        path = _write(tmp_path / "users.jsonl", "\n".join([
+            json.dumps({"user": "a", "targetStation": "X", "startDate": "2025-01-01"}),
+            json.dumps({"user": "b", "targetStation": "X", "startDate": "01/02/2025"}),
+        ]))
+        with pytest.raises(ValueError, match=r"users.jsonl:2: Invalid date format for startDate"):
+            list(iter_manifest(path))
+
+        path = _write(tmp_path / "dupes.csv", "user,targetStation,startDate\na,X,2025-01-01\na,Y,2025-01-01\n")
+        with pytest.raises(ValueError, match=r"dupes.csv:3: duplicate user 'a'"):
+            list(iter_manifest(path))
+
+    def test_missing_secrets_are_listed(self, tmp_path):
+        path = _write(tmp_path / "users.csv",
+                      "user,targetStation,startDate\nkoustubh,X,2025-01-01\nalice,X,2025-01-01\n")
+        secrets = FileSecretSource(_write(tmp_path / "secrets.csv", SECRETS_CSV))
+
+        with pytest.raises(ValueError) as exc_info:
+            load_manifest_config(path, secrets)
+
+        message = str(exc_info.value)
+        assert "secrets file" in message
+        assert "password for user 'alice'" in message
+        assert "koustubh" not in message
+
+    def test_load_tracker_config_dispatches_on_suffix(self, tmp_path, monkeypatch):
+        path = _write(tmp_path / "users.csv", "user,targetStation,startDate\njohn,X,2025-01-01\n")
+        monkeypatch.setenv("MYKI_SECRETS_FILE", _write(tmp_path / "secrets.jsonl", json.dumps(
+            {"user": "john", "username": "j", "card_number": "1", "password": "p"})))
+
+        config = load_tracker_config(path)
+
+        assert config.usernames == ["john"]
+        assert config.credentials["john"]["card_number"] == "1"
+        assert config.config_path == path
@@ -0,0 +1,68 @@
+"""Tests for the precompiled WorkingDayCalendar."""
+
+import random
+from datetime import date, timedelta
+
+from src.working_days import VIC_HOLIDAYS, WorkingDayCalendar, is_working_day
+from src.output_manager import calculate_statistics
+
+
+class TestWorkingDayCalendar:
+    """Tests that WorkingDayCalendar agrees with is_working_day."""
+
+    def test_matches_is_working_day(self):
+        """Test: Every date in the range gives the same answer as is_working_day."""
+        skip_dates = [date(2025, 1, 6), date(2025, 1, 11), date(2025, 12, 25)]
+        calendar = WorkingDayCalendar(date(2024, 12, 1), date(2026, 1, 31), skip_dates, VIC_HOLIDAYS)
+
+        current = date(2024, 12, 1)
+        while current <= date(2026, 1, 31):
+            assert calendar.is_working_day(current) == is_working_day(current, skip_dates, VIC_HOLIDAYS)
+            current += timedelta(days=1)
+
+    def test_extends_beyond_compiled_range(self):
+        """Test: Dates outside the compiled years are still classified correctly."""
+        calendar = WorkingDayCalendar(date(2025, 1, 1), date(2025, 12, 31), [], VIC_HOLIDAYS)
+
+        assert not calendar.is_working_day(date(2030, 1, 1))  # New Year's Day
+        assert calendar.is_working_day(date(2030, 1, 2))
+
+    def test_count_between_matches_iteration(self):
+        """Test: count_between equals a day-by-day count over random ranges."""
+        rng = random.Random(3)
+        skip_dates = [date(2025, 1, 1) + timedelta(days=rng.randrange(365)) for _ in range(20)]
+        calendar = WorkingDayCalendar(date(2024, 1, 1), date(2026, 12, 31), skip_dates, VIC_HOLIDAYS)
+
+        for _ in range(100):
+            start = date(2024, 1, 1) + timedelta(days=rng.randrange(1000))
+            end = start + timedelta(days=rng.randrange(120))
+            expected = sum(
+                1 for offset in range((end - start).days + 1)
+                if is_working_day(start + timedelta(days=offset), skip_dates, VIC_HOLIDAYS)
+            )
+            assert calendar.count_between(start, end) == expected
+
+        assert calendar.count_between(date(2025, 5, 2), date(2025, 5, 1)) == 0
+
+    def test_iter_months_and_statistics(self):
+        """Test: Monthly counts feed calculate_statistics unchanged."""
+        start, end = date(2025, 3, 15), date(2025, 5, 10)
+        calendar = WorkingDayCalendar(start, end, [], VIC_HOLIDAYS)
+
+        months = dict(calendar.iter_months(start, end))
+
+        assert list(months) == ["2025-03", "2025-04", "2025-05"]
+        assert months["2025-03"] == 11  # 17-31 Mar; Labour Day (10 Mar) is before the range
+        assert sum(months.values()) == calendar.count_between(start, end)
+
+        with_calendar = calculate_statistics(["2025-04-01"], start, end, [], VIC_HOLIDAYS, calendar=calendar)
+        without_calendar = calculate_statistics(["2025-04-01"], start, end, [], VIC_HOLIDAYS)
+        assert with_calendar == without_calendar
+        assert with_calendar["totalWorkingDays"] == sum(months.values())
+
+    def test_default_holidays(self):
+        """Test: Without a holidays object the calendar uses the shared VIC holidays."""
+        calendar = WorkingDayCalendar(date(2025, 1, 1), date(2025, 12, 31))
+
+        assert not calendar.is_working_day(date(2025, 11, 4))  # Melbourne Cup
+        assert calendar.count_between(date(2025, 1, 1), date(2025, 1, 31)) == 21